@@ -0,0 +1,59 @@
+"""Full-text search columns
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+# Поля и веса tsvector по таблицам (A - самый значимый)
+SEARCH_FIELDS = {
+    'projects': [('name', 'A'), ('address', 'B'), ('city', 'B'), ('description', 'C')],
+    'inspections': [('title', 'A'), ('description', 'B')],
+    'hidden_works': [('title', 'A'), ('description', 'B')],
+    'documents': [('title', 'A'), ('description', 'B')],
+    'regulations': [('code', 'A'), ('title', 'A'), ('content', 'C')],
+}
+
+
+def search_vector_sql(fields) -> str:
+    """Выражение generated колонки: взвешенный tsvector с русской конфигурацией"""
+    return ' || '.join(
+        f"setweight(to_tsvector('russian', coalesce({column}, '')), '{weight}')"
+        for column, weight in fields
+    )
+
+
+def upgrade() -> None:
+    # Колонки вычисляются PostgreSQL при INSERT/UPDATE, приложение их не пишет
+    for table, fields in SEARCH_FIELDS.items():
+        op.add_column(
+            table,
+            sa.Column(
+                'search_vector',
+                postgresql.TSVECTOR(),
+                sa.Computed(search_vector_sql(fields), persisted=True),
+                nullable=True
+            )
+        )
+        op.create_index(
+            f'ix_{table}_search_vector',
+            table,
+            ['search_vector'],
+            postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(list(SEARCH_FIELDS)):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,43 @@
+"""Trigram indexes for fuzzy search
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 12:30:00
+
+"""
+from alembic import op
+
+# revision identifiers
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+# Короткие поля, по которым ищут с опечатками и по подстроке
+TRIGRAM_COLUMNS = [
+    ('projects', 'name'),
+    ('projects', 'address'),
+    ('inspections', 'title'),
+    ('regulations', 'code'),
+    ('documents', 'title'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # gin_trgm_ops обслуживает similarity/word_similarity операторы и ILIKE '%...%'
+    for table, column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f'ix_{table}_{column}_trgm',
+            table,
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    for table, column in reversed(TRIGRAM_COLUMNS):
+        op.drop_index(f'ix_{table}_{column}_trgm', table_name=table)
+    # Расширение не удаляем: им могут пользоваться другие объекты базы
@@ -0,0 +1,100 @@
+"""
+Server-Sent Events endpoints для real-time обновлений
+
+Запасной канал для сетей, где прокси не пропускает WebSocket upgrade.
+События те же, что у /ws: нумерация seq, backplane между воркерами, heartbeat.
+
+Endpoints:
+- GET /events/projects/{project_id} - поток событий проекта (text/event-stream)
+"""
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.dependencies import get_current_user_ws
+from app.models import User
+from app.realtime.codecs import SSE_CODEC
+from app.realtime.sse import SSEConnection
+from app.websocket import manager
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+def _parse_event_id(value: Optional[str]) -> Optional[int]:
+    """Номер события из Last-Event-ID (нечисловые значения игнорируются)"""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+@router.get("/projects/{project_id}")
+async def project_event_stream(
+    project_id: int,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    last_seq: Optional[int] = Query(
+        None,
+        description="Номер последнего полученного события (если нельзя передать Last-Event-ID)"
+    ),
+    current_user: User = Depends(get_current_user_ws)
+):
+    """
+    Поток событий проекта в формате Server-Sent Events
+
+    Параметры:
+    - token: JWT токен (query, EventSource не умеет передавать заголовки)
+    - Last-Event-ID: заголовок, который EventSource отправляет сам при переподключении
+    - last_seq: то же через query для клиентов без Last-Event-ID
+
+    Формат событий:
+    - id: seq события проекта
+    - event: тип ("inspection_created", "defect_detected", ...)
+    - data: JSON, как в WebSocket кадрах
+    - ": heartbeat" комментарий каждые SSE_HEARTBEAT_INTERVAL секунд без событий
+    - event "replay" после повтора пропущенного; complete=false - нужно перечитать проект через REST
+    """
+    connection = SSEConnection()
+    connected = await manager.connect(
+        connection,
+        user_id=current_user.id,
+        project_id=project_id,
+        metadata={"transport": "sse"},
+        codec=SSE_CODEC
+    )
+    if not connected:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Connection limit reached, retry later",
+            headers={"Retry-After": "5"}
+        )
+
+    resume_from = _parse_event_id(last_event_id)
+    if resume_from is None:
+        resume_from = last_seq
+    if resume_from is not None:
+        await manager.replay(connection, project_id, resume_from)
+
+    async def body():
+        try:
+            async for chunk in connection.stream():
+                yield chunk
+                # Кадр ушел клиенту - подключение живо для heartbeat менеджера
+                manager.touch(connection)
+        finally:
+            manager.disconnect(connection)
+            logger.info(f"SSE client disconnected: user_id={current_user.id}, project_id={project_id}")
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # nginx не должен буферизовать поток
+            "X-Accel-Buffering": "no",
+        }
+    )
@@ -1,136 +1,344 @@
 """
 Endpoints для экспорта данных
 """
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 from typing import List, Optional
-import io
-import csv
+from pydantic import BaseModel
 import json
+import logging
+import os
 
 from app.database import get_db
 from app.models.user import User
-from app.models.project import Project
-from app.models.inspection import Inspection
-from app.models.hidden_works import HiddenWork
+from app.models.project import Project, ProjectType, ProjectStatus
+from app.models.inspection import (
+    Inspection,
+    InspectionPhoto,
+    DefectDetection,
+    InspectionStatus,
+    DefectType,
+    DefectSeverity,
+)
+from app.models.hidden_works import HiddenWork, HiddenWorkType, HiddenWorkStatus
 from app.api.dependencies import get_current_user
+from app.utils.csv_stream import stream_csv, DEFAULT_FETCH_SIZE
+from app.utils.columnar_stream import stream_parquet, stream_arrow_ipc, pyarrow_available
+from app.utils.zip_stream import stream_zip, iter_file
+from app.services.document_service import document_service
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Количество проектов, готовящихся параллельно при пакетном экспорте
+BATCH_EXPORT_WORKERS = 4
+
+
+PROJECTS_CSV_HEADER = [
+    'ID', 'Название', 'Тип', 'Статус', 'Адрес', 'Город',
+    'Дата начала', 'Дата окончания', 'Прогресс %'
+]
+
+INSPECTIONS_CSV_HEADER = [
+    'ID', 'Проект ID', 'Проект', 'Название', 'Дата', 'Статус',
+    'Этап', 'Этаж', 'Секция', 'Широта', 'Долгота', 'Инспектор'
+]
+
+
+def _projects_rows_query(db: Session, user_id: int, project_ids: Optional[List[int]] = None):
+    """Запрос строк проектов для CSV (только нужные колонки, без ORM объектов)"""
+    query = db.query(
+        Project.id,
+        Project.name,
+        Project.project_type,
+        Project.status,
+        Project.address,
+        Project.city,
+        Project.start_date,
+        Project.planned_end_date,
+        Project.completion_percentage,
+    ).filter(
+        Project.created_by == user_id
+    )
 
+    if project_ids is not None:
+        query = query.filter(Project.id.in_(project_ids))
+
+    return query.order_by(Project.id)
+
+
+def _inspections_rows_query(db: Session, user_id: int, project_id: Optional[int] = None):
+    """Запрос строк проверок для CSV (проект и инспектор через JOIN)"""
+    query = db.query(
+        Inspection.id,
+        Inspection.project_id,
+        Project.name,
+        Inspection.title,
+        Inspection.inspection_date,
+        Inspection.status,
+        Inspection.construction_phase,
+        Inspection.floor_level,
+        Inspection.section,
+        Inspection.latitude,
+        Inspection.longitude,
+        User.full_name,
+    ).join(
+        Project, Inspection.project_id == Project.id
+    ).join(
+        User, Inspection.inspector_id == User.id
+    ).filter(
+        Project.created_by == user_id
+    )
 
-@router.get("/projects/csv")
-def export_projects_csv(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Экспорт проектов в CSV"""
-
-    projects = db.query(Project).filter(
-        Project.created_by_id == current_user.id
-    ).all()
-
-    # Создаем CSV в памяти
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Заголовки
-    writer.writerow([
-        'ID', 'Название', 'Тип', 'Статус', 'Адрес',
-        'Дата начала', 'Дата окончания', 'Бюджет', 'Клиент'
-    ])
-
-    # Данные
-    for project in projects:
-        writer.writerow([
-            project.id,
-            project.name,
-            project.project_type,
-            project.status,
-            project.address,
-            project.start_date,
-            project.end_date,
-            project.budget or '',
-            project.client_name or '',
-        ])
-
-    # Возвращаем CSV
-    output.seek(0)
+    if project_id:
+        query = query.filter(Inspection.project_id == project_id)
+
+    return query.order_by(Inspection.id)
+
+
+def _stream_rows(db: Session, query):
+    """
+    Построчное чтение через серверный курсор
+
+    yield_per включает stream_results, поэтому PostgreSQL отдает строки
+    пачками по DEFAULT_FETCH_SIZE, а не весь результат сразу.
+    Сессия закрывается, когда генератор исчерпан или клиент отключился.
+    """
+    try:
+        yield from query.yield_per(DEFAULT_FETCH_SIZE)
+    finally:
+        db.close()
+
+
+def _csv_response(filename_prefix: str, chunks) -> StreamingResponse:
+    """StreamingResponse для CSV с именем файла по времени выгрузки"""
     return StreamingResponse(
-        iter([output.getvalue()]),
+        chunks,
         media_type="text/csv",
         headers={
-            "Content-Disposition": f"attachment; filename=projects_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            "Content-Disposition": f"attachment; filename={filename_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         }
     )
 
 
+@router.get("/projects/csv")
+def export_projects_csv(
+    bom: bool = Query(True, description="UTF-8 BOM для корректного открытия в Excel"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Экспорт проектов в CSV (потоковый, постоянный объем памяти)"""
+
+    rows = _stream_rows(db, _projects_rows_query(db, current_user.id))
+    return _csv_response("projects", stream_csv(PROJECTS_CSV_HEADER, rows, bom=bom))
+
+
 @router.get("/inspections/csv")
 def export_inspections_csv(
     project_id: Optional[int] = None,
+    bom: bool = Query(True, description="UTF-8 BOM для корректного открытия в Excel"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Экспорт проверок в CSV"""
-
-    query = db.query(Inspection).join(Project).filter(
-        Project.created_by_id == current_user.id
-    )
+    """Экспорт проверок в CSV (потоковый, постоянный объем памяти)"""
+
+    rows = _stream_rows(db, _inspections_rows_query(db, current_user.id, project_id))
+    return _csv_response("inspections", stream_csv(INSPECTIONS_CSV_HEADER, rows, bom=bom))
+
+
+# Колоночные выгрузки для аналитики (Parquet / Arrow IPC)
+PROJECTS_COLUMNS = [
+    ("id", "int"),
+    ("name", "string"),
+    ("project_type", ProjectType),
+    ("status", ProjectStatus),
+    ("address", "string"),
+    ("city", "string"),
+    ("region", "string"),
+    ("latitude", "float"),
+    ("longitude", "float"),
+    ("start_date", "timestamp"),
+    ("planned_end_date", "timestamp"),
+    ("actual_end_date", "timestamp"),
+    ("completion_percentage", "float"),
+    ("created_at", "timestamp"),
+]
+
+INSPECTIONS_COLUMNS = [
+    ("id", "int"),
+    ("project_id", "int"),
+    ("inspector_id", "int"),
+    ("title", "string"),
+    ("status", InspectionStatus),
+    ("construction_phase", "string"),
+    ("floor_level", "string"),
+    ("section", "string"),
+    ("latitude", "float"),
+    ("longitude", "float"),
+    ("inspection_date", "timestamp"),
+    ("created_at", "timestamp"),
+]
+
+HIDDEN_WORKS_COLUMNS = [
+    ("id", "int"),
+    ("project_id", "int"),
+    ("title", "string"),
+    ("work_type", HiddenWorkType),
+    ("status", HiddenWorkStatus),
+    ("floor_level", "string"),
+    ("section", "string"),
+    ("axis", "string"),
+    ("planned_inspection_date", "timestamp"),
+    ("actual_inspection_date", "timestamp"),
+    ("closing_deadline", "timestamp"),
+    ("created_at", "timestamp"),
+]
+
+DEFECTS_COLUMNS = [
+    ("id", "int"),
+    ("photo_id", "int"),
+    ("inspection_id", "int"),
+    ("project_id", "int"),
+    ("defect_type", DefectType),
+    ("severity", DefectSeverity),
+    ("detected_by_ai", "bool"),
+    ("confidence_score", "float"),
+    ("is_fixed", "bool"),
+    ("fixed_at", "timestamp"),
+    ("created_at", "timestamp"),
+]
+
+
+def _columnar_query(db: Session, dataset: str, user_id: int, project_id: Optional[int] = None):
+    """Запрос колонок набора данных в порядке спецификации *_COLUMNS"""
+    if dataset == "projects":
+        query = db.query(*[getattr(Project, name) for name, _ in PROJECTS_COLUMNS])
+        order_by = Project.id
+    elif dataset == "inspections":
+        query = db.query(*[getattr(Inspection, name) for name, _ in INSPECTIONS_COLUMNS]).join(
+            Project, Inspection.project_id == Project.id
+        )
+        order_by = Inspection.id
+    elif dataset == "hidden-works":
+        query = db.query(*[getattr(HiddenWork, name) for name, _ in HIDDEN_WORKS_COLUMNS]).join(
+            Project, HiddenWork.project_id == Project.id
+        )
+        order_by = HiddenWork.id
+    elif dataset == "defects":
+        query = db.query(
+            DefectDetection.id,
+            DefectDetection.photo_id,
+            InspectionPhoto.inspection_id,
+            Inspection.project_id,
+            DefectDetection.defect_type,
+            DefectDetection.severity,
+            DefectDetection.detected_by_ai,
+            DefectDetection.confidence_score,
+            DefectDetection.is_fixed,
+            DefectDetection.fixed_at,
+            DefectDetection.created_at,
+        ).join(
+            InspectionPhoto, DefectDetection.photo_id == InspectionPhoto.id
+        ).join(
+            Inspection, InspectionPhoto.inspection_id == Inspection.id
+        ).join(
+            Project, Inspection.project_id == Project.id
+        )
+        order_by = DefectDetection.id
+    else:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset: {dataset}")
 
+    query = query.filter(Project.created_by == user_id)
     if project_id:
-        query = query.filter(Inspection.project_id == project_id)
-
-    inspections = query.all()
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    writer.writerow([
-        'ID', 'Проект', 'Дата', 'Местоположение',
-        'Результат', 'Широта', 'Долгота', 'Инспектор'
-    ])
-
-    for inspection in inspections:
-        writer.writerow([
-            inspection.id,
-            inspection.project.name,
-            inspection.inspection_date,
-            inspection.location,
-            inspection.result,
-            inspection.latitude or '',
-            inspection.longitude or '',
-            inspection.inspector.full_name,
-        ])
-
-    output.seek(0)
+        query = query.filter(Project.id == project_id)
+
+    return query.order_by(order_by)
+
+
+COLUMNAR_DATASETS = {
+    "projects": PROJECTS_COLUMNS,
+    "inspections": INSPECTIONS_COLUMNS,
+    "hidden-works": HIDDEN_WORKS_COLUMNS,
+    "defects": DEFECTS_COLUMNS,
+}
+
+
+def _columnar_response(
+    dataset: str,
+    fmt: str,
+    project_id: Optional[int],
+    current_user: User,
+    db: Session
+) -> StreamingResponse:
+    """Потоковая выгрузка набора данных в Parquet или Arrow IPC"""
+    if not pyarrow_available:
+        raise HTTPException(status_code=501, detail="Columnar export requires pyarrow")
+
+    if dataset not in COLUMNAR_DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset: {dataset}")
+
+    columns = COLUMNAR_DATASETS[dataset]
+    rows = _stream_rows(db, _columnar_query(db, dataset, current_user.id, project_id))
+
+    if fmt == "parquet":
+        chunks = stream_parquet(rows, columns)
+        media_type = "application/vnd.apache.parquet"
+        extension = "parquet"
+    else:
+        chunks = stream_arrow_ipc(rows, columns)
+        media_type = "application/vnd.apache.arrow.stream"
+        extension = "arrows"
+
+    filename = f"{dataset.replace('-', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename=inspections_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        }
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
 
-@router.get("/project/{project_id}/json")
-def export_project_json(
-    project_id: int,
-    include_inspections: bool = True,
-    include_hidden_works: bool = True,
+@router.get("/{dataset}/parquet")
+def export_dataset_parquet(
+    dataset: str,
+    project_id: Optional[int] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Экспорт проекта со всеми данными в JSON"""
+    """
+    Экспорт набора данных в Parquet (projects, inspections, hidden-works, defects)
 
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.created_by_id == current_user.id
-    ).first()
+    Строки пишутся row group'ами прямо из курсора БД, перечисления
+    (статусы, типы, критичность) закодированы словарем.
+    """
+    return _columnar_response(dataset, "parquet", project_id, current_user, db)
+
+
+@router.get("/{dataset}/arrow")
+def export_dataset_arrow(
+    dataset: str,
+    project_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Экспорт набора данных в Arrow IPC stream (projects, inspections, hidden-works, defects)
+
+    Читается через pyarrow.ipc.open_stream без промежуточного парсинга.
+    """
+    return _columnar_response(dataset, "arrow", project_id, current_user, db)
 
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
 
+def _project_export_data(
+    db: Session,
+    project: Project,
+    exported_by: str,
+    include_inspections: bool = True,
+    include_hidden_works: bool = True
+) -> dict:
+    """Полные данные проекта для JSON выгрузки"""
     data = {
         "project": {
             "id": project.id,
@@ -138,55 +346,91 @@ def export_project_json(
             "description": project.description,
             "project_type": project.project_type,
             "status": project.status,
-            "start_date": str(project.start_date),
-            "end_date": str(project.end_date) if project.end_date else None,
             "address": project.address,
+            "city": project.city,
+            "region": project.region,
             "latitude": project.latitude,
             "longitude": project.longitude,
-            "client_name": project.client_name,
-            "budget": project.budget,
+            "start_date": str(project.start_date) if project.start_date else None,
+            "planned_end_date": str(project.planned_end_date) if project.planned_end_date else None,
+            "actual_end_date": str(project.actual_end_date) if project.actual_end_date else None,
+            "completion_percentage": project.completion_percentage,
         },
         "export_date": datetime.utcnow().isoformat(),
-        "exported_by": current_user.full_name,
+        "exported_by": exported_by,
     }
 
     if include_inspections:
-        inspections = db.query(Inspection).filter(
-            Inspection.project_id == project_id
-        ).all()
+        inspections = db.query(Inspection, User.full_name).join(
+            User, Inspection.inspector_id == User.id
+        ).filter(
+            Inspection.project_id == project.id
+        ).order_by(Inspection.id).all()
 
         data["inspections"] = [
             {
                 "id": i.id,
+                "title": i.title,
+                "description": i.description,
+                "status": i.status,
                 "inspection_date": str(i.inspection_date),
-                "location": i.location,
-                "result": i.result,
-                "notes": i.notes,
+                "construction_phase": i.construction_phase,
+                "floor_level": i.floor_level,
+                "section": i.section,
                 "latitude": i.latitude,
                 "longitude": i.longitude,
-                "inspector": i.inspector.full_name,
+                "inspector": inspector_name,
             }
-            for i in inspections
+            for i, inspector_name in inspections
         ]
 
     if include_hidden_works:
         hidden_works = db.query(HiddenWork).filter(
-            HiddenWork.project_id == project_id
-        ).all()
+            HiddenWork.project_id == project.id
+        ).order_by(HiddenWork.id).all()
 
         data["hidden_works"] = [
             {
                 "id": hw.id,
+                "title": hw.title,
                 "work_type": hw.work_type,
                 "description": hw.description,
-                "location": hw.location,
                 "status": hw.status,
-                "scheduled_date": str(hw.scheduled_date),
-                "completed_date": str(hw.completed_date) if hw.completed_date else None,
+                "floor_level": hw.floor_level,
+                "section": hw.section,
+                "axis": hw.axis,
+                "planned_inspection_date": str(hw.planned_inspection_date) if hw.planned_inspection_date else None,
+                "actual_inspection_date": str(hw.actual_inspection_date) if hw.actual_inspection_date else None,
+                "closing_deadline": str(hw.closing_deadline) if hw.closing_deadline else None,
             }
             for hw in hidden_works
         ]
 
+    return data
+
+
+@router.get("/project/{project_id}/json")
+def export_project_json(
+    project_id: int,
+    include_inspections: bool = True,
+    include_hidden_works: bool = True,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Экспорт проекта со всеми данными в JSON"""
+
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.created_by == current_user.id
+    ).first()
+
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    data = _project_export_data(
+        db, project, current_user.full_name, include_inspections, include_hidden_works
+    )
+
     # Возвращаем JSON как файл
     json_str = json.dumps(data, ensure_ascii=False, indent=2)
     return StreamingResponse(
@@ -198,35 +442,199 @@ def export_project_json(
     )
 
 
+class BatchExportRequest(BaseModel):
+    """Запрос на пакетный экспорт"""
+    project_ids: List[int]
+    format: str = "zip"
+    include_pdfs: bool = False  # PDF отчеты по проверкам
+    include_photos: bool = False  # Оригиналы фотографий
+
+
+def _build_project_entries(
+    bind,
+    project_id: int,
+    user_id: int,
+    exported_by: str,
+    include_pdfs: bool,
+    include_photos: bool
+):
+    """
+    Подготовка записей архива для одного проекта (выполняется в пуле потоков)
+
+    Каждый поток работает в собственной сессии на том же engine.
+    Фотографии не читаются здесь: в записи передается ленивый итератор файла,
+    который читается уже при записи архива.
+
+    Returns:
+        Tuple (сводка по проекту для manifest.json, список записей архива)
+    """
+    db = Session(bind=bind)
+    try:
+        project = db.query(Project).filter(
+            Project.id == project_id,
+            Project.created_by == user_id
+        ).first()
+
+        if not project:
+            return {"id": project_id, "status": "not_found"}, []
+
+        folder = f"project_{project.id}"
+        data = _project_export_data(db, project, exported_by)
+        entries = [
+            (
+                f"{folder}/project.json",
+                json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"),
+                True,
+            ),
+            (
+                f"{folder}/inspections.csv",
+                b"".join(stream_csv(
+                    INSPECTIONS_CSV_HEADER,
+                    _inspections_rows_query(db, user_id, project.id).yield_per(DEFAULT_FETCH_SIZE)
+                )),
+                True,
+            ),
+            (
+                f"{folder}/hidden_works.csv",
+                b"".join(stream_csv(
+                    [name for name, _ in HIDDEN_WORKS_COLUMNS],
+                    _columnar_query(db, "hidden-works", user_id, project.id).yield_per(DEFAULT_FETCH_SIZE)
+                )),
+                True,
+            ),
+        ]
+
+        if include_pdfs:
+            for inspection in data.get("inspections", []):
+                pdf_bytes = document_service.generate_inspection_report({
+                    "id": inspection["id"],
+                    "date": inspection["inspection_date"],
+                    "project_name": project.name,
+                    "inspector_name": inspection["inspector"],
+                    "status": inspection["status"],
+                })
+                entries.append((f"{folder}/reports/inspection_{inspection['id']}.pdf", pdf_bytes, True))
+
+        photos_count = 0
+        if include_photos:
+            photos = db.query(InspectionPhoto.id, InspectionPhoto.inspection_id, InspectionPhoto.file_url).join(
+                Inspection, InspectionPhoto.inspection_id == Inspection.id
+            ).filter(
+                Inspection.project_id == project.id
+            ).order_by(InspectionPhoto.id).all()
+
+            for photo_id, inspection_id, file_url in photos:
+                path = file_url.lstrip("/")
+                if not os.path.isfile(path):
+                    logger.warning(f"Batch export: photo file missing: {file_url}")
+                    continue
+                name = f"{folder}/photos/inspection_{inspection_id}/{photo_id}_{os.path.basename(path)}"
+                # JPEG уже сжат, храним без повторного сжатия
+                entries.append((name, iter_file(path), False))
+                photos_count += 1
+
+        summary = {
+            "id": project.id,
+            "name": project.name,
+            "status": "exported",
+            "inspections": len(data.get("inspections", [])),
+            "hidden_works": len(data.get("hidden_works", [])),
+            "photos": photos_count,
+        }
+        return summary, entries
+    finally:
+        db.close()
+
+
+def _iter_batch_entries(
+    bind,
+    project_ids: List[int],
+    user_id: int,
+    exported_by: str,
+    include_pdfs: bool,
+    include_photos: bool
+):
+    """
+    Параллельная подготовка проектов; записи отдаются в порядке готовности
+
+    В работе одновременно не больше BATCH_EXPORT_WORKERS * 2 проектов,
+    чтобы готовые, но еще не записанные проекты не накапливались в памяти.
+    """
+    summaries = []
+    pending_ids = iter(dict.fromkeys(project_ids))
+    in_flight_limit = BATCH_EXPORT_WORKERS * 2
+
+    with ThreadPoolExecutor(max_workers=BATCH_EXPORT_WORKERS) as executor:
+        def submit_next(in_flight: set) -> bool:
+            project_id = next(pending_ids, None)
+            if project_id is None:
+                return False
+            in_flight.add(executor.submit(
+                _build_project_entries, bind, project_id, user_id, exported_by, include_pdfs, include_photos
+            ))
+            return True
+
+        in_flight = set()
+        while len(in_flight) < in_flight_limit and submit_next(in_flight):
+            pass
+
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                submit_next(in_flight)
+                summary, entries = future.result()
+                summaries.append(summary)
+                yield from entries
+
+    manifest = {
+        "export_date": datetime.utcnow().isoformat(),
+        "exported_by": exported_by,
+        "projects": sorted(summaries, key=lambda item: item["id"]),
+    }
+    yield "manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"), True
+
+
 @router.post("/batch-export")
 def batch_export(
-    project_ids: List[int],
-    format: str = "json",
+    request: BatchExportRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Пакетный экспорт нескольких проектов"""
+    """
+    Пакетный экспорт нескольких проектов
+
+    format=zip (по умолчанию): потоковый ZIP архив без временных файлов.
+    Для каждого проекта - project.json (как /project/{id}/json), inspections.csv,
+    hidden_works.csv, опционально PDF отчеты по проверкам и оригиналы фото.
+    Проекты готовятся параллельно и пишутся в архив по мере готовности,
+    сводка по всем проектам - в manifest.json.
 
-    projects = db.query(Project).filter(
-        Project.id.in_(project_ids),
-        Project.created_by_id == current_user.id
-    ).all()
+    format=json: полные данные всех проектов одним JSON документом.
+    """
+
+    if request.format not in ("zip", "json"):
+        raise HTTPException(status_code=400, detail="Unsupported format")
+
+    project_ids = [
+        project_id for (project_id,) in db.query(Project.id).filter(
+            Project.id.in_(request.project_ids),
+            Project.created_by == current_user.id
+        ).all()
+    ]
 
-    if not projects:
+    if not project_ids:
         raise HTTPException(status_code=404, detail="No projects found")
 
-    if format == "json":
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    if request.format == "json":
+        projects = db.query(Project).filter(Project.id.in_(project_ids)).order_by(Project.id).all()
         data = {
             "export_date": datetime.utcnow().isoformat(),
             "exported_by": current_user.full_name,
             "projects": [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "status": p.status,
-                    "project_type": p.project_type,
-                }
-                for p in projects
+                _project_export_data(db, project, current_user.full_name)
+                for project in projects
             ]
         }
 
@@ -235,8 +643,22 @@ def batch_export(
             iter([json_str]),
             media_type="application/json",
             headers={
-                "Content-Disposition": f"attachment; filename=batch_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                "Content-Disposition": f"attachment; filename=batch_export_{timestamp}.json"
             }
         )
 
-    raise HTTPException(status_code=400, detail="Unsupported format")
+    entries = _iter_batch_entries(
+        db.get_bind(),
+        project_ids,
+        current_user.id,
+        current_user.full_name,
+        request.include_pdfs,
+        request.include_photos,
+    )
+    return StreamingResponse(
+        stream_zip(entries),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename=batch_export_{timestamp}.zip"
+        }
+    )
@@ -11,6 +11,9 @@ from app.models.user import User
 from app.models.regulation import Regulation
 from app.api.v1.endpoints.auth import get_current_user
 from app.config import settings
+from app.search.indexer import search_index
+from app.services.consultant_context import get_consult_context
+import logging
 
 # Для ИИ консультанта
 try:
@@ -26,6 +29,7 @@ except ImportError:
     claude_available = False
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 # Pydantic схемы
@@ -95,29 +99,9 @@ async def get_regulation(
     return regulation
 
 
-@router.post("/ai-consult", response_model=AIConsultResponse)
-async def ai_consult(
-    request: AIConsultRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    ИИ-консультант по нормативам
-    Использует OpenAI API или Claude API для ответов на вопросы
-    """
-
-    # Получение релевантных нормативов из БД
-    # В продакшене здесь будет использоваться Elasticsearch для семантического поиска
-    relevant_regulations = db.query(Regulation).filter(Regulation.is_active == True).limit(5).all()
-
-    # Формирование контекста для ИИ
-    regulations_context = "\n".join([
-        f"- {reg.code}: {reg.title}"
-        for reg in relevant_regulations
-    ])
-
-    # Расширенный system prompt для профессиональных ответов
-    system_prompt = """Ты - высококвалифицированный эксперт по строительным нормативам и правилам Российской Федерации с 20+ летним опытом.
+# System prompt ИИ-консультанта: развернутые профессиональные ответы
+SYSTEM_PROMPT = """Ты - высококвалифицированный эксперт по строительным нормативам и правилам \
+Российской Федерации с 20+ летним опытом.
 
 ТВОЯ РОЛЬ:
 - Консультант технических специалистов, инженеров и архитекторов
@@ -160,9 +144,24 @@ async def ai_consult(
 ✓ Приводи примеры из практики
 """
 
-    prompt = f"""{system_prompt}
 
-📚 ДОСТУПНЫЕ НОРМАТИВЫ В БАЗЕ:
+@router.post("/ai-consult", response_model=AIConsultResponse)
+async def ai_consult(
+    request: AIConsultRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    ИИ-консультант по нормативам
+    Использует OpenAI API или Claude API для ответов на вопросы
+    """
+
+    # Нормативы и требования, подходящие к вопросу, в пределах бюджета токенов (с кешем)
+    consult_context = get_consult_context(db, request.question)
+    regulations_context = consult_context.text or "Подходящих нормативов в базе не найдено"
+
+    # System prompt передается отдельно и один раз: в запросе только контекст и вопрос
+    prompt = f"""📚 НОРМАТИВЫ ПО ВОПРОСУ:
 {regulations_context}
 
 🏗️ КОНТЕКСТ ПРОЕКТА: {request.context or 'Не указан'}
@@ -181,6 +180,7 @@ async def ai_consult(
                 model="claude-3-sonnet-20240229",
                 max_tokens=4096,  # Увеличено для развернутых ответов
                 temperature=0.7,
+                system=SYSTEM_PROMPT,
                 messages=[
                     {"role": "user", "content": prompt}
                 ]
@@ -193,7 +193,7 @@ async def ai_consult(
             response = client.chat.completions.create(
                 model="gpt-4-turbo-preview",
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=4096,  # Увеличено для развернутых ответов
@@ -240,7 +240,7 @@ async def ai_consult(
 
         return {
             "answer": answer,
-            "referenced_regulations": [reg.code for reg in relevant_regulations],
+            "referenced_regulations": consult_context.regulations,
             "confidence": 0.85
         }
 
@@ -258,11 +258,27 @@ async def semantic_search_regulations(
     db: Session = Depends(get_db)
 ):
     """
-    Семантический поиск по нормативам
-    TODO: Интеграция с Elasticsearch и векторным поиском
+    Поиск по нормативам в поисковом индексе (Elasticsearch или embedded)
+
+    Ищет по коду, названию, полному названию, ключевым словам, описанию и тексту
+    с русской морфологией. Если индекс недоступен - поиск по БД.
     """
-    # Заглушка для семантического поиска
-    # В продакшене здесь будет Elasticsearch с BERT embeddings
+    try:
+        hits = search_index(db, "regulations", query, filters={"is_active": True}, limit=10)
+        return {
+            "query": query,
+            "results": [
+                {
+                    "id": int(hit["id"]),
+                    "code": hit["source"]["code"],
+                    "title": hit["source"]["title"],
+                    "score": hit["score"],
+                }
+                for hit in hits
+            ]
+        }
+    except Exception as e:
+        logger.warning(f"Search index unavailable, falling back to database: {e}")
 
     results = db.query(Regulation).filter(
         (Regulation.title.ilike(f"%{query}%")) |
@@ -276,7 +292,7 @@ async def semantic_search_regulations(
                 "id": reg.id,
                 "code": reg.code,
                 "title": reg.title,
-                "score": 0.9  # Заглушка для релевантности
+                "score": None
             }
             for reg in results
         ]
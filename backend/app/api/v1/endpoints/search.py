@@ -1,9 +1,11 @@
 """
 Endpoints для поиска
 """
+import json
+
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
 from typing import List, Optional
 
 from app.database import get_db
@@ -14,107 +16,162 @@ from app.models.hidden_works import HiddenWork
 from app.models.document import Document
 from app.models.regulation import Regulation
 from app.api.dependencies import get_current_user
+from app.search import federated, fulltext, trigram
+from app.search.autocomplete import autocomplete_index
 
 router = APIRouter()
 
+# Типы подсказок индекса автодополнения по entity_type (None - все)
+AUTOCOMPLETE_KINDS = {
+    "all": None,
+    "projects": {"project"},
+    "inspections": {"inspection"},
+    "documents": {"document"},
+}
+# С какой длины запроса искать опечатки в БД, если индекс ничего не нашел
+TYPO_SEARCH_MIN_LENGTH = 3
+
+SEARCH_MODE_PATTERN = "^(auto|fulltext|fuzzy)$"
+SEARCH_MODE_DESCRIPTION = (
+    "fulltext - по словам с морфологией, fuzzy - с опечатками по коротким полям, "
+    "auto - fuzzy, если fulltext ничего не нашел"
+)
+
+
+def _search_project_hits(db: Session, q: str, user_id: int, limit: int) -> List[dict]:
+    """Проекты пользователя для глобального поиска"""
+    hits = fulltext.ranked_search(
+        db.query(Project).filter(Project.created_by == user_id),
+        Project,
+        q,
+        fallback_columns=[Project.name, Project.description, Project.address],
+        snippet_column=Project.description,
+        limit=limit
+    )
+    return [
+        {
+            "id": p.id,
+            "name": p.name,
+            "type": "project",
+            "description": p.description,
+            "rank": rank,
+            "snippet": snippet,
+        }
+        for p, rank, snippet in hits
+    ]
+
+
+def _search_inspection_hits(db: Session, q: str, user_id: int, limit: int) -> List[dict]:
+    """Проверки по проектам пользователя для глобального поиска"""
+    hits = fulltext.ranked_search(
+        db.query(Inspection).join(Project).filter(Project.created_by == user_id),
+        Inspection,
+        q,
+        fallback_columns=[Inspection.title, Inspection.description],
+        snippet_column=Inspection.description,
+        limit=limit
+    )
+    return [
+        {
+            "id": i.id,
+            "title": i.title,
+            "type": "inspection",
+            "date": str(i.inspection_date),
+            "rank": rank,
+            "snippet": snippet,
+        }
+        for i, rank, snippet in hits
+    ]
+
+
+def _search_hidden_work_hits(db: Session, q: str, user_id: int, limit: int) -> List[dict]:
+    """Скрытые работы по проектам пользователя для глобального поиска"""
+    hits = fulltext.ranked_search(
+        db.query(HiddenWork).join(Project).filter(Project.created_by == user_id),
+        HiddenWork,
+        q,
+        fallback_columns=[HiddenWork.title, HiddenWork.description],
+        snippet_column=HiddenWork.description,
+        limit=limit
+    )
+    return [
+        {
+            "id": hw.id,
+            "title": hw.title,
+            "type": "hidden_work",
+            "work_type": hw.work_type,
+            "rank": rank,
+            "snippet": snippet,
+        }
+        for hw, rank, snippet in hits
+    ]
+
+
+def _search_document_hits(db: Session, q: str, user_id: int, limit: int) -> List[dict]:
+    """Документы по проектам пользователя для глобального поиска"""
+    hits = fulltext.ranked_search(
+        db.query(Document).join(Project).filter(Project.created_by == user_id),
+        Document,
+        q,
+        fallback_columns=[Document.title, Document.description],
+        snippet_column=Document.description,
+        limit=limit
+    )
+    return [
+        {
+            "id": d.id,
+            "title": d.title,
+            "type": "document",
+            "document_type": d.document_type,
+            "rank": rank,
+            "snippet": snippet,
+        }
+        for d, rank, snippet in hits
+    ]
+
+
+GLOBAL_SEARCH_TYPES = {
+    "projects": _search_project_hits,
+    "inspections": _search_inspection_hits,
+    "hidden_works": _search_hidden_work_hits,
+    "documents": _search_document_hits,
+}
+
 
 @router.get("/global")
 def global_search(
     q: str = Query(..., min_length=2, description="Поисковый запрос"),
+    per_type: int = Query(10, ge=1, le=50, description="Максимум результатов каждого типа"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Глобальный поиск по всем сущностям"""
-
-    search_term = f"%{q}%"
-
-    # Поиск проектов
-    projects = db.query(Project).filter(
-        and_(
-            Project.created_by_id == current_user.id,
-            or_(
-                Project.name.ilike(search_term),
-                Project.description.ilike(search_term),
-                Project.address.ilike(search_term)
-            )
-        )
-    ).limit(10).all()
-
-    # Поиск проверок
-    inspections = db.query(Inspection).join(Project).filter(
-        and_(
-            Project.created_by_id == current_user.id,
-            or_(
-                Inspection.location.ilike(search_term),
-                Inspection.notes.ilike(search_term)
-            )
-        )
-    ).limit(10).all()
-
-    # Поиск скрытых работ
-    hidden_works = db.query(HiddenWork).join(Project).filter(
-        and_(
-            Project.created_by_id == current_user.id,
-            or_(
-                HiddenWork.work_type.ilike(search_term),
-                HiddenWork.description.ilike(search_term),
-                HiddenWork.location.ilike(search_term)
-            )
-        )
-    ).limit(10).all()
-
-    # Поиск документов
-    documents = db.query(Document).join(Project).filter(
-        and_(
-            Project.created_by_id == current_user.id,
-            or_(
-                Document.title.ilike(search_term),
-                Document.description.ilike(search_term)
-            )
-        )
-    ).limit(10).all()
+    """
+    Глобальный поиск по всем сущностям
+
+    Полнотекстовый поиск (русская морфология) с сортировкой по релевантности.
+    Поддерживается синтаксис websearch: "точная фраза", or, -исключение.
+    snippet - фрагмент текста с подсветкой совпадений (<mark>).
+
+    Типы сущностей ищутся параллельно на отдельных подключениях. Если часть
+    поисков не уложилась в SEARCH_DEADLINE_MS, ответ содержит найденное,
+    partial=true и список типов в timed_out.
+    ranked - все результаты одним списком по убыванию релевантности.
+    """
+    user_id = current_user.id
+    tasks = {
+        name: (lambda session, search=search: search(session, q, user_id, per_type))
+        for name, search in GLOBAL_SEARCH_TYPES.items()
+    }
+    found, missing = federated.run_parallel(db.get_bind(), tasks)
+    results = {name: found.get(name, []) for name in GLOBAL_SEARCH_TYPES}
 
     return {
         "query": q,
-        "results": {
-            "projects": [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "type": "project",
-                    "description": p.description,
-                }
-                for p in projects
-            ],
-            "inspections": [
-                {
-                    "id": i.id,
-                    "location": i.location,
-                    "type": "inspection",
-                    "date": str(i.inspection_date),
-                }
-                for i in inspections
-            ],
-            "hidden_works": [
-                {
-                    "id": hw.id,
-                    "work_type": hw.work_type,
-                    "type": "hidden_work",
-                    "location": hw.location,
-                }
-                for hw in hidden_works
-            ],
-            "documents": [
-                {
-                    "id": d.id,
-                    "title": d.title,
-                    "type": "document",
-                    "document_type": d.document_type,
-                }
-                for d in documents
-            ],
-        },
-        "total_results": len(projects) + len(inspections) + len(hidden_works) + len(documents),
+        "results": results,
+        "ranked": federated.merge_ranked(results, per_type),
+        "partial": bool(missing),
+        "timed_out": missing,
+        "total_results": sum(len(hits) for hits in results.values()),
     }
 
 
@@ -123,24 +180,13 @@ def search_projects(
     q: str = Query(..., min_length=2),
     project_type: Optional[str] = None,
     status: Optional[str] = None,
+    mode: str = Query("auto", pattern=SEARCH_MODE_PATTERN, description=SEARCH_MODE_DESCRIPTION),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Расширенный поиск по проектам"""
-
-    search_term = f"%{q}%"
-
-    query = db.query(Project).filter(
-        and_(
-            Project.created_by_id == current_user.id,
-            or_(
-                Project.name.ilike(search_term),
-                Project.description.ilike(search_term),
-                Project.address.ilike(search_term),
-                Project.client_name.ilike(search_term)
-            )
-        )
-    )
+    """Расширенный поиск по проектам (по релевантности)"""
+
+    query = db.query(Project).filter(Project.created_by == current_user.id)
 
     if project_type:
         query = query.filter(Project.project_type == project_type)
@@ -148,7 +194,22 @@ def search_projects(
     if status:
         query = query.filter(Project.status == status)
 
-    projects = query.all()
+    projects = []
+    matched_by = "fulltext"
+    if mode != "fuzzy":
+        projects = fulltext.ranked_search(
+            query,
+            Project,
+            q,
+            fallback_columns=[Project.name, Project.description, Project.address, Project.city],
+            snippet_column=Project.description
+        )
+    if mode == "fuzzy" or (mode == "auto" and not projects):
+        matched_by = "fuzzy"
+        projects = [
+            (p, similarity, None)
+            for p, similarity in trigram.fuzzy_search(query, q, [Project.name, Project.address])
+        ]
 
     return {
         "query": q,
@@ -156,6 +217,7 @@ def search_projects(
             "project_type": project_type,
             "status": status,
         },
+        "mode": matched_by,
         "results": [
             {
                 "id": p.id,
@@ -164,49 +226,82 @@ def search_projects(
                 "project_type": p.project_type,
                 "status": p.status,
                 "address": p.address,
-                "client_name": p.client_name,
+                "city": p.city,
+                "rank": rank,
+                "snippet": snippet,
             }
-            for p in projects
+            for p, rank, snippet in projects
         ],
         "count": len(projects),
     }
 
 
+def _categories(value: Optional[str]) -> List[str]:
+    """Категории норматива из JSON массива в колонке categories"""
+    try:
+        categories = json.loads(value) if value else []
+    except ValueError:
+        return []
+    return categories if isinstance(categories, list) else []
+
+
 @router.get("/regulations")
 def search_regulations(
     q: str = Query(..., min_length=2, description="Поиск по СП, ГОСТ"),
     category: Optional[str] = None,
+    mode: str = Query("auto", pattern=SEARCH_MODE_PATTERN, description=SEARCH_MODE_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
-    """Поиск по нормативным документам"""
+    """
+    Поиск по нормативным документам (по релевантности, с фрагментами текста)
 
-    search_term = f"%{q}%"
+    В режиме fuzzy ищется код норматива с опечатками и неполный:
+    "СП 63.1333" находит "СП 63.13330.2018".
+    """
 
-    query = db.query(Regulation).filter(
-        or_(
-            Regulation.code.ilike(search_term),
-            Regulation.title.ilike(search_term),
-            Regulation.content.ilike(search_term)
-        )
-    )
+    query = db.query(Regulation)
 
     if category:
-        query = query.filter(Regulation.category == category)
-
-    regulations = query.limit(20).all()
+        # categories - JSON массив строк: ищем элемент в кавычках (с экранированием и без)
+        query = query.filter(or_(
+            Regulation.categories.contains(json.dumps(category, ensure_ascii=False)),
+            Regulation.categories.contains(json.dumps(category)),
+        ))
+
+    regulations = []
+    matched_by = "fulltext"
+    if mode != "fuzzy":
+        regulations = fulltext.ranked_search(
+            query,
+            Regulation,
+            q,
+            fallback_columns=[Regulation.code, Regulation.title, Regulation.content],
+            snippet_column=Regulation.content,
+            limit=20
+        )
+    if mode == "fuzzy" or (mode == "auto" and not regulations):
+        matched_by = "fuzzy"
+        regulations = [
+            (r, similarity, None)
+            for r, similarity in trigram.fuzzy_search(query, q, [Regulation.code], limit=20)
+        ]
 
     return {
         "query": q,
         "category": category,
+        "mode": matched_by,
         "results": [
             {
                 "id": r.id,
                 "code": r.code,
                 "title": r.title,
-                "category": r.category,
+                "regulation_type": r.regulation_type,
+                "categories": _categories(r.categories),
                 "effective_date": str(r.effective_date) if r.effective_date else None,
+                "rank": rank,
+                "snippet": snippet,
             }
-            for r in regulations
+            for r, rank, snippet in regulations
         ],
         "count": len(regulations),
     }
@@ -215,42 +310,60 @@ def search_regulations(
 @router.get("/autocomplete")
 def autocomplete(
     q: str = Query(..., min_length=1),
-    entity_type: str = Query("all", description="Тип сущности: all, projects, inspections, documents"),
+    entity_type: str = Query(
+        "all",
+        pattern="^(all|projects|inspections|documents)$",
+        description="Тип сущности: all, projects, inspections, documents"
+    ),
     limit: int = Query(10, le=20),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Автодополнение для поиска"""
-
-    search_term = f"{q}%"
-    suggestions = []
-
+    """
+    Автодополнение для поиска
+
+    Подсказки берутся из in-memory индекса пользователя (названия проектов,
+    проверок и документов) по началу строки или любого слова в ней.
+    Если в индексе ничего нет, ищутся похожие значения в БД (опечатки).
+    """
+
+    kinds = AUTOCOMPLETE_KINDS.get(entity_type)
+    suggestions = autocomplete_index.suggest(db, current_user.id, q, limit, kinds)
+    if suggestions or len(q) < TYPO_SEARCH_MIN_LENGTH:
+        return {
+            "query": q,
+            "suggestions": suggestions,
+        }
+
+    # В индексе ничего нет - возможно, опечатка: ищем похожие значения по trigram индексам
     if entity_type in ["all", "projects"]:
-        projects = db.query(Project.name).filter(
-            and_(
-                Project.created_by_id == current_user.id,
-                Project.name.ilike(search_term)
-            )
-        ).limit(limit).all()
-        suggestions.extend([{"text": p[0], "type": "project"} for p in projects])
+        names = trigram.suggest(
+            db.query(Project.name).filter(Project.created_by == current_user.id),
+            Project.name,
+            q,
+            limit
+        )
+        suggestions.extend([{"text": name, "type": "project"} for name in names])
 
     if entity_type in ["all", "inspections"]:
-        locations = db.query(Inspection.location).join(Project).filter(
-            and_(
-                Project.created_by_id == current_user.id,
-                Inspection.location.ilike(search_term)
-            )
-        ).distinct().limit(limit).all()
-        suggestions.extend([{"text": l[0], "type": "location"} for l in locations])
+        titles = trigram.suggest(
+            db.query(Inspection.title).join(Project).filter(
+                Project.created_by == current_user.id
+            ).distinct(),
+            Inspection.title,
+            q,
+            limit
+        )
+        suggestions.extend([{"text": title, "type": "inspection"} for title in titles])
 
     if entity_type in ["all", "documents"]:
-        docs = db.query(Document.title).join(Project).filter(
-            and_(
-                Project.created_by_id == current_user.id,
-                Document.title.ilike(search_term)
-            )
-        ).limit(limit).all()
-        suggestions.extend([{"text": d[0], "type": "document"} for d in docs])
+        titles = trigram.suggest(
+            db.query(Document.title).join(Project).filter(Project.created_by == current_user.id),
+            Document.title,
+            q,
+            limit
+        )
+        suggestions.extend([{"text": title, "type": "document"} for title in titles])
 
     return {
         "query": q,
@@ -1,22 +1,34 @@
 """
 Endpoints для статистики
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import io
+import csv
 
 from app.database import get_db
 from app.models.user import User
-from app.models.project import Project
-from app.models.inspection import Inspection, InspectionPhoto, DefectDetection
-from app.models.hidden_works import HiddenWork
+from app.models.project import Project, ProjectStatus
+from app.models.inspection import Inspection, InspectionPhoto, DefectDetection, DefectSeverity
+from app.models.hidden_works import HiddenWork, HiddenWorkStatus
 from app.api.dependencies import get_current_user
+from app.utils.analytics import describe, bucket_by_date, rate_per_period
+from app.utils.helpers import flatten_dict
+from app.services.stats_cache import stats_cache
+from app.services.document_service import document_service
 
 router = APIRouter()
 
 
+def _counts(rows) -> Dict[str, int]:
+    """Счетчики по значениям перечисления (ключи - строки, как в JSON и CSV)"""
+    return {getattr(key, "value", key): count for key, count in rows}
+
+
 @router.get("/dashboard")
 def get_dashboard_stats(
     current_user: User = Depends(get_current_user),
@@ -26,46 +38,46 @@ def get_dashboard_stats(
 
     # Общая статистика
     total_projects = db.query(Project).filter(
-        Project.created_by_id == current_user.id
+        Project.created_by == current_user.id
     ).count()
 
     active_projects = db.query(Project).filter(
         and_(
-            Project.created_by_id == current_user.id,
-            Project.status == 'in_progress'
+            Project.created_by == current_user.id,
+            Project.status == ProjectStatus.IN_PROGRESS
         )
     ).count()
 
     total_inspections = db.query(Inspection).join(Project).filter(
-        Project.created_by_id == current_user.id
+        Project.created_by == current_user.id
     ).count()
 
     # Проверки за последние 30 дней
     thirty_days_ago = datetime.utcnow() - timedelta(days=30)
     recent_inspections = db.query(Inspection).join(Project).filter(
         and_(
-            Project.created_by_id == current_user.id,
+            Project.created_by == current_user.id,
             Inspection.created_at >= thirty_days_ago
         )
     ).count()
 
     # Дефекты
     total_defects = db.query(DefectDetection).join(InspectionPhoto).join(Inspection).join(Project).filter(
-        Project.created_by_id == current_user.id
+        Project.created_by == current_user.id
     ).count()
 
     critical_defects = db.query(DefectDetection).join(InspectionPhoto).join(Inspection).join(Project).filter(
         and_(
-            Project.created_by_id == current_user.id,
-            DefectDetection.severity == 'critical'
+            Project.created_by == current_user.id,
+            DefectDetection.severity == DefectSeverity.CRITICAL
         )
     ).count()
 
     # Скрытые работы
     pending_hidden_works = db.query(HiddenWork).join(Project).filter(
         and_(
-            Project.created_by_id == current_user.id,
-            HiddenWork.status == 'pending'
+            Project.created_by == current_user.id,
+            HiddenWork.status == HiddenWorkStatus.PENDING
         )
     ).count()
 
@@ -74,16 +86,16 @@ def get_dashboard_stats(
         Project.status,
         func.count(Project.id)
     ).filter(
-        Project.created_by_id == current_user.id
+        Project.created_by == current_user.id
     ).group_by(Project.status).all()
 
-    # Проверки по результатам
+    # Проверки по статусам
     inspections_by_result = db.query(
-        Inspection.result,
+        Inspection.status,
         func.count(Inspection.id)
     ).join(Project).filter(
-        Project.created_by_id == current_user.id
-    ).group_by(Inspection.result).all()
+        Project.created_by == current_user.id
+    ).group_by(Inspection.status).all()
 
     return {
         "summary": {
@@ -95,12 +107,8 @@ def get_dashboard_stats(
             "critical_defects": critical_defects,
             "pending_hidden_works": pending_hidden_works,
         },
-        "projects_by_status": {
-            status: count for status, count in projects_by_status
-        },
-        "inspections_by_result": {
-            result: count for result, count in inspections_by_result
-        },
+        "projects_by_status": _counts(projects_by_status),
+        "inspections_by_result": _counts(inspections_by_result),
     }
 
 
@@ -122,23 +130,22 @@ def get_project_statistics(
     ).count()
 
     inspections_by_result = db.query(
-        Inspection.result,
+        Inspection.status,
         func.count(Inspection.id)
     ).filter(
         Inspection.project_id == project_id
-    ).group_by(Inspection.result).all()
+    ).group_by(Inspection.status).all()
 
     # Фотографии
     total_photos = db.query(InspectionPhoto).join(Inspection).filter(
         Inspection.project_id == project_id
     ).count()
 
-    photos_with_defects = db.query(InspectionPhoto).join(Inspection).filter(
-        and_(
-            Inspection.project_id == project_id,
-            InspectionPhoto.has_defects == True
-        )
-    ).count()
+    photos_with_defects = db.query(
+        func.count(func.distinct(DefectDetection.photo_id))
+    ).join(InspectionPhoto).join(Inspection).filter(
+        Inspection.project_id == project_id
+    ).scalar()
 
     # Дефекты
     defects_by_type = db.query(
@@ -163,12 +170,15 @@ def get_project_statistics(
         HiddenWork.project_id == project_id
     ).group_by(HiddenWork.status).all()
 
-    # Прогресс проекта (пример расчета)
+    # Прогресс проекта: завершенный - 100%, иначе доля прошедшего планового срока
     completion_percentage = 0
-    if project.end_date:
-        total_days = (project.end_date - project.start_date).days
-        elapsed_days = (datetime.utcnow().date() - project.start_date).days
-        completion_percentage = min(100, max(0, (elapsed_days / total_days) * 100))
+    if project.actual_end_date:
+        completion_percentage = 100
+    elif project.start_date and project.planned_end_date:
+        total_days = (project.planned_end_date - project.start_date).days
+        elapsed_days = (datetime.utcnow() - project.start_date).days
+        if total_days > 0:
+            completion_percentage = min(100, max(0, (elapsed_days / total_days) * 100))
 
     return {
         "project_id": project_id,
@@ -176,18 +186,18 @@ def get_project_statistics(
         "completion_percentage": round(completion_percentage, 2),
         "inspections": {
             "total": total_inspections,
-            "by_result": {result: count for result, count in inspections_by_result},
+            "by_result": _counts(inspections_by_result),
         },
         "photos": {
             "total": total_photos,
             "with_defects": photos_with_defects,
         },
         "defects": {
-            "by_type": {dtype: count for dtype, count in defects_by_type},
-            "by_severity": {severity: count for severity, count in defects_by_severity},
+            "by_type": _counts(defects_by_type),
+            "by_severity": _counts(defects_by_severity),
         },
         "hidden_works": {
-            "by_status": {status: count for status, count in hidden_works_by_status},
+            "by_status": _counts(hidden_works_by_status),
         },
     }
 
@@ -208,21 +218,21 @@ def get_trends(
         func.count(Inspection.id).label('count')
     ).join(Project).filter(
         and_(
-            Project.created_by_id == current_user.id,
+            Project.created_by == current_user.id,
             Inspection.inspection_date >= start_date
         )
     ).group_by(func.date(Inspection.inspection_date)).all()
 
     # Дефекты по дням
     defects_by_day = db.query(
-        func.date(DefectDetection.detected_at).label('date'),
+        func.date(DefectDetection.created_at).label('date'),
         func.count(DefectDetection.id).label('count')
     ).join(InspectionPhoto).join(Inspection).join(Project).filter(
         and_(
-            Project.created_by_id == current_user.id,
-            DefectDetection.detected_at >= start_date
+            Project.created_by == current_user.id,
+            DefectDetection.created_at >= start_date
         )
-    ).group_by(func.date(DefectDetection.detected_at)).all()
+    ).group_by(func.date(DefectDetection.created_at)).all()
 
     return {
         "period_days": days,
@@ -237,27 +247,163 @@ def get_trends(
     }
 
 
+@router.get("/defects/confidence")
+def get_defect_confidence_distribution(
+    project_id: int = None,
+    bins: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Распределение уверенности ИИ по обнаруженным дефектам"""
+
+    query = db.query(
+        DefectDetection.confidence_score
+    ).join(InspectionPhoto).join(Inspection).join(Project).filter(
+        and_(
+            Project.created_by == current_user.id,
+            DefectDetection.detected_by_ai.is_(True),
+            DefectDetection.confidence_score.isnot(None)
+        )
+    )
+
+    if project_id:
+        query = query.filter(Inspection.project_id == project_id)
+
+    # Забираем только один столбец, без построения ORM объектов
+    scores = [row[0] for row in query.all()]
+
+    return {
+        "project_id": project_id,
+        "confidence": describe(scores, bins=bins, value_range=(0.0, 1.0)),
+    }
+
+
+@router.get("/inspections/throughput")
+def get_inspection_throughput(
+    days: int = Query(30, ge=1, le=366),
+    period: str = Query("day", pattern="^(day|week|month)$"),
+    project_id: int = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Пропускная способность: количество проверок по периодам"""
+
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+
+    query = db.query(Inspection.inspection_date).join(Project).filter(
+        and_(
+            Project.created_by == current_user.id,
+            Inspection.inspection_date >= start_date
+        )
+    )
+
+    if project_id:
+        query = query.filter(Inspection.project_id == project_id)
+
+    timestamps = [row[0] for row in query.all()]
+    buckets = bucket_by_date(
+        timestamps,
+        period=period,
+        date_from=start_date.date(),
+        date_to=end_date.date(),
+        fill_gaps=True
+    )
+
+    return {
+        "period_days": days,
+        "period": period,
+        "project_id": project_id,
+        "total": len(timestamps),
+        "throughput": [
+            {"date": bucket, "count": count}
+            for bucket, count in buckets.items()
+        ],
+        "rate": rate_per_period(buckets),
+    }
+
+
+def _iter_stats_csv(snapshot: Dict[str, Any]):
+    """Построчная генерация CSV из снимка статистики"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    rows = [("Показатель", "Значение"), ("snapshot_at", snapshot["snapshot_at"])]
+    rows.extend(flatten_dict(snapshot["stats"]))
+
+    for metric, value in rows:
+        writer.writerow([metric, "" if value is None else value])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+
 @router.get("/export-stats")
 def export_statistics(
     project_id: int = None,
     format: str = "json",
+    snapshot_ts: Optional[int] = Query(None, description="Момент снимка из предыдущей выгрузки"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Экспорт статистики в различных форматах"""
+    """
+    Экспорт статистики в различных форматах
 
-    if project_id:
-        stats = get_project_statistics(project_id, current_user, db)
+    Статистика берется из снимка, закешированного по пользователю, проекту и времени:
+    повторные выгрузки того же периода (в любом формате) не обращаются к БД.
+    Момент снимка возвращается в заголовке X-Stats-Snapshot.
+    """
+
+    if format not in ("json", "csv", "pdf"):
+        raise HTTPException(status_code=400, detail="Unsupported format")
+
+    if snapshot_ts is not None:
+        snapshot = stats_cache.get(current_user.id, project_id, snapshot_ts)
+        if snapshot is None:
+            raise HTTPException(status_code=404, detail="Statistics snapshot expired")
+    elif project_id:
+        snapshot = stats_cache.get_or_create(
+            current_user.id,
+            project_id,
+            lambda: get_project_statistics(project_id, current_user, db)
+        )
     else:
-        stats = get_dashboard_stats(current_user, db)
+        snapshot = stats_cache.get_or_create(
+            current_user.id,
+            None,
+            lambda: get_dashboard_stats(current_user, db)
+        )
+
+    stats = snapshot["stats"]
+    filename = f"statistics_{project_id or 'dashboard'}_{snapshot['snapshot_ts']}"
+    headers = {"X-Stats-Snapshot": str(snapshot["snapshot_ts"])}
 
     if format == "json":
-        return stats
-    elif format == "csv":
-        # TODO: Конвертировать в CSV
-        return {"message": "CSV export not implemented yet", "data": stats}
-    elif format == "pdf":
-        # TODO: Генерация PDF отчета
-        return {"message": "PDF export not implemented yet", "data": stats}
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported format")
+        return JSONResponse(content=stats, headers=headers)
+
+    if format == "csv":
+        return StreamingResponse(
+            _iter_stats_csv(snapshot),
+            media_type="text/csv",
+            headers={
+                **headers,
+                "Content-Disposition": f"attachment; filename={filename}.csv"
+            }
+        )
+
+    title = stats.get("project_name") or "Дашборд"
+    pdf_bytes = document_service.generate_statistics_report({
+        "title": title,
+        "snapshot_at": snapshot["snapshot_at"],
+        "exported_by": current_user.full_name,
+        "rows": flatten_dict(stats),
+    })
+
+    return StreamingResponse(
+        io.BytesIO(pdf_bytes),
+        media_type="application/pdf",
+        headers={
+            **headers,
+            "Content-Disposition": f"attachment; filename={filename}.pdf"
+        }
+    )
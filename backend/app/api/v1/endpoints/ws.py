@@ -6,7 +6,6 @@ from app.websocket import manager, handle_websocket_message
 from app.dependencies import get_current_user_ws
 from app.models import User
 import logging
-import json
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -16,7 +15,10 @@ logger = logging.getLogger(__name__)
 async def websocket_endpoint(
     websocket: WebSocket,
     token: str = Query(..., description="JWT токен для авторизации"),
-    project_id: int = Query(None, description="ID проекта (опционально)")
+    project_id: int = Query(None, description="ID проекта (опционально)"),
+    batch: bool = Query(False, description="Получать события проекта пакетами"),
+    encoding: str = Query("json", description="Кодировка кадров: json, msgpack или deflate"),
+    last_seq: int = Query(None, description="Номер последнего полученного события проекта (для повтора)")
 ):
     """
     WebSocket endpoint для real-time обновлений
@@ -24,21 +26,39 @@ async def websocket_endpoint(
     Параметры:
     - token: JWT токен для авторизации
     - project_id: ID проекта для подписки (опционально)
+    - batch: события проекта приходят пакетами раз в WS_BATCH_WINDOW_MS (опционально)
+    - encoding: кодировка кадров сервера (опционально)
+        - json: текстовые кадры (по умолчанию)
+        - msgpack: бинарные кадры MessagePack
+        - deflate: бинарные кадры JSON, сжатые zlib
+      Клиент может отправлять текстовые JSON кадры или бинарные в выбранной кодировке.
+    - last_seq: при переподключении к project_id - досылаются события с seq > last_seq (опционально)
 
     Примеры сообщений от клиента:
     - {"type": "ping"} - проверка соединения
     - {"type": "subscribe_project", "project_id": 1} - подписаться на проект
+    - {"type": "subscribe_project", "project_id": 1, "batch": true} - подписаться с пакетной доставкой
+    - {"type": "subscribe_project", "project_id": 1, "last_seq": 42} - подписаться и получить пропущенное
     - {"type": "unsubscribe_project", "project_id": 1} - отписаться от проекта
     - {"type": "get_stats"} - получить статистику подключений
+    - {"type": "pong"} - ответ на серверный ping
+
+    События проектов содержат монотонный номер seq (свой у каждого проекта).
 
     Сообщения от сервера:
     - {"type": "connection_established", ...} - соединение установлено
     - {"type": "pong", ...} - ответ на ping
+    - {"type": "ping", ...} - серверный heartbeat: клиент должен прислать любой кадр (например, pong),
+      иначе подключение закрывается через WS_IDLE_TIMEOUT
     - {"type": "inspection_created", ...} - создана новая проверка
     - {"type": "inspection_updated", ...} - обновлена проверка
     - {"type": "photo_uploaded", ...} - загружено фото
     - {"type": "defect_detected", ...} - обнаружен дефект
     - {"type": "project_updated", ...} - обновлен проект
+    - {"type": "replay", "project_id": 1, "events": [...], "complete": true, "last_seq": N} - пропущенные
+      события; complete=false - часть событий вытеснена из журнала, проект нужно перечитать через REST
+    - {"type": "batch", "project_id": 1, "count": N, "events": [...]} - пакет событий проекта
+      (только при batch; повторные inspection_updated одной проверки схлопываются)
     """
     try:
         # Авторизация пользователя по токену
@@ -46,34 +66,44 @@ async def websocket_endpoint(
         # Пока используем упрощенный вариант
         user_id = 1  # В реальности: decode JWT token
 
-        # Подключаем WebSocket
-        await manager.connect(
+        # Подключаем WebSocket (при превышении лимита воркера сокет уже закрыт)
+        connected = await manager.connect(
             websocket,
             user_id=user_id,
             project_id=project_id,
-            metadata={"token": token}
+            metadata={"token": token, "batch": batch, "encoding": encoding}
         )
+        if not connected:
+            return
+
+        # Переподключение: досылаем пропущенные события проекта
+        if project_id and last_seq is not None:
+            await manager.replay(websocket, project_id, last_seq)
 
         try:
             # Основной цикл обработки сообщений
             while True:
-                # Получаем сообщение от клиента
-                data = await websocket.receive_text()
+                # Получаем сообщение от клиента (текстовый или бинарный кадр)
+                frame = await websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(frame.get("code", 1000))
+                manager.touch(websocket)
 
                 try:
-                    # Парсим JSON
-                    message = json.loads(data)
+                    # Разбираем кадр в кодировке подключения
+                    data = frame.get("text")
+                    message = manager.decode_message(websocket, data if data is not None else frame.get("bytes"))
 
                     # Обрабатываем сообщение
                     await handle_websocket_message(websocket, message)
 
-                except json.JSONDecodeError:
-                    # Ошибка парсинга JSON
+                except ValueError:
+                    # Ошибка разбора кадра (json.JSONDecodeError тоже ValueError)
                     await manager.send_personal_message(
                         websocket,
                         {
                             "type": "error",
-                            "message": "Invalid JSON format"
+                            "message": "Invalid message format"
                         }
                     )
 
@@ -100,11 +130,17 @@ async def get_websocket_stats():
     - total_connections: Общее количество подключений
     - connected_users: Количество подключенных пользователей
     - users: Список ID подключенных пользователей
+    - queues: Состояние исходящих очередей (глубина, отброшенные сообщения)
+    - backplane: Тип backplane и число каналов, на которые подписан процесс
+    - heartbeat: Настройки heartbeat, число закрытых молчащих и отклоненных подключений
     """
     return {
         "total_connections": manager.get_total_connections(),
         "connected_users": len(manager.get_connected_users()),
-        "users": manager.get_connected_users()
+        "users": manager.get_connected_users(),
+        "queues": manager.get_queue_stats(),
+        "backplane": manager.get_backplane_stats(),
+        "heartbeat": manager.get_heartbeat_stats()
     }
 
 
@@ -2,7 +2,7 @@
 Главный роутер API v1
 """
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, projects, inspections, hidden_works, regulations, ws, documents
+from app.api.v1.endpoints import auth, projects, inspections, hidden_works, regulations, ws, documents, events
 
 api_router = APIRouter()
 
@@ -14,3 +14,4 @@ api_router.include_router(hidden_works.router, prefix="/hidden-works", tags=["Hi
 api_router.include_router(regulations.router, prefix="/regulations", tags=["Regulations"])
 api_router.include_router(documents.router, prefix="/documents", tags=["Documents"])
 api_router.include_router(ws.router, tags=["WebSocket"])
+api_router.include_router(events.router, prefix="/events", tags=["Server-Sent Events"])
@@ -8,7 +8,12 @@ celery_app = Celery(
     "tehnadzor",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=["app.tasks.ml_tasks", "app.tasks.document_tasks", "app.tasks.notification_tasks"]
+    include=[
+        "app.tasks.ml_tasks",
+        "app.tasks.document_tasks",
+        "app.tasks.notification_tasks",
+        "app.tasks.search_tasks",
+    ]
 )
 
 # Конфигурация Celery
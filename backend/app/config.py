@@ -38,6 +38,9 @@ class Settings(BaseSettings):
     # AI APIs
     OPENAI_API_KEY: str = ""
     CLAUDE_API_KEY: str = ""
+    AI_CONSULT_CONTEXT_TOKENS: int = 1200  # Бюджет контекста нормативов в запросе к LLM, токенов
+    AI_CONSULT_CONTEXT_TTL: float = 600.0  # Время жизни кеша контекста по вопросу, сек
+    AI_CONSULT_CONTEXT_CACHE_SIZE: int = 500  # Максимум вопросов в кеше контекста
 
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:19006"]
@@ -50,6 +53,34 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
+    # WebSocket
+    WS_SEND_TIMEOUT: float = 5.0  # Таймаут отправки одному клиенту, сек
+    WS_QUEUE_SIZE: int = 256  # Размер исходящей очереди подключения
+    WS_OVERFLOW_POLICY: str = "drop_oldest"  # drop_oldest / coalesce / disconnect
+    WS_BACKPLANE: str = "redis"  # redis / memory / local - рассылка между воркерами
+    WS_BATCH_WINDOW_MS: int = 100  # Окно склейки событий проекта для клиентов с batch=true
+    WS_BATCH_MAX_EVENTS: int = 500  # Размер пакета для досрочной отправки
+    WS_HEARTBEAT_INTERVAL: float = 30.0  # Период проверки подключений и серверного ping, сек
+    WS_IDLE_TIMEOUT: float = 90.0  # Подключение без входящих кадров дольше этого закрывается, сек
+    WS_MAX_CONNECTIONS: int = 10000  # Лимит подключений на один воркер
+    # redis / memory - журнал событий проектов для возобновления. memory - только для одного
+    # воркера: с WS_BACKPLANE=redis номера seq разных воркеров совпадают, такая пара отклоняется
+    WS_EVENT_LOG: str = "redis"
+    WS_EVENT_LOG_SIZE: int = 1000  # Сколько последних событий проекта хранить для повтора
+
+    # Server-Sent Events
+    SSE_HEARTBEAT_INTERVAL: float = 15.0  # Период heartbeat комментариев при отсутствии событий, сек
+    SSE_RETRY_MS: int = 3000  # Задержка переподключения EventSource, мс
+
+    # Search
+    SEARCH_DEADLINE_MS: int = 800  # Дедлайн глобального поиска: отдаем то, что успело найтись
+    SEARCH_WORKERS: int = 8  # Потоки для параллельных запросов поиска (каждый - свое подключение к БД)
+    AUTOCOMPLETE_TTL: float = 300.0  # Время жизни in-memory индекса подсказок пользователя, сек
+    AUTOCOMPLETE_MAX_SCOPES: int = 1000  # Максимум пользователей в индексе подсказок
+    SEARCH_BACKEND: str = "elasticsearch"  # elasticsearch / embedded - поисковый индекс
+    SEARCH_INDEX_PREFIX: str = "tehnadzor"  # Префикс имен индексов
+    SEARCH_INDEX_ON_CHANGE: bool = True  # Индексировать проекты, проверки, документы и нормативы при изменении
+
     class Config:
         env_file = ".env"
         case_sensitive = True
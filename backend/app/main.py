@@ -7,6 +7,8 @@ from fastapi.staticfiles import StaticFiles
 from prometheus_fastapi_instrumentator import Instrumentator
 from app.config import settings
 from app.api.v1.router import api_router
+from app.websocket import manager as ws_manager
+from app.search import indexer as search_indexer
 from app.middleware import (
     RequestLoggingMiddleware,
     SecurityHeadersMiddleware,
@@ -47,6 +49,10 @@ app.add_middleware(
 # Подключение роутеров
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
+# Изменения проектов, проверок, документов и нормативов уходят в поисковый индекс
+if settings.SEARCH_INDEX_ON_CHANGE:
+    search_indexer.track_changes()
+
 # Prometheus metrics instrumentation
 Instrumentator().instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
 
@@ -56,6 +62,18 @@ if not os.path.exists("uploads"):
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 
+@app.on_event("startup")
+async def start_realtime():
+    """Подключение WebSocket менеджера к backplane (события других воркеров и Celery)"""
+    await ws_manager.start()
+
+
+@app.on_event("shutdown")
+async def stop_realtime():
+    """Остановка backplane и закрытие исходящих очередей"""
+    await ws_manager.stop()
+
+
 @app.get("/")
 async def root():
     """Корневой эндпоинт"""
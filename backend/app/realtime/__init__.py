@@ -0,0 +1 @@
+# Real-time (WebSocket) package
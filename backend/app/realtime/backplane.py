@@ -0,0 +1,322 @@
+"""
+Backplane для рассылки WebSocket событий между процессами
+
+Каждый uvicorn воркер держит только свои подключения. Событие, опубликованное
+в одном воркере (или в Celery задаче), через backplane доходит до остальных.
+
+Доставка ровно один раз на узел: узел рассылает событие своим подключениям сразу,
+публикует его в канал и игнорирует собственные сообщения, пришедшие из канала.
+Узел подписан на канал проекта/пользователя, только пока у него есть такие подключения.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from typing import Awaitable, Callable, Optional, Set
+
+from app.config import settings
+from app.realtime.event_log import append_sync
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "ws"
+BROADCAST_CHANNEL = f"{CHANNEL_PREFIX}:broadcast"
+
+# Обработчик входящих событий: (канал, сообщение)
+MessageHandler = Callable[[str, dict], Awaitable[None]]
+
+
+def project_channel(project_id: int) -> str:
+    """Канал событий проекта"""
+    return f"{CHANNEL_PREFIX}:project:{project_id}"
+
+
+def user_channel(user_id: int) -> str:
+    """Канал событий пользователя"""
+    return f"{CHANNEL_PREFIX}:user:{user_id}"
+
+
+def encode_envelope(origin: str, message: dict) -> str:
+    """Упаковка сообщения с идентификатором узла-отправителя"""
+    return json.dumps({"origin": origin, "message": message}, ensure_ascii=False, default=str)
+
+
+def decode_envelope(payload) -> Optional[dict]:
+    """Распаковка сообщения из канала (None для битых сообщений)"""
+    try:
+        envelope = json.loads(payload)
+    except (TypeError, ValueError):
+        logger.warning("Skipping malformed backplane message")
+        return None
+    if not isinstance(envelope, dict) or not isinstance(envelope.get("message"), dict):
+        logger.warning("Skipping malformed backplane message")
+        return None
+    return envelope
+
+
+class Backplane:
+    """
+    Базовый backplane: только локальная доставка (один процесс)
+
+    Наследники переопределяют _publish, _subscribe и _unsubscribe.
+    """
+
+    def __init__(self, node_id: Optional[str] = None):
+        # Уникальный идентификатор процесса для отсева собственных сообщений
+        self.node_id = node_id or uuid.uuid4().hex
+        self.channels: Set[str] = set()
+        self._handler: Optional[MessageHandler] = None
+
+    async def start(self, handler: MessageHandler):
+        """
+        Запуск приема сообщений
+
+        Args:
+            handler: Корутина (канал, сообщение), вызываемая для чужих событий
+        """
+        self._handler = handler
+
+    async def stop(self):
+        """Остановка приема сообщений"""
+        self._handler = None
+
+    def subscribe(self, channel: str):
+        """Подписка узла на канал (идемпотентно, без ожидания)"""
+        if channel not in self.channels:
+            self.channels.add(channel)
+            self._subscribe(channel)
+
+    def unsubscribe(self, channel: str):
+        """Отписка узла от канала (идемпотентно, без ожидания)"""
+        if channel in self.channels:
+            self.channels.discard(channel)
+            self._unsubscribe(channel)
+
+    async def publish(self, channel: str, message: dict):
+        """
+        Публикация события для остальных узлов
+
+        Args:
+            channel: Канал (project_channel / user_channel / BROADCAST_CHANNEL)
+            message: Сообщение (dict)
+        """
+        await self._publish(channel, encode_envelope(self.node_id, message))
+
+    async def _dispatch(self, channel: str, payload):
+        """Передача входящего сообщения обработчику менеджера"""
+        envelope = decode_envelope(payload)
+        if envelope is None or envelope.get("origin") == self.node_id:
+            return
+        if self._handler is None or channel not in self.channels:
+            return
+        try:
+            await self._handler(channel, envelope["message"])
+        except Exception as e:
+            logger.error(f"Error handling backplane message on {channel}: {e}", exc_info=True)
+
+    def _subscribe(self, channel: str):
+        pass
+
+    def _unsubscribe(self, channel: str):
+        pass
+
+    async def _publish(self, channel: str, payload: str):
+        pass
+
+
+class InMemoryBroker:
+    """Общая "шина" для InMemoryBackplane нескольких менеджеров (тесты, один процесс)"""
+
+    def __init__(self):
+        self.nodes: Set["InMemoryBackplane"] = set()
+        self.published = 0
+
+    async def publish(self, channel: str, payload: str):
+        self.published += 1
+        for node in list(self.nodes):
+            await node._dispatch(channel, payload)
+
+
+class InMemoryBackplane(Backplane):
+    """Backplane в памяти процесса: эмулирует Redis pub/sub для тестов"""
+
+    def __init__(self, broker: Optional[InMemoryBroker] = None, node_id: Optional[str] = None):
+        super().__init__(node_id)
+        self.broker = broker or InMemoryBroker()
+
+    async def start(self, handler: MessageHandler):
+        await super().start(handler)
+        self.broker.nodes.add(self)
+
+    async def stop(self):
+        self.broker.nodes.discard(self)
+        await super().stop()
+
+    async def _publish(self, channel: str, payload: str):
+        await self.broker.publish(channel, payload)
+
+
+class RedisBackplane(Backplane):
+    """Backplane на Redis pub/sub"""
+
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, url: str, node_id: Optional[str] = None):
+        super().__init__(node_id)
+        self.url = url
+        self._redis = None
+        self._pubsub = None
+        # Команды подписки выполняются по порядку одной задачей
+        self._commands: Optional[asyncio.Queue] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start(self, handler: MessageHandler):
+        import redis.asyncio as aioredis
+
+        await super().start(handler)
+        self._redis = aioredis.from_url(self.url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._commands = asyncio.Queue()
+
+        # Широковещательный канал нужен всегда, он же держит pub/sub соединение открытым
+        self.channels.add(BROADCAST_CHANNEL)
+        self._commands.put_nowait(("subscribe", BROADCAST_CHANNEL))
+        for channel in self.channels - {BROADCAST_CHANNEL}:
+            self._commands.put_nowait(("subscribe", channel))
+
+        for coro in (self._apply_commands(), self._read_loop()):
+            task = asyncio.create_task(coro)
+            self._tasks.add(task)
+
+        logger.info(f"Redis backplane started: node_id={self.node_id}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+        self._pubsub = self._redis = None
+        await super().stop()
+
+    def _subscribe(self, channel: str):
+        if self._commands is not None:
+            self._commands.put_nowait(("subscribe", channel))
+
+    def _unsubscribe(self, channel: str):
+        if self._commands is not None:
+            self._commands.put_nowait(("unsubscribe", channel))
+
+    async def _publish(self, channel: str, payload: str):
+        if self._redis is None:
+            return
+        try:
+            await self._redis.publish(channel, payload)
+        except Exception as e:
+            # Локальные подключения уже получили событие, теряем только удаленные
+            logger.error(f"Redis backplane publish to {channel} failed: {e}")
+
+    async def _apply_commands(self):
+        """Выполнение подписок/отписок в порядке поступления"""
+        while True:
+            action, channel = await self._commands.get()
+            while True:
+                try:
+                    if action == "subscribe":
+                        # Канал могли успеть отписать, пока команда ждала очереди
+                        if channel in self.channels:
+                            await self._pubsub.subscribe(channel)
+                    elif channel not in self.channels:
+                        await self._pubsub.unsubscribe(channel)
+                    break
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Redis backplane {action} {channel} failed: {e}")
+                    await asyncio.sleep(self.RECONNECT_DELAY)
+
+    async def _read_loop(self):
+        """Чтение сообщений из Redis"""
+        while True:
+            try:
+                if not self._pubsub.subscribed:
+                    await asyncio.sleep(0.1)
+                    continue
+                message = await self._pubsub.get_message(timeout=1.0)
+                if message is None or message.get("type") != "message":
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                await self._dispatch(channel, message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # redis-py переподключается и восстанавливает подписки сам при следующем чтении
+                logger.error(f"Redis backplane read failed: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+
+
+def create_backplane(kind: Optional[str] = None) -> Backplane:
+    """
+    Backplane по настройкам
+
+    Args:
+        kind: "redis", "memory" или "local" (по умолчанию settings.WS_BACKPLANE)
+    """
+    kind = kind or settings.WS_BACKPLANE
+    if kind == "redis":
+        return RedisBackplane(settings.REDIS_URL)
+    if kind == "memory":
+        return InMemoryBackplane()
+    if kind == "local":
+        return Backplane()
+    raise ValueError(f"Unsupported WebSocket backplane: {kind}")
+
+
+_sync_client = None
+
+
+def publish_sync(channel: str, message: dict) -> bool:
+    """
+    Публикация события из синхронного кода (Celery задачи)
+
+    Сообщение получают все узлы, подписанные на канал; origin "worker"
+    не совпадает ни с одним узлом, поэтому событие доставится каждому ровно раз.
+
+    Returns:
+        True если публикация прошла успешно
+    """
+    global _sync_client
+    if settings.WS_BACKPLANE != "redis":
+        return False
+    try:
+        if _sync_client is None:
+            import redis
+            _sync_client = redis.Redis.from_url(settings.REDIS_URL)
+        _sync_client.publish(channel, encode_envelope("worker", message))
+        return True
+    except Exception as e:
+        logger.error(f"Failed to publish WebSocket event to {channel}: {e}")
+        return False
+
+
+def publish_project_sync(project_id: int, message: dict) -> bool:
+    """
+    Публикация события проекта из Celery задачи с присвоением номера в журнале событий
+
+    Args:
+        project_id: ID проекта
+        message: Сообщение (dict)
+
+    Returns:
+        True если публикация прошла успешно
+    """
+    seq = append_sync(project_id, message)
+    if seq is not None:
+        message = {**message, "seq": seq}
+    return publish_sync(project_channel(project_id), message)
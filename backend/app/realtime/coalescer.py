@@ -0,0 +1,123 @@
+"""
+Склейка частых WebSocket событий в пакеты
+
+События группы (проекта) копятся в течение короткого окна и уходят одним кадром.
+События с одинаковым ключом (например, повторные inspection_updated одной проверки)
+внутри окна схлопываются: в пакете остается последняя версия, и она занимает место
+по времени поступления, чтобы номера seq внутри пакета возрастали.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from app.realtime.metrics import WS_BATCH_FRAMES, WS_EVENTS_COLLAPSED
+
+logger = logging.getLogger(__name__)
+
+# Колбэк отправки пакета: (группа, события)
+FlushCallback = Callable[[Hashable, List[dict]], Awaitable[None]]
+
+
+class _Batch:
+    """Накапливаемый пакет событий одной группы"""
+
+    __slots__ = ("events", "timer")
+
+    def __init__(self):
+        # Ключ схлопывания -> событие; порядок словаря - порядок отправки
+        self.events: Dict[Hashable, dict] = {}
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class EventCoalescer:
+    """Накопление событий по группам с отправкой раз в окно"""
+
+    def __init__(self, window: float, on_flush: FlushCallback, max_events: int = 500):
+        """
+        Args:
+            window: Длительность окна накопления, сек
+            on_flush: Корутина отправки пакета (группа, события)
+            max_events: Размер пакета, при котором он отправляется досрочно
+        """
+        self.window = window
+        self.on_flush = on_flush
+        self.max_events = max_events
+        self._batches: Dict[Hashable, _Batch] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.collapsed = 0
+        self.frames = 0
+
+    @property
+    def pending(self) -> int:
+        """Количество событий, ожидающих отправки"""
+        return sum(len(batch.events) for batch in self._batches.values())
+
+    def add(self, group: Hashable, event: dict, key: Optional[Hashable] = None):
+        """
+        Добавление события в пакет группы
+
+        Args:
+            group: Группа (например, ID проекта)
+            event: Событие (dict)
+            key: Ключ схлопывания (None - событие не схлопывается)
+        """
+        batch = self._batches.get(group)
+        if batch is None:
+            batch = self._batches[group] = _Batch()
+            loop = asyncio.get_running_loop()
+            batch.timer = loop.call_later(self.window, self._flush_group, group)
+
+        if key is None:
+            # Уникальный ключ: событие ни с чем не схлопывается
+            key = object()
+        elif key in batch.events:
+            # Старая версия уходит из пакета, новая встает в конец
+            del batch.events[key]
+            batch.events[key] = event
+            self.collapsed += 1
+            WS_EVENTS_COLLAPSED.inc()
+            return
+
+        batch.events[key] = event
+
+        if len(batch.events) >= self.max_events:
+            self._flush_group(group)
+
+    def _flush_group(self, group: Hashable):
+        """Отправка пакета группы в фоне"""
+        batch = self._batches.pop(group, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        task = asyncio.create_task(self._send(group, list(batch.events.values())))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, group: Hashable, events: List[dict]):
+        self.frames += 1
+        WS_BATCH_FRAMES.inc()
+        try:
+            await self.on_flush(group, events)
+        except Exception as e:
+            logger.error(f"Error flushing event batch for {group}: {e}", exc_info=True)
+
+    def discard(self, group: Hashable):
+        """Удаление пакета группы без отправки (в группе не осталось получателей)"""
+        batch = self._batches.pop(group, None)
+        if batch is not None and batch.timer is not None:
+            batch.timer.cancel()
+
+    async def flush(self):
+        """Немедленная отправка всех накопленных пакетов и ожидание отправки"""
+        for group in list(self._batches):
+            self._flush_group(group)
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def close(self):
+        """Отмена таймеров и сброс накопленных событий"""
+        for group in list(self._batches):
+            self.discard(group)
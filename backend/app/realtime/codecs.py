@@ -0,0 +1,147 @@
+"""
+Кодировки кадров WebSocket протокола
+
+Кодировка выбирается клиентом при подключении (?encoding=...):
+- json: текстовые кадры JSON (по умолчанию)
+- msgpack: бинарные кадры MessagePack
+- deflate: бинарные кадры JSON, сжатые zlib (для клиентов без permessage-deflate)
+
+Отдельно SSECodec форматирует те же события для Server-Sent Events.
+"""
+import json
+import zlib
+from typing import Any, Dict, List, Union
+
+try:
+    import msgpack
+    msgpack_available = True
+except ImportError:
+    msgpack_available = False
+
+DEFAULT_ENCODING = "json"
+
+Frame = Union[str, bytes]
+
+
+class JSONCodec:
+    """Текстовые JSON кадры (совпадают с WebSocket.send_json из Starlette, но компактнее)"""
+
+    name = "json"
+    binary = False
+
+    def encode(self, message: dict) -> str:
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+    def decode(self, frame: Frame) -> Any:
+        return json.loads(frame)
+
+
+class MsgPackCodec:
+    """Бинарные кадры MessagePack"""
+
+    name = "msgpack"
+    binary = True
+
+    def encode(self, message: dict) -> bytes:
+        return msgpack.packb(message, default=str, use_bin_type=True)
+
+    def decode(self, frame: Frame) -> Any:
+        if isinstance(frame, str):
+            return json.loads(frame)
+        try:
+            return msgpack.unpackb(frame, raw=False)
+        except Exception as e:
+            raise ValueError(f"Invalid MessagePack frame: {e}")
+
+
+class DeflateCodec:
+    """JSON, сжатый zlib (RFC 1950), в бинарных кадрах"""
+
+    name = "deflate"
+    binary = True
+
+    def __init__(self, level: int = 6):
+        self.level = level
+        self._json = JSONCodec()
+
+    def encode(self, message: dict) -> bytes:
+        return zlib.compress(self._json.encode(message).encode("utf-8"), self.level)
+
+    def decode(self, frame: Frame) -> Any:
+        if isinstance(frame, str):
+            return json.loads(frame)
+        try:
+            return json.loads(zlib.decompress(frame))
+        except zlib.error as e:
+            raise ValueError(f"Invalid deflate frame: {e}")
+
+
+class SSECodec:
+    """
+    Кадры Server-Sent Events (не предлагается WebSocket клиентам)
+
+    Номер seq события проекта становится id события, что дает клиенту
+    Last-Event-ID для возобновления. Пакеты (batch/replay) разворачиваются
+    в отдельные события, чтобы id продвигался по каждому из них.
+    """
+
+    name = "sse"
+    binary = False
+
+    def __init__(self):
+        self._json = JSONCodec()
+
+    def _event(self, message: dict, event_id=None) -> str:
+        lines = []
+        if event_id is not None:
+            lines.append(f"id: {event_id}")
+        lines.append(f"event: {message.get('type', 'message')}")
+        # JSON без отступов всегда в одну строку - поле data не разрывается
+        lines.append(f"data: {self._json.encode(message)}")
+        return "\n".join(lines) + "\n\n"
+
+    def encode(self, message: dict) -> str:
+        message_type = message.get("type")
+        if message_type not in ("batch", "replay"):
+            return self._event(message, message.get("seq"))
+
+        frame = "".join(self._event(event, event.get("seq")) for event in message.get("events", ()))
+        if message_type == "replay":
+            # Итог повтора; id = последний номер, чтобы после перечитывания проекта продолжить с него
+            status = {key: value for key, value in message.items() if key != "events"}
+            frame += self._event(status, message.get("last_seq"))
+        return frame
+
+    def decode(self, frame: Frame) -> Any:
+        raise ValueError("SSE is a server-to-client stream")
+
+
+SSE_CODEC = SSECodec()
+
+
+_CODECS: Dict[str, Any] = {
+    JSONCodec.name: JSONCodec(),
+    DeflateCodec.name: DeflateCodec(),
+}
+if msgpack_available:
+    _CODECS[MsgPackCodec.name] = MsgPackCodec()
+
+
+def available_encodings() -> List[str]:
+    """Кодировки, доступные в текущем окружении"""
+    return list(_CODECS)
+
+
+def get_codec(name: str = DEFAULT_ENCODING):
+    """
+    Кодек по имени
+
+    Raises:
+        ValueError: Неизвестная или недоступная кодировка
+    """
+    codec = _CODECS.get(name)
+    if codec is None:
+        raise ValueError(
+            f"Unsupported encoding: {name}. Available: {', '.join(available_encodings())}"
+        )
+    return codec
@@ -0,0 +1,270 @@
+"""
+Журнал событий проектов для возобновления WebSocket потока
+
+Каждое событие проекта получает монотонный номер seq (свой счетчик у каждого проекта)
+и попадает в ограниченный кольцевой буфер. Переподключившийся клиент присылает
+last_seq и получает только пропущенные события. Если часть пропущенных событий
+уже вытеснена из буфера, клиенту сообщается complete=False - нужно перечитать проект через REST.
+"""
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Deque, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (события с seq > last_seq, удалось ли восстановить все пропущенные)
+Replay = Tuple[List[dict], bool]
+
+
+class EventLog(ABC):
+    """Интерфейс журнала событий"""
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    @abstractmethod
+    async def append(self, project_id: int, message: dict) -> Optional[int]:
+        """
+        Присвоение номера новому событию проекта и запись в журнал
+
+        Returns:
+            Номер события или None, если журнал недоступен
+        """
+
+    async def record(self, project_id: int, message: dict):
+        """Запись события с уже присвоенным номером (событие другого процесса)"""
+
+    @abstractmethod
+    async def since(self, project_id: int, last_seq: int) -> Replay:
+        """События проекта с номером больше last_seq"""
+
+    @abstractmethod
+    async def current(self, project_id: int) -> int:
+        """Номер последнего события проекта (0 - событий не было)"""
+
+
+class _ProjectBuffer:
+    """Кольцевой буфер событий одного проекта"""
+
+    __slots__ = ("seq", "events")
+
+    def __init__(self, size: int):
+        self.seq = 0
+        self.events: Deque[dict] = deque(maxlen=size)
+
+    @property
+    def first_seq(self) -> int:
+        """Номер самого старого события в буфере"""
+        return self.seq - len(self.events) + 1
+
+
+class InMemoryEventLog(EventLog):
+    """
+    Журнал в памяти процесса
+
+    Номера в буфере идут подряд, поэтому позиция события вычисляется
+    без поиска: offset = last_seq + 1 - first_seq.
+    """
+
+    def __init__(self, max_events: Optional[int] = None, max_projects: int = 10000):
+        """
+        Args:
+            max_events: Размер буфера одного проекта
+            max_projects: Сколько проектов держать в памяти (давно молчащие вытесняются)
+        """
+        self.max_events = max_events or settings.WS_EVENT_LOG_SIZE
+        self.max_projects = max_projects
+        self._buffers: "OrderedDict[int, _ProjectBuffer]" = OrderedDict()
+
+    def _buffer(self, project_id: int) -> _ProjectBuffer:
+        buffer = self._buffers.get(project_id)
+        if buffer is None:
+            buffer = self._buffers[project_id] = _ProjectBuffer(self.max_events)
+            if len(self._buffers) > self.max_projects:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(project_id)
+        return buffer
+
+    async def append(self, project_id: int, message: dict) -> int:
+        buffer = self._buffer(project_id)
+        buffer.seq += 1
+        buffer.events.append({**message, "seq": buffer.seq})
+        return buffer.seq
+
+    async def record(self, project_id: int, message: dict):
+        seq = message.get("seq")
+        if seq is None:
+            return
+        buffer = self._buffer(project_id)
+        if seq <= buffer.seq:
+            return
+        if seq != buffer.seq + 1:
+            # Разрыв в номерах: буфер должен быть непрерывным
+            buffer.events.clear()
+        buffer.seq = seq
+        buffer.events.append(message)
+
+    async def since(self, project_id: int, last_seq: int) -> Replay:
+        buffer = self._buffers.get(project_id)
+        current = buffer.seq if buffer is not None else 0
+        if last_seq == current:
+            return [], True
+        if buffer is None or last_seq > current or last_seq + 1 < buffer.first_seq:
+            # Номер из будущего (журнал перезапущен) или события уже вытеснены
+            return [], False
+        offset = last_seq + 1 - buffer.first_seq
+        return list(islice(buffer.events, offset, None)), True
+
+    async def current(self, project_id: int) -> int:
+        buffer = self._buffers.get(project_id)
+        return buffer.seq if buffer is not None else 0
+
+
+# Атомарно: следующий номер проекта + запись в stream с ID "<seq>-0"
+_APPEND_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[2], seq .. '-0', 'm', ARGV[1])
+return seq
+"""
+
+
+def _seq_key(project_id: int) -> str:
+    return f"ws:seq:{project_id}"
+
+
+def _stream_key(project_id: int) -> str:
+    return f"ws:events:{project_id}"
+
+
+def _encode(message: dict) -> str:
+    return json.dumps(message, ensure_ascii=False, default=str)
+
+
+class RedisEventLog(EventLog):
+    """
+    Журнал в Redis: счетчик INCR и stream на проект
+
+    Номер события совпадает с ID записи stream ("<seq>-0"), поэтому
+    пропущенные события читаются одним XRANGE. Общий для всех воркеров.
+    """
+
+    def __init__(self, url: str, max_events: Optional[int] = None):
+        self.url = url
+        self.max_events = max_events or settings.WS_EVENT_LOG_SIZE
+        self._redis = None
+        self._append = None
+
+    async def start(self):
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis.from_url(self.url, decode_responses=True)
+        self._append = self._redis.register_script(_APPEND_SCRIPT)
+
+    async def stop(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+        self._redis = self._append = None
+
+    async def append(self, project_id: int, message: dict) -> Optional[int]:
+        if self._redis is None:
+            return None
+        try:
+            seq = await self._append(
+                keys=[_seq_key(project_id), _stream_key(project_id)],
+                args=[_encode(message), self.max_events]
+            )
+        except Exception as e:
+            logger.error(f"Event log append for project {project_id} failed: {e}")
+            return None
+        return int(seq)
+
+    async def since(self, project_id: int, last_seq: int) -> Replay:
+        if self._redis is None:
+            return [], False
+        try:
+            entries = await self._redis.xrange(
+                _stream_key(project_id), min=f"{last_seq + 1}-0", max="+", count=self.max_events
+            )
+            current = int(await self._redis.get(_seq_key(project_id)) or 0)
+        except Exception as e:
+            logger.error(f"Event log replay for project {project_id} failed: {e}")
+            return [], False
+
+        if last_seq > current:
+            return [], False
+        if last_seq == current:
+            return [], True
+
+        events = []
+        for entry_id, fields in entries:
+            seq = int(entry_id.split("-")[0])
+            events.append({**json.loads(fields["m"]), "seq": seq})
+
+        # Первое найденное событие должно идти сразу за last_seq, иначе начало вытеснено
+        complete = bool(events) and events[0]["seq"] == last_seq + 1
+        return (events, True) if complete else ([], False)
+
+    async def current(self, project_id: int) -> int:
+        if self._redis is None:
+            return 0
+        try:
+            return int(await self._redis.get(_seq_key(project_id)) or 0)
+        except Exception as e:
+            logger.error(f"Event log read for project {project_id} failed: {e}")
+            return 0
+
+
+def create_event_log(kind: Optional[str] = None) -> EventLog:
+    """
+    Журнал событий по настройкам
+
+    Args:
+        kind: "redis" или "memory" (по умолчанию settings.WS_EVENT_LOG)
+    """
+    kind = kind or settings.WS_EVENT_LOG
+    if kind == "redis":
+        return RedisEventLog(settings.REDIS_URL)
+    if kind == "memory":
+        if settings.WS_BACKPLANE == "redis":
+            # У каждого воркера свой счетчик: номера seq одного проекта совпадут
+            raise ValueError("WS_EVENT_LOG=memory cannot be used with WS_BACKPLANE=redis")
+        return InMemoryEventLog()
+    raise ValueError(f"Unsupported WebSocket event log: {kind}")
+
+
+_sync_client = None
+_sync_append = None
+
+
+def append_sync(project_id: int, message: dict) -> Optional[int]:
+    """
+    Присвоение номера событию из синхронного кода (Celery задачи)
+
+    Returns:
+        Номер события или None, если журнал в Redis не используется/недоступен
+    """
+    global _sync_client, _sync_append
+    if settings.WS_EVENT_LOG != "redis":
+        return None
+    try:
+        if _sync_client is None:
+            import redis
+            _sync_client = redis.Redis.from_url(settings.REDIS_URL)
+            _sync_append = _sync_client.register_script(_APPEND_SCRIPT)
+        seq = _sync_append(
+            keys=[_seq_key(project_id), _stream_key(project_id)],
+            args=[_encode(message), settings.WS_EVENT_LOG_SIZE]
+        )
+        return int(seq)
+    except Exception as e:
+        logger.error(f"Event log append for project {project_id} failed: {e}")
+        return None
@@ -0,0 +1,59 @@
+"""
+Prometheus метрики real-time подсистемы
+
+Экспортируются через /metrics вместе с метриками Instrumentator.
+"""
+from prometheus_client import Counter, Gauge
+
+WS_CONNECTIONS = Gauge(
+    "ws_connections",
+    "Активные WebSocket подключения в процессе"
+)
+
+WS_QUEUE_DEPTH = Gauge(
+    "ws_outbound_queue_depth",
+    "Сообщения в исходящих очередях всех подключений процесса"
+)
+
+WS_MESSAGES_SENT = Counter(
+    "ws_messages_sent_total",
+    "Отправленные клиентам WebSocket сообщения"
+)
+
+WS_MESSAGES_DROPPED = Counter(
+    "ws_messages_dropped_total",
+    "Сообщения, отброшенные при переполнении исходящей очереди",
+    ["policy"]
+)
+
+WS_MESSAGES_COALESCED = Counter(
+    "ws_messages_coalesced_total",
+    "Сообщения, замененные более новой версией в исходящей очереди"
+)
+
+WS_SLOW_CONSUMERS = Counter(
+    "ws_slow_consumer_disconnects_total",
+    "Подключения, закрытые из-за переполнения очереди или таймаута отправки",
+    ["reason"]
+)
+
+WS_BATCH_FRAMES = Counter(
+    "ws_batch_frames_total",
+    "Пакетные кадры, отправленные подписчикам с включенной склейкой событий"
+)
+
+WS_EVENTS_COLLAPSED = Counter(
+    "ws_events_collapsed_total",
+    "События, схлопнутые с более новой версией внутри окна склейки"
+)
+
+WS_REAPED = Counter(
+    "ws_reaped_connections_total",
+    "Подключения, закрытые сервером из-за отсутствия активности клиента",
+    ["reason"]
+)
+
+WS_REJECTED = Counter(
+    "ws_rejected_connections_total",
+    "Подключения, отклоненные из-за лимита подключений воркера"
+)
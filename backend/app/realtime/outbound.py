@@ -0,0 +1,210 @@
+"""
+Исходящие очереди WebSocket подключений
+
+У каждого подключения своя ограниченная очередь и своя задача-писатель.
+Рассылка только кладет готовый кадр в очереди и никогда не ждет сеть,
+поэтому зависший клиент не может задержать рассылающую корутину.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+
+from app.realtime.metrics import (
+    WS_MESSAGES_COALESCED,
+    WS_MESSAGES_DROPPED,
+    WS_MESSAGES_SENT,
+    WS_QUEUE_DEPTH,
+    WS_SLOW_CONSUMERS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy:
+    """Поведение при переполнении исходящей очереди"""
+    DROP_OLDEST = "drop_oldest"  # Выбросить самое старое сообщение
+    COALESCE = "coalesce"  # Заменять сообщения с тем же ключом, иначе выбросить самое старое
+    DISCONNECT = "disconnect"  # Отключить медленного клиента
+
+    ALL = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+
+class ConnectionWriter:
+    """Ограниченная исходящая очередь и задача отправки для одного подключения"""
+
+    def __init__(
+        self,
+        websocket: Any,
+        max_queue: int,
+        policy: str,
+        send_timeout: float,
+        on_failure: Callable[[Any, str], None]
+    ):
+        """
+        Args:
+            websocket: WebSocket соединение
+            max_queue: Максимальное количество сообщений в очереди
+            policy: Политика переполнения (OverflowPolicy)
+            send_timeout: Таймаут отправки одного сообщения, сек
+            on_failure: Колбэк отключения (websocket, причина)
+        """
+        if policy not in OverflowPolicy.ALL:
+            raise ValueError(f"Unsupported overflow policy: {policy}")
+
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.on_failure = on_failure
+
+        # Элементы очереди: [ключ склейки, кадр]; список, чтобы заменять кадр на месте
+        self._queue: Deque[List[Any]] = deque()
+        self._pending_keys: Dict[Hashable, List[Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._sending = False
+        self.closed = False
+
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def depth(self) -> int:
+        """Текущая глубина очереди"""
+        return len(self._queue)
+
+    def start(self):
+        """Запуск задачи-писателя"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def enqueue(self, frame: Any, coalesce_key: Optional[Hashable] = None) -> bool:
+        """
+        Постановка кадра в очередь (без ожидания)
+
+        Args:
+            frame: Готовый к отправке кадр (str или bytes)
+            coalesce_key: Ключ склейки (например, ("inspection_updated", 5))
+
+        Returns:
+            True если кадр принят в очередь
+        """
+        if self.closed:
+            return False
+
+        if coalesce_key is not None and self.policy == OverflowPolicy.COALESCE:
+            entry = self._pending_keys.get(coalesce_key)
+            if entry is not None:
+                entry[1] = frame
+                self.coalesced += 1
+                WS_MESSAGES_COALESCED.inc()
+                return True
+
+        if len(self._queue) >= self.max_queue:
+            if self.policy == OverflowPolicy.DISCONNECT:
+                logger.warning(f"WebSocket outbound queue overflow ({self.max_queue}), disconnecting slow consumer")
+                WS_SLOW_CONSUMERS.labels(reason="queue_overflow").inc()
+                self._fail("queue_overflow")
+                return False
+
+            self._pop()
+            self.dropped += 1
+            WS_MESSAGES_DROPPED.labels(policy=self.policy).inc()
+
+        entry = [coalesce_key, frame]
+        self._queue.append(entry)
+        if coalesce_key is not None and self.policy == OverflowPolicy.COALESCE:
+            self._pending_keys[coalesce_key] = entry
+        WS_QUEUE_DEPTH.inc()
+        self._wakeup.set()
+        return True
+
+    def _pop(self) -> List[Any]:
+        """Извлечение первого элемента очереди"""
+        entry = self._queue.popleft()
+        if entry[0] is not None and self._pending_keys.get(entry[0]) is entry:
+            del self._pending_keys[entry[0]]
+        WS_QUEUE_DEPTH.dec()
+        return entry
+
+    async def _send(self, frame: Any):
+        """Отправка одного кадра (текст или бинарный)"""
+        if isinstance(frame, (bytes, bytearray)):
+            await self.websocket.send_bytes(frame)
+        else:
+            await self.websocket.send_text(frame)
+
+    async def _run(self):
+        """Цикл отправки сообщений из очереди"""
+        try:
+            while not self.closed:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                _, frame = self._pop()
+                self._sending = True
+                # asyncio.wait вместо wait_for: wait_for может поглотить отмену писателя,
+                # если она совпала с завершением отправки
+                send = asyncio.ensure_future(self._send(frame))
+                try:
+                    done, _ = await asyncio.wait({send}, timeout=self.send_timeout)
+                except asyncio.CancelledError:
+                    send.cancel()
+                    raise
+                finally:
+                    self._sending = False
+
+                if not done:
+                    send.cancel()
+                    logger.warning(f"WebSocket send timed out after {self.send_timeout}s, dropping slow client")
+                    WS_SLOW_CONSUMERS.labels(reason="send_timeout").inc()
+                    self._fail("send_timeout")
+                    return
+                if send.exception() is not None:
+                    logger.error(f"Error sending message: {send.exception()}")
+                    self._fail("send_error")
+                    return
+
+                self.sent += 1
+                WS_MESSAGES_SENT.inc()
+        except asyncio.CancelledError:
+            pass
+
+    def _fail(self, reason: str):
+        """Отключение клиента после ошибки отправки или переполнения"""
+        if self.closed:
+            return
+        self.close()
+        self.on_failure(self.websocket, reason)
+
+    def close(self):
+        """Остановка писателя и очистка очереди"""
+        if self.closed:
+            return
+        self.closed = True
+        WS_QUEUE_DEPTH.dec(len(self._queue))
+        self._queue.clear()
+        self._pending_keys.clear()
+        self._wakeup.set()
+
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    async def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Ожидание опустошения очереди (для корректного закрытия и тестов)
+
+        Returns:
+            True если очередь опустела до таймаута
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (self._queue or self._sending) and not self.closed:
+            if loop.time() >= deadline:
+                return False
+            await asyncio.sleep(0.001)
+        return True
@@ -0,0 +1,73 @@
+"""
+Server-Sent Events подключения поверх ConnectionManager
+
+SSEConnection реализует ту же часть интерфейса WebSocket, что использует менеджер
+(accept/send_text/send_bytes/close), поэтому SSE клиенты получают события
+проектов из того же конвейера: журнал seq, backplane, исходящая очередь писателя.
+Между писателем и HTTP ответом - очередь на один кадр, так что память на клиента
+ограничена исходящей очередью писателя.
+"""
+import asyncio
+from typing import AsyncIterator, Optional
+
+from app.config import settings
+
+
+class SSEConnection:
+    """Подключение SSE клиента"""
+
+    def __init__(self, heartbeat_interval: Optional[float] = None):
+        """
+        Args:
+            heartbeat_interval: Период комментариев-heartbeat при отсутствии событий, сек
+        """
+        self.heartbeat_interval = (
+            heartbeat_interval if heartbeat_interval is not None else settings.SSE_HEARTBEAT_INTERVAL
+        )
+        self._frames: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame: str):
+        """Передача кадра в HTTP ответ (ждет, пока ответ заберет предыдущий кадр)"""
+        if self.closed:
+            raise RuntimeError("SSE connection closed")
+        await self._frames.put(frame)
+
+    async def send_bytes(self, frame: bytes):
+        await self.send_text(frame.decode("utf-8"))
+
+    async def close(self, code: int = 1000, reason: str = None):
+        """Завершение потока (сервер закрыл подключение)"""
+        if self.closed:
+            return
+        self.closed = True
+        # Освобождаем место под маркер конца, непрочитанный кадр уже не нужен
+        while not self._frames.empty():
+            self._frames.get_nowait()
+        self._frames.put_nowait(None)
+
+    async def stream(self, retry_ms: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Тело text/event-stream ответа
+
+        Args:
+            retry_ms: Задержка переподключения для EventSource, мс
+
+        Yields:
+            SSE кадры и комментарии-heartbeat
+        """
+        yield f"retry: {retry_ms if retry_ms is not None else settings.SSE_RETRY_MS}\n\n"
+
+        while not self.closed:
+            try:
+                frame = await asyncio.wait_for(self._frames.get(), timeout=self.heartbeat_interval)
+            except asyncio.TimeoutError:
+                # Комментарий держит соединение через прокси и проверяет, что клиент жив
+                yield ": heartbeat\n\n"
+                continue
+            if frame is None:
+                break
+            yield frame
@@ -0,0 +1,345 @@
+"""
+In-memory индекс автодополнения
+
+Для каждого пользователя (область видимости - его проекты) хранится
+отсортированный массив ключей: названия проектов, проверок и документов,
+а также суффиксы этих строк с начала каждого слова ("ЖК Горизонт" находится
+и по "жк", и по "гор"). Поиск префикса - bisect по массиву, без запросов к БД.
+
+Индекс пользователя строится лениво при первом запросе и обновляется после
+commit сессий, создающих/изменяющих/удаляющих проекты, проверки и документы
+этого процесса. Изменения из других процессов (воркеры, Celery) попадут в
+индекс не позже чем через AUTOCOMPLETE_TTL секунд.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.document import Document
+from app.models.inspection import Inspection
+from app.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+# Тип подсказки -> (модель, поле с текстом)
+SUGGESTION_FIELDS = {
+    "project": (Project, "name"),
+    "inspection": (Inspection, "title"),
+    "document": (Document, "title"),
+}
+
+# Элемент индекса: (ключ поиска, номер слова, тип, исходный текст)
+Entry = Tuple[str, int, str, str]
+
+
+def normalize(text: str) -> str:
+    """Ключ сравнения: регистр, ё/е и пробелы не важны"""
+    return " ".join(text.casefold().replace("ё", "е").split())
+
+
+class PrefixIndex:
+    """Отсортированный массив ключей с поиском по префиксу"""
+
+    def __init__(self):
+        self._entries: List[Entry] = []
+        # Одинаковые тексты (типовые названия проверок) хранятся один раз, со счетчиком
+        self._counts: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    @staticmethod
+    def _keys(text: str) -> List[Tuple[str, int]]:
+        words = normalize(text).split(" ")
+        return [(" ".join(words[position:]), position) for position in range(len(words)) if words[position]]
+
+    def add(self, kind: str, text: Optional[str]):
+        """Добавление текста (повторное - только увеличивает счетчик)"""
+        if not text:
+            return
+        self._counts[(kind, text)] += 1
+        if self._counts[(kind, text)] > 1:
+            return
+        for key, position in self._keys(text):
+            insort(self._entries, (key, position, kind, text))
+
+    def remove(self, kind: str, text: Optional[str]):
+        """Удаление текста (из массива - когда счетчик дошел до нуля)"""
+        if not text or self._counts[(kind, text)] <= 0:
+            return
+        self._counts[(kind, text)] -= 1
+        if self._counts[(kind, text)] > 0:
+            return
+        del self._counts[(kind, text)]
+        for key, position in self._keys(text):
+            entry = (key, position, kind, text)
+            index = bisect_left(self._entries, entry)
+            if index < len(self._entries) and self._entries[index] == entry:
+                del self._entries[index]
+
+    def search(self, prefix: str, limit: int, kinds: Optional[Set[str]] = None) -> List[Tuple[str, str]]:
+        """
+        Тексты, у которых строка или одно из слов начинается с prefix
+
+        Args:
+            prefix: Введенный текст
+            limit: Максимум подсказок
+            kinds: Типы подсказок (None - все)
+
+        Returns:
+            Список (тип, текст): сначала совпадения с начала строки, затем по словам
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        # Кандидатов берем с запасом, чтобы совпадения с начала строки не вытеснялись
+        candidates = []
+        index = bisect_left(self._entries, (prefix,))
+        while index < len(self._entries) and len(candidates) < limit * 4:
+            key, position, kind, text = self._entries[index]
+            if not key.startswith(prefix):
+                break
+            if kinds is None or kind in kinds:
+                candidates.append((position > 0, key, kind, text))
+            index += 1
+
+        results = []
+        seen = set()
+        for _, _, kind, text in sorted(candidates):
+            if (kind, text) not in seen:
+                seen.add((kind, text))
+                results.append((kind, text))
+                if len(results) >= limit:
+                    break
+        return results
+
+
+class ScopeIndex:
+    """Индекс одного пользователя"""
+
+    def __init__(self, project_ids: Iterable[int]):
+        self.project_ids: Set[int] = set(project_ids)
+        self.index = PrefixIndex()
+        # Текущий текст каждого объекта: при изменении старый текст убираем по нему,
+        # а не по истории атрибута (она пуста, если старое значение не загружалось)
+        self.texts: Dict[Tuple[str, int], str] = {}
+        self.built_at = time.monotonic()
+
+    def set(self, kind: str, object_id: int, text: Optional[str]):
+        """Замена текста объекта (None - объект удален из области)"""
+        self.index.remove(kind, self.texts.pop((kind, object_id), None))
+        if text:
+            self.texts[(kind, object_id)] = text
+            self.index.add(kind, text)
+
+
+# Элемент области: (тип, ID объекта, текст)
+ScopeItem = Tuple[str, int, str]
+
+# Загрузка текстов области: (сессия, user_id) -> (ID проектов, элементы)
+ScopeLoader = Callable[[Session, int], Tuple[List[int], List[ScopeItem]]]
+
+
+def load_scope(db: Session, user_id: int) -> Tuple[List[int], List[ScopeItem]]:
+    """Тексты для индекса пользователя: три запроса без DISTINCT и LIKE"""
+    projects = db.query(Project.id, Project.name).filter(Project.created_by == user_id).all()
+    project_ids = [project_id for project_id, _ in projects]
+    items = [("project", project_id, name) for project_id, name in projects]
+
+    if project_ids:
+        items.extend(
+            ("inspection", inspection_id, title)
+            for inspection_id, title in db.query(Inspection.id, Inspection.title).filter(
+                Inspection.project_id.in_(project_ids)
+            )
+        )
+        items.extend(
+            ("document", document_id, title)
+            for document_id, title in db.query(Document.id, Document.title).filter(
+                Document.project_id.in_(project_ids)
+            )
+        )
+    return project_ids, items
+
+
+class AutocompleteIndex:
+    """Индексы автодополнения по пользователям (LRU с временем жизни)"""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_scopes: Optional[int] = None,
+        loader: ScopeLoader = load_scope
+    ):
+        """
+        Args:
+            ttl_seconds: Через сколько секунд индекс пользователя перестраивается
+            max_scopes: Максимум пользователей в памяти
+            loader: Загрузка текстов пользователя из БД
+        """
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.AUTOCOMPLETE_TTL
+        self.max_scopes = max_scopes if max_scopes is not None else settings.AUTOCOMPLETE_MAX_SCOPES
+        self.loader = loader
+        self._scopes: "OrderedDict[int, ScopeIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def _get_scope(self, db: Session, user_id: int) -> ScopeIndex:
+        with self._lock:
+            scope = self._scopes.get(user_id)
+            if scope is not None and time.monotonic() - scope.built_at < self.ttl_seconds:
+                self._scopes.move_to_end(user_id)
+                return scope
+
+        # Запросы к БД - вне блокировки, чтобы не задерживать других пользователей
+        project_ids, items = self.loader(db, user_id)
+        scope = ScopeIndex(project_ids)
+        for kind, object_id, text in items:
+            scope.set(kind, object_id, text)
+
+        with self._lock:
+            self._scopes[user_id] = scope
+            self._scopes.move_to_end(user_id)
+            while len(self._scopes) > self.max_scopes:
+                self._scopes.popitem(last=False)
+            self.builds += 1
+        return scope
+
+    def suggest(
+        self,
+        db: Session,
+        user_id: int,
+        q: str,
+        limit: int = 10,
+        kinds: Optional[Set[str]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Подсказки автодополнения
+
+        Args:
+            db: Сессия (нужна только для первого построения индекса пользователя)
+            user_id: ID пользователя
+            q: Введенный текст
+            limit: Максимум подсказок
+            kinds: Типы подсказок ("project", "inspection", "document"), None - все
+
+        Returns:
+            Список {"text": ..., "type": ...}
+        """
+        scope = self._get_scope(db, user_id)
+        with self._lock:
+            matches = scope.index.search(q, limit, kinds)
+        return [{"text": text, "type": kind} for kind, text in matches]
+
+    def invalidate(self, user_id: Optional[int] = None):
+        """Сброс индекса пользователя (или всех)"""
+        with self._lock:
+            if user_id is None:
+                self._scopes.clear()
+            else:
+                self._scopes.pop(user_id, None)
+
+    def apply(self, changes: Iterable[tuple]):
+        """
+        Применение изменений после commit
+
+        Args:
+            changes: (тип, ID объекта, ID проекта, владелец проекта, новый текст или None при удалении)
+        """
+        with self._lock:
+            for kind, object_id, project_id, owner_id, text in changes:
+                for user_id, scope in self._scopes.items():
+                    if kind == "project":
+                        in_scope = text is not None and owner_id == user_id
+                        if in_scope:
+                            scope.project_ids.add(project_id)
+                        else:
+                            scope.project_ids.discard(project_id)
+                    else:
+                        in_scope = text is not None and project_id in scope.project_ids
+
+                    if in_scope:
+                        scope.set(kind, object_id, text)
+                    elif (kind, object_id) in scope.texts:
+                        # Объект удален или переехал в чужой проект
+                        scope.set(kind, object_id, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Статистика индекса"""
+        with self._lock:
+            return {
+                "scopes": len(self._scopes),
+                "texts": sum(len(scope.index) for scope in self._scopes.values()),
+                "builds": self.builds,
+            }
+
+
+autocomplete_index = AutocompleteIndex()
+
+
+# Обновление индекса по изменениям в сессиях
+
+CHANGES_KEY = "autocomplete_changes"
+
+
+def _changed_text(obj, field: str) -> Tuple[bool, Optional[str]]:
+    """(изменилось ли поле, новое значение) - без загрузки значений из БД"""
+    state = inspect(obj)
+    if field not in state.mapper.attrs:
+        return False, None
+    history = state.attrs[field].history
+    if not history.added:
+        return False, None
+    return True, history.added[0]
+
+
+def _collect_changes(session: Session, flush_context):
+    """Запоминаем изменения текстов до commit (в after_flush история полей еще доступна)"""
+    try:
+        changes = session.info.setdefault(CHANGES_KEY, [])
+        for objects, deleted in ((session.new, False), (session.dirty, False), (session.deleted, True)):
+            for obj in objects:
+                for kind, (model, field) in SUGGESTION_FIELDS.items():
+                    if not isinstance(obj, model):
+                        continue
+                    if kind == "project":
+                        project_id, owner_id = obj.id, obj.created_by
+                        moved = _changed_text(obj, "created_by")[0]
+                    else:
+                        project_id, owner_id = obj.project_id, None
+                        moved = _changed_text(obj, "project_id")[0]
+
+                    if deleted:
+                        changes.append((kind, obj.id, project_id, owner_id, None))
+                        continue
+                    changed, text = _changed_text(obj, field)
+                    if moved and not changed:
+                        text = getattr(obj, field)
+                    if changed or moved:
+                        changes.append((kind, obj.id, project_id, owner_id, text))
+    except Exception as e:
+        # Индекс подсказок не должен ломать запись в БД; устаревшее исправит TTL
+        logger.warning(f"Failed to track autocomplete changes: {e}")
+
+
+def _apply_changes(session: Session):
+    changes = session.info.pop(CHANGES_KEY, None)
+    if changes:
+        autocomplete_index.apply(changes)
+
+
+def _discard_changes(session: Session, previous_transaction):
+    session.info.pop(CHANGES_KEY, None)
+
+
+event.listen(Session, "after_flush", _collect_changes)
+event.listen(Session, "after_commit", _apply_changes)
+event.listen(Session, "after_soft_rollback", _discard_changes)
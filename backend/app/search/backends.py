@@ -0,0 +1,306 @@
+"""
+Бэкенды поискового индекса
+
+- ElasticsearchBackend: кластер из ELASTICSEARCH_URL (русский анализатор)
+- EmbeddedBackend: инвертированный индекс в памяти процесса - для тестов,
+  разработки и окружений без кластера
+
+Оба бэкенда принимают одинаковые документы (dict) и запросы: текст ищется
+по полям с весами, фильтры - точное совпадение значения (или одного из списка).
+"""
+import logging
+import math
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.search.text import tokenize
+
+try:
+    from elasticsearch import ConnectionError as ESConnectionError, ConnectionTimeout, Elasticsearch, helpers
+    elasticsearch_available = True
+    # Ошибки недоступности кластера, после которых индексацию стоит повторить
+    RETRYABLE_ERRORS = (ESConnectionError, ConnectionTimeout)
+except ImportError:
+    elasticsearch_available = False
+    RETRYABLE_ERRORS = ()
+
+logger = logging.getLogger(__name__)
+
+# Операция индексации: ("index", id, документ) или ("delete", id, None)
+Action = Tuple[str, Any, Optional[dict]]
+
+# Результат поиска: {"id": ..., "score": ..., "source": {...}}
+Hit = Dict[str, Any]
+
+
+class SearchBackend(ABC):
+    """Интерфейс поискового бэкенда"""
+
+    name = "base"
+
+    @abstractmethod
+    def ensure_index(self, index: str, mapping: dict):
+        """
+        Создание индекса, если его нет
+
+        Args:
+            index: Имя индекса (без префикса)
+            mapping: Описание полей в формате Elasticsearch mappings
+        """
+
+    @abstractmethod
+    def drop_index(self, index: str):
+        """Удаление индекса со всеми документами"""
+
+    @abstractmethod
+    def bulk(self, index: str, actions: Iterable[Action]) -> int:
+        """
+        Пакетная индексация и удаление документов
+
+        Returns:
+            Количество выполненных операций
+        """
+
+    @abstractmethod
+    def search(
+        self,
+        index: str,
+        query: str,
+        fields: Dict[str, float],
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10
+    ) -> List[Hit]:
+        """
+        Поиск по тексту
+
+        Args:
+            index: Имя индекса
+            query: Текст запроса
+            fields: Поля для поиска и их веса
+            filters: Точные фильтры {поле: значение или список значений}
+            limit: Максимум результатов
+
+        Returns:
+            Список результатов по убыванию score
+        """
+
+    @abstractmethod
+    def count(self, index: str) -> int:
+        """Количество документов в индексе"""
+
+
+class ElasticsearchBackend(SearchBackend):
+    """Индекс в Elasticsearch"""
+
+    name = "elasticsearch"
+
+    # Анализатор по умолчанию для текстовых полей: русская морфология и стоп-слова
+    INDEX_SETTINGS = {"analysis": {"analyzer": {"default": {"type": "russian"}}}}
+
+    def __init__(self, url: str, prefix: str = ""):
+        if not elasticsearch_available:
+            raise RuntimeError("elasticsearch package is not installed")
+        self.client = Elasticsearch(url)
+        self.prefix = prefix
+
+    def _name(self, index: str) -> str:
+        return f"{self.prefix}_{index}" if self.prefix else index
+
+    def ensure_index(self, index: str, mapping: dict):
+        name = self._name(index)
+        if not self.client.indices.exists(index=name):
+            self.client.indices.create(index=name, mappings=mapping, settings=self.INDEX_SETTINGS)
+            logger.info(f"Created search index {name}")
+
+    def drop_index(self, index: str):
+        self.client.indices.delete(index=self._name(index), ignore_unavailable=True)
+
+    def bulk(self, index: str, actions: Iterable[Action]) -> int:
+        name = self._name(index)
+
+        def operations():
+            for op, doc_id, document in actions:
+                if op == "delete":
+                    yield {"_op_type": "delete", "_index": name, "_id": doc_id}
+                else:
+                    yield {"_op_type": "index", "_index": name, "_id": doc_id, "_source": document}
+
+        success, errors = helpers.bulk(self.client, operations(), raise_on_error=False, stats_only=False)
+        for error in errors:
+            # Удаление отсутствующего документа - не ошибка
+            if error.get("delete", {}).get("status") != 404:
+                logger.error(f"Search index {name} bulk error: {error}")
+        return success
+
+    def search(self, index, query, fields, filters=None, limit=10) -> List[Hit]:
+        body_filters = []
+        for field, value in (filters or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                body_filters.append({"terms": {field: list(value)}})
+            else:
+                body_filters.append({"term": {field: value}})
+
+        response = self.client.search(
+            index=self._name(index),
+            query={
+                "bool": {
+                    "must": {
+                        "multi_match": {
+                            "query": query,
+                            "fields": [f"{field}^{boost:g}" for field, boost in fields.items()],
+                        }
+                    },
+                    "filter": body_filters,
+                }
+            },
+            size=limit,
+        )
+        return [
+            {"id": hit["_id"], "score": hit["_score"], "source": hit["_source"]}
+            for hit in response["hits"]["hits"]
+        ]
+
+    def count(self, index: str) -> int:
+        return self.client.count(index=self._name(index))["count"]
+
+
+class EmbeddedBackend(SearchBackend):
+    """
+    Инвертированный индекс в памяти процесса
+
+    Слово -> документы; score = сумма по словам запроса idf * вес поля * tf/(tf+1).
+    Данные живут в процессе: каждый воркер индексирует свои изменения сам.
+    """
+
+    name = "embedded"
+
+    def __init__(self):
+        self._documents: Dict[str, Dict[str, dict]] = {}
+        # индекс -> слово -> id -> {поле: tf}
+        self._postings: Dict[str, Dict[str, Dict[str, Counter]]] = {}
+        # Индексы, заполненные полной переиндексацией (до нее в индексе только изменения после commit)
+        self._populated: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def ensure_index(self, index: str, mapping: dict):
+        with self._lock:
+            self._documents.setdefault(index, {})
+            self._postings.setdefault(index, defaultdict(dict))
+
+    def drop_index(self, index: str):
+        with self._lock:
+            self._documents.pop(index, None)
+            self._postings.pop(index, None)
+            self._populated.discard(index)
+
+    def mark_populated(self, index: str):
+        """Отметка, что индекс заполнен всеми объектами из БД"""
+        with self._lock:
+            self._populated.add(index)
+
+    def is_populated(self, index: str) -> bool:
+        with self._lock:
+            return index in self._populated
+
+    def _remove(self, index: str, doc_id: str):
+        document = self._documents[index].pop(doc_id, None)
+        if document is None:
+            return
+        postings = self._postings[index]
+        for value in document.values():
+            if not isinstance(value, str):
+                continue
+            for token in set(tokenize(value)):
+                postings.get(token, {}).pop(doc_id, None)
+                if token in postings and not postings[token]:
+                    del postings[token]
+
+    def bulk(self, index: str, actions: Iterable[Action]) -> int:
+        self.ensure_index(index, {})
+        applied = 0
+        with self._lock:
+            postings = self._postings[index]
+            for op, doc_id, document in actions:
+                doc_id = str(doc_id)
+                self._remove(index, doc_id)
+                if op != "delete":
+                    self._documents[index][doc_id] = document
+                    for field, value in document.items():
+                        if isinstance(value, str):
+                            for token in tokenize(value):
+                                postings[token].setdefault(doc_id, Counter())[field] += 1
+                applied += 1
+        return applied
+
+    @staticmethod
+    def _matches(document: dict, filters: Dict[str, Any]) -> bool:
+        for field, expected in filters.items():
+            value = document.get(field)
+            if isinstance(expected, (list, tuple, set)):
+                if value not in expected:
+                    return False
+            elif value != expected:
+                return False
+        return True
+
+    def search(self, index, query, fields, filters=None, limit=10) -> List[Hit]:
+        with self._lock:
+            documents = self._documents.get(index, {})
+            postings = self._postings.get(index, {})
+            total = len(documents)
+            scores: Dict[str, float] = defaultdict(float)
+
+            for token in set(tokenize(query)):
+                matches = postings.get(token)
+                if not matches:
+                    continue
+                idf = math.log(1 + (total - len(matches) + 0.5) / (len(matches) + 0.5))
+                for doc_id, frequencies in matches.items():
+                    for field, boost in fields.items():
+                        tf = frequencies.get(field, 0)
+                        if tf:
+                            scores[doc_id] += idf * boost * tf / (tf + 1)
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            hits = []
+            for doc_id, score in ranked:
+                document = documents[doc_id]
+                if filters and not self._matches(document, filters):
+                    continue
+                hits.append({"id": doc_id, "score": round(score, 6), "source": dict(document)})
+                if len(hits) >= limit:
+                    break
+            return hits
+
+    def count(self, index: str) -> int:
+        with self._lock:
+            return len(self._documents.get(index, {}))
+
+
+_backend: Optional[SearchBackend] = None
+
+
+def create_search_backend(kind: Optional[str] = None) -> SearchBackend:
+    """
+    Бэкенд по настройкам
+
+    Args:
+        kind: "elasticsearch" или "embedded" (по умолчанию settings.SEARCH_BACKEND)
+    """
+    kind = kind or settings.SEARCH_BACKEND
+    if kind == "elasticsearch":
+        return ElasticsearchBackend(settings.ELASTICSEARCH_URL, settings.SEARCH_INDEX_PREFIX)
+    if kind == "embedded":
+        return EmbeddedBackend()
+    raise ValueError(f"Unsupported search backend: {kind}")
+
+
+def get_search_backend() -> SearchBackend:
+    """Общий бэкенд процесса (создается при первом обращении)"""
+    global _backend
+    if _backend is None:
+        _backend = create_search_backend()
+    return _backend
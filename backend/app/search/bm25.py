@@ -0,0 +1,100 @@
+"""
+Инвертированный индекс с ранжированием Okapi BM25
+
+Документ - набор текстовых полей с весами (BM25F): частоты основ слов и длина
+документа считаются с учетом веса поля. Индекс строится один раз, поиск
+проходит только по спискам документов слов запроса.
+"""
+import math
+from collections import Counter, defaultdict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from app.search.text import analyze
+
+
+class BM25Index:
+    """Индекс BM25 по документам с несколькими полями"""
+
+    def __init__(self, fields: Dict[str, float], k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            fields: Поля документа и их веса
+            k1: Насыщение частоты слова
+            b: Нормализация по длине документа
+        """
+        self.fields = fields
+        self.k1 = k1
+        self.b = b
+        self._keys: List[Hashable] = []
+        self._lengths: List[float] = []
+        # основа слова -> [(номер документа, взвешенная частота)]
+        self._postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        # основа слова -> idf; заполняется при первом поиске после добавления документов
+        self._idf: Optional[Dict[str, float]] = None
+        self._norms: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: Hashable, document: Dict[str, Any]):
+        """
+        Добавление документа
+
+        Args:
+            key: Ключ документа, возвращаемый поиском
+            document: Тексты полей (поля не из fields игнорируются)
+        """
+        position = len(self._keys)
+        frequencies: Counter = Counter()
+        length = 0.0
+        for field, weight in self.fields.items():
+            value = document.get(field)
+            if isinstance(value, (list, tuple)):
+                value = " ".join(str(item) for item in value)
+            for term in analyze(value):
+                frequencies[term] += weight
+                length += weight
+
+        self._keys.append(key)
+        self._lengths.append(length)
+        for term, frequency in frequencies.items():
+            self._postings[term].append((position, frequency))
+        self._idf = None
+
+    def _prepare(self):
+        total = len(self._keys)
+        average = sum(self._lengths) / total if total else 0.0
+        self._norms = [
+            self.k1 * (1 - self.b + self.b * length / average) if average else self.k1
+            for length in self._lengths
+        ]
+        self._idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Hashable, float]]:
+        """
+        Поиск документов
+
+        Args:
+            query: Текст запроса
+            limit: Максимум результатов
+
+        Returns:
+            Список (ключ документа, score) по убыванию score
+        """
+        if self._idf is None:
+            self._prepare()
+
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(analyze(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf[term]
+            for position, frequency in postings:
+                scores[position] += idf * frequency * (self.k1 + 1) / (frequency + self._norms[position])
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(self._keys[position], round(score, 6)) for position, score in ranked]
@@ -0,0 +1,190 @@
+"""
+Векторный поиск по смыслу без внешней модели
+
+HashingEncoder переводит текст в вектор фиксированной размерности: основы
+слов и символьные n-граммы слов хешируются в ячейки вектора. Близкие по
+написанию формы и однокоренные слова ("усадка"/"осадка", "основания"/
+"основание") получают общие ячейки, поэтому косинусная близость находит
+перефразированные вопросы, которые не совпадают по ключевым словам.
+
+VectorIndex хранит векторы документов в одной матрице NumPy (строки
+нормированы, веса ячеек - idf по коллекции) и ищет top-k одним умножением
+матрицы на вектор запроса. Индекс сохраняется в .npz и загружается за
+миллисекунды.
+"""
+import json
+import logging
+import math
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.search.text import stem, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+class HashingEncoder:
+    """Вектор текста из хешей основ слов и символьных n-грамм"""
+
+    def __init__(self, dim: int = 1024, ngram_range: Tuple[int, int] = (3, 5)):
+        """
+        Args:
+            dim: Размерность вектора
+            ngram_range: Длины символьных n-грамм (слово обрамляется "<" и ">")
+        """
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        """Параметры, от которых зависят векторы (сохраняются вместе с индексом)"""
+        return {"encoder": "hashing", "dim": self.dim, "ngram_range": list(self.ngram_range)}
+
+    def _features(self, text: str) -> List[str]:
+        features = []
+        low, high = self.ngram_range
+        for token in tokenize(text):
+            if len(token) < 2:
+                continue
+            base = stem(token)
+            features.append(f"w:{base}")
+            word = f"<{base}>"
+            for size in range(low, high + 1):
+                features.extend(word[start:start + size] for start in range(len(word) - size + 1))
+        return features
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Векторы текстов без нормировки
+
+        Returns:
+            Матрица (len(texts), dim): частоты ячеек 1 + log(tf) со знаком хеша
+        """
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts: Dict[Tuple[int, float], int] = {}
+            for feature in self._features(text):
+                digest = zlib.crc32(feature.encode("utf-8"))
+                # Младшие биты - ячейка, старший - знак (коллизии гасят друг друга, а не копятся)
+                cell = (digest % self.dim, 1.0 if digest & 0x80000000 else -1.0)
+                counts[cell] = counts.get(cell, 0) + 1
+            for (column, sign), count in counts.items():
+                matrix[row, column] += sign * (1.0 + math.log(count))
+        return matrix
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorIndex:
+    """Матрица векторов документов с поиском top-k по косинусу"""
+
+    def __init__(
+        self,
+        encoder: HashingEncoder,
+        keys: List[Hashable],
+        matrix: np.ndarray,
+        idf: np.ndarray,
+        fingerprint: str = ""
+    ):
+        self.encoder = encoder
+        self.keys = keys
+        self.matrix = matrix
+        self.idf = idf
+        self.fingerprint = fingerprint
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def build(
+        cls,
+        items: Sequence[Tuple[Hashable, str]],
+        encoder: Optional[HashingEncoder] = None,
+        fingerprint: str = ""
+    ) -> "VectorIndex":
+        """
+        Построение индекса
+
+        Args:
+            items: Пары (ключ документа, текст)
+            encoder: Кодировщик текста
+            fingerprint: Отпечаток исходных данных (проверяется при загрузке)
+        """
+        encoder = encoder or HashingEncoder()
+        raw = encoder.encode([text for _, text in items])
+        document_frequency = np.count_nonzero(raw, axis=0)
+        idf = np.log((1 + len(items)) / (1 + document_frequency)).astype(np.float32) + 1.0
+        matrix = _normalize_rows(raw * idf).astype(np.float32)
+        return cls(encoder, [key for key, _ in items], matrix, idf, fingerprint)
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.0) -> List[Tuple[Hashable, float]]:
+        """
+        Документы, ближайшие к запросу
+
+        Args:
+            query: Текст запроса
+            limit: Максимум результатов
+            min_score: Минимальная косинусная близость
+
+        Returns:
+            Список (ключ документа, близость) по убыванию близости
+        """
+        if not self.keys:
+            return []
+        vector = _normalize_rows(self.encoder.encode([query]) * self.idf)[0]
+        if not vector.any():
+            return []
+
+        scores = self.matrix @ vector
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (self.keys[position], round(float(scores[position]), 6))
+            for position in top
+            if scores[position] >= min_score
+        ]
+
+    def save(self, path: Path):
+        """Сохранение в .npz (матрица, idf, ключи и параметры кодировщика)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {"keys": self.keys, "encoder": self.encoder.params, "fingerprint": self.fingerprint}
+        with open(path, "wb") as f:
+            np.savez(f, matrix=self.matrix, idf=self.idf, meta=np.array(json.dumps(meta, ensure_ascii=False)))
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: Optional[str] = None) -> Optional["VectorIndex"]:
+        """
+        Загрузка сохраненного индекса
+
+        Args:
+            path: Файл .npz
+            fingerprint: Ожидаемый отпечаток данных (None - не проверять)
+
+        Returns:
+            Индекс или None, если файла нет или он построен по другим данным
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                matrix, idf = data["matrix"], data["idf"]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to load vector index {path}: {e}")
+            return None
+
+        if fingerprint is not None and meta.get("fingerprint") != fingerprint:
+            return None
+        params = meta["encoder"]
+        encoder = HashingEncoder(dim=params["dim"], ngram_range=tuple(params["ngram_range"]))
+        keys = [tuple(key) if isinstance(key, list) else key for key in meta["keys"]]
+        return cls(encoder, keys, matrix, idf, meta.get("fingerprint", ""))
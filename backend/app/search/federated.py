@@ -0,0 +1,122 @@
+"""
+Параллельный поиск по нескольким типам сущностей
+
+Запрос по каждому типу выполняется в своем потоке и своей сессии (отдельное
+подключение из пула engine). Ответ собирается к дедлайну из того, что успело
+выполниться; в PostgreSQL не успевшие запросы прерываются по statement_timeout,
+чтобы не держать подключения после ответа.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.search.fulltext import is_supported
+
+logger = logging.getLogger(__name__)
+
+# Поиск одного типа: сессия -> список результатов (dict с ключом "rank")
+SearchTask = Callable[[Session], List[dict]]
+
+# Запас statement_timeout сверх дедлайна: запрос, пойманный на границе, доработает
+STATEMENT_TIMEOUT_GRACE_MS = 200
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Общий пул потоков поиска (создается при первом запросе)"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.SEARCH_WORKERS, thread_name_prefix="search")
+    return _executor
+
+
+def _run_task(bind, name: str, task: SearchTask, timeout_ms: int) -> List[dict]:
+    """Выполнение одного поиска в собственной сессии"""
+    db = Session(bind=bind)
+    try:
+        if is_supported(db):
+            # Действует до конца транзакции, подключение вернется в пул без него
+            db.execute(
+                text("SELECT set_config('statement_timeout', :timeout, true)"),
+                {"timeout": f"{timeout_ms}ms"}
+            )
+        return task(db)
+    except Exception:
+        # Логируем здесь: поиск, упавший после дедлайна, run_parallel уже не увидит
+        logger.exception(f"Search for {name} failed")
+        raise
+    finally:
+        db.close()
+
+
+def run_parallel(
+    bind,
+    tasks: Dict[str, SearchTask],
+    deadline: Optional[float] = None
+) -> Tuple[Dict[str, List[dict]], List[str]]:
+    """
+    Параллельный запуск поисков с общим дедлайном
+
+    Args:
+        bind: Engine (или подключение), на котором открываются сессии
+        tasks: Поиски по именам типов
+        deadline: Дедлайн, сек (по умолчанию settings.SEARCH_DEADLINE_MS)
+
+    Returns:
+        Tuple (результаты успевших поисков по именам, имена не успевших или упавших)
+    """
+    if deadline is None:
+        deadline = settings.SEARCH_DEADLINE_MS / 1000
+    timeout_ms = int(deadline * 1000) + STATEMENT_TIMEOUT_GRACE_MS
+
+    started = time.monotonic()
+    futures = {
+        get_executor().submit(_run_task, bind, name, task, timeout_ms): name
+        for name, task in tasks.items()
+    }
+    done, not_done = wait(futures, timeout=deadline)
+
+    results = {}
+    missing = []
+    for future in done:
+        name = futures[future]
+        if future.exception() is not None:
+            # Ошибка с traceback уже записана в _run_task
+            missing.append(name)
+        else:
+            results[name] = future.result()
+    for future in not_done:
+        # Еще не начатые поиски не запустятся, начатые прервет statement_timeout
+        future.cancel()
+        missing.append(futures[future])
+
+    if missing:
+        logger.warning(
+            f"Search returned partial results after {time.monotonic() - started:.3f}s, missing: {', '.join(missing)}"
+        )
+    # Порядок типов как в запросе, а не в порядке завершения
+    return {name: results[name] for name in tasks if name in results}, [name for name in tasks if name in missing]
+
+
+def merge_ranked(groups: Dict[str, List[dict]], per_type: int, limit: Optional[int] = None) -> List[dict]:
+    """
+    Общий список результатов по убыванию релевантности
+
+    Args:
+        groups: Результаты по типам (уже отсортированы по rank внутри типа)
+        per_type: Максимум результатов одного типа
+        limit: Максимум результатов в списке
+
+    Returns:
+        Список результатов; при равном ранге (или без ранга) сохраняется порядок типов
+    """
+    merged = [hit for hits in groups.values() for hit in hits[:per_type]]
+    # sorted устойчив: без ранга (не PostgreSQL) остается порядок типов и порядок внутри типа
+    merged = sorted(merged, key=lambda hit: hit.get("rank") or 0.0, reverse=True)
+    return merged[:limit] if limit else merged
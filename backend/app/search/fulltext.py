@@ -0,0 +1,110 @@
+"""
+Полнотекстовый поиск PostgreSQL
+
+Таблицы projects, inspections, hidden_works, documents и regulations содержат
+generated колонку search_vector (взвешенный tsvector с конфигурацией russian)
+и GIN индекс по ней (миграция 002). Колонка вычисляется базой и не объявлена
+в моделях, поэтому здесь на нее ссылаемся по имени таблицы.
+
+Запросы разбираются websearch_to_tsquery (синтаксис поисковиков: "фраза",
+or, -исключение), результаты сортируются по ts_rank, фрагменты с подсветкой
+строит ts_headline. На других СУБД (SQLite в разработке) - поиск через ILIKE.
+"""
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Query, Session
+
+TS_CONFIG = "russian"
+SEARCH_VECTOR_COLUMN = "search_vector"
+
+# Параметры фрагментов: до двух отрывков по ~20 слов, совпадения в <mark>
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=20, MinWords=5, MaxFragments=2"
+
+# Результат поиска: (объект, ранг, фрагмент с подсветкой)
+SearchHit = Tuple[Any, Optional[float], Optional[str]]
+
+
+def is_supported(db: Session) -> bool:
+    """Доступен ли полнотекстовый поиск (только PostgreSQL)"""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def search_vector(model):
+    """Колонка search_vector таблицы модели"""
+    return literal_column(f"{model.__tablename__}.{SEARCH_VECTOR_COLUMN}", type_=TSVECTOR)
+
+
+def websearch_query(q: str):
+    """Разбор пользовательского запроса в tsquery"""
+    return func.websearch_to_tsquery(TS_CONFIG, q)
+
+
+def headline(column, ts_query):
+    """Фрагмент текста колонки с подсветкой совпадений"""
+    return func.ts_headline(TS_CONFIG, func.coalesce(column, ""), ts_query, HEADLINE_OPTIONS)
+
+
+def ranked_query(query: Query, model, q: str, snippet_column=None) -> Query:
+    """
+    Запрос с фильтром по search_vector, колонками rank/snippet и сортировкой по рангу
+
+    Args:
+        query: Запрос по модели
+        model: Модель с колонкой search_vector
+        q: Поисковая строка пользователя
+        snippet_column: Колонка для фрагмента с подсветкой (опционально)
+    """
+    ts_query = websearch_query(q)
+    vector = search_vector(model)
+    rank = func.ts_rank(vector, ts_query).label("rank")
+
+    columns = [rank]
+    if snippet_column is not None:
+        columns.append(headline(snippet_column, ts_query).label("snippet"))
+
+    return (
+        query.add_columns(*columns)
+        .filter(vector.op("@@")(ts_query))
+        .order_by(rank.desc(), model.id)
+    )
+
+
+def ranked_search(
+    query: Query,
+    model,
+    q: str,
+    fallback_columns: Sequence,
+    snippet_column=None,
+    limit: Optional[int] = None
+) -> List[SearchHit]:
+    """
+    Ранжированный поиск по search_vector
+
+    Args:
+        query: Запрос по модели с уже примененными фильтрами (права, статус и т.д.)
+        model: Модель, чью колонку search_vector используем
+        q: Поисковая строка пользователя
+        fallback_columns: Колонки для ILIKE, если СУБД не PostgreSQL
+        snippet_column: Колонка для фрагмента с подсветкой (опционально)
+        limit: Максимум результатов
+
+    Returns:
+        Список (объект, ранг, фрагмент) по убыванию ранга
+    """
+    if not is_supported(query.session):
+        search_term = f"%{q}%"
+        query = query.filter(or_(*(column.ilike(search_term) for column in fallback_columns)))
+        if limit:
+            query = query.limit(limit)
+        return [(obj, None, None) for obj in query.all()]
+
+    query = ranked_query(query, model, q, snippet_column)
+    if limit:
+        query = query.limit(limit)
+
+    return [
+        (row[0], round(float(row.rank), 6), row.snippet if snippet_column is not None else None)
+        for row in query.all()
+    ]
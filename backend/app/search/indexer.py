@@ -0,0 +1,326 @@
+"""
+Индексация проектов, проверок, документов и нормативов в поисковом бэкенде
+
+- index_entities: (пере)индексация объектов по ID, отсутствующие в БД удаляются из индекса
+- reindex: полная переиндексация сущности пачками
+- track_changes: после commit сессии изменения уходят в индекс (Celery задача
+  для Elasticsearch, сразу в процессе - для embedded бэкенда)
+"""
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.document import Document
+from app.models.inspection import Inspection
+from app.models.project import Project
+from app.models.regulation import Regulation
+from app.search.backends import EmbeddedBackend, SearchBackend, get_search_backend
+
+logger = logging.getLogger(__name__)
+
+REINDEX_BATCH_SIZE = 500
+
+
+def _enum_value(value) -> Optional[str]:
+    return getattr(value, "value", value)
+
+
+def _datetime(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def project_document(project: Project) -> dict:
+    return {
+        "name": project.name,
+        "description": project.description,
+        "address": project.address,
+        "city": project.city,
+        "project_type": _enum_value(project.project_type),
+        "status": _enum_value(project.status),
+        "owner_id": project.created_by,
+        "project_id": project.id,
+        "updated_at": _datetime(project.updated_at),
+    }
+
+
+def inspection_document(inspection: Inspection) -> dict:
+    return {
+        "title": inspection.title,
+        "description": inspection.description,
+        "construction_phase": inspection.construction_phase,
+        "section": inspection.section,
+        "floor_level": inspection.floor_level,
+        "status": _enum_value(inspection.status),
+        "project_id": inspection.project_id,
+        "inspection_date": _datetime(inspection.inspection_date),
+    }
+
+
+def document_document(document: Document) -> dict:
+    return {
+        "title": document.title,
+        "description": document.description,
+        "document_number": document.document_number,
+        "tags": document.tags,
+        "document_type": _enum_value(document.document_type),
+        "project_id": document.project_id,
+        "document_date": _datetime(document.document_date),
+    }
+
+
+def regulation_document(regulation: Regulation) -> dict:
+    return {
+        "code": regulation.code,
+        "title": regulation.title,
+        "full_name": regulation.full_name,
+        "description": regulation.description,
+        "content": regulation.content,
+        "keywords": regulation.keywords,
+        "regulation_type": regulation.regulation_type,
+        "is_active": bool(regulation.is_active),
+    }
+
+
+# Индекс -> модель, построение документа, поля поиска с весами, mapping Elasticsearch
+INDEXES: Dict[str, Dict[str, Any]] = {
+    "projects": {
+        "model": Project,
+        "build": project_document,
+        "fields": {"name": 3.0, "address": 2.0, "city": 1.5, "description": 1.0},
+        "keywords": ("project_type", "status"),
+        "integers": ("owner_id", "project_id"),
+        "dates": ("updated_at",),
+    },
+    "inspections": {
+        "model": Inspection,
+        "build": inspection_document,
+        "fields": {"title": 3.0, "section": 2.0, "construction_phase": 1.5, "floor_level": 1.0, "description": 1.0},
+        "keywords": ("status",),
+        "integers": ("project_id",),
+        "dates": ("inspection_date",),
+    },
+    "documents": {
+        "model": Document,
+        "build": document_document,
+        "fields": {"title": 3.0, "document_number": 2.0, "tags": 1.5, "description": 1.0},
+        "keywords": ("document_type",),
+        "integers": ("project_id",),
+        "dates": ("document_date",),
+    },
+    "regulations": {
+        "model": Regulation,
+        "build": regulation_document,
+        "fields": {
+            "code": 4.0, "title": 3.0, "full_name": 2.0, "keywords": 2.0, "description": 1.5, "content": 1.0,
+        },
+        "keywords": ("regulation_type",),
+        "integers": (),
+        "dates": (),
+        "booleans": ("is_active",),
+    },
+}
+
+
+def index_mapping(index: str) -> dict:
+    """Mapping индекса для Elasticsearch"""
+    spec = INDEXES[index]
+    properties = {field: {"type": "text"} for field in spec["fields"]}
+    properties.update({field: {"type": "keyword"} for field in spec["keywords"]})
+    properties.update({field: {"type": "integer"} for field in spec["integers"]})
+    properties.update({field: {"type": "date"} for field in spec["dates"]})
+    properties.update({field: {"type": "boolean"} for field in spec.get("booleans", ())})
+    return {"properties": properties}
+
+
+def index_for(obj) -> Optional[str]:
+    """Имя индекса для объекта модели (None - не индексируется)"""
+    for index, spec in INDEXES.items():
+        if isinstance(obj, spec["model"]):
+            return index
+    return None
+
+
+def index_entities(
+    db: Session,
+    index: str,
+    ids: Iterable[int],
+    backend: Optional[SearchBackend] = None
+) -> int:
+    """
+    Индексация объектов по ID
+
+    Args:
+        db: Сессия БД
+        index: Имя индекса из INDEXES
+        ids: ID объектов; отсутствующие в БД удаляются из индекса
+        backend: Бэкенд (по умолчанию общий бэкенд процесса)
+
+    Returns:
+        Количество операций индексации
+    """
+    backend = backend or get_search_backend()
+    spec = INDEXES[index]
+    model = spec["model"]
+    ids = set(ids)
+    if not ids:
+        return 0
+
+    backend.ensure_index(index, index_mapping(index))
+    found = db.query(model).filter(model.id.in_(ids)).all()
+    actions = [("index", obj.id, spec["build"](obj)) for obj in found]
+    actions.extend(("delete", missing_id, None) for missing_id in ids - {obj.id for obj in found})
+    return backend.bulk(index, actions)
+
+
+def reindex(
+    db: Session,
+    index: str,
+    backend: Optional[SearchBackend] = None,
+    batch_size: int = REINDEX_BATCH_SIZE,
+    recreate: bool = False
+) -> int:
+    """
+    Полная переиндексация сущности пачками
+
+    Args:
+        db: Сессия БД
+        index: Имя индекса из INDEXES
+        backend: Бэкенд (по умолчанию общий бэкенд процесса)
+        batch_size: Размер пачки bulk запроса
+        recreate: Удалить индекс перед заполнением (после смены mapping)
+
+    Returns:
+        Количество проиндексированных документов
+    """
+    backend = backend or get_search_backend()
+    spec = INDEXES[index]
+    model = spec["model"]
+
+    if recreate:
+        backend.drop_index(index)
+    backend.ensure_index(index, index_mapping(index))
+
+    total = 0
+    batch: List[tuple] = []
+    for obj in db.query(model).order_by(model.id).yield_per(batch_size):
+        batch.append(("index", obj.id, spec["build"](obj)))
+        if len(batch) >= batch_size:
+            total += backend.bulk(index, batch)
+            batch = []
+    if batch:
+        total += backend.bulk(index, batch)
+    if isinstance(backend, EmbeddedBackend):
+        backend.mark_populated(index)
+
+    logger.info(f"Reindexed {total} documents into {index} ({backend.name})")
+    return total
+
+
+def search_index(
+    db: Session,
+    index: str,
+    query: str,
+    filters: Optional[Dict[str, Any]] = None,
+    limit: int = 10,
+    backend: Optional[SearchBackend] = None
+) -> List[dict]:
+    """
+    Поиск по индексу с весами полей из INDEXES
+
+    Embedded индекс живет в памяти процесса и при первом поиске заполняется из БД
+    (даже если после commit в него уже попали отдельные измененные объекты).
+
+    Returns:
+        Список {"id", "score", "source"}
+    """
+    backend = backend or get_search_backend()
+    if isinstance(backend, EmbeddedBackend) and not backend.is_populated(index):
+        reindex(db, index, backend=backend)
+    return backend.search(index, query, INDEXES[index]["fields"], filters=filters, limit=limit)
+
+
+# Отслеживание изменений
+
+CHANGES_KEY = "search_index_changes"
+
+# Отправка изменений после commit: (сессия, {индекс: ID}) -> None
+ChangeDispatcher = Callable[[Session, Dict[str, set]], None]
+
+
+def dispatch_to_celery(session: Session, changes: Dict[str, set]):
+    """Изменения в Celery задачу (Elasticsearch индексирует воркер)"""
+    from app.tasks.search_tasks import index_entities_task
+
+    for index, ids in changes.items():
+        index_entities_task.delay(index, sorted(ids))
+
+
+def dispatch_in_process(session: Session, changes: Dict[str, set]):
+    """Индексация сразу в процессе (embedded бэкенд живет в памяти этого процесса)"""
+    db = Session(bind=session.get_bind())
+    try:
+        for index, ids in changes.items():
+            index_entities(db, index, ids)
+    finally:
+        db.close()
+
+
+def _collect_changes(session: Session, flush_context):
+    """ID измененных объектов (после flush у новых объектов уже есть id)"""
+    changes = session.info.setdefault(CHANGES_KEY, {})
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        index = index_for(obj)
+        if index is not None and obj.id is not None:
+            changes.setdefault(index, set()).add(obj.id)
+
+
+def _make_commit_handler(dispatcher: ChangeDispatcher):
+    def _apply_changes(session: Session):
+        changes = session.info.pop(CHANGES_KEY, None)
+        if not changes:
+            return
+        try:
+            dispatcher(session, changes)
+        except Exception as e:
+            # Запись в БД уже прошла; индекс догонит переиндексация
+            logger.error(f"Failed to schedule search indexing: {e}")
+    return _apply_changes
+
+
+def _discard_changes(session: Session, previous_transaction):
+    session.info.pop(CHANGES_KEY, None)
+
+
+_commit_handler = None
+
+
+def track_changes(dispatcher: Optional[ChangeDispatcher] = None):
+    """
+    Включение индексации изменений для всех сессий процесса
+
+    Args:
+        dispatcher: Куда отправлять изменения (по умолчанию - по settings.SEARCH_BACKEND)
+    """
+    global _commit_handler
+    if dispatcher is None:
+        dispatcher = dispatch_in_process if settings.SEARCH_BACKEND == "embedded" else dispatch_to_celery
+
+    stop_tracking()
+    _commit_handler = _make_commit_handler(dispatcher)
+    event.listen(Session, "after_flush", _collect_changes)
+    event.listen(Session, "after_commit", _commit_handler)
+    event.listen(Session, "after_soft_rollback", _discard_changes)
+
+
+def stop_tracking():
+    """Отключение индексации изменений"""
+    global _commit_handler
+    if _commit_handler is None:
+        return
+    event.remove(Session, "after_flush", _collect_changes)
+    event.remove(Session, "after_commit", _commit_handler)
+    event.remove(Session, "after_soft_rollback", _discard_changes)
+    _commit_handler = None
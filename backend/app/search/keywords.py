@@ -0,0 +1,156 @@
+"""
+Поиск ключевых слов в тексте автоматом Ахо-Корасик
+
+Все ключевые слова всех тем компилируются в один автомат, и вопрос
+просматривается за один проход независимо от числа тем и слов. Совпадение
+засчитывается с начала слова: "трещина" находится в "трещинами", но
+"швы" не находится внутри другого слова.
+
+Темы ранжируются по сумме весов найденных ключевых слов: фраза из
+нескольких слов весит больше одного слова, а слово, общее для нескольких
+тем, делит вес между ними.
+"""
+from collections import defaultdict, deque
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from app.search.text import normalize
+
+
+class KeywordMatcher:
+    """Автомат Ахо-Корасик по ключевым словам тем"""
+
+    def __init__(self):
+        # Бор: переходы, ссылки неудач, номера слов, заканчивающихся в узле
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._keywords: List[str] = []
+        self._keyword_ids: Dict[str, int] = {}
+        # номер слова -> {тема: вес}
+        self._topics: List[Dict[Hashable, float]] = []
+        self._built = True
+
+    @classmethod
+    def from_topics(cls, topics: Dict[Hashable, Iterable[str]]) -> "KeywordMatcher":
+        """
+        Автомат по словарю {тема: ключевые слова}
+
+        Вес слова - число слов во фразе, деленное на число тем с этим словом.
+        """
+        matcher = cls()
+        owners: Dict[str, List[Hashable]] = defaultdict(list)
+        for topic, keywords in topics.items():
+            for keyword in keywords:
+                key = normalize(keyword).strip()
+                if key and topic not in owners[key]:
+                    owners[key].append(topic)
+        for keyword, keyword_topics in owners.items():
+            weight = len(keyword.split()) / len(keyword_topics)
+            for topic in keyword_topics:
+                matcher.add(keyword, topic, weight)
+        return matcher
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def add(self, keyword: str, topic: Hashable, weight: float = 1.0):
+        """
+        Добавление ключевого слова темы
+
+        Args:
+            keyword: Слово или фраза
+            topic: Тема
+            weight: Вес совпадения для темы
+        """
+        keyword = normalize(keyword).strip()
+        if not keyword:
+            return
+        keyword_id = self._keyword_ids.get(keyword)
+        if keyword_id is None:
+            keyword_id = self._keyword_ids[keyword] = len(self._keywords)
+            self._keywords.append(keyword)
+            self._topics.append({})
+            node = 0
+            for char in keyword:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append(keyword_id)
+        self._topics[keyword_id][topic] = weight
+        self._built = False
+
+    def _build(self):
+        """Ссылки неудач обходом бора в ширину"""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Слова, заканчивающиеся в узле, включают слова его ссылки неудачи
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+                queue.append(child)
+        self._built = True
+
+    def find(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Ключевые слова в тексте
+
+        Returns:
+            Список (позиция начала, ключевое слово) в порядке окончания совпадений
+        """
+        if not self._built:
+            self._build()
+
+        text = normalize(text)
+        matches = []
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for keyword_id in self._output[node]:
+                keyword = self._keywords[keyword_id]
+                start = position - len(keyword) + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    matches.append((start, keyword))
+        return matches
+
+    def rank(self, text: str, limit: Optional[int] = None) -> List[Tuple[Hashable, float]]:
+        """
+        Темы по сумме весов найденных ключевых слов
+
+        Каждое слово учитывается один раз; при равном весе выше тема,
+        слово которой встретилось в тексте раньше.
+
+        Args:
+            text: Текст вопроса
+            limit: Максимум тем (None - все найденные)
+
+        Returns:
+            Список (тема, score) по убыванию score
+        """
+        scores: Dict[Hashable, float] = defaultdict(float)
+        first_seen: Dict[Hashable, int] = {}
+        counted = set()
+        for start, keyword in self.find(text):
+            if keyword in counted:
+                continue
+            counted.add(keyword)
+            for topic, weight in self._topics[self._keyword_ids[keyword]].items():
+                scores[topic] += weight
+                first_seen[topic] = min(first_seen.get(topic, start), start)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], first_seen[item[0]]))
+        return [(topic, round(score, 6)) for topic, score in ranked[:limit]]
@@ -0,0 +1,113 @@
+"""
+Поиск по требованиям нормативов из data/regulations_database.json
+
+Каждое требование (key_requirements) - отдельный документ BM25: тема,
+текст требования, а также ключевые слова и название норматива. Результат -
+требования по убыванию релевантности со ссылкой на пункт норматива.
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+
+from app.search.bm25 import BM25Index
+
+# Веса полей документа требования
+REQUIREMENT_FIELDS = {
+    "topic": 3.0,
+    "keywords": 2.0,
+    "full_name": 1.5,
+    "requirement": 1.0,
+}
+
+
+class RequirementsIndex:
+    """Индекс требований нормативов (строится один раз при загрузке базы)"""
+
+    def __init__(self, regulations: Iterable[Dict[str, Any]]):
+        """
+        Args:
+            regulations: Нормативы из regulations_database.json
+        """
+        self.regulations: Dict[str, Dict[str, Any]] = {}
+        self.index = BM25Index(REQUIREMENT_FIELDS)
+
+        for regulation in regulations:
+            self.regulations[regulation["id"]] = regulation
+            for position, requirement in enumerate(regulation.get("key_requirements", [])):
+                self.index.add((regulation["id"], position), {
+                    "topic": requirement.get("topic"),
+                    "requirement": requirement.get("requirement"),
+                    "keywords": regulation.get("keywords", []),
+                    "full_name": regulation.get("full_name"),
+                })
+
+    def search_requirements(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Требования, наиболее подходящие к запросу
+
+        Args:
+            query: Вопрос или поисковый запрос
+            limit: Максимум требований
+
+        Returns:
+            Список требований с нормативом, пунктом и score
+        """
+        return [
+            self.requirement(regulation_id, position, score)
+            for (regulation_id, position), score in self.index.search(query, limit)
+        ]
+
+    def requirement(self, regulation_id: str, position: int, score: float = 0.0) -> Dict[str, Any]:
+        """Требование с нормативом и пунктом по ключу документа"""
+        regulation = self.regulations[regulation_id]
+        requirement = regulation["key_requirements"][position]
+        return {
+            "regulation_id": regulation_id,
+            "code": " ".join(filter(None, (regulation.get("type"), regulation.get("number")))),
+            "number": regulation.get("number"),
+            "name": regulation.get("full_name"),
+            "topic": requirement.get("topic"),
+            "requirement": requirement.get("requirement"),
+            "article": requirement.get("article"),
+            "score": score,
+        }
+
+    def texts(self) -> List[Tuple[Tuple[str, int], str]]:
+        """Ключи и тексты требований (для векторного индекса)"""
+        texts = []
+        for regulation_id, regulation in self.regulations.items():
+            for position, requirement in enumerate(regulation.get("key_requirements", [])):
+                text = ". ".join(filter(None, (
+                    requirement.get("topic"), requirement.get("requirement"), regulation.get("full_name"),
+                )))
+                texts.append(((regulation_id, position), text))
+        return texts
+
+    def search_regulations(self, query: str, limit: int = 10, requirements_limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        Нормативы, сгруппированные по найденным требованиям
+
+        Args:
+            query: Поисковый запрос
+            limit: Максимум нормативов
+            requirements_limit: Максимум требований норматива в ответе
+
+        Returns:
+            Нормативы по убыванию score лучшего требования
+        """
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for (regulation_id, position), score in self.index.search(query, limit=len(self.index)):
+            regulation = self.regulations[regulation_id]
+            entry = grouped.get(regulation_id)
+            if entry is None:
+                if len(grouped) >= limit:
+                    continue
+                entry = grouped[regulation_id] = {
+                    "id": regulation_id,
+                    "number": regulation.get("number"),
+                    "name": regulation.get("full_name"),
+                    "category": regulation.get("category"),
+                    "score": score,
+                    "key_requirements": [],
+                }
+            if len(entry["key_requirements"]) < requirements_limit:
+                entry["key_requirements"].append(regulation["key_requirements"][position])
+        return list(grouped.values())
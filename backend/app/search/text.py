@@ -0,0 +1,161 @@
+"""
+Разбор текста для поисковых индексов в памяти процесса
+
+- tokenize: слова текста в нормализованном виде
+- stem: основа русского слова (алгоритм Snowball для русского языка)
+- analyze: основы слов текста без стоп-слов - для ранжирования по смыслу
+  ("трещины", "трещина", "трещин" -> "трещин")
+"""
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Служебные слова, не влияющие на смысл запроса
+STOP_WORDS = frozenset("""
+    а без в во все для до же за и из или к как какая какие какой ко ли на над не ни
+    о об от по под при про с со то у что чем это
+""".split())
+
+
+def normalize(text: str) -> str:
+    """Приведение к нижнему регистру, ё -> е"""
+    return text.casefold().replace("ё", "е")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Слова текста в нормализованном виде
+
+    "СП 63.13330.2018" -> ["сп", "63", "13330", "2018"]
+    """
+    if not text:
+        return []
+    return TOKEN_RE.findall(normalize(text))
+
+
+# Стеммер Snowball для русского языка
+# (https://snowballstem.org/algorithms/russian/stemmer.html)
+
+VOWELS = frozenset("аеиоуыэюя")
+
+# Окончания первой группы допустимы только после "а" или "я"
+PERFECTIVE_GERUND = (("в", "вши", "вшись"), ("ив", "ивши", "ившись", "ыв", "ывши", "ывшись"))
+ADJECTIVE = ((), (
+    "ее", "ие", "ые", "ое", "ими", "ыми", "ей", "ий", "ый", "ой", "ем", "им", "ым", "ом",
+    "его", "ого", "ему", "ому", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею",
+))
+PARTICIPLE = (("ем", "нн", "вш", "ющ", "щ"), ("ивш", "ывш", "ующ"))
+REFLEXIVE = ((), ("ся", "сь"))
+VERB = (
+    ("ла", "на", "ете", "йте", "ли", "й", "л", "ем", "н", "ло", "но", "ет", "ют", "ны", "ть", "ешь", "нно"),
+    (
+        "ила", "ыла", "ена", "ейте", "уйте", "ите", "или", "ыли", "ей", "уй", "ил", "ыл", "им", "ым", "ен",
+        "ило", "ыло", "ено", "ят", "ует", "уют", "ит", "ыт", "ены", "ить", "ыть", "ишь", "ую", "ю",
+    ),
+)
+NOUN = ((), (
+    "а", "ев", "ов", "ие", "ье", "е", "иями", "ями", "ами", "еи", "ии", "и", "ией", "ей", "ой", "ий", "й",
+    "иям", "ям", "ием", "ем", "ам", "ом", "о", "у", "ах", "иях", "ях", "ы", "ь", "ию", "ью", "ю", "ия", "ья", "я",
+))
+# Длинные окончания раньше коротких
+DERIVATIONAL = ("ость", "ост")
+SUPERLATIVE = ("ейше", "ейш")
+
+
+def _regions(word: str) -> Tuple[int, int]:
+    """Начала областей RV и R2"""
+    rv = len(word)
+    for index, char in enumerate(word):
+        if char in VOWELS:
+            rv = index + 1
+            break
+
+    def after_vowel_consonant(start: int) -> int:
+        for index in range(start + 1, len(word)):
+            if word[index] not in VOWELS and word[index - 1] in VOWELS:
+                return index + 1
+        return len(word)
+
+    r1 = after_vowel_consonant(0)
+    return rv, after_vowel_consonant(r1)
+
+
+def _strip(word: str, rv: int, endings: Tuple[tuple, tuple]) -> Optional[str]:
+    """
+    Удаление самого длинного окончания из области RV
+
+    Returns:
+        Слово без окончания или None, если окончание не найдено
+    """
+    after_a, anywhere = endings
+    longest = max(
+        (ending for ending in (*after_a, *anywhere) if word.endswith(ending) and len(word) - len(ending) >= rv),
+        key=len,
+        default=None,
+    )
+    if longest is None:
+        return None
+    start = len(word) - len(longest)
+    if longest in after_a and longest not in anywhere:
+        if start - 1 < rv or word[start - 1] not in "ая":
+            return None
+    return word[:start]
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Основа слова: "трещины" -> "трещин", "бетонирования" -> "бетонирован"
+
+    Слова без русских гласных (числа, латиница) возвращаются без изменений.
+    """
+    rv, r2 = _regions(word)
+    if rv >= len(word):
+        return word
+
+    # Шаг 1: деепричастие, иначе возвратная частица и прилагательное/глагол/существительное
+    stripped = _strip(word, rv, PERFECTIVE_GERUND)
+    if stripped is None:
+        word = _strip(word, rv, REFLEXIVE) or word
+        stripped = _strip(word, rv, ADJECTIVE)
+        if stripped is not None:
+            stripped = _strip(stripped, rv, PARTICIPLE) or stripped
+        else:
+            stripped = _strip(word, rv, VERB)
+            if stripped is None:
+                stripped = _strip(word, rv, NOUN)
+    word = stripped if stripped is not None else word
+
+    # Шаг 2: конечное "и"
+    if word.endswith("и") and len(word) - 1 >= rv:
+        word = word[:-1]
+
+    # Шаг 3: словообразовательный суффикс в R2
+    for ending in DERIVATIONAL:
+        if word.endswith(ending) and len(word) - len(ending) >= max(rv, r2):
+            word = word[:-len(ending)]
+            break
+
+    # Шаг 4: превосходная степень, двойное "н", мягкий знак
+    superlative = next(
+        (ending for ending in SUPERLATIVE if word.endswith(ending) and len(word) - len(ending) >= rv),
+        None,
+    )
+    if superlative:
+        word = word[:-len(superlative)]
+    if word.endswith("нн") and len(word) - 2 >= rv:
+        word = word[:-1]
+    elif word.endswith("ь") and not superlative and len(word) - 1 >= rv:
+        word = word[:-1]
+    return word
+
+
+def analyze(text: Optional[str]) -> List[str]:
+    """
+    Основы значимых слов текста
+
+    "Допустимая ширина трещин" -> ["допустим", "ширин", "трещин"]
+    """
+    return [stem(token) for token in tokenize(text) if token not in STOP_WORDS]
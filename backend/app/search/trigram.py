@@ -0,0 +1,101 @@
+"""
+Нечеткий поиск через pg_trgm
+
+Для коротких полей (названия проектов, адреса, места проверок, коды нормативов,
+названия документов) построены GIN индексы gin_trgm_ops (миграция 003).
+Сравнение идет по word_similarity: запрос ищется как фрагмент строки, поэтому
+"СП 63.1333" находит "СП 63.13330.2018", а "фундамнт" - "Фундамент".
+
+Операторы <% и ILIKE используют индекс; порог совпадения задается
+pg_trgm.word_similarity_threshold (по умолчанию 0.6).
+На других СУБД - ILIKE без ранжирования.
+"""
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, literal, or_
+from sqlalchemy.orm import Query
+
+from app.search.fulltext import is_supported
+
+# Результат поиска: (объект, сходство 0..1)
+FuzzyHit = Tuple[Any, Optional[float]]
+
+
+def word_similarity(q: str, column):
+    """Сходство запроса с наиболее похожим фрагментом значения колонки (0..1)"""
+    return func.word_similarity(q, column)
+
+
+def fuzzy_match(q: str, column):
+    """Условие q <% column (по индексу gin_trgm_ops)"""
+    return literal(q).op("<%")(column)
+
+
+def fuzzy_search(
+    query: Query,
+    q: str,
+    columns: Sequence,
+    limit: Optional[int] = None
+) -> List[FuzzyHit]:
+    """
+    Поиск с опечатками, ранжированный по сходству
+
+    Args:
+        query: Запрос по модели с уже примененными фильтрами
+        q: Поисковая строка пользователя
+        columns: Колонки с trigram индексом
+        limit: Максимум результатов
+
+    Returns:
+        Список (объект, сходство) по убыванию сходства
+    """
+    if not is_supported(query.session):
+        search_term = f"%{q}%"
+        query = query.filter(or_(*(column.ilike(search_term) for column in columns)))
+        if limit:
+            query = query.limit(limit)
+        return [(obj, None) for obj in query.all()]
+
+    scores = [word_similarity(q, column) for column in columns]
+    score = (func.greatest(*scores) if len(scores) > 1 else scores[0]).label("similarity")
+
+    query = (
+        query.add_columns(score)
+        .filter(or_(*(fuzzy_match(q, column) for column in columns)))
+        .order_by(score.desc())
+    )
+    if limit:
+        query = query.limit(limit)
+
+    return [(row[0], round(float(row.similarity), 6)) for row in query.all()]
+
+
+def suggest(query: Query, column, q: str, limit: int) -> List[str]:
+    """
+    Подсказки автодополнения: сначала значения, начинающиеся с q, затем похожие
+
+    Args:
+        query: Запрос, выбирающий одну колонку (с фильтрами прав, можно distinct)
+        column: Колонка с trigram индексом
+        q: Введенный текст
+        limit: Максимум подсказок
+
+    Returns:
+        Список значений колонки
+    """
+    prefix = column.ilike(f"{q}%")
+
+    if not is_supported(query.session):
+        return [row[0] for row in query.filter(prefix).limit(limit).all()]
+
+    # Выражения сортировки в списке выборки - иначе PostgreSQL не даст сортировать DISTINCT
+    is_prefix = prefix.label("is_prefix")
+    score = word_similarity(q, column).label("similarity")
+    rows = (
+        query.add_columns(is_prefix, score)
+        .filter(or_(prefix, fuzzy_match(q, column)))
+        .order_by(is_prefix.desc(), score.desc(), column)
+        .limit(limit)
+        .all()
+    )
+    return [row[0] for row in rows]
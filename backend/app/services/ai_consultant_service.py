@@ -6,1783 +6,32 @@ AI Consultant Service - Профессиональный консультант
 - Поиск по базе нормативов
 - Рекомендации по устранению дефектов
 - Расчеты и формулы
+
+База знаний - data/knowledge_base, загружается движком консультанта
+(app.services.consultant_engine) при первом вопросе.
 """
 
-import json
-from pathlib import Path
 from typing import List, Dict, Any, Optional
 import logging
 
+from app.services.consultant_engine import CLASSIC, ConsultantEngine, KnowledgeBase, get_consultant_engine
+
 logger = logging.getLogger(__name__)
 
 
 class AIConsultantService:
     """Сервис AI консультанта по строительным нормам"""
 
-    def __init__(self):
-        self.regulations_db = self._load_regulations_database()
-        self.knowledge_base = self._build_knowledge_base()
-
-    def _load_regulations_database(self) -> Dict[str, Any]:
-        """Загрузка базы данных нормативов"""
-        try:
-            db_path = Path(__file__).parent.parent.parent / "data" / "regulations_database.json"
-            with open(db_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading regulations database: {e}")
-            return {"regulations": [], "defect_categories": []}
-
-    def _build_knowledge_base(self) -> Dict[str, Dict[str, Any]]:
-        """Построение расширенной базы знаний"""
-
-        knowledge = {
-            # Трещины в бетоне
-            "трещины": {
-                "keywords": ["трещина", "трещины", "раскрытие", "ширина трещины", "crack"],
-                "regulations": ["СП 63.13330.2018", "СП 13-102-2003"],
-                "detailed_response": """<strong>ТРЕЩИНЫ В ЖЕЛЕЗОБЕТОННЫХ КОНСТРУКЦИЯХ</strong><br><br>
-
-<strong>📋 Согласно СП 63.13330.2018 "Бетонные и железобетонные конструкции":</strong><br><br>
-
-<strong>Допустимая ширина раскрытия трещин (пункт 8.2.4):</strong><br>
-• Для обычных условий эксплуатации: <strong>≤ 0.3 мм</strong><br>
-• Для агрессивной среды (слабоагрессивная): <strong>≤ 0.2 мм</strong><br>
-• Для особо агрессивной среды: <strong>≤ 0.1 мм</strong><br>
-• Для предварительно напряженных конструкций: <strong>не допускаются</strong><br><br>
-
-<strong>📊 Классификация трещин по опасности:</strong><br><br>
-
-<strong>1. КРИТИЧЕСКИЕ (немедленное вмешательство):</strong><br>
-   • Ширина раскрытия > 0.3 мм в несущих элементах<br>
-   • Продольные трещины вдоль арматуры<br>
-   • Сквозные трещины в стенах и перекрытиях<br>
-   • Трещины с признаками прогрессирования<br><br>
-
-<strong>2. ЗНАЧИТЕЛЬНЫЕ (устранение в ближайшее время):</strong><br>
-   • Ширина 0.2-0.3 мм<br>
-   • Поперечные трещины в балках<br>
-   • Сетка мелких трещин<br><br>
-
-<strong>3. НЕЗНАЧИТЕЛЬНЫЕ (мониторинг):</strong><br>
-   • Ширина < 0.2 мм в ненесущих элементах<br>
-   • Усадочные трещины в отделке<br>
-   • Поверхностные волосяные трещины<br><br>
-
-<strong>🔧 Методы устранения (СП 13-102-2003):</strong><br><br>
-
-<strong>Для трещин шириной до 0.3 мм:</strong><br>
-1. Инъектирование эпоксидными составами<br>
-2. Поверхностная герметизация полимерными материалами<br><br>
-
-<strong>Для трещин шириной более 0.3 мм:</strong><br>
-1. Расшивка трещин на глубину 20-30 мм<br>
-2. Очистка и грунтование<br>
-3. Заполнение ремонтным составом М300-М400<br>
-4. При необходимости - установка металлических скоб или обойм<br><br>
-
-<strong>⚠️ Обязательные мероприятия:</strong><br>
-• Установка маяков для контроля развития трещин<br>
-• Обследование конструкции на несущую способность<br>
-• Выявление причин образования трещин<br>
-• Разработка проекта усиления (при ширине > 0.5 мм)<br><br>
-
-<strong>📐 Расчет допустимой ширины раскрытия:</strong><br>
-acrc = δ × (3.5 - 100 × μ) × σs / Es × (1 + ξ)<br>
-где:<br>
-• δ - коэффициент, учитывающий вид нагрузки (1.0-1.5)<br>
-• μ - коэффициент армирования<br>
-• σs - напряжение в арматуре, МПа<br>
-• Es - модуль упругости арматуры (200000 МПа)<br>
-• ξ - коэффициент учета неравномерности деформаций<br><br>
-
-<strong>📞 Дополнительная информация:</strong><br>
-СП 63.13330.2018, раздел 8 "Расчет по раскрытию трещин"<br>
-Пособие по проектированию бетонных и железобетонных конструкций""",
-            },
-
-            # Коррозия
-            "коррозия": {
-                "keywords": ["коррозия", "ржавчина", "арматура", "окисление", "corrosion"],
-                "regulations": ["СП 28.13330.2017", "СП 63.13330.2018"],
-                "detailed_response": """<strong>КОРРОЗИЯ АРМАТУРЫ В ЖЕЛЕЗОБЕТОНЕ</strong><br><br>
-
-<strong>📋 СП 28.13330.2017 "Защита строительных конструкций от коррозии"</strong><br><br>
-
-<strong>Виды коррозии арматуры:</strong><br><br>
-
-<strong>1. ЭЛЕКТРОХИМИЧЕСКАЯ КОРРОЗИЯ (наиболее распространенная):</strong><br>
-   • Причины: карбонизация бетона, хлориды, влага<br>
-   • Признаки: ржавые пятна, отслоение защитного слоя<br>
-   • Скорость: 0.1-0.2 мм/год (в агрессивной среде до 1 мм/год)<br><br>
-
-<strong>2. ХИМИЧЕСКАЯ КОРРОЗИЯ:</strong><br>
-   • Воздействие кислот, щелочей, солей<br>
-   • Коррозия под напряжением<br><br>
-
-<strong>3. БИОЛОГИЧЕСКАЯ КОРРОЗИЯ:</strong><br>
-   • Воздействие микроорганизмов<br>
-   • В условиях высокой влажности<br><br>
-
-<strong>🔍 Степени поражения коррозией:</strong><br><br>
-
-<strong>КРИТИЧЕСКАЯ (требует немедленного усиления):</strong><br>
-• Потеря сечения арматуры > 10%<br>
-• Оголение арматуры на участках > 50 см²<br>
-• Расслоение продуктов коррозии<br>
-• Снижение несущей способности > 15%<br><br>
-
-<strong>ЗНАЧИТЕЛЬНАЯ (требует устранения):</strong><br>
-• Потеря сечения 5-10%<br>
-• Видимая коррозия с отслоением защитного слоя<br>
-• Площадь повреждения 20-50 см²<br><br>
-
-<strong>НЕЗНАЧИТЕЛЬНАЯ (мониторинг):</strong><br>
-• Потеря сечения < 5%<br>
-• Поверхностная коррозия без потери защитного слоя<br>
-• Локальные пятна ржавчины<br><br>
-
-<strong>🛠️ Технология устранения коррозии:</strong><br><br>
-
-<strong>Этап 1. Подготовка:</strong><br>
-1. Удаление разрушенного бетона до оголения арматуры + 20 мм<br>
-2. Очистка арматуры от ржавчины (пескоструйная обработка, щетки)<br>
-3. Оценка остаточного сечения арматуры<br><br>
-
-<strong>Этап 2. Защита арматуры:</strong><br>
-1. Обезжиривание арматуры растворителем<br>
-2. Нанесение преобразователя ржавчины (если требуется)<br>
-3. Грунтование антикоррозийным составом в 2 слоя:<br>
-   • Цинконаполненные грунты (толщина 60-80 мкм)<br>
-   • Эпоксидные грунты (толщина 80-120 мкм)<br>
-4. Время высыхания: 24 часа при +20°C<br><br>
-
-<strong>Этап 3. Усиление (при необходимости):</strong><br>
-При потере сечения > 10%:<br>
-• Приварка дополнительных стержней арматуры<br>
-• Установка хомутов усиления<br>
-• Применение композитных материалов (углеволокно)<br><br>
-
-<strong>Этап 4. Восстановление защитного слоя:</strong><br>
-1. Обработка поверхности грунтовкой адгезионной<br>
-2. Нанесение ремонтного состава:<br>
-   • Безусадочные цементные смеси класса R4 (СП 28.13330)<br>
-   • Полимерцементные составы<br>
-   • Минимальная толщина защитного слоя: 25-30 мм<br>
-3. Уход за бетоном (увлажнение 7-14 дней)<br><br>
-
-<strong>📊 Требования к защитному слою (СП 63.13330.2018, п. 10.3):</strong><br><br>
-
-Минимальная толщина защитного слоя:<br>
-• Плиты и стены: 20 мм<br>
-• Балки и колонны: 25 мм<br>
-• Фундаменты (бетон на грунте): 35 мм<br>
-• Фундаменты (с бетонной подготовкой): 30 мм<br>
-• В агрессивной среде: +5 мм к указанным значениям<br><br>
-
-<strong>🔬 Контроль качества восстановления:</strong><br>
-1. Адгезия ремонтного слоя: ≥ 1.5 МПа (метод отрыва)<br>
-2. Прочность на сжатие: ≥ прочности основного бетона<br>
-3. Водонепроницаемость: W6-W8<br>
-4. Морозостойкость: F100-F150<br><br>
-
-<strong>⚠️ Профилактические мероприятия:</strong><br>
-• Гидрофобизация поверхности бетона<br>
-• Нанесение защитных покрытий (эпоксидные, полиуретановые)<br>
-• Катодная защита (для особо ответственных конструкций)<br>
-• Обеспечение вентиляции замкнутых пространств<br>
-• Исключение прямого контакта с грунтом<br><br>
-
-<strong>📞 Нормативные документы:</strong><br>
-• СП 28.13330.2017, раздел 5 "Защита от коррозии арматуры"<br>
-• СП 63.13330.2018, раздел 10 "Конструктивные требования"<br>
-• ГОСТ 31384 "Защита бетонных и железобетонных конструкций от коррозии"<br>
-• Пособие по защите от коррозии бетонных и железобетонных строительных конструкций""",
-            },
-
-            # Гидроизоляция
-            "гидроизоляция": {
-                "keywords": ["гидроизоляция", "влага", "протечка", "фундамент", "подвал", "waterproofing"],
-                "regulations": ["СП 28.13330.2017", "СП 22.13330.2016"],
-                "detailed_response": """<strong>ГИДРОИЗОЛЯЦИЯ СТРОИТЕЛЬНЫХ КОНСТРУКЦИЙ</strong><br><br>
-
-<strong>📋 СП 28.13330.2017 "Защита строительных конструкций от коррозии"</strong><br>
-<strong>СП 22.13330.2016 "Основания зданий и сооружений"</strong><br><br>
-
-<strong>🏗️ ТИПЫ ГИДРОИЗОЛЯЦИИ ФУНДАМЕНТОВ:</strong><br><br>
-
-<strong>1. ОБМАЗОЧНАЯ ГИДРОИЗОЛЯЦИЯ (раздел 7.3):</strong><br><br>
-
-<strong>Битумная мастика:</strong><br>
-• Количество слоев: минимум 2<br>
-• Толщина каждого слоя: 1.5-2 мм<br>
-• Общая толщина: 3-4 мм<br>
-• Расход: 3-4 кг/м² за 2 слоя<br>
-• Температура нанесения: +5°C...+30°C<br>
-• Применение: при УГВ ниже подошвы фундамента<br><br>
-
-<strong>Полимерно-битумная мастика:</strong><br>
-• Повышенная эластичность<br>
-• Срок службы: до 25 лет<br>
-• Применение при деформациях до 200%<br><br>
-
-<strong>Цементно-полимерная обмазка:</strong><br>
-• Толщина: 3-5 мм в 2 слоя<br>
-• Расход: 3-4 кг/м²<br>
-• Паропроницаемая<br>
-• Можно наносить на влажную поверхность<br><br>
-
-<strong>2. ОКЛЕЕЧНАЯ ГИДРОИЗОЛЯЦИЯ (раздел 7.4):</strong><br><br>
-
-<strong>Рулонные материалы:</strong><br>
-• Количество слоев: не менее 2<br>
-• Нахлест полотен: 100 мм<br>
-• Нахлест в торцах: 150 мм<br>
-• Высота заведения на стены: выше УГВ + 500 мм<br><br>
-
-<strong>Виды материалов:</strong><br>
-• Наплавляемые (Технониколь, Бикрост): срок службы 15-25 лет<br>
-• Самоклеящиеся (Барьер): срок службы 20-30 лет<br>
-• ПВХ-мембраны: срок службы 30-50 лет<br><br>
-
-<strong>3. ПРОНИКАЮЩАЯ ГИДРОИЗОЛЯЦИЯ:</strong><br><br>
-
-<strong>Принцип действия:</strong><br>
-• Проникновение в поры бетона на глубину 150-400 мм<br>
-• Кристаллизация в капиллярах<br>
-• Самозалечивание трещин до 0.4 мм<br><br>
-
-<strong>Применение:</strong><br>
-• При наличии грунтовых вод<br>
-• Для ремонта существующих конструкций<br>
-• Изнутри подвалов<br><br>
-
-<strong>Расход:</strong><br>
-• Пенетрон: 0.8-1.0 кг/м² в 2 слоя<br>
-• Лахта: 1.5 кг/м²<br>
-• Кальматрон: 1.0 кг/м²<br><br>
-
-<strong>4. ДРЕНАЖНАЯ СИСТЕМА (СП 22.13330, п. 8.13):</strong><br><br>
-
-<strong>Обязательна при:</strong><br>
-• УГВ выше подошвы фундамента<br>
-• Эксплуатируемых подвалах<br>
-• Глинистых грунтах с плохой водопроницаемостью<br><br>
-
-<strong>Конструкция пристенного дренажа:</strong><br>
-1. Дренажные трубы Ø110-160 мм с перфорацией<br>
-2. Уклон труб: минимум 0.002 (2 мм на 1 м)<br>
-3. Обсыпка щебнем фракции 20-40 мм (толщина 200 мм)<br>
-4. Геотекстиль (плотность 200 г/м²)<br>
-5. Глубина залегания: на 300-500 мм ниже подошвы<br>
-6. Отступ от стены: 0.5-1.0 м<br>
-7. Смотровые колодцы: через каждые 10-15 м<br><br>
-
-<strong>📊 ТЕХНОЛОГИЯ УСТРОЙСТВА ГИДРОИЗОЛЯЦИИ:</strong><br><br>
-
-<strong>ЭТАП 1. Подготовка поверхности:</strong><br>
-1. Очистка от грязи, пыли, масел<br>
-2. Удаление острых выступов (срубка > 5 мм)<br>
-3. Заделка раковин и трещин ремонтным составом<br>
-4. Скругление внутренних углов (радиус 50 мм)<br>
-5. Выравнивание поверхности (отклонения не более 5 мм на 2 м)<br>
-6. Высушивание (влажность < 4% для битумных материалов)<br><br>
-
-<strong>ЭТАП 2. Грунтование:</strong><br>
-• Битумный праймер: расход 0.3-0.4 л/м²<br>
-• Время высыхания: 4-24 часа<br>
-• Обязательно для обмазочной и оклеечной гидроизоляции<br><br>
-
-<strong>ЭТАП 3. Нанесение гидроизоляции:</strong><br><br>
-
-<strong>Для обмазочной:</strong><br>
-• Первый слой: вертикально<br>
-• Второй слой: горизонтально (перпендикулярно первому)<br>
-• Время между слоями: 4-8 часов<br><br>
-
-<strong>Для оклеечной:</strong><br>
-• Раскатка рулонов снизу вверх<br>
-• Прогрев горелкой до оплавления индикатора<br>
-• Прикатка валиком (удаление пузырей)<br>
-• Контроль герметичности швов<br><br>
-
-<strong>ЭТАП 4. Защита гидроизоляции:</strong><br>
-1. Прижимная стенка из кирпича (120 мм)<br>
-2. Профилированная мембрана (Плантер, Тефонд)<br>
-3. Утеплитель ЭППС (50-100 мм)<br>
-4. Обратная засыпка песком с послойным уплотнением<br><br>
-
-<strong>⚠️ КРИТИЧЕСКИЕ ОШИБКИ:</strong><br>
-❌ Нанесение на влажную поверхность (битумная)<br>
-❌ Отсутствие грунтовки<br>
-❌ Недостаточное количество слоев<br>
-❌ Механические повреждения при обратной засыпке<br>
-❌ Отсутствие защиты гидроизоляции<br>
-❌ Нарушение технологии в узлах и примыканиях<br><br>
-
-<strong>🔬 КОНТРОЛЬ КАЧЕСТВА:</strong><br><br>
-
-<strong>Визуальный контроль:</strong><br>
-• Отсутствие пропусков и разрывов<br>
-• Герметичность швов<br>
-• Отсутствие вздутий и складок<br><br>
-
-<strong>Инструментальный контроль:</strong><br>
-• Толщина слоя (толщиномер)<br>
-• Адгезия к основанию (не менее 0.3 МПа)<br>
-• Водонепроницаемость (испытание напором воды)<br><br>
-
-<strong>📐 РАСЧЕТ МАТЕРИАЛОВ (пример для фундамента 10×10 м, H=3 м):</strong><br><br>
-
-Площадь гидроизоляции:<br>
-S = (10+10)×2 × 3 + 10×10 = 220 м²<br><br>
-
-<strong>Битумная мастика (2 слоя):</strong><br>
-220 м² × 4 кг/м² = 880 кг (18 ведер по 50 кг)<br>
-Стоимость: ~55,000 руб<br><br>
-
-<strong>Рулонная (2 слоя):</strong><br>
-220 м² × 2 слоя × 1.15 (запас) = 506 м²<br>
-51 рулон по 10 м²<br>
-Стоимость: ~80,000 руб<br><br>
-
-<strong>Проникающая:</strong><br>
-220 м² × 1 кг/м² = 220 кг<br>
-Стоимость: ~66,000 руб<br><br>
-
-<strong>📞 НОРМАТИВНЫЕ ДОКУМЕНТЫ:</strong><br>
-• СП 28.13330.2017, раздел 7 "Защита от грунтовой влаги"<br>
-• СП 22.13330.2016, раздел 8 "Проектирование защиты от подземных вод"<br>
-• СП 71.13330.2017 "Изоляционные и отделочные покрытия"<br>
-• ГОСТ 30693 "Мастики кровельные и гидроизоляционные"<br>
-• Пособие по проектированию гидроизоляции подземных частей зданий""",
-            },
-
-            # Сварочные работы
-            "сварка": {
-                "keywords": ["сварка", "сварочные работы", "швы", "сварной шов", "welding"],
-                "regulations": ["ГОСТ 23055-78", "СНиП 3.03.01-87"],
-                "detailed_response": """<strong>КОНТРОЛЬ КАЧЕСТВА СВАРОЧНЫХ РАБОТ</strong><br><br>
-
-<strong>📋 ГОСТ 23055-78 "Контроль неразрушающий. Сварка металлов плавлением"</strong><br>
-<strong>СНиП 3.03.01-87 "Несущие и ограждающие конструкции"</strong><br><br>
-
-<strong>🔍 МЕТОДЫ КОНТРОЛЯ СВАРНЫХ ШВОВ:</strong><br><br>
-
-<strong>1. ВИЗУАЛЬНЫЙ И ИЗМЕРИТЕЛЬНЫЙ КОНТРОЛЬ (ВИК) - 100% швов:</strong><br><br>
-
-<strong>Инструменты:</strong><br>
-• Лупа с увеличением ×7-×10<br>
-• Штангенциркуль (точность 0.1 мм)<br>
-• Шаблоны сварщика (УШС-2, УШС-3)<br>
-• Угломер<br>
-• Линейка измерительная<br><br>
-
-<strong>Проверяемые параметры:</strong><br>
-• Геометрические размеры шва<br>
-• Наличие поверхностных дефектов<br>
-• Качество зачистки<br>
-• Соответствие проектной документации<br><br>
-
-<strong>Допустимые размеры катетов (ГОСТ 5264):</strong><br>
-• Для металла толщиной до 4 мм: катет 3-4 мм<br>
-• Для металла 5-10 мм: катет 5-7 мм<br>
-• Для металла 11-16 мм: катет 8-10 мм<br>
-• Для металла более 16 мм: катет 10-12 мм<br><br>
-
-<strong>2. УЛЬТРАЗВУКОВОЙ КОНТРОЛЬ (УЗК) - для ответственных конструкций:</strong><br><br>
-
-<strong>Применяется для:</strong><br>
-• Стыковых швов толщиной более 8 мм<br>
-• Сварных соединений несущих конструкций<br>
-• Швов, работающих под давлением<br>
-• Швов в сейсмических районах<br><br>
-
-<strong>Объем контроля:</strong><br>
-• Особо ответственные конструкции: 100%<br>
-• Ответственные: 25%<br>
-• Обычные: 10%<br><br>
-
-<strong>Оборудование:</strong><br>
-• Дефектоскоп УД2-70, УД2-12<br>
-• Преобразователи наклонные (угол 40°, 50°, 65°, 70°)<br>
-• Контактная жидкость (глицерин, масло)<br><br>
-
-<strong>3. РАДИОГРАФИЧЕСКИЙ КОНТРОЛЬ (РК) - для особо ответственных швов:</strong><br><br>
-
-<strong>Применяется для:</strong>
-<br>
-• Сосудов, работающих под давлением<br>
-• Магистральных трубопроводов<br>
-• Конструкций АЭС и ГЭС<br>
-• Мостовых конструкций<br><br>
-
-<strong>Методы:</strong><br>
-• Рентгеновский контроль (толщина до 60 мм)<br>
-• Гамма-дефектоскопия (толщина 10-100 мм)<br><br>
-
-<strong>4. КАПИЛЛЯРНЫЙ КОНТРОЛЬ (для обнаружения поверхностных дефектов):</strong><br><br>
-
-<strong>Этапы:</strong><br>
-1. Очистка поверхности<br>
-2. Нанесение проникающей жидкости (пенетранта)<br>
-3. Удаление избытка пенетранта<br>
-4. Нанесение проявителя<br>
-5. Визуальный осмотр индикаторных следов<br><br>
-
-<strong>❌ НЕДОПУСТИМЫЕ ДЕФЕКТЫ СВАРНЫХ ШВОВ:</strong><br><br>
-
-<strong>1. ТРЕЩИНЫ (любых размеров и направлений):</strong><br>
-• Продольные трещины<br>
-• Поперечные трещины<br>
-• Радиальные трещины (звездочки)<br>
-• Разветвленные трещины<br>
-<strong>→ Шов подлежит полной переварке</strong><br><br>
-
-<strong>2. НЕПРОВАРЫ:</strong><br>
-• Отсутствие сплавления между слоями<br>
-• Несплавление кромок<br>
-• Непровар в корне шва<br>
-<strong>→ Допустимая суммарная длина: не более 25 мм на 1 м шва</strong><br>
-<strong>→ При превышении - переварка участка</strong><br><br>
-
-<strong>3. ПОРЫ И ГАЗОВЫЕ ВКЛЮЧЕНИЯ:</strong><br>
-• Одиночные поры Ø > 3 мм - недопустимы<br>
-• Скопление пор: не более 3 шт на 100 мм шва<br>
-• Цепочка пор вдоль шва - недопустима<br>
-<strong>→ Зачистка + подварка</strong><br><br>
-
-<strong>4. ПОДРЕЗЫ:</strong><br>
-• Глубина подреза > 0.5 мм - недопустимо для ответственных конструкций<br>
-• Глубина > 1 мм - недопустимо для всех конструкций<br>
-• Суммарная длина подрезов > 100 мм на 1 м - недопустимо<br>
-<strong>→ Зашлифовка + подварка</strong><br><br>
-
-<strong>5. НАПЛЫВЫ И НАТЕКИ:</strong><br>
-• Наплывы высотой > 2 мм<br>
-• Натеки на вертикальных поверхностях<br>
-<strong>→ Механическая зачистка</strong><br><br>
-
-<strong>6. ШЛАКОВЫЕ ВКЛЮЧЕНИЯ:</strong><br>
-• Отдельные включения длиной > 3 мм<br>
-• Суммарная длина > 20 мм на 100 мм шва<br>
-<strong>→ Выборка + подварка</strong><br><br>
-
-<strong>📋 ТРЕБОВАНИЯ К СВАРЩИКАМ:</strong><br><br>
-
-<strong>Квалификация (НАКС):</strong><br>
-• Сварщик должен иметь аттестацию НАКС<br>
-• Допуск к работам соответствующей группы<br>
-• Периодическая переаттестация (каждые 2 года)<br><br>
-
-<strong>Клеймение швов:</strong><br>
-• Каждый сварщик имеет личное клеймо<br>
-• Клеймо ставится в начале и конце шва<br>
-• Позволяет отследить качество работы<br><br>
-
-<strong>🔧 ТЕХНОЛОГИЯ КОНТРОЛЯ СВАРНЫХ ШВОВ:</strong><br><br>
-
-<strong>ЭТАП 1. Входной контроль:</strong><br>
-1. Проверка сертификатов на электроды/проволоку<br>
-2. Проверка аттестации сварщиков<br>
-3. Проверка сварочного оборудования<br>
-4. Контроль подготовки кромок<br><br>
-
-<strong>ЭТАП 2. Операционный контроль:</strong><br>
-1. Контроль режимов сварки (ток, напряжение, скорость)<br>
-2. Контроль последовательности наложения слоев<br>
-3. Контроль межслойной зачистки<br>
-4. Контроль температуры предварительного подогрева<br><br>
-
-<strong>ЭТАП 3. Приемочный контроль:</strong><br>
-1. ВИК - 100% швов<br>
-2. УЗК - согласно проекту (10-100%)<br>
-3. РК - для особо ответственных швов<br>
-4. Механические испытания контрольных образцов<br><br>
-
-<strong>📊 АКТЫ ОСВИДЕТЕЛЬСТВОВАНИЯ:</strong><br><br>
-
-<strong>Обязательные документы:</strong><br>
-• Журнал сварочных работ<br>
-• Акты на скрытые работы (сварка арматуры)<br>
-• Паспорта и сертификаты на сварочные материалы<br>
-• Протоколы УЗК/РК<br>
-• Удостоверения сварщиков<br>
-• Заключение о качестве сварных соединений<br><br>
-
-<strong>🎯 КРИТЕРИИ ПРИЕМКИ (ГОСТ 23055-78, п. 4.1):</strong><br><br>
-
-<strong>Сварные соединения принимаются при соблюдении:</strong><br>
-1. Отсутствие недопустимых дефектов<br>
-2. Соответствие геометрических размеров швов<br>
-3. Наличие всех обязательных документов<br>
-4. Положительные результаты неразрушающего контроля<br>
-5. Соответствие внешнего вида требованиям проекта<br><br>
-
-<strong>⚠️ ОСОБЫЕ ТРЕБОВАНИЯ:</strong><br><br>
-
-<strong>Для сварки арматуры (СНиП 3.03.01-87):</strong><br>
-• Арматура класса А500С и выше - только ванная сварка<br>
-• Длина нахлеста: 10 диаметров арматуры<br>
-• Предварительный подогрев при Ø > 25 мм<br>
-• Контроль прочности на отрыв (испытание образцов)<br><br>
-
-<strong>Для монтажных сварных соединений:</strong><br>
-• Сварка при температуре ниже -30°C запрещена<br>
-• При температуре -15...-30°C обязателен предварительный подогрев<br>
-• Защита места сварки от атмосферных осадков<br>
-• Сушка электродов согласно инструкции производителя<br><br>
-
-<strong>📞 НОРМАТИВНЫЕ ДОКУМЕНТЫ:</strong><br>
-• ГОСТ 23055-78 "Контроль неразрушающий. Сварка металлов"<br>
-• ГОСТ 5264-80 "Ручная дуговая сварка. Соединения сварные"<br>
-• СП 16.13330.2017 "Стальные конструкции"<br>
-• СНиП 3.03.01-87, раздел 3 "Арматурные работы"<br>
-• РД 03-606-03 "Инструкция по визуальному и измерительному контролю"<br>
-• ПБ 03-273-99 "Правила аттестации сварщиков и специалистов сварочного производства"""
-            },
-
-            # Фундаменты и основания
-            "фундамент": {
-                "keywords": ["фундамент", "основание", "осадка", "деформация фундамента", "foundation"],
-                "regulations": ["СП 22.13330.2016", "СП 50-101-2004"],
-                "detailed_response": """<strong>ОСНОВАНИЯ И ФУНДАМЕНТЫ ЗДАНИЙ</strong><br><br>
-
-<strong>📋 СП 22.13330.2016 "Основания зданий и сооружений"</strong><br>
-<strong>СП 50-101-2004 "Проектирование и устройство оснований и фундаментов"</strong><br><br>
-
-<strong>📊 ДОПУСТИМЫЕ ДЕФОРМАЦИИ ОСНОВАНИЙ (Приложение Д):</strong><br><br>
-
-<strong>1. ОСАДКА ФУНДАМЕНТОВ:</strong><br><br>
-
-<strong>Для многоэтажных зданий с полным каркасом:</strong><br>
-• Максимальная осадка: <strong>120 мм</strong><br>
-• Относительная разность осадок: <strong>0.002</strong> (L/500)<br>
-• Средняя осадка: 80-100 мм<br><br>
-
-<strong>Для зданий с несущими стенами:</strong><br>
-• Кирпичные здания: максимальная осадка <strong>100 мм</strong><br>
-• Крупнопанельные здания: <strong>80 мм</strong><br>
-• Относительная разность: <strong>0.0005-0.001</strong> (L/1000-L/2000)<br><br>
-
-<strong>Для производственных зданий:</strong><br>
-• Одноэтажные с мостовыми кранами: <strong>150 мм</strong><br>
-• Без кранов: <strong>200 мм</strong><br>
-• Относительная разность: <strong>0.003</strong><br><br>
-
-<strong>2. КРЕН ФУНДАМЕНТОВ:</strong><br><br>
-
-<strong>Допустимые значения крена i:</strong><br>
-• Многоэтажные здания (h/L < 1.5): <strong>i ≤ 0.004</strong> (4 мм на 1 м)<br>
-• Высотные сооружения (h/L ≥ 4): <strong>i ≤ 0.001</strong><br>
-• Дымовые трубы: <strong>i ≤ 0.004</strong><br>
-• Резервуары: <strong>i ≤ 0.003</strong><br>
-• Силосы: <strong>i ≤ 0.002</strong><br><br>
-
-<strong>3. ПРОГИБ, ВЫГИБ, ГОРИЗОНТАЛЬНОЕ СМЕЩЕНИЕ:</strong><br>
-• Относительный прогиб/выгиб: <strong>L/300 - L/500</strong><br>
-• Горизонтальное смещение: <strong>0.001h</strong> (где h - высота здания)<br><br>
-
-<strong>🏗️ ТИПЫ ФУНДАМЕНТОВ И ТРЕБОВАНИЯ:</strong><br><br>
-
-<strong>1. ЛЕНТОЧНЫЕ ФУНДАМЕНТЫ:</strong><br><br>
-
-<strong>Минимальная глубина заложения (п. 5.5.3):</strong><br>
-• Отапливаемые здания: <strong>0.5 м</strong> от планировочной отметки<br>
-• Неотапливаемые: ниже глубины промерзания<br>
-• Для Москвы: 1.4-1.6 м (нормативная глубина промерзания 1.4 м)<br>
-• Для СПб: 1.5-1.7 м<br>
-• Для Екатеринбурга: 1.8-2.0 м<br><br>
-
-<strong>Ширина подошвы:</strong><br>
-• Минимальная: 300 мм (для ненесущих стен)<br>
-• Для кирпичных стен: 500-800 мм<br>
-• Для тяжелых зданий: 1000-1600 мм<br>
-• Расчет: b = N / (R × L), где N - нагрузка, R - расчетное сопротивление грунта<br><br>
-
-<strong>Армирование:</strong><br>
-• Продольная арматура: Ø12-16 мм, класс А400<br>
-• Поперечная: Ø8-10 мм<br>
-• Защитный слой бетона: 35-50 мм<br>
-• Сетки в 2 ряда (верхний и нижний пояс)<br><br>
-
-<strong>2. ПЛИТНЫЕ ФУНДАМЕНТЫ:</strong><br><br>
-
-<strong>Толщина плиты:</strong><br>
-• Минимальная: 200 мм<br>
-• Для жилых зданий 3-5 этажей: 300-400 мм<br>
-• Для высотных зданий: 600-1200 мм<br>
-• Расчет: h = √(M×6 / (b×Rb)), где M - изгибающий момент<br><br>
-
-<strong>Армирование:</strong><br>
-• Процент армирования: 0.3-0.6% от площади сечения<br>
-• Диаметр стержней: Ø12-25 мм<br>
-• Шаг стержней: 150-200 мм<br>
-• Двойное армирование (верх и низ)<br><br>
-
-<strong>3. СВАЙНЫЕ ФУНДАМЕНТЫ (СП 50-101-2004, раздел 7):</strong><br><br>
-
-<strong>Минимальное количество свай:</strong><br>
-• Под отдельную колонну: <strong>1 свая</strong> (с закреплением от смещения)<br>
-• В ростверке: <strong>минимум 3 сваи</strong><br>
-• Рекомендуется: 4-6 свай для равномерного распределения нагрузки<br><br>
-
-<strong>Расстояние между сваями:</strong><br>
-• Минимальное: <strong>3d</strong> (где d - диаметр сваи)<br>
-• Оптимальное: <strong>3-6d</strong><br>
-• Максимальное: <strong>8-12d</strong><br>
-• Для свай Ø300 мм: расстояние 900-1800 мм<br><br>
-
-<strong>Несущая способность свай:</strong><br>
-• Расчетная нагрузка на 1 сваю: 30-100 тонн<br>
-• Забивные сваи сечением 300×300 мм: 50-70 тонн<br>
-• Буронабивные Ø400 мм: 60-100 тонн<br>
-• Винтовые сваи Ø108 мм: 5-8 тонн<br><br>
-
-<strong>Контроль несущей способности (п. 8.4):</strong><br>
-• Статические испытания: <strong>1% свай, но не менее 3 штук</strong><br>
-• Динамические испытания: 3-5% свай<br>
-• Сплошное низкочастотное зондирование (для буронабивных)<br>
-• УЗК бетона ствола сваи<br><br>
-
-<strong>4. РОСТВЕРК (п. 7.5):</strong><br><br>
-
-<strong>Минимальная высота:</strong><br>
-• Низкий ростверк (в грунте): 300 мм<br>
-• Высокий ростверк (над грунтом): 400-600 мм<br>
-• Зазор между подошвой и грунтом: 100-150 мм<br><br>
-
-<strong>Армирование ростверка (п. 7.5.12):</strong><br>
-• Процент армирования: <strong>не менее 0.05%</strong> от площади сечения<br>
-• Продольная арматура: Ø16-25 мм<br>
-• Поперечная (хомуты): Ø8-12 мм<br>
-• Шаг хомутов: 200-300 мм<br>
-• Защитный слой: 35-50 мм<br><br>
-
-<strong>🔬 ОБСЛЕДОВАНИЕ И КОНТРОЛЬ:</strong><br><br>
-
-<strong>1. ПРИЗНАКИ НЕДОПУСТИМЫХ ДЕФОРМАЦИЙ:</strong><br><br>
-
-<strong>Критические (требуют немедленного усиления):</strong><br>
-• Крен здания > 0.004 (4 мм на 1 м высоты)<br>
-• Трещины в стенах шириной > 5 мм<br>
-• Разрушение отделки, вываливание кирпича<br>
-• Заклинивание дверей и окон<br>
-• Видимое отклонение стен от вертикали<br>
-• Разрывы коммуникаций<br><br>
-
-<strong>Значительные (требуют обследования):</strong><br>
-• Трещины 2-5 мм<br>
-• Локальные просадки полов<br>
-• Нарушение плотности примыканий<br>
-• Появление новых трещин<br><br>
-
-<strong>2. МЕТОДЫ ОПРЕДЕЛЕНИЯ ОСАДОК:</strong><br><br>
-
-<strong>Геодезические наблюдения:</strong><br>
-• Установка осадочных марок на фундаменте<br>
-• Периодичность измерений: каждые 3-6 месяцев<br>
-• Точность измерений: ±0.5 мм<br>
-• Контрольный репер вне зоны деформаций<br><br>
-
-<strong>Инструментальные методы:</strong><br>
-• Георадарное обследование<br>
-• Электротомография<br>
-• Статическое зондирование грунта<br>
-• Отбор образцов грунта (бурение скважин)<br><br>
-
-<strong>🛠️ МЕТОДЫ УСИЛЕНИЯ ФУНДАМЕНТОВ:</strong><br><br>
-
-<strong>1. УШИРЕНИЕ ПОДОШВЫ:</strong><br>
-• Откопка существующего фундамента<br>
-• Установка дополнительных блоков или монолитное бетонирование<br>
-• Анкеровка к существующей конструкции<br>
-• Увеличение площади опирания на 30-100%<br><br>
-
-<strong>2. УСИЛЕНИЕ СВАЯМИ:</strong><br>
-• Устройство буроинъекционных свай через существующий фундамент<br>
-• Диаметр: 150-250 мм<br>
-• Длина: до надежного грунта (5-15 м)<br>
-• Шаг свай: 1.5-3.0 м<br><br>
-
-<strong>3. ЦЕМЕНТАЦИЯ И ИНЪЕКТИРОВАНИЕ:</strong><br>
-• Нагнетание цементного раствора в грунт<br>
-• Силикатизация слабых грунтов<br>
-• Смолизация (инъекция смол)<br>
-• Давление нагнетания: 0.2-0.6 МПа<br><br>
-
-<strong>4. УСТРОЙСТВО ОБОЙМ:</strong><br>
-• Железобетонная обойма вокруг существующего фундамента<br>
-• Толщина: 100-200 мм<br>
-• Армирование: сетки Ø10-12 мм<br>
-• Анкеровка к существующему фундаменту<br><br>
-
-<strong>⚠️ ПРОФИЛАКТИКА ДЕФОРМАЦИЙ:</strong><br><br>
-
-<strong>На этапе проектирования:</strong><br>
-• Качественные инженерно-геологические изыскания<br>
-• Учет прогноза осадок на стадии проектирования<br>
-• Устройство деформационных швов (через 30-40 м)<br>
-• Равномерное распределение нагрузок<br><br>
-
-<strong>На этапе строительства:</strong><br>
-• Контроль качества бетонных работ<br>
-• Соблюдение технологических перерывов<br>
-• Недопущение замачивания грунтов<br>
-• Своевременное устройство отмостки<br><br>
-
-<strong>При эксплуатации:</strong><br>
-• Организация отвода поверхностных вод<br>
-• Предотвращение протечек водопровода<br>
-• Контроль состояния дренажной системы<br>
-• Периодические геодезические наблюдения<br><br>
-
-<strong>📐 ПРИМЕР РАСЧЕТА ОСАДКИ:</strong><br><br>
-
-<strong>Исходные данные:</strong><br>
-• Нагрузка на фундамент: N = 500 кН<br>
-• Ширина подошвы: b = 1.5 м<br>
-• Глубина заложения: d = 1.8 м<br>
-• Грунт: суглинок, E = 18 МПа<br><br>
-
-<strong>Расчет осадки методом послойного суммирования:</strong><br>
-
-s = β × Σ(σzp,i × hi / Ei)<br><br>
-
-где:<br>
-• β = 0.8 - коэффициент<br>
-• σzp,i - дополнительное напряжение в i-том слое<br>
-• hi - толщина i-того слоя (0.4 м)<br>
-• Ei - модуль деформации i-того слоя<br><br>
-
-<strong>Результат:</strong><br>
-s = 42 мм < 120 мм (допустимо для жилого здания)<br><br>
-
-<strong>📞 НОРМАТИВНЫЕ ДОКУМЕНТЫ:</strong><br>
-• СП 22.13330.2016 "Основания зданий и сооружений"<br>
-• СП 50-101-2004 "Проектирование и устройство оснований и фундаментов"<br>
-• СП 24.13330.2011 "Свайные фундаменты"<br>
-• ГОСТ 25100-2011 "Грунты. Классификация"<br>
-• Пособие по проектированию оснований зданий и сооружений""",
-            },
-
-            # Бетонные работы
-            "бетон": {
-                "keywords": ["бетон", "бетонирование", "прочность бетона", "класс бетона", "concrete"],
-                "regulations": ["СП 63.13330.2018", "ГОСТ 10180-2012", "СНиП 3.03.01-87"],
-                "detailed_response": """<strong>БЕТОННЫЕ РАБОТЫ И КОНТРОЛЬ КАЧЕСТВА БЕТОНА</strong><br><br>
-
-<strong>📋 СП 63.13330.2018 "Бетонные и железобетонные конструкции"</strong><br>
-<strong>ГОСТ 10180-2012 "Бетоны. Методы определения прочности"</strong><br>
-<strong>СНиП 3.03.01-87 "Несущие и ограждающие конструкции"</strong><br><br>
-
-<strong>📊 КЛАССЫ БЕТОНА И ПРИМЕНЕНИЕ:</strong><br><br>
-
-<strong>По прочности на сжатие (СП 63.13330, п. 6.1.2):</strong><br><br>
-
-<strong>B7.5-B12.5 (M100-M150):</strong><br>
-• Подготовка под фундаменты (подбетонка)<br>
-• Стяжки полов<br>
-• Дорожки, отмостки<br>
-• Ненесущие конструкции<br><br>
-
-<strong>B15 (M200):</strong><br>
-• <strong>Минимальный класс для несущих конструкций</strong><br>
-• Ленточные фундаменты малоэтажных зданий<br>
-• Лестничные площадки<br>
-• Перегородки<br><br>
-
-<strong>B20-B22.5 (M250-M300):</strong><br>
-• Плитные фундаменты<br>
-• Ленточные фундаменты многоэтажных зданий<br>
-• Ростверки<br>
-• Монолитные перекрытия<br>
-• Колонны малоэтажных зданий<br><br>
-
-<strong>B25-B30 (M350-M400):</strong><br>
-• Колонны высотных зданий<br>
-• Балки большой длины<br>
-• Чаши бассейнов<br>
-• Монолитные конструкции с высокими нагрузками<br><br>
-
-<strong>B35-B60 (M450-M800):</strong><br>
-• Несущие конструкции высотных зданий<br>
-• Мосты, путепроводы<br>
-• Гидротехнические сооружения<br>
-• Специальные конструкции<br><br>
-
-<strong>🔬 КОНТРОЛЬ КАЧЕСТВА БЕТОНА:</strong><br><br>
-
-<strong>1. ОТБОР ОБРАЗЦОВ (ГОСТ 10180, п. 5.1):</strong><br><br>
-
-<strong>Периодичность отбора:</strong><br>
-• Из каждой партии бетона объемом <strong>не более 50 м³</strong><br>
-• Минимум 1 серия образцов в смену<br>
-• При изменении состава бетона - новая серия<br>
-• Для ответственных конструкций - каждые 25 м³<br><br>
-
-<strong>Количество образцов в серии:</strong><br>
-• Минимум <strong>3 образца-куба</strong> размером 150×150×150 мм<br>
-• Для высокопрочных бетонов (>B30): размер 100×100×100 мм<br>
-• Дополнительно 3 образца для контроля прочности в 7 суток<br><br>
-
-<strong>Маркировка образцов:</strong><br>
-• Дата изготовления<br>
-• Номер партии бетона<br>
-• Место укладки<br>
-• Проектный класс бетона<br>
-• Серийный номер<br><br>
-
-<strong>2. УСЛОВИЯ ХРАНЕНИЯ ОБРАЗЦОВ (п. 6.2):</strong><br><br>
-
-<strong>Нормальные условия твердения:</strong><br>
-• Температура: <strong>20±2°C</strong><br>
-• Относительная влажность: <strong>не менее 95%</strong><br>
-• Первые сутки - в формах<br>
-• Затем - в ванне с водой или во влажной камере<br>
-• Срок твердения: <strong>28 суток</strong> (для определения класса)<br><br>
-
-<strong>Ускоренное твердение (для раннего контроля):</strong><br>
-• Пропаривание при 80-90°C в течение 12-18 часов<br>
-• Позволяет определить прочность в 1-3 суток<br>
-• Коэффициенты пересчета на 28-суточную прочность<br><br>
-
-<strong>3. ИСПЫТАНИЕ ОБРАЗЦОВ (п. 7):</strong><br><br>
-
-<strong>Подготовка к испытанию:</strong><br>
-• Извлечение из воды за 2-4 часа до испытания<br>
-• Протирка поверхности<br>
-• Визуальный осмотр на наличие дефектов<br>
-• Измерение размеров с точностью ±1 мм<br><br>
-
-<strong>Процесс испытания:</strong><br>
-• Установка на пресс (гидравлический, усилие до 3000 кН)<br>
-• Центрирование образца<br>
-• Скорость нагружения: 0.6±0.2 МПа/с<br>
-• Фиксация разрушающей нагрузки<br><br>
-
-<strong>Расчет прочности:</strong><br>
-Rb = P / A<br><br>
-
-где:<br>
-• Rb - прочность на сжатие, МПа<br>
-• P - разрушающая нагрузка, Н<br>
-• A - площадь сжимаемой поверхности, мм²<br><br>
-
-<strong>4. ОПРЕДЕЛЕНИЕ КЛАССА БЕТОНА (п. 4.3):</strong><br><br>
-
-<strong>Класс бетона:</strong><br>
-B = Rbm × (1 - 1.64 × V)<br><br>
-
-где:<br>
-• Rbm - средняя прочность серии образцов<br>
-• V - коэффициент вариации прочности (обычно 0.135)<br>
-• 1.64 - коэффициент обеспеченности 95%<br><br>
-
-<strong>Пример:</strong><br>
-Испытано 3 образца: 27.5, 28.2, 26.8 МПа<br>
-Rbm = (27.5 + 28.2 + 26.8) / 3 = 27.5 МПа<br>
-B = 27.5 × (1 - 1.64 × 0.135) = 27.5 × 0.779 = 21.4 МПа<br>
-<strong>Класс бетона: B20</strong><br><br>
-
-<strong>🏗️ ТЕХНОЛОГИЯ БЕТОНИРОВАНИЯ:</strong><br><br>
-
-<strong>1. ПОДГОТОВКА К БЕТОНИРОВАНИЮ (СНиП 3.03.01, п. 2.60):</strong><br><br>
-
-<strong>Проверка опалубки:</strong><br>
-• Прочность и устойчивость<br>
-• Герметичность стыков<br>
-• Наличие смазки для распалубки<br>
-• Установка закладных деталей<br><br>
-
-<strong>Проверка арматуры:</strong><br>
-• Соответствие проекту (диаметры, шаг, класс)<br>
-• Правильность вязки и сварки<br>
-• Толщина защитного слоя (контроль фиксаторами)<br>
-• Отсутствие загрязнений<br><br>
-
-<strong>2. УКЛАДКА БЕТОННОЙ СМЕСИ (п. 2.64):</strong><br><br>
-
-<strong>Способы укладки:</strong><br>
-• Автобетононасос (высота подачи до 60 м)<br>
-• Бадьи с краном<br>
-• Автобетоносмесители (для фундаментов)<br>
-• Ленточные транспортеры<br><br>
-
-<strong>Правила укладки:</strong><br>
-• Высота свободного падения: <strong>не более 2 м</strong> (иначе расслоение)<br>
-• Укладка горизонтальными слоями толщиной 30-50 см<br>
-• Непрерывность бетонирования (или холодные швы)<br>
-• Время от изготовления до укладки: не более 2 часов<br><br>
-
-<strong>3. УПЛОТНЕНИЕ БЕТОНА (п. 2.71):</strong><br><br>
-
-<strong>Вибрирование:</strong><br>
-• Глубинные вибраторы Ø40-80 мм<br>
-• Частота колебаний: 150-200 Гц<br>
-• Шаг установки: 1.5 радиуса действия (обычно 30-50 см)<br>
-• Погружение в предыдущий слой на 10 см<br>
-• Время вибрирования: 20-40 секунд на одну точку<br>
-• Признак достаточного уплотнения: прекращение осадки, появление цементного молока<br><br>
-
-<strong>Недопустимо:</strong><br>
-❌ Вибрировать более 60 секунд (расслоение)<br>
-❌ Использовать вибратор для перемещения смеси<br>
-❌ Опирать вибратор на арматуру<br><br>
-
-<strong>4. УХОД ЗА БЕТОНОМ (п. 2.75):</strong><br><br>
-
-<strong>Первые 7 суток:</strong><br>
-• Укрытие пленкой или мешковиной<br>
-• Регулярное увлажнение: летом каждые 3 часа, ночью 1 раз<br>
-• Поддержание влажности не менее 90%<br>
-• Защита от прямых солнечных лучей<br><br>
-
-<strong>Первые 28 суток:</strong><br>
-• Недопустима преждевременная загрузка конструкций<br>
-• Запрет на ударные воздействия<br>
-• Контроль набора прочности<br><br>
-
-<strong>5. УСЛОВИЯ БЕТОНИРОВАНИЯ (п. 2.68):</strong><br><br>
-
-<strong>Температурные условия:</strong><br>
-• Оптимальная температура: <strong>+15...+25°C</strong><br>
-• Минимальная для летнего бетонирования: <strong>+5°C</strong><br>
-• Ниже +5°C - зимнее бетонирование (спецмероприятия)<br>
-• Максимальная: +35°C (требуется охлаждение смеси)<br><br>
-
-<strong>Зимнее бетонирование (при t < +5°C):</strong><br>
-• Подогрев воды и заполнителей<br>
-• Применение противоморозных добавок<br>
-• Прогрев бетона (электропрогрев, тепляки)<br>
-• Утепление конструкций<br>
-• Запрет на бетонирование при t < -15°C (без прогрева)<br><br>
-
-<strong>6. РАСПАЛУБКА КОНСТРУКЦИЙ (п. 2.88):</strong><br><br>
-
-<strong>Допускается при достижении прочности:</strong><br><br>
-
-<strong>Вертикальные поверхности (стены, колонны):</strong><br>
-• <strong>0.5 МПа</strong> (1-2 суток летом)<br><br>
-
-<strong>Горизонтальные конструкции (балки, плиты):</strong><br>
-• При пролете до 6 м: <strong>70% проектной прочности</strong><br>
-• При пролете более 6 м: <strong>80% проектной прочности</strong><br>
-• Консоли: <strong>100% проектной прочности</strong><br><br>
-
-<strong>Для бетона B20 (Rb = 20 МПа):</strong><br>
-• 70% = 14 МПа (обычно 10-14 суток)<br>
-• 80% = 16 МПа (обычно 14-18 суток)<br>
-• 100% = 20 МПа (28 суток)<br><br>
-
-<strong>⚠️ ТИПИЧНЫЕ ДЕФЕКТЫ БЕТОННЫХ КОНСТРУКЦИЙ:</strong><br><br>
-
-<strong>1. РАКОВИНЫ И КАВЕРНЫ:</strong><br>
-• Причина: плохое уплотнение, густая арматура<br>
-• Допустимо: глубина до 5 мм, площадь до 1% поверхности<br>
-• Устранение: затирка цементным раствором<br><br>
-
-<strong>2. РАССЛОЕНИЕ БЕТОНА:</strong><br>
-• Причина: избыточное вибрирование, большая высота сброса<br>
-• Признак: вода и цементное молоко на поверхности<br>
-• Устранение: удаление дефектного бетона, перебетонирование<br><br>
-
-<strong>3. ХОЛОДНЫЕ ШВЫ:</strong><br>
-• Причина: большой перерыв в бетонировании (более 4 часов)<br>
-• Требование: подготовка поверхности, обработка грунтовкой<br>
-• Контроль: испытание керна на адгезию<br><br>
-
-<strong>4. ТРЕЩИНЫ УСАДОЧНЫЕ:</strong><br>
-• Причина: быстрое высыхание, отсутствие ухода<br>
-• Профилактика: регулярное увлажнение, укрытие<br>
-• Допустимая ширина: до 0.1 мм для неагрессивной среды<br><br>
-
-<strong>📐 ПРИМЕР РАСЧЕТА ПОТРЕБНОСТИ В БЕТОНЕ:</strong><br><br>
-
-<strong>Для ленточного фундамента:</strong><br>
-• Периметр: 40 м<br>
-• Ширина: 0.4 м<br>
-• Высота: 1.2 м<br><br>
-
-V = 40 × 0.4 × 1.2 = 19.2 м³<br>
-С учетом потерь (+10%): 19.2 × 1.1 = <strong>21.1 м³</strong><br><br>
-
-<strong>Количество автомиксеров (объем 7 м³):</strong><br>
-21.1 / 7 = 3.01 ≈ <strong>4 миксера</strong><br><br>
-
-<strong>Стоимость (условно, M300):</strong><br>
-21.1 м³ × 4500 руб/м³ = <strong>94,950 руб</strong><br><br>
-
-<strong>📞 НОРМАТИВНЫЕ ДОКУМЕНТЫ:</strong><br>
-• СП 63.13330.2018 "Бетонные и железобетонные конструкции"<br>
-• ГОСТ 10180-2012 "Бетоны. Методы определения прочности"<br>
-• ГОСТ 7473-2010 "Смеси бетонные. Технические условия"<br>
-• СНиП 3.03.01-87, раздел 2 "Бетонные работы"<br>
-• Пособие по производству бетонных работ"""
-            },
-
-            # Кровельные работы
-            "кровля": {
-                "keywords": ["кровля", "крыша", "кровельные работы", "протечка крыши", "ремонт кровли", "roof", "roofing"],
-                "regulations": ["СП 17.13330.2017", "СНиП II-26-76"],
-                "detailed_response": """<strong>КРОВЕЛЬНЫЕ РАБОТЫ И УСТРОЙСТВО КРОВЛИ</strong><br><br>
-
-<strong>📋 СП 17.13330.2017 "Кровли"</strong><br>
-<strong>СНиП II-26-76 "Кровли"</strong><br><br>
-
-<strong>🏗️ ТИПЫ КРОВЕЛЬНЫХ ПОКРЫТИЙ:</strong><br><br>
-
-<strong>1. ПЛОСКИЕ КРОВЛИ (уклон до 12°):</strong><br><br>
-
-<strong>Рулонные битумные материалы:</strong><br>
-• Количество слоев: <strong>минимум 4 слоя</strong> (СП 17.13330, п. 5.3.1)<br>
-• При уклоне 0-5%: 4-5 слоев<br>
-• При уклоне 5-10%: 3-4 слоя<br>
-• При уклоне более 10%: 2-3 слоя<br><br>
-
-<strong>Нахлесты полотнищ:</strong><br>
-• Продольный нахлест: <strong>100 мм</strong><br>
-• Поперечный нахлест: <strong>150 мм</strong><br>
-• В местах примыканий: <strong>250 мм</strong><br>
-• Смещение швов между слоями: минимум 300 мм<br><br>
-
-<strong>ПВХ и ТПО мембраны:</strong><br>
-• Количество слоев: <strong>1 слой</strong><br>
-• Толщина мембраны: 1.2-2.0 мм<br>
-• Ширина сварного шва: минимум 20 мм<br>
-• Прочность шва: не менее 80% прочности материала<br>
-• Контроль швов: 100% визуально + 10% ультразвуковым методом<br>
-• Срок службы: 30-50 лет<br><br>
-
-<strong>2. СКАТНЫЕ КРОВЛИ (уклон более 12°):</strong><br><br>
-
-<strong>Металлочерепица:</strong><br>
-• Минимальный уклон: <strong>14°</strong> (п. 5.4.2)<br>
-• Толщина стали: 0.45-0.55 мм<br>
-• Толщина цинкового покрытия: 275 г/м²<br>
-• Шаг обрешетки: 350-400 мм (по профилю)<br>
-• Нахлест по длине: 150-200 мм<br>
-• Крепление: саморезы с EPDM прокладкой, 6-8 шт/м²<br><br>
-
-<strong>Профнастил (фальцевая кровля):</strong><br>
-• Минимальный уклон: <strong>8°</strong><br>
-• Толщина: 0.5-0.7 мм<br>
-• Высота профиля: не менее 20 мм<br>
-• Тип фальца: двойной стоячий фальц (высота 40 мм)<br>
-• Расстояние между фальцами: 500-600 мм<br><br>
-
-<strong>Гибкая черепица (битумная):</strong><br>
-• Минимальный уклон: <strong>12°</strong><br>
-• Толщина гонта: 3-5 мм<br>
-• Подкладочный ковер: обязателен по всей площади при уклоне < 18°<br>
-• Нахлест гонтов: 100-150 мм<br>
-• Крепление: гвозди оцинкованные 30 мм, 4-6 шт/гонт<br><br>
-
-<strong>Керамическая и цементно-песчаная черепица:</strong><br>
-• Минимальный уклон: <strong>22°</strong> (для керамической)<br>
-• Вес: 40-60 кг/м² (керамика), 35-45 кг/м² (цементная)<br>
-• Шаг обрешетки: определяется типом черепицы (300-380 мм)<br>
-• Крепление: каждая 3-я черепица в рядовой зоне<br>
-• В краевых зонах (карнизы, коньки, ребра): каждая черепица<br><br>
-
-<strong>📐 КОНСТРУКЦИЯ КРОВЕЛЬНОГО ПИРОГА:</strong><br><br>
-
-<strong>ДЛЯ ПЛОСКОЙ КРОВЛИ (снизу вверх):</strong><br><br>
-
-<strong>1. Пароизоляция:</strong><br>
-• Полиэтиленовая пленка 200 мкм или битумная пароизоляция<br>
-• Нахлест: 100-150 мм<br>
-• Проклейка швов обязательна<br><br>
-
-<strong>2. Теплоизоляция:</strong><br>
-• Каменная вата плотностью: верхний слой 160-180 кг/м³, нижний 110-130 кг/м³<br>
-• Толщина для Москвы: 150-200 мм (R=4.0-5.0 м²·К/Вт)<br>
-• Укладка в 2 слоя с разбежкой швов<br>
-• Крепление: телескопические дюбели, 2 шт/м² + 4-6 по периметру плит<br><br>
-
-<strong>3. Разделительный слой:</strong><br>
-• Стеклохолст или геотекстиль 100-150 г/м²<br><br>
-
-<strong>4. Цементно-песчаная стяжка (если требуется):</strong><br>
-• Толщина: 40-50 мм<br>
-• Марка бетона: М150-М200<br>
-• Армирование сеткой 100×100 мм, Ø 4 мм<br>
-• Деформационные швы: через каждые 6 м<br><br>
-
-<strong>5. Основной кровельный ковер:</strong><br>
-• 4-5 слоев битумных материалов или<br>
-• 1 слой ПВХ/ТПО мембраны<br><br>
-
-<strong>ДЛЯ СКАТНОЙ КРОВЛИ (снизу вверх):</strong><br><br>
-
-<strong>1. Пароизоляция:</strong><br>
-• Крепится к стропилам изнутри<br>
-• Нахлест 150 мм + проклейка двусторонним скотчем<br><br>
-
-<strong>2. Утеплитель между стропилами:</strong><br>
-• Каменная вата или стекловата<br>
-• Толщина: 200-250 мм для Москвы<br>
-• Плотность: 30-50 кг/м³<br>
-• Укладка с распором (на 10-15 мм шире шага стропил)<br><br>
-
-<strong>3. Ветрозащитная паропроницаемая мембрана:</strong><br>
-• Супердиффузионная мембрана (Sd < 0.1 м)<br>
-• Крепление контробрешеткой 40×50 мм вдоль стропил<br>
-• Провис: 10-20 мм между стропилами<br><br>
-
-<strong>4. Вентиляционный зазор:</strong><br>
-• Высота: минимум 50 мм (контробрешетка)<br>
-• Обеспечивает циркуляцию воздуха от карниза к коньку<br><br>
-
-<strong>5. Обрешетка:</strong><br>
-• Сплошная (фанера, OSB 12 мм) - для гибкой черепицы<br>
-• Разреженная (доска 25×100 мм) - для металлочерепицы, профнастила<br><br>
-
-<strong>6. Кровельное покрытие</strong><br><br>
-
-<strong>⚠️ КРИТИЧЕСКИЕ УЗЛЫ КРОВЛИ:</strong><br><br>
-
-<strong>1. ПРИМЫКАНИЯ К ВЕРТИКАЛЬНЫМ ПОВЕРХНОСТЯМ:</strong><br><br>
-
-<strong>Для плоской кровли:</strong><br>
-• Заведение кровельного ковра на вертикальную поверхность: <strong>минимум 250 мм</strong><br>
-• Устройство галтели (бортика) из раствора радиусом 100 мм<br>
-• Дополнительные слои усиления: 2 слоя на высоту 250 мм<br>
-• Прижимная рейка из металла или дерева<br>
-• Герметизация верха примыкания<br><br>
-
-<strong>Для скатной кровли:</strong><br>
-• Установка планки примыкания<br>
-• Заведение под облицовку на 150 мм минимум<br>
-• Герметизация силиконовым герметиком<br>
-• Нахлест планок: 100 мм<br><br>
-
-<strong>2. ЕНДОВЫ (внутренние углы):</strong><br><br>
-
-<strong>Нижняя ендова:</strong><br>
-• Устанавливается на сплошную обрешетку<br>
-• Ширина: минимум 600 мм (по 300 мм на каждый скат)<br>
-• Нахлест по длине: 200-300 мм<br>
-• Герметизация нахлестов обязательна<br><br>
-
-<strong>Верхняя ендова (декоративная):</strong><br>
-• Устанавливается поверх кровельного покрытия<br>
-• Обрезка кровельного материала на расстоянии 60-100 мм от оси ендовы<br><br>
-
-<strong>3. КОНЕК:</strong><br><br>
-
-<strong>Вентилируемый конек (обязателен для утепленных кровель):</strong><br>
-• Зазор для вентиляции: 50-80 мм<br>
-• Установка вентиляционной ленты (защита от насекомых, птиц)<br>
-• Коньковый элемент с вентиляционными отверстиями<br>
-• Нахлест элементов конька: 100 мм<br>
-• Крепление саморезами с шагом 300 мм<br><br>
-
-<strong>4. КАРНИЗНЫЙ СВЕС:</strong><br><br>
-
-<strong>Требования:</strong><br>
-• Вынос свеса: минимум 400 мм от стены<br>
-• Капельник для отвода воды<br>
-• Вентиляционные продухи (площадь 1/300 площади кровли)<br>
-• Подшивка софитами с перфорацией (для вентиляции)<br>
-• Защита от птиц вентиляционной сеткой<br><br>
-
-<strong>🔬 КОНТРОЛЬ КАЧЕСТВА КРОВЕЛЬНЫХ РАБОТ:</strong><br><br>
-
-<strong>ЭТАП 1. Подготовка основания:</strong><br>
-1. Проверка ровности основания (отклонение не более 5 мм на 2 м)<br>
-2. Проверка уклонов (уклонометром)<br>
-3. Влажность основания: не более 4% для битумных материалов<br>
-4. Отсутствие острых выступов, раковин<br><br>
-
-<strong>ЭТАП 2. Устройство кровельного ковра:</strong><br><br>
-
-<strong>Для наплавляемых материалов:</strong><br>
-• Контроль температуры наплавления (по индикатору на рулоне)<br>
-• Ширина наплавленных швов: проверка шпателем<br>
-• Отсутствие складок, вздутий, непроклеев<br>
-• Сплошность приклейки: простукивание деревянным молотком<br><br>
-
-<strong>Для мембран ПВХ/ТПО:</strong><br>
-• Контроль ширины сварного шва: 20-30 мм<br>
-• Прочность шва: метод отслаивания (шов не должен расслаиваться)<br>
-• Ультразвуковой контроль: 10% швов (приборы типа "Лейстер")<br>
-• Испытание на герметичность: подача воздуха под мембрану (0.02-0.03 МПа)<br><br>
-
-<strong>ЭТАП 3. Приемочный контроль:</strong><br>
-1. Визуальный осмотр 100% поверхности<br>
-2. Испытание на водонепроницаемость (заливка участков водой на 24 часа)<br>
-3. Проверка примыканий, узлов, швов<br>
-4. Оформление актов на скрытые работы<br><br>
-
-<strong>⚡ ТИПИЧНЫЕ ДЕФЕКТЫ И УСТРАНЕНИЕ:</strong><br><br>
-
-<strong>1. ВЗДУТИЯ КРОВЕЛЬНОГО КОВРА:</strong><br>
-• Причина: увлажнение утеплителя, недостаточная приклейка<br>
-• Устранение: крестообразный разрез, просушка, наплавление заплаты<br><br>
-
-<strong>2. ПРОТЕЧКИ В МЕСТАХ ПРИМЫКАНИЙ:</strong><br>
-• Причина: недостаточная высота заведения, отсутствие герметизации<br>
-• Устранение: дополнительное усиление 2-3 слоями на высоту 300-400 мм<br><br>
-
-<strong>3. ОТСЛОЕНИЕ ШВОВ МЕМБРАНЫ:</strong><br>
-• Причина: недостаточный прогрев, загрязнение поверхности<br>
-• Устранение: очистка, повторная сварка с увеличенной температурой<br><br>
-
-<strong>4. ОБРАЗОВАНИЕ НАЛЕДИ И СОСУЛЕК:</strong><br>
-• Причина: недостаточная вентиляция подкровельного пространства<br>
-• Устранение: увеличение площади вентиляционных отверстий, установка снегозадержателей<br><br>
-
-<strong>📊 РАСЧЕТ МАТЕРИАЛОВ (пример для дома 10×10 м):</strong><br><br>
-
-<strong>Скатная кровля (уклон 30°, площадь 140 м²):</strong><br><br>
-
-<strong>Металлочерепица:</strong><br>
-• Площадь с учетом нахлестов: 140 × 1.15 = 161 м²<br>
-• Количество листов (1.1 м × 3.5 м): 161 / 3.85 = 42 листа<br>
-• Стоимость: ~120,000 руб (средний сегмент)<br><br>
-
-<strong>Утеплитель 200 мм:</strong><br>
-• Объем: 100 м² × 0.2 м = 20 м³<br>
-• Плиты каменной ваты: 200 плит (1.2×0.6×0.1 м)<br>
-• Стоимость: ~35,000 руб<br><br>
-
-<strong>Пароизоляция:</strong><br>
-• Площадь с нахлестами: 100 м² × 1.2 = 120 м²<br>
-• Рулоны 70 м²: 2 рулона<br>
-• Стоимость: ~4,000 руб<br><br>
-
-<strong>Гидроветрозащита:</strong><br>
-• Площадь: 140 м² × 1.2 = 168 м²<br>
-• Стоимость: ~12,000 руб<br><br>
-
-<strong>Обрешетка (доска 25×100):</strong><br>
-• Погонаж: ~400 м<br>
-• Кубатура: 1.0 м³<br>
-• Стоимость: ~9,000 руб<br><br>
-
-<strong>ИТОГО материалы: ~180,000 руб</strong><br>
-<strong>Работа (60% от материалов): ~108,000 руб</strong><br>
-<strong>ВСЕГО: ~288,000 руб</strong><br><br>
-
-<strong>📞 НОРМАТИВНЫЕ ДОКУМЕНТЫ:</strong><br>
-• СП 17.13330.2017 "Кровли"<br>
-• СП 50.13330.2012 "Тепловая защита зданий"<br>
-• СНиП II-26-76 "Кровли"<br>
-• ГОСТ 30547-97 "Материалы рулонные кровельные и гидроизоляционные"<br>
-• Альбом технических решений "Скатные кровли"<br>
-• Пособие по проектированию и устройству кровель""",
-            },
-
-            # Теплоизоляция
-            "теплоизоляция": {
-                "keywords": ["теплоизоляция", "утепление", "утеплитель", "энергоэффективность", "thermal insulation"],
-                "regulations": ["СП 50.13330.2012", "СП 23-101-2004"],
-                "detailed_response": """<strong>ТЕПЛОВАЯ ЗАЩИТА ЗДАНИЙ И ТЕПЛОИЗОЛЯЦИЯ</strong><br><br>
-
-<strong>📋 СП 50.13330.2012 "Тепловая защита зданий"</strong><br>
-<strong>СП 23-101-2004 "Проектирование тепловой защиты зданий"</strong><br><br>
-
-<strong>📊 ТРЕБОВАНИЯ К СОПРОТИВЛЕНИЮ ТЕПЛОПЕРЕДАЧЕ (СП 50.13330, табл. 3):</strong><br><br>
-
-<strong>Для различных климатических зон (градусо-сутки отопительного периода):</strong><br><br>
-
-<strong>Москва и Московская область (Dd = 5000°С·сут):</strong><br>
-• Наружные стены: <strong>R ≥ 3.13 м²·°С/Вт</strong><br>
-• Покрытия и чердачные перекрытия: <strong>R ≥ 4.7 м²·°С/Вт</strong><br>
-• Перекрытия над неотапливаемыми подвалами: <strong>R ≥ 3.36 м²·°С/Вт</strong><br>
-• Окна и балконные двери: <strong>R ≥ 0.54 м²·°С/Вт</strong><br><br>
-
-<strong>Санкт-Петербург (Dd = 5100°С·сут):</strong><br>
-• Наружные стены: <strong>R ≥ 3.16 м²·°С/Вт</strong><br>
-• Покрытия: <strong>R ≥ 4.76 м²·°С/Вт</strong><br>
-• Перекрытия над подвалами: <strong>R ≥ 3.40 м²·°С/Вт</strong><br><br>
-
-<strong>Екатеринбург (Dd = 6200°С·сут):</strong><br>
-• Наружные стены: <strong>R ≥ 3.49 м²·°С/Вт</strong><br>
-• Покрытия: <strong>R ≥ 5.28 м²·°С/Вт</strong><br>
-• Перекрытия над подвалами: <strong>R ≥ 3.76 м²·°С/Вт</strong><br><br>
-
-<strong>🏗️ ТИПЫ ТЕПЛОИЗОЛЯЦИОННЫХ МАТЕРИАЛОВ:</strong><br><br>
-
-<strong>1. МИНЕРАЛОВАТНЫЕ УТЕПЛИТЕЛИ:</strong><br><br>
-
-<strong>Каменная вата (базальтовая):</strong><br>
-• Теплопроводность λ: <strong>0.035-0.045 Вт/(м·°С)</strong><br>
-• Плотность: 30-200 кг/м³ (в зависимости от применения)<br>
-• Группа горючести: <strong>НГ</strong> (негорючая)<br>
-• Паропроницаемость: высокая (0.25-0.35 мг/(м·ч·Па))<br>
-• Срок службы: 50+ лет<br><br>
-
-<strong>Применение по плотности:</strong><br>
-• 30-50 кг/м³: скатные кровли, каркасные стены, перегородки<br>
-• 80-110 кг/м³: вентилируемые фасады (средний слой)<br>
-• 130-160 кг/м³: штукатурные фасады, плоские кровли (нижний слой)<br>
-• 160-200 кг/м³: плоские кровли под стяжку (верхний слой)<br><br>
-
-<strong>Стекловата:</strong><br>
-• Теплопроводность λ: <strong>0.038-0.046 Вт/(м·°С)</strong><br>
-• Плотность: 11-30 кг/м³<br>
-• Группа горючести: <strong>НГ</strong><br>
-• Более упругая, чем каменная вата<br>
-• Применение: каркасные конструкции, перекрытия<br><br>
-
-<strong>2. ПЕНОПОЛИСТИРОЛ (ППС, пенопласт):</strong><br><br>
-
-<strong>Обычный ППС (EPS):</strong><br>
-• Теплопроводность λ: <strong>0.033-0.038 Вт/(м·°С)</strong><br>
-• Плотность: 15-35 кг/м³<br>
-• Группа горючести: <strong>Г1-Г4</strong> (горючий, требует защиты)<br>
-• Водопоглощение: низкое (до 2% по объему)<br>
-• Паропроницаемость: низкая<br>
-• Срок службы: 25-50 лет<br><br>
-
-<strong>Применение:</strong><br>
-• ППС-15: ненагруженные конструкции (стены, перекрытия)<br>
-• ППС-25: фасады под штукатурку, полы<br>
-• ППС-35: нагруженные конструкции (фундаменты, отмостки)<br><br>
-
-<strong>3. ЭКСТРУДИРОВАННЫЙ ПЕНОПОЛИСТИРОЛ (ЭППС, XPS):</strong><br><br>
-
-<strong>Характеристики:</strong><br>
-• Теплопроводность λ: <strong>0.029-0.033 Вт/(м·°С)</strong> (лучший показатель)<br>
-• Плотность: 28-45 кг/м³<br>
-• Прочность на сжатие: 250-500 кПа<br>
-• Водопоглощение: <strong>минимальное (0.2-0.4%)</strong><br>
-• Группа горючести: Г3-Г4<br>
-• Срок службы: 50+ лет<br><br>
-
-<strong>Применение:</strong><br>
-• Цоколи и фундаменты (ниже уровня земли)<br>
-• Эксплуатируемые плоские кровли<br>
-• Полы по грунту<br>
-• Дорожное строительство<br>
-• Холодильные камеры<br><br>
-
-<strong>4. ПЕНОПОЛИУРЕТАН (ППУ):</strong><br><br>
-
-<strong>Напыляемый ППУ:</strong><br>
-• Теплопроводность λ: <strong>0.019-0.035 Вт/(м·°С)</strong><br>
-• Плотность: 30-80 кг/м³<br>
-• Бесшовное покрытие<br>
-• Отличная адгезия к любым поверхностям<br>
-• Группа горючести: Г2-Г3<br><br>
-
-<strong>Плитный ППУ (PIR):</strong><br>
-• Теплопроводность λ: <strong>0.021-0.023 Вт/(м·°С)</strong><br>
-• Облицовка алюминиевой фольгой или стеклохолстом<br>
-• Группа горючести: Г1-Г2 (с антипиренами)<br>
-• Применение: сэндвич-панели, плоские кровли<br><br>
-
-<strong>📐 РАСЧЕТ ТОЛЩИНЫ УТЕПЛИТЕЛЯ:</strong><br><br>
-
-<strong>Формула расчета:</strong><br>
-R = δ / λ<br><br>
-
-где:<br>
-• R - требуемое сопротивление теплопередаче, м²·°С/Вт<br>
-• δ - толщина утеплителя, м<br>
-• λ - коэффициент теплопроводности, Вт/(м·°С)<br><br>
-
-<strong>Пример расчета для Москвы:</strong><br><br>
-
-<strong>Наружная стена (R требуемое = 3.13 м²·°С/Вт):</strong><br><br>
-
-<strong>Конструкция стены:</strong><br>
-1. Кирпич керамический полнотелый 380 мм (λ = 0.56): R₁ = 0.38 / 0.56 = 0.68 м²·°С/Вт<br>
-2. Штукатурка внутренняя 20 мм (λ = 0.76): R₂ = 0.02 / 0.76 = 0.026 м²·°С/Вт<br>
-3. Штукатурка наружная 20 мм (λ = 0.76): R₃ = 0.02 / 0.76 = 0.026 м²·°С/Вт<br>
-4. Сопротивление теплообмену на поверхностях: R₄ = 1/αвн + 1/αнар = 0.115 + 0.043 = 0.158 м²·°С/Вт<br><br>
-
-<strong>R существующее = 0.68 + 0.026 + 0.026 + 0.158 = 0.89 м²·°С/Вт</strong><br><br>
-
-<strong>R недостающее = 3.13 - 0.89 = 2.24 м²·°С/Вт</strong><br><br>
-
-<strong>Расчет толщины утеплителя:</strong><br><br>
-
-<strong>Каменная вата (λ = 0.04):</strong><br>
-δ = R × λ = 2.24 × 0.04 = 0.090 м = <strong>90 мм → принимаем 100 мм</strong><br><br>
-
-<strong>ЭППС (λ = 0.03):</strong><br>
-δ = 2.24 × 0.03 = 0.067 м = <strong>67 мм → принимаем 80 мм</strong><br><br>
-
-<strong>ППС-25 (λ = 0.035):</strong><br>
-δ = 2.24 × 0.035 = 0.078 м = <strong>78 мм → принимаем 100 мм</strong><br><br>
-
-<strong>🏗️ СИСТЕМЫ УТЕПЛЕНИЯ ФАСАДОВ:</strong><br><br>
-
-<strong>1. "МОКРЫЙ ФАСАД" (штукатурная система):</strong><br><br>
-
-<strong>Конструкция (снаружи внутрь):</strong><br>
-1. Декоративная штукатурка 5-7 мм<br>
-2. Базовый штукатурный слой с армирующей сеткой 3-5 мм<br>
-3. Утеплитель: минвата плотностью 130-160 кг/м³ или ППС-25<br>
-4. Клеевой слой<br>
-5. Стена<br><br>
-
-<strong>Технология монтажа:</strong><br><br>
-
-<strong>Этап 1. Подготовка:</strong><br>
-• Очистка и выравнивание стены (неровности не более 10 мм)<br>
-• Грунтование поверхности<br>
-• Установка цокольного профиля (стартовая планка)<br><br>
-
-<strong>Этап 2. Крепление утеплителя:</strong><br>
-• Нанесение клея: по периметру плиты + маяки в центре (60-70% площади)<br>
-• Приклеивание с перевязкой швов (Т-образные стыки недопустимы)<br>
-• Выдержка клея: 3 суток<br>
-• Дюбелирование тарельчатыми дюбелями: 5-7 шт/м² + по углам<br>
-• Длина дюбеля: толщина утеплителя + 10 мм клея + 50 мм в основание<br><br>
-
-<strong>Этап 3. Армирование:</strong><br>
-• Нанесение базового слоя клея 3 мм<br>
-• Утапливание щелочестойкой стеклосетки (плотность 145-165 г/м²)<br>
-• Нахлест сетки: 100 мм<br>
-• Укрывочный слой клея 2 мм<br>
-• Общая толщина базового слоя: 5-6 мм<br><br>
-
-<strong>Этап 4. Финишная отделка:</strong><br>
-• Грунтовка под декоративную штукатурку<br>
-• Нанесение декоративной штукатурки (минеральная, акриловая, силиконовая)<br>
-• Толщина: 3-7 мм (в зависимости от фракции заполнителя)<br><br>
-
-<strong>2. ВЕНТИЛИРУЕМЫЙ ФАСАД (НВФ):</strong><br><br>
-
-<strong>Конструкция:</strong><br>
-1. Облицовка (керамогранит, композитные панели, фиброцемент)<br>
-2. Воздушный вентилируемый зазор: <strong>40-60 мм</strong><br>
-3. Ветрозащитная паропроницаемая мембрана<br>
-4. Утеплитель: минвата плотностью 80-110 кг/м³ (наружный слой 110 кг/м³)<br>
-5. Несущая подсистема (кронштейны + профили)<br>
-6. Стена<br><br>
-
-<strong>Особенности:</strong><br>
-• Точка росы смещается в утеплитель<br>
-• Влага выводится через вентзазор<br>
-• Долговечность: 50+ лет<br>
-• Можно монтировать круглый год<br><br>
-
-<strong>⚠️ ТИПИЧНЫЕ ОШИБКИ ПРИ УТЕПЛЕНИИ:</strong><br><br>
-
-<strong>1. МОСТИКИ ХОЛОДА:</strong><br>
-• Причина: неутепленные перемычки, откосы, балконные плиты<br>
-• Последствия: локальное промерзание, плесень, увеличение теплопотерь на 15-30%<br>
-• Устранение: сплошное утепление всех конструкций без разрывов<br><br>
-
-<strong>2. НЕДОСТАТОЧНАЯ ТОЛЩИНА УТЕПЛИТЕЛЯ:</strong><br>
-• Причина: экономия, неправильный расчет<br>
-• Последствия: промерзание стен, конденсат, плесень<br>
-• Устранение: дополнительный слой утеплителя<br><br>
-
-<strong>3. ОТСУТСТВИЕ ПАРОИЗОЛЯЦИИ ПРИ УТЕПЛЕНИИ ИЗНУТРИ:</strong><br>
-• Причина: незнание технологии<br>
-• Последствия: накопление влаги в утеплителе, снижение R до 50%, плесень<br>
-• Устранение: установка пароизоляции с внутренней стороны утеплителя<br><br>
-
-<strong>4. ИСПОЛЬЗОВАНИЕ ПАРОНЕПРОНИЦАЕМОГО УТЕПЛИТЕЛЯ СНАРУЖИ ПАРОПРОНИЦАЕМОЙ СТЕНЫ:</strong><br>
-• Пример: ППС на газобетоне без вентзазора<br>
-• Последствия: накопление влаги в стене<br>
-• Решение: использовать минвату или оставлять вентзазор<br><br>
-
-<strong>📊 ЭКОНОМИЧЕСКАЯ ЭФФЕКТИВНОСТЬ УТЕПЛЕНИЯ:</strong><br><br>
-
-<strong>Пример для дома 100 м² в Москве:</strong><br><br>
-
-<strong>Теплопотери через стены БЕЗ утепления:</strong><br>
-• R стены = 0.89 м²·°С/Вт<br>
-• Потери: Q = (20°C - (-5°C)) × 100 м² / 0.89 = 2809 Вт = 2.8 кВт<br>
-• За сезон (210 дней): 2.8 кВт × 24 ч × 210 = 14,112 кВт·ч<br>
-• Стоимость (газ 6 руб/кВт·ч): 84,672 руб/год<br><br>
-
-<strong>Теплопотери С утеплением 100 мм минваты:</strong><br>
-• R утепленной стены = 3.39 м²·°С/Вт<br>
-• Потери: Q = 25 × 100 / 3.39 = 738 Вт = 0.74 кВт<br>
-• За сезон: 3,720 кВт·ч<br>
-• Стоимость: 22,320 руб/год<br><br>
-
-<strong>Экономия: 84,672 - 22,320 = 62,352 руб/год</strong><br><br>
-
-<strong>Стоимость утепления 100 м² стен системой "мокрый фасад":</strong><br>
-• Материалы: ~180,000 руб<br>
-• Работа: ~120,000 руб<br>
-• Итого: ~300,000 руб<br><br>
-
-<strong>Срок окупаемости: 300,000 / 62,352 = 4.8 года</strong><br><br>
-
-<strong>📞 НОРМАТИВНЫЕ ДОКУМЕНТЫ:</strong><br>
-• СП 50.13330.2012 "Тепловая защита зданий"<br>
-• СП 23-101-2004 "Проектирование тепловой защиты зданий"<br>
-• ГОСТ 31913-2011 "Материалы и изделия теплоизоляционные. Термины и определения"<br>
-• ГОСТ 31309-2005 "Вата минеральная. Технические условия"<br>
-• Альбом технических решений "Системы утепления фасадов"<br>
-• СП 293.1325800.2017 "Системы фасадные теплоизоляционные композиционные с наружными штукатурными слоями"<br>
-• СП 316.1325800.2017 "Фасады навесные вентилируемые"<br><br>
-
-<strong>💡 ДОПОЛНИТЕЛЬНЫЕ РЕКОМЕНДАЦИИ:</strong><br>
-• Утепление всегда выполнять СНАРУЖИ (исключение - невозможность по архитектурным причинам)<br>
-• При утеплении изнутри обязательна пароизоляция + принудительная вентиляция<br>
-• Для деревянных домов использовать только паропроницаемые материалы (минвата)<br>
-• Обязательно утеплять откосы, перемычки, балконные плиты<br>
-• Устройство отмостки с утеплением (ЭППС 50-100 мм) снижает промерзание фундамента<br>
-• Энергоаудит перед утеплением позволяет выявить все зоны теплопотерь"""
-            },
-
-            # Вентиляция
-            "вентиляция": {
-                "keywords": ["вентиляция", "вентиляционная система", "вытяжка", "приточная вентиляция", "ventilation"],
-                "regulations": ["СП 60.13330.2016", "СНиП 41-01-2003"],
-                "detailed_response": """<strong>СИСТЕМЫ ВЕНТИЛЯЦИИ ЗДАНИЙ</strong><br><br>
-
-<strong>📋 СП 60.13330.2016 "Отопление, вентиляция и кондиционирование воздуха"</strong><br>
-<strong>СНиП 41-01-2003 "Отопление, вентиляция и кондиционирование"</strong><br><br>
-
-<strong>📊 НОРМАТИВНЫЙ ВОЗДУХООБМЕН (СП 60.13330, табл. 9.1-9.3):</strong><br><br>
-
-<strong>ЖИЛЫЕ ПОМЕЩЕНИЯ:</strong><br><br>
-
-<strong>Минимальный расход воздуха (м³/ч):</strong><br>
-• Жилая комната (на 1 человека): <strong>30 м³/ч</strong><br>
-• Спальня (на 1 человека): <strong>30 м³/ч</strong><br>
-• Кухня с электроплитой: <strong>60 м³/ч</strong><br>
-• Кухня с газовой плитой (2 конфорки): <strong>60 м³/ч</strong><br>
-• Кухня с газовой плитой (4 конфорки): <strong>90 м³/ч</strong><br>
-• Ванная комната: <strong>25 м³/ч</strong><br>
-• Туалет: <strong>25 м³/ч</strong><br>
-• Совмещенный санузел: <strong>50 м³/ч</strong><br>
-• Постирочная: <strong>25 м³/ч</strong><br>
-• Гардеробная: <strong>10 м³/ч</strong><br><br>
-
-<strong>ОБЩЕСТВЕННЫЕ ЗДАНИЯ:</strong><br><br>
-
-<strong>Офисы:</strong><br>
-• На 1 работающего: <strong>60 м³/ч</strong> (при отсутствии естественного проветривания)<br>
-• При естественном проветривании: <strong>40 м³/ч</strong><br>
-• Кратность: минимум <strong>2 раза/час</strong><br><br>
-
-<strong>Торговые помещения:</strong><br>
-• Торговый зал: <strong>20 м³/ч на 1 м² площади</strong><br>
-• Минимальная кратность: <strong>1 раз/час</strong><br><br>
-
-<strong>Санитарные помещения общественных зданий:</strong><br>
-• Туалет (с умывальником): <strong>75 м³/ч</strong><br>
-• Душевая: <strong>75 м³/ч</strong><br>
-• Умывальная: <strong>25 м³/ч на 1 прибор</strong><br><br>
-
-<strong>🏗️ ТИПЫ СИСТЕМ ВЕНТИЛЯЦИИ:</strong><br><br>
-
-<strong>1. ЕСТЕСТВЕННАЯ ВЕНТИЛЯЦИЯ:</strong><br><br>
-
-<strong>Принцип работы:</strong><br>
-• Основан на разности плотностей холодного и теплого воздуха<br>
-• Тяга зависит от высоты вентканала и температуры<br>
-• Формула тяги: ΔP = h × g × (ρн - ρв), где h - высота канала<br><br>
-
-<strong>Требования к вентканалам (п. 7.11):</strong><br>
-• Минимальное сечение: <strong>150 см²</strong> (эквивалент Ø140 мм)<br>
-• Для кухни с газовой плитой: <strong>200 см²</strong><br>
-• Минимальная высота: <strong>3 м</strong> от решетки до устья<br>
-• Материал: кирпич, бетонные блоки, нержавеющая сталь<br>
-• Шероховатость стенок: минимальная (гладкие поверхности)<br><br>
-
-<strong>Устье вентканала (высота над кровлей):</strong><br>
-• На плоской кровле: минимум <strong>0.5 м</strong><br>
-• На скатной кровле:<br>
-  - До 1.5 м от конька: на <strong>0.5 м</strong> выше конька<br>
-  - 1.5-3.0 м от конька: вровень с коньком<br>
-  - Более 3 м от конька: на линии 10° от конька<br><br>
-
-<strong>Приток воздуха:</strong><br>
-• Через приточные клапаны в стенах или окнах<br>
-• Производительность клапана: 30-50 м³/ч<br>
-• Размещение: на высоте 2.0-2.2 м от пола<br>
-• Регулируемые заслонки обязательны<br><br>
-
-<strong>2. МЕХАНИЧЕСКАЯ ПРИТОЧНО-ВЫТЯЖНАЯ ВЕНТИЛЯЦИЯ (ПВУ):</strong><br><br>
-
-<strong>Основные компоненты:</strong><br><br>
-
-<strong>1) Приточная установка:</strong><br>
-• Воздухозаборная решетка (h = 2.0 м от земли минимум)<br>
-• Фильтр грубой очистки (класс G3-G4)<br>
-• Фильтр тонкой очистки (класс F5-F7)<br>
-• Калорифер (электрический или водяной)<br>
-• Вентилятор (центробежный или осевой)<br>
-• Шумоглушитель (снижение шума на 15-30 дБ)<br>
-• Система автоматики<br><br>
-
-<strong>2) Вытяжная установка:</strong><br>
-• Вытяжной вентилятор<br>
-• Обратный клапан<br>
-• Шумоглушитель<br>
-• Дефлектор на выбросе<br><br>
-
-<strong>3. ПРИТОЧНО-ВЫТЯЖНАЯ УСТАНОВКА С РЕКУПЕРАЦИЕЙ ТЕПЛА:</strong><br><br>
-
-<strong>Типы рекуператоров:</strong><br><br>
-
-<strong>Пластинчатый рекуператор:</strong><br>
-• КПД: <strong>50-65%</strong><br>
-• Без движущихся частей<br>
-• Надежный, простой в обслуживании<br>
-• Обмерзание при -10°C (требуется байпас)<br><br>
-
-<strong>Роторный рекуператор:</strong><br>
-• КПД: <strong>75-85%</strong><br>
-• Вращающийся барабан с алюминиевыми пластинами<br>
-• Частичный перенос запахов (5-10%)<br>
-• Не обмерзает<br><br>
-
-<strong>Рекуператор с промежуточным теплоносителем:</strong><br>
-• КПД: <strong>45-55%</strong><br>
-• Раздельные приточный и вытяжной каналы<br>
-• Нет переноса запахов<br>
-• Возможность размещения приточной и вытяжной установок в разных местах<br><br>
-
-<strong>📐 РАСЧЕТ ПРОИЗВОДИТЕЛЬНОСТИ ВЕНТИЛЯЦИИ:</strong><br><br>
-
-<strong>Пример для квартиры 80 м² (высота потолков 2.7 м):</strong><br><br>
-
-<strong>Помещения:</strong><br>
-• Гостиная 25 м² - 2 человека<br>
-• Спальня 15 м² - 2 человека<br>
-• Детская 12 м² - 1 человек<br>
-• Кухня 10 м² - газовая плита 4 конфорки<br>
-• Ванная 4 м²<br>
-• Туалет 2 м²<br><br>
-
-<strong>МЕТОД 1. По нормам на человека + санузлы:</strong><br><br>
-
-<strong>Приток (жилые комнаты):</strong><br>
-• Гостиная: 2 × 30 = 60 м³/ч<br>
-• Спальня: 2 × 30 = 60 м³/ч<br>
-• Детская: 1 × 30 = 30 м³/ч<br>
-<strong>Итого приток: 150 м³/ч</strong><br><br>
-
-<strong>Вытяжка (кухня + санузлы):</strong><br>
-• Кухня: 90 м³/ч<br>
-• Ванная: 25 м³/ч<br>
-• Туалет: 25 м³/ч<br>
-<strong>Итого вытяжка: 140 м³/ч</strong><br><br>
-
-<strong>Принимаем расчетную производительность: 150 м³/ч</strong><br>
-(Приток и вытяжка должны быть сбалансированы)<br><br>
-
-<strong>МЕТОД 2. По кратности (1 раз/час для жилых помещений):</strong><br><br>
-
-• Объем квартиры: 80 м² × 2.7 м = 216 м³<br>
-• При кратности 1: L = 216 м³/ч<br><br>
-
-<strong>Рекомендуется принимать большее значение → 216 м³/ч</strong><br><br>
-
-<strong>🔧 ПРОЕКТИРОВАНИЕ ВОЗДУХОВОДОВ:</strong><br><br>
-
-<strong>Требования к воздуховодам (СП 60.13330, раздел 7):</strong><br><br>
-
-<strong>Скорость воздуха:</strong><br>
-• Магистральные воздуховоды: <strong>4-6 м/с</strong><br>
-• Ответвления к помещениям: <strong>2-3 м/с</strong><br>
-• Приточные решетки: <strong>1-2 м/с</strong><br>
-• Вытяжные решетки: <strong>2-3 м/с</strong><br>
-• Превышение скорости → высокий уровень шума<br><br>
-
-<strong>Расчет диаметра воздуховода:</strong><br><br>
-
-Формула: D = √(4 × L / (π × V × 3600))<br><br>
-
-где:<br>
-• D - диаметр воздуховода, м<br>
-• L - расход воздуха, м³/ч<br>
-• V - скорость воздуха, м/с<br><br>
-
-<strong>Пример: L = 200 м³/ч, V = 4 м/с</strong><br>
-D = √(4 × 200 / (3.14 × 4 × 3600)) = √(800 / 45,216) = √0.0177 = 0.133 м = <strong>133 мм</strong><br><br>
-
-<strong>Принимаем стандартный диаметр: Ø160 мм</strong><br><br>
-
-<strong>Материалы воздуховодов:</strong><br>
-• Оцинкованная сталь толщиной 0.5-1.0 мм (наиболее распространен)<br>
-• Нержавеющая сталь (для агрессивных сред)<br>
-• Гибкие алюминиевые гофрированные (для коротких участков)<br>
-• Пластиковые (для бытовых систем)<br><br>
-
-<strong>Класс герметичности:</strong><br>
-• Класс А: <strong>нормируемые утечки ≤ 0.27 × P^0.65</strong> л/(с·м²)<br>
-• Класс В: утечки ≤ 0.54 × P^0.65 л/(с·м²)<br>
-• Класс С: утечки ≤ 1.06 × P^0.65 л/(с·м²)<br>
-• Для жилых зданий - минимум класс В<br><br>
-
-<strong>Теплоизоляция воздуховодов:</strong><br>
-• Приточные воздуховоды в неотапливаемых зонах: обязательна<br>
-• Толщина изоляции: 50-100 мм (каменная вата, вспененный полиэтилен)<br>
-• Предотвращение конденсата и теплопотерь<br><br>
-
-<strong>⚠️ ТИПИЧНЫЕ ОШИБКИ ПРИ ПРОЕКТИРОВАНИИ И МОНТАЖЕ:</strong><br><br>
-
-<strong>1. НЕДОСТАТОЧНАЯ ПРОИЗВОДИТЕЛЬНОСТЬ ВЕНТИЛЯЦИИ:</strong><br>
-• Причина: расчет только по площади без учета фактического количества людей<br>
-• Последствия: духота, повышенная влажность, плесень, CO₂ > 1000 ppm<br>
-• Решение: расчет по нормам СП 60.13330<br><br>
-
-<strong>2. ОТСУТСТВИЕ ПРИТОКА ПРИ НАЛИЧИИ ВЫТЯЖКИ:</strong><br>
-• Причина: установлена только вытяжная вентиляция<br>
-• Последствия: разряжение в помещении, обратная тяга, задувание из вентканалов<br>
-• Решение: организация притока (клапаны, ПВУ)<br><br>
-
-<strong>3. НЕПРАВИЛЬНОЕ РАСПОЛОЖЕНИЕ ПРИТОЧНЫХ И ВЫТЯЖНЫХ УСТРОЙСТВ:</strong><br>
-• Ошибка: приток и вытяжка в одной зоне<br>
-• Последствия: короткое замыкание воздушных потоков, застойные зоны<br>
-• Правильно: приток в жилых комнатах (у окна), вытяжка на кухне и в санузлах<br><br>
-
-<strong>4. ВЫСОКИЙ УРОВЕНЬ ШУМА:</strong><br>
-• Причины: избыточная скорость в воздуховодах (>6 м/с), отсутствие шумоглушителей<br>
-• Нормы: днем ≤35 дБА (жилые), ночью ≤25 дБА<br>
-• Решение: снижение скорости, установка шумоглушителей, виброизоляция<br><br>
-
-<strong>📊 СТОИМОСТЬ СИСТЕМ ВЕНТИЛЯЦИИ:</strong><br><br>
-
-<strong>Пример для квартиры 80 м²:</strong><br><br>
-
-<strong>Вариант 1. Естественная вентиляция:</strong><br>
-• Приточные клапаны КИВ-125: 4 шт × 4,000 = 16,000 руб<br>
-• Монтаж: 8,000 руб<br>
-<strong>Итого: ~24,000 руб</strong><br><br>
-
-<strong>Вариант 2. Децентрализованная вентиляция с рекуперацией:</strong><br>
-• Проветриватели с рекуперацией: 3 шт × 35,000 = 105,000 руб<br>
-• Монтаж: 15,000 руб<br>
-<strong>Итого: ~120,000 руб</strong><br><br>
-
-<strong>Вариант 3. Центральная ПВУ с рекуперацией:</strong><br>
-• Приточно-вытяжная установка 250 м³/ч: 80,000 руб<br>
-• Воздуховоды и комплектующие: 50,000 руб<br>
-• Монтаж и пусконаладка: 70,000 руб<br>
-<strong>Итого: ~200,000 руб</strong><br><br>
-
-<strong>Эксплуатационные расходы (отопительный сезон 210 дней):</strong><br>
-• Без рекуперации: 35,000-50,000 руб/год (нагрев приточного воздуха)<br>
-• С рекуперацией 75%: 10,000-15,000 руб/год<br>
-• Экономия: 25,000-35,000 руб/год<br>
-• Окупаемость рекуператора: 2-3 года<br><br>
-
-<strong>📞 НОРМАТИВНЫЕ ДОКУМЕНТЫ:</strong><br>
-• СП 60.13330.2016 "Отопление, вентиляция и кондиционирование воздуха"<br>
-• СП 7.13130.2013 "Отопление, вентиляция и кондиционирование. Требования пожарной безопасности"<br>
-• СНиП 41-01-2003 "Отопление, вентиляция и кондиционирование"<br>
-• ГОСТ 12.1.005-88 "Воздух рабочей зоны"<br>
-• СанПиН 1.2.3685-21 "Гигиенические нормативы"<br>
-• Методика испытаний воздушных фильтров (ГОСТ Р ЕН 779-2014)<br><br>
-
-<strong>💡 РЕКОМЕНДАЦИИ:</strong><br>
-• Обязательна балансировка притока и вытяжки (допустимый дисбаланс ±10%)<br>
-• Установка рекуператора экономически оправдана в холодном климате<br>
-• Регулярное обслуживание: замена фильтров раз в 3-6 месяцев<br>
-• Очистка воздуховодов: раз в 3-5 лет<br>
-• Контроль CO₂ (датчики): оптимально 600-800 ppm, максимум 1000 ppm<br>
-• При проектировании учитывать возможность обслуживания (ревизионные люки)"""
-            },
-        }
+    def __init__(self, engine: Optional[ConsultantEngine] = None):
+        """
+        Args:
+            engine: Движок базы знаний (по умолчанию общий движок процесса)
+        """
+        self._engine = engine
 
-        return knowledge
+    @property
+    def engine(self) -> ConsultantEngine:
+        return self._engine or get_consultant_engine()
 
     def get_answer(self, question: str) -> str:
         """
@@ -1794,91 +43,58 @@ D = √(4 × 200 / (3.14 × 4 × 3600)) = √(800 / 45,216) = √0.0177 = 0.133
         Returns:
             Профессиональный ответ с ссылками на нормативы
         """
-        question_lower = question.lower()
-
-        # Поиск в базе знаний
-        for topic, data in self.knowledge_base.items():
-            if any(keyword in question_lower for keyword in data["keywords"]):
-                logger.info(f"Found answer for topic: {topic}")
-                return data["detailed_response"]
+        topics = self.match_topics(question, limit=1)
+        if topics:
+            topic, score = topics[0]
+            logger.info(f"Found answer for topic: {topic} (score {score})")
+            return self.engine.knowledge_base.body(topic, CLASSIC)
 
         # Если точное совпадение не найдено, возвращаем общий ответ
         return self._get_general_response(question)
 
-    def _get_general_response(self, question: str) -> str:
-        """Общий ответ с перечнем доступных тем"""
-        return """<strong>AI КОНСУЛЬТАНТ ПО СТРОИТЕЛЬНЫМ НОРМАМ</strong><br><br>
-
-Я могу предоставить детальные профессиональные консультации по следующим темам:<br><br>
-
-<strong>📋 Доступные разделы:</strong><br><br>
-
-<strong>1. КОНСТРУКЦИИ:</strong><br>
-• Трещины в железобетоне (СП 63.13330.2018)<br>
-• Бетонные работы и контроль качества<br>
-• Арматурные работы<br>
-• Несущие конструкции<br><br>
-
-<strong>2. ЗАЩИТА КОНСТРУКЦИЙ:</strong><br>
-• Коррозия арматуры (СП 28.13330.2017)<br>
-• Гидроизоляция фундаментов<br>
-• Антикоррозийная защита<br>
-• Защитные покрытия<br><br>
-
-<strong>3. ОСНОВАНИЯ И ФУНДАМЕНТЫ:</strong><br>
-• Деформации оснований (СП 22.13330.2016)<br>
-• Свайные фундаменты (СП 50-101-2004)<br>
-• Ленточные и плитные фундаменты<br>
-• Усиление фундаментов<br><br>
-
-<strong>4. СПЕЦИАЛЬНЫЕ РАБОТЫ:</strong><br>
-• Сварочные работы (ГОСТ 23055-78)<br>
-• Контроль качества сварных швов<br>
-• Скрытые работы (СНиП 3.03.01-87)<br><br>
+    def match_topics(self, question: str, limit: int = 3) -> List[tuple]:
+        """
+        Темы базы знаний, подходящие к вопросу
 
-<strong>🔍 Примеры вопросов:</strong><br>
-• "Какая допустимая ширина трещин в железобетоне?"<br>
-• "Как устранить коррозию арматуры?"<br>
-• "Требования к гидроизоляции фундамента"<br>
-• "Контроль качества сварных швов"<br>
-• "Допустимые осадки фундамента"<br>
-• "Как правильно бетонировать?"<br><br>
+        Args:
+            question: Вопрос пользователя
+            limit: Максимум тем
 
-<strong>📚 База знаний включает:</strong><br>
-• 10 основных нормативов (СП, ГОСТ, СНиП)<br>
-• Детальные технологические карты<br>
-• Расчетные формулы<br>
-• Критерии оценки дефектов<br>
-• Методы устранения нарушений<br><br>
+        Returns:
+            Список (тема, score) по убыванию веса найденных ключевых слов
+        """
+        return self.engine.match_topics(question, limit=limit)
 
-Задайте конкретный вопрос, и я предоставлю подробную информацию с ссылками на нормативные документы."""
+    def _get_general_response(self, question: str) -> str:
+        """Общий ответ с перечнем доступных тем"""
+        return self.engine.knowledge_base.body(KnowledgeBase.GENERAL, CLASSIC)
 
-    def search_regulations(self, query: str) -> List[Dict[str, Any]]:
+    def search_regulations(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
-        Поиск по базе нормативов
+        Поиск по базе нормативов (BM25 по требованиям, с учетом словоформ)
 
         Args:
             query: Поисковый запрос
+            limit: Максимум нормативов
 
         Returns:
-            Список найденных нормативов
+            Список найденных нормативов по убыванию релевантности
+        """
+        return self.engine.search_regulations(query, limit=limit)
+
+    def search_requirements(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
-        results = []
-        query_lower = query.lower()
+        Требования нормативов, наиболее подходящие к вопросу
 
-        for regulation in self.regulations_db.get("regulations", []):
-            # Поиск по keywords
-            if any(keyword in query_lower for keyword in regulation.get("keywords", [])):
-                results.append({
-                    "id": regulation["id"],
-                    "number": regulation["number"],
-                    "name": regulation["full_name"],
-                    "category": regulation["category"],
-                    "key_requirements": regulation.get("key_requirements", [])[:3]  # Первые 3 требования
-                })
+        Args:
+            query: Вопрос
+            limit: Максимум требований
 
-        return results
+        Returns:
+            Список требований со ссылками на пункты нормативов
+        """
+        return self.engine.search_requirements(query, limit=limit)
 
 
-# Singleton instance
+# Singleton instance (база знаний загружается при первом вопросе)
 ai_consultant_service = AIConsultantService()
@@ -0,0 +1,194 @@
+"""
+Контекст нормативов для ИИ-консультанта (retrieval-augmented generation)
+
+Вместо одних и тех же первых нормативов из БД в запрос к LLM попадают
+нормативы, подходящие к вопросу:
+- требования с пунктами из базы нормативов консультанта (BM25, при
+  отсутствии совпадений - векторный поиск)
+- действующие нормативы из БД через поисковый индекс
+
+Строки добавляются по убыванию релевантности, пока укладываются в бюджет
+токенов. Собранный контекст кешируется по вопросу: повторные и частые
+вопросы не выполняют поиск заново.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.search.indexer import search_index
+from app.search.text import normalize
+from app.services.consultant_engine import ConsultantEngine, get_consultant_engine
+
+logger = logging.getLogger(__name__)
+
+# Для русского текста в токенизаторах LLM - около 3 символов на токен
+CHARS_PER_TOKEN = 3.0
+
+# Сколько кандидатов брать из каждого источника
+REQUIREMENTS_LIMIT = 8
+REGULATIONS_LIMIT = 5
+
+# Описание норматива в контексте обрезается до этой длины
+DESCRIPTION_MAX_CHARS = 300
+
+
+def estimate_tokens(text: str) -> int:
+    """Оценка числа токенов текста без токенизатора"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _truncate(text: Optional[str], max_chars: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= max_chars else text[:max_chars].rsplit(" ", 1)[0] + "…"
+
+
+class ConsultContext:
+    """Контекст нормативов для одного вопроса"""
+
+    def __init__(self, lines: List[str], regulations: List[str]):
+        self.lines = lines
+        # Коды нормативов, попавших в контекст, в порядке релевантности
+        self.regulations = regulations
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+def requirement_candidates(engine: ConsultantEngine, question: str) -> List[Tuple[str, str]]:
+    """Требования с пунктами: (строка контекста, код норматива)"""
+    candidates = []
+    for item in engine.search_requirements(question, limit=REQUIREMENTS_LIMIT):
+        article = f", {item['article']}" if item.get("article") else ""
+        line = f"- {item['code']}{article} ({item['topic']}): {item['requirement']}"
+        candidates.append((line, item["code"]))
+    return candidates
+
+
+def regulation_candidates(db: Session, question: str) -> List[Tuple[str, str]]:
+    """Действующие нормативы из БД: (строка контекста, код норматива)"""
+    try:
+        hits = search_index(db, "regulations", question, filters={"is_active": True}, limit=REGULATIONS_LIMIT)
+    except Exception as e:
+        logger.warning(f"Search index unavailable for consult context: {e}")
+        return []
+
+    candidates = []
+    for hit in hits:
+        source = hit["source"]
+        line = f"- {source['code']}: {source.get('full_name') or source['title']}"
+        description = _truncate(source.get("description"), DESCRIPTION_MAX_CHARS)
+        if description:
+            line = f"{line}. {description}"
+        candidates.append((line, source["code"]))
+    return candidates
+
+
+def build_context(
+    db: Session,
+    question: str,
+    token_budget: Optional[int] = None,
+    engine: Optional[ConsultantEngine] = None
+) -> ConsultContext:
+    """
+    Подбор нормативов к вопросу в пределах бюджета токенов
+
+    Args:
+        db: Сессия БД
+        question: Вопрос пользователя
+        token_budget: Бюджет токенов (по умолчанию settings.AI_CONSULT_CONTEXT_TOKENS)
+        engine: Движок консультанта (по умолчанию общий движок процесса)
+
+    Returns:
+        Контекст: сначала требования с пунктами, затем нормативы из БД
+    """
+    token_budget = token_budget if token_budget is not None else settings.AI_CONSULT_CONTEXT_TOKENS
+    engine = engine or get_consultant_engine()
+
+    lines: List[str] = []
+    regulations: List[str] = []
+    used = 0
+    for line, code in requirement_candidates(engine, question) + regulation_candidates(db, question):
+        if line in lines:
+            continue
+        # +1 токен на перевод строки
+        cost = estimate_tokens(line) + 1
+        if used + cost > token_budget:
+            continue
+        lines.append(line)
+        used += cost
+        if code and code not in regulations:
+            regulations.append(code)
+    return ConsultContext(lines, regulations)
+
+
+class ConsultContextCache:
+    """In-memory кеш контекста по нормализованному вопросу (LRU с временем жизни)"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Args:
+            ttl_seconds: Время жизни контекста (нормативы в БД могут измениться)
+            max_entries: Максимум вопросов в кеше
+        """
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.AI_CONSULT_CONTEXT_TTL
+        self.max_entries = max_entries if max_entries is not None else settings.AI_CONSULT_CONTEXT_CACHE_SIZE
+        self._entries: "OrderedDict[str, Tuple[float, ConsultContext]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(question: str) -> str:
+        """Ключ кеша: регистр, ё/е и пробелы не важны"""
+        return " ".join(normalize(question).split())
+
+    def get_or_build(self, question: str, builder: Callable[[], ConsultContext]) -> ConsultContext:
+        """
+        Контекст из кеша или собранный builder
+
+        Args:
+            question: Вопрос пользователя
+            builder: Сборка контекста (поиск по индексам)
+        """
+        key = self.key(question)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Поиск - вне блокировки, чтобы не задерживать другие вопросы
+        context = builder()
+        with self._lock:
+            self._entries[key] = (now, context)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return context
+
+    def clear(self):
+        """Сброс кеша"""
+        with self._lock:
+            self._entries.clear()
+
+
+consult_context_cache = ConsultContextCache()
+
+
+def get_consult_context(db: Session, question: str) -> ConsultContext:
+    """Контекст нормативов к вопросу (с кешем)"""
+    return consult_context_cache.get_or_build(question, lambda: build_context(db, question))
@@ -0,0 +1,357 @@
+"""
+Движок базы знаний AI консультанта
+
+Содержимое базы знаний хранится в data/knowledge_base:
+- index.json: метаданные тем (ключевые слова, нормативы, сложность, время
+  чтения, термины) и пути к текстам тем - загружается целиком и остается в памяти
+- topics/*.html: тексты тем в двух редакциях ("classic" - подробный ответ,
+  "structured" - структурированный ответ V2) - читаются с диска при первом
+  обращении, в памяти хранятся только последние использованные
+
+Темы выбираются по ключевым словам (автомат Ахо-Корасик). Если ключевые
+слова почти не нашлись ("усадка основания" вместо "осадка фундамента"),
+используется векторный поиск по разделам тем и требованиям нормативов
+(app.search.embeddings); векторный индекс сохраняется в
+data/knowledge_base/embeddings.npz и перестраивается при изменении данных.
+
+Движок создается при первом вопросе, а не при импорте модуля, поэтому импорт
+сервисов консультанта (в том числе воркерами Celery) не читает базу знаний.
+"""
+import hashlib
+import html
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.search.embeddings import VectorIndex
+from app.search.keywords import KeywordMatcher
+from app.search.requirements import RequirementsIndex
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+KNOWLEDGE_BASE_DIR = DATA_DIR / "knowledge_base"
+REGULATIONS_DATABASE_PATH = DATA_DIR / "regulations_database.json"
+EMBEDDINGS_PATH = KNOWLEDGE_BASE_DIR / "embeddings.npz"
+
+# Сколько текстов тем держать в памяти
+BODY_CACHE_SIZE = 8
+
+# Ниже этого веса ключевых слов тема ищется по смыслу
+KEYWORD_MIN_SCORE = 1.0
+# Минимальная косинусная близость векторного поиска
+SEMANTIC_MIN_SCORE = 0.2
+# Размер раздела темы для векторного индекса, символов
+SECTION_MAX_CHARS = 600
+
+TAG_RE = re.compile(r"<[^>]+>")
+BREAK_RE = re.compile(r"<br\s*/?>|</(?:p|div|h\d|li|section)>", re.IGNORECASE)
+
+CLASSIC = "classic"
+STRUCTURED = "structured"
+
+
+class ComplexityLevel(str, Enum):
+    """Уровень сложности темы"""
+    BASIC = "Начальный"
+    INTERMEDIATE = "Средний"
+    ADVANCED = "Продвинутый"
+    EXPERT = "Экспертный"
+
+
+class TopicMeta:
+    """Метаданные темы базы знаний (без текста)"""
+
+    def __init__(self, key: str, data: Dict[str, Any]):
+        self.key = key
+        self.title = data["title"]
+        self.keywords: List[str] = data.get("keywords", [])
+        self.regulations: List[str] = data.get("regulations", [])
+        self.complexity = ComplexityLevel(data.get("complexity", ComplexityLevel.INTERMEDIATE.value))
+        self.reading_time_minutes: int = data.get("reading_time_minutes", 1)
+        self.key_terms: List[str] = data.get("key_terms", [])
+        self.related_topics: List[str] = data.get("related_topics", [])
+        # Редакция -> путь к тексту относительно каталога базы знаний
+        self.bodies: Dict[str, str] = data["bodies"]
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """Метаданные для ответа консультанта"""
+        return {
+            "topic": self.title,
+            "complexity": self.complexity.value,
+            "reading_time_minutes": self.reading_time_minutes,
+            "key_terms": self.key_terms,
+            "related_topics": self.related_topics,
+            "regulations": self.regulations,
+        }
+
+
+class KnowledgeBase:
+    """Метаданные тем в памяти, тексты - с диска по запросу"""
+
+    GENERAL = "general"
+
+    def __init__(self, directory: Path = KNOWLEDGE_BASE_DIR, cache_size: int = BODY_CACHE_SIZE):
+        """
+        Args:
+            directory: Каталог с index.json и текстами тем
+            cache_size: Сколько текстов тем держать в памяти
+        """
+        self.directory = Path(directory)
+        self.cache_size = cache_size
+        with open(self.directory / "index.json", "r", encoding="utf-8") as f:
+            index = json.load(f)
+
+        self.topics: Dict[str, TopicMeta] = {
+            key: TopicMeta(key, data) for key, data in index["topics"].items()
+        }
+        self.general = TopicMeta(self.GENERAL, index["general"])
+        self.matcher = KeywordMatcher.from_topics({key: topic.keywords for key, topic in self.topics.items()})
+        self._bodies: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.topics
+
+    def _topic(self, key: str) -> TopicMeta:
+        return self.general if key == self.GENERAL else self.topics[key]
+
+    def body(self, key: str, edition: str = CLASSIC) -> str:
+        """
+        Текст темы
+
+        Args:
+            key: Ключ темы (или KnowledgeBase.GENERAL - общий ответ)
+            edition: Редакция; если у темы ее нет - берется подробный ответ
+
+        Returns:
+            HTML текст
+        """
+        topic = self._topic(key)
+        edition = edition if edition in topic.bodies else CLASSIC
+        cache_key = (key, edition)
+
+        with self._lock:
+            body = self._bodies.get(cache_key)
+            if body is not None:
+                self._bodies.move_to_end(cache_key)
+                return body
+
+        body = (self.directory / topic.bodies[edition]).read_text(encoding="utf-8")
+        with self._lock:
+            self._bodies[cache_key] = body
+            while len(self._bodies) > self.cache_size:
+                self._bodies.popitem(last=False)
+            self.loads += 1
+        return body
+
+    def match(self, question: str, limit: int = 3) -> List[Tuple[str, float]]:
+        """Темы по весу найденных в вопросе ключевых слов"""
+        return self.matcher.rank(question, limit=limit)
+
+
+def split_sections(body: str, max_chars: int = SECTION_MAX_CHARS) -> List[str]:
+    """
+    Разбиение HTML текста темы на разделы по абзацам
+
+    Returns:
+        Тексты разделов без разметки, не длиннее max_chars (кроме длинных абзацев)
+    """
+    text = html.unescape(TAG_RE.sub(" ", BREAK_RE.sub("\n", body)))
+    paragraphs = [" ".join(line.split()) for line in text.split("\n")]
+    sections, current = [], ""
+    for paragraph in filter(None, paragraphs):
+        if current and len(current) + len(paragraph) + 1 > max_chars:
+            sections.append(current)
+            current = paragraph
+        else:
+            current = f"{current} {paragraph}" if current else paragraph
+    if current:
+        sections.append(current)
+    return sections
+
+
+class ConsultantEngine:
+    """База знаний и поиск по нормативам для сервисов консультанта"""
+
+    def __init__(
+        self,
+        knowledge_base: Optional[KnowledgeBase] = None,
+        regulations_path: Path = REGULATIONS_DATABASE_PATH,
+        embeddings_path: Optional[Path] = EMBEDDINGS_PATH
+    ):
+        """
+        Args:
+            knowledge_base: База знаний (по умолчанию data/knowledge_base)
+            regulations_path: База нормативов
+            embeddings_path: Файл векторного индекса (None - не сохранять)
+        """
+        self.knowledge_base = knowledge_base or KnowledgeBase()
+        self.regulations_path = regulations_path
+        self.embeddings_path = embeddings_path
+        self._regulations_db: Optional[Dict[str, Any]] = None
+        self._requirements_index: Optional[RequirementsIndex] = None
+        self._semantic_index: Optional[VectorIndex] = None
+        # Векторный индекс строится по индексу требований - блокировка повторно входимая
+        self._lock = threading.RLock()
+
+    @property
+    def regulations_db(self) -> Dict[str, Any]:
+        """База нормативов (загружается при первом обращении)"""
+        if self._regulations_db is None:
+            try:
+                with open(self.regulations_path, "r", encoding="utf-8") as f:
+                    self._regulations_db = json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading regulations database: {e}")
+                self._regulations_db = {"regulations": [], "defect_categories": []}
+        return self._regulations_db
+
+    @property
+    def requirements_index(self) -> RequirementsIndex:
+        """Индекс BM25 требований нормативов (строится при первом поиске)"""
+        if self._requirements_index is None:
+            with self._lock:
+                if self._requirements_index is None:
+                    self._requirements_index = RequirementsIndex(self.regulations_db.get("regulations", []))
+        return self._requirements_index
+
+    def _fingerprint(self) -> str:
+        """Отпечаток исходных данных векторного индекса: размеры и время изменения файлов"""
+        directory = self.knowledge_base.directory
+        paths = [directory / "index.json", self.regulations_path]
+        for topic in (*self.knowledge_base.topics.values(), self.knowledge_base.general):
+            paths.extend(directory / body for body in topic.bodies.values())
+
+        digest = hashlib.sha1(str(SECTION_MAX_CHARS).encode())
+        for path in paths:
+            try:
+                stat = path.stat()
+                digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+            except OSError:
+                digest.update(f"{path}:missing".encode())
+        return digest.hexdigest()
+
+    def _build_semantic_index(self, fingerprint: str) -> VectorIndex:
+        items = []
+        for key, topic in self.knowledge_base.topics.items():
+            # Тексты читаются напрямую, минуя кэш: построение - разовая операция
+            for edition, relative_path in topic.bodies.items():
+                body = (self.knowledge_base.directory / relative_path).read_text(encoding="utf-8")
+                for number, section in enumerate(split_sections(body)):
+                    items.append((("section", key, f"{edition}:{number}"), f"{topic.title}. {section}"))
+        for (regulation_id, position), text in self.requirements_index.texts():
+            items.append((("requirement", regulation_id, position), text))
+        return VectorIndex.build(items, fingerprint=fingerprint)
+
+    @property
+    def semantic_index(self) -> VectorIndex:
+        """
+        Векторный индекс разделов тем и требований нормативов
+
+        Загружается из embeddings_path; если файла нет или данные изменились -
+        строится заново и сохраняется.
+        """
+        if self._semantic_index is None:
+            with self._lock:
+                if self._semantic_index is None:
+                    self._semantic_index = self._load_semantic_index()
+        return self._semantic_index
+
+    def _load_semantic_index(self) -> VectorIndex:
+        fingerprint = self._fingerprint()
+        if self.embeddings_path is not None:
+            index = VectorIndex.load(self.embeddings_path, fingerprint)
+            if index is not None:
+                return index
+
+        index = self._build_semantic_index(fingerprint)
+        logger.info(f"Built consultant semantic index: {len(index)} vectors")
+        if self.embeddings_path is not None:
+            try:
+                index.save(self.embeddings_path)
+            except OSError as e:
+                logger.warning(f"Failed to save consultant semantic index: {e}")
+        return index
+
+    def semantic_search(self, query: str, limit: int = 5, kind: Optional[str] = None) -> List[Tuple[tuple, float]]:
+        """
+        Векторный поиск по смыслу
+
+        Args:
+            query: Текст запроса
+            limit: Максимум результатов
+            kind: "section" или "requirement" (None - все)
+
+        Returns:
+            Список (ключ, близость): ("section", тема, раздел) или ("requirement", норматив, номер)
+        """
+        index = self.semantic_index
+        # Кандидатов берем с запасом, чтобы после фильтра по типу осталось limit
+        hits = index.search(query, limit=len(index) if kind else limit, min_score=SEMANTIC_MIN_SCORE)
+        if kind:
+            hits = [(key, score) for key, score in hits if key[0] == kind]
+        return hits[:limit]
+
+    def match_topics(self, question: str, limit: int = 3) -> List[Tuple[str, float]]:
+        """
+        Темы базы знаний, подходящие к вопросу
+
+        По весу найденных ключевых слов; если он ниже KEYWORD_MIN_SCORE -
+        по близости вопроса к разделам тем.
+
+        Args:
+            question: Вопрос пользователя
+            limit: Максимум тем
+
+        Returns:
+            Список (ключ темы, score) по убыванию score
+        """
+        topics = self.knowledge_base.match(question, limit=limit)
+        if topics and topics[0][1] >= KEYWORD_MIN_SCORE:
+            return topics
+
+        semantic: Dict[str, float] = {}
+        for (_, topic, _), score in self.semantic_search(question, limit=limit * 4, kind="section"):
+            semantic.setdefault(topic, score)
+        if not semantic:
+            return topics
+        return list(semantic.items())[:limit]
+
+    def search_regulations(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Нормативы по убыванию релевантности (с лучшими требованиями)"""
+        return self.requirements_index.search_regulations(query, limit=limit)
+
+    def search_requirements(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Требования нормативов со ссылками на пункты
+
+        BM25 по словам запроса; если слова не нашлись - векторный поиск по смыслу.
+        """
+        results = self.requirements_index.search_requirements(query, limit=limit)
+        if results:
+            return results
+        return [
+            self.requirements_index.requirement(regulation_id, position, score)
+            for (_, regulation_id, position), score in self.semantic_search(query, limit=limit, kind="requirement")
+        ]
+
+
+_engine: Optional[ConsultantEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_consultant_engine() -> ConsultantEngine:
+    """Общий движок процесса (создается при первом обращении)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = ConsultantEngine()
+    return _engine
@@ -512,6 +512,77 @@ class DocumentService:
         logger.info("Prescription document generated successfully")
         return buffer.getvalue()
 
+    def generate_statistics_report(self, stats_data: Dict[str, Any]) -> bytes:
+        """
+        Генерация сводного отчета по статистике
+
+        Args:
+            stats_data: Данные отчета
+                - title: Заголовок (проект или дашборд)
+                - snapshot_at: Момент снимка статистики
+                - exported_by: Кто выгрузил
+                - rows: Список пар (показатель, значение)
+
+        Returns:
+            bytes: PDF отчет
+        """
+        logger.info(f"Generating statistics report: {stats_data.get('title')}")
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=A4,
+            rightMargin=20 * mm,
+            leftMargin=20 * mm,
+            topMargin=20 * mm,
+            bottomMargin=20 * mm,
+        )
+
+        story = []
+
+        # Заголовок
+        story.append(Paragraph("СВОДНАЯ СТАТИСТИКА", self.styles["CustomTitle"]))
+        story.append(
+            Paragraph(stats_data.get("title", "—"), self.styles["CustomHeading"])
+        )
+        story.append(
+            Paragraph(
+                f"Данные на {stats_data.get('snapshot_at', '—')} (UTC), "
+                f"выгрузил: {stats_data.get('exported_by', '—')}",
+                self.styles["RightAlign"],
+            )
+        )
+        story.append(Spacer(1, 8 * mm))
+
+        # Показатели
+        rows = [["Показатель", "Значение"]]
+        rows.extend(
+            [str(metric), "—" if value is None else str(value)]
+            for metric, value in stats_data.get("rows", [])
+        )
+
+        stats_table = Table(rows, colWidths=[110 * mm, 60 * mm], repeatRows=1)
+        stats_table.setStyle(
+            TableStyle(
+                [
+                    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                    ("FONTSIZE", (0, 0), (-1, -1), 10),
+                    ("ALIGN", (1, 1), (1, -1), "RIGHT"),
+                    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+                ]
+            )
+        )
+        story.append(stats_table)
+
+        # Генерация
+        doc.build(story)
+        buffer.seek(0)
+
+        logger.info("Statistics report generated successfully")
+        return buffer.getvalue()
+
     def export_to_word(self, data: Dict[str, Any], template: str) -> str:
         """
         Экспорт данных в Word документ
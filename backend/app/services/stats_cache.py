@@ -0,0 +1,134 @@
+"""
+Stats Snapshot Cache - Кеш снимков статистики для экспорта
+
+Функции:
+- Хранение рассчитанной статистики по ключу (пользователь, проект, момент снимка)
+- Повторный экспорт того же периода без запросов к БД
+- Ограничение по времени жизни и количеству снимков (LRU)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+SnapshotKey = Tuple[int, Optional[int], int]
+
+
+class StatsSnapshotCache:
+    """In-memory кеш снимков статистики"""
+
+    def __init__(self, ttl_seconds: int = 300, max_entries: int = 1000):
+        """
+        Args:
+            ttl_seconds: Длина окна снимка; в пределах окна экспорт использует один снимок
+            max_entries: Максимальное количество хранимых снимков
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._snapshots: "OrderedDict[SnapshotKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _window_start(self, now: float) -> int:
+        """Начало окна снимка (unix timestamp, кратный ttl)"""
+        return int(now // self.ttl_seconds * self.ttl_seconds)
+
+    def _evict_expired(self, now: float):
+        """Удаление снимков старше двух окон"""
+        horizon = now - 2 * self.ttl_seconds
+        expired = [key for key in self._snapshots if key[2] < horizon]
+        for key in expired:
+            del self._snapshots[key]
+
+    def get(self, user_id: int, project_id: Optional[int], snapshot_ts: int) -> Optional[Dict[str, Any]]:
+        """
+        Получение снимка по точному ключу
+
+        Args:
+            user_id: ID пользователя
+            project_id: ID проекта (None для дашборда)
+            snapshot_ts: Момент снимка (unix timestamp)
+
+        Returns:
+            Снимок или None
+        """
+        key = (user_id, project_id, snapshot_ts)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None:
+                self._snapshots.move_to_end(key)
+        return snapshot
+
+    def get_or_create(
+        self,
+        user_id: int,
+        project_id: Optional[int],
+        builder: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Получение снимка статистики или расчет нового
+
+        Args:
+            user_id: ID пользователя
+            project_id: ID проекта (None для дашборда)
+            builder: Функция расчета статистики (выполняет запросы к БД)
+
+        Returns:
+            Снимок: {"snapshot_ts", "snapshot_at", "stats"}
+        """
+        now = time.time()
+        window = self._window_start(now)
+
+        cached = self.get(user_id, project_id, window)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        logger.info(f"Building stats snapshot: user_id={user_id}, project_id={project_id}, ts={window}")
+
+        snapshot = {
+            "snapshot_ts": window,
+            "snapshot_at": datetime.utcfromtimestamp(window).isoformat(),
+            "stats": builder(),
+        }
+
+        with self._lock:
+            self._evict_expired(now)
+            self._snapshots[(user_id, project_id, window)] = snapshot
+            while len(self._snapshots) > self.max_entries:
+                self._snapshots.popitem(last=False)
+
+        return snapshot
+
+    def invalidate(self, user_id: Optional[int] = None, project_id: Optional[int] = None):
+        """
+        Сброс снимков пользователя и/или проекта
+
+        Args:
+            user_id: ID пользователя (None - любой)
+            project_id: ID проекта (None - любой)
+        """
+        with self._lock:
+            keys = [
+                key for key in self._snapshots
+                if (user_id is None or key[0] == user_id)
+                and (project_id is None or key[1] == project_id)
+            ]
+            for key in keys:
+                del self._snapshots[key]
+
+    def clear(self):
+        """Полная очистка кеша"""
+        with self._lock:
+            self._snapshots.clear()
+
+
+# Singleton instance
+stats_cache = StatsSnapshotCache()
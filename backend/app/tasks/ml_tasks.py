@@ -5,6 +5,8 @@ from celery import Task
 from app.celery_app import celery_app
 from app.database import SessionLocal
 from app.models.inspection import InspectionPhoto, DefectDetection
+from app.realtime.backplane import publish_project_sync
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -56,6 +58,7 @@ def analyze_photo(photo_id: int):
         ]
 
         # Сохранение обнаруженных дефектов
+        defects = []
         for detection_data in demo_detections:
             defect = DefectDetection(
                 photo_id=photo_id,
@@ -63,6 +66,7 @@ def analyze_photo(photo_id: int):
                 **detection_data
             )
             db.add(defect)
+            defects.append(defect)
 
         # Обновление статуса фото
         photo.ai_analyzed = True
@@ -70,6 +74,22 @@ def analyze_photo(photo_id: int):
 
         db.commit()
 
+        # Уведомляем подписчиков проекта во всех воркерах API
+        project_id = photo.inspection.project_id
+        for detection_data, defect in zip(demo_detections, defects):
+            publish_project_sync(project_id, {
+                "type": "defect_detected",
+                "defect_id": defect.id,
+                "photo_id": photo_id,
+                "project_id": project_id,
+                "data": {
+                    "defect_type": detection_data["defect_type"],
+                    "severity": detection_data["severity"],
+                    "confidence": detection_data["confidence_score"],
+                },
+                "timestamp": datetime.now().isoformat()
+            })
+
         logger.info(f"Photo {photo_id} analyzed successfully. Found {len(demo_detections)} defects")
 
         return {
@@ -0,0 +1,62 @@
+"""
+Задачи индексации в поисковом бэкенде
+"""
+from typing import List, Optional
+from celery import Task
+from app.celery_app import celery_app
+from app.database import SessionLocal
+from app.search.backends import RETRYABLE_ERRORS
+from app.search.indexer import INDEXES, index_entities, reindex
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SearchIndexTask(Task):
+    """Базовый класс для задач индексации"""
+
+    # Кластер может быть временно недоступен - повторяем
+    autoretry_for = RETRYABLE_ERRORS
+    retry_backoff = True
+    max_retries = 5
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        logger.error(f"Search Index Task {task_id} failed: {exc}")
+        super().on_failure(exc, task_id, args, kwargs, einfo)
+
+
+@celery_app.task(base=SearchIndexTask, name="app.tasks.search_tasks.index_entities")
+def index_entities_task(index: str, ids: List[int]):
+    """
+    Индексация измененных объектов (отправляется после commit)
+
+    Args:
+        index: Имя индекса (projects, inspections, documents, regulations)
+        ids: ID объектов; удаленные из БД удаляются из индекса
+    """
+    db = SessionLocal()
+
+    try:
+        indexed = index_entities(db, index, ids)
+        logger.info(f"Indexed {indexed} {index} documents")
+        return {"index": index, "operations": indexed}
+    finally:
+        db.close()
+
+
+@celery_app.task(base=SearchIndexTask, name="app.tasks.search_tasks.reindex_all")
+def reindex_all(index: Optional[str] = None, recreate: bool = False):
+    """
+    Полная переиндексация
+
+    Args:
+        index: Имя индекса (None - все)
+        recreate: Пересоздать индекс (после изменения mapping)
+    """
+    db = SessionLocal()
+
+    try:
+        names = [index] if index else list(INDEXES)
+        return {name: reindex(db, name, recreate=recreate) for name in names}
+    finally:
+        db.close()
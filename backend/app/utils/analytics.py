@@ -0,0 +1,221 @@
+"""
+Векторизованная аналитика на NumPy
+
+Используется эндпоинтами статистики для распределений (уверенность ИИ,
+длительности) и группировки событий по датам без поэлементных циклов Python.
+"""
+from typing import Any, Dict, Iterable, Optional, Sequence
+from datetime import date, datetime
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PERCENTILES = (25, 50, 75, 90, 95, 99)
+
+# Единицы datetime64 для группировки по периодам
+BUCKET_UNITS = {
+    "day": "D",
+    "week": "W",
+    "month": "M",
+    "year": "Y",
+}
+
+
+def to_float_array(values: Iterable[Any]) -> np.ndarray:
+    """
+    Преобразование последовательности значений в массив float64
+
+    None и нечисловые значения отбрасываются (как NULL в SQL агрегатах).
+
+    Args:
+        values: Последовательность чисел (может содержать None)
+
+    Returns:
+        Одномерный массив float64 без NaN
+    """
+    if isinstance(values, np.ndarray):
+        array = values.astype(np.float64, copy=False).ravel()
+    else:
+        array = np.fromiter(
+            (v if v is not None else np.nan for v in values),
+            dtype=np.float64
+        )
+    return array[~np.isnan(array)]
+
+
+def describe(
+    values: Iterable[Any],
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    bins: int = 10,
+    value_range: Optional[tuple] = None
+) -> Dict[str, Any]:
+    """
+    Описательная статистика за один проход по данным
+
+    Массив строится один раз, затем все показатели считаются
+    векторизованными операциями NumPy.
+
+    Args:
+        values: Последовательность чисел
+        percentiles: Перцентили для расчета (0-100)
+        bins: Количество интервалов гистограммы
+        value_range: Границы гистограммы (min, max), например (0, 1) для confidence
+
+    Returns:
+        Словарь со статистикой (count, min, max, sum, avg, std, percentiles, histogram)
+    """
+    array = to_float_array(values)
+    count = int(array.size)
+
+    if count == 0:
+        return {
+            "count": 0,
+            "min": 0.0,
+            "max": 0.0,
+            "sum": 0.0,
+            "avg": 0.0,
+            "std": 0.0,
+            "percentiles": {f"p{p:g}": 0.0 for p in percentiles},
+            "histogram": {"bins": [], "counts": []},
+        }
+
+    total = float(array.sum())
+    mean = total / count
+    # Стандартное отклонение генеральной совокупности (ddof=0)
+    std = float(np.sqrt(np.mean((array - mean) ** 2)))
+
+    percentile_values = np.percentile(array, percentiles) if len(percentiles) else []
+    counts, edges = np.histogram(array, bins=bins, range=value_range)
+
+    return {
+        "count": count,
+        "min": float(array.min()),
+        "max": float(array.max()),
+        "sum": total,
+        "avg": mean,
+        "std": std,
+        "percentiles": {
+            f"p{p:g}": round(float(v), 6)
+            for p, v in zip(percentiles, percentile_values)
+        },
+        "histogram": {
+            "bins": [round(float(edge), 6) for edge in edges],
+            "counts": counts.tolist(),
+        },
+    }
+
+
+def to_datetime64(timestamps: Iterable[Any]) -> np.ndarray:
+    """
+    Преобразование последовательности дат в массив datetime64[s]
+
+    Args:
+        timestamps: datetime, date или ISO строки (None отбрасываются)
+
+    Returns:
+        Массив datetime64[s] без NaT
+    """
+    if isinstance(timestamps, np.ndarray) and np.issubdtype(timestamps.dtype, np.datetime64):
+        array = timestamps.astype("datetime64[s]")
+    else:
+        array = np.array(
+            [
+                np.datetime64(t.replace(tzinfo=None) if isinstance(t, datetime) else t, "s")
+                if t is not None else np.datetime64("NaT")
+                for t in timestamps
+            ],
+            dtype="datetime64[s]"
+        )
+    return array[~np.isnat(array)]
+
+
+def bucket_by_date(
+    timestamps: Iterable[Any],
+    period: str = "day",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    fill_gaps: bool = False
+) -> Dict[str, int]:
+    """
+    Векторизованная группировка событий по периодам
+
+    Args:
+        timestamps: Временные метки событий
+        period: Период группировки (day, week, month, year)
+        date_from: Начало периода (включительно) для заполнения пропусков
+        date_to: Конец периода (включительно) для заполнения пропусков
+        fill_gaps: Добавлять периоды без событий с нулевым значением
+
+    Returns:
+        Упорядоченный словарь {начало периода ISO: количество событий}
+    """
+    if period not in BUCKET_UNITS:
+        raise ValueError(f"Unsupported period: {period}")
+
+    unit = BUCKET_UNITS[period]
+    array = to_datetime64(timestamps)
+
+    if period == "week":
+        # datetime64[W] начинается с четверга (эпоха 1970-01-01), выравниваем по понедельнику
+        days = array.astype("datetime64[D]").astype(np.int64)
+        buckets = ((days - 4) // 7 * 7 + 4).astype("datetime64[D]")
+    else:
+        buckets = array.astype(f"datetime64[{unit}]")
+
+    keys, counts = np.unique(buckets, return_counts=True)
+    result = {_bucket_label(key): int(count) for key, count in zip(keys, counts)}
+
+    if not fill_gaps:
+        return result
+
+    start = np.datetime64(date_from, "D") if date_from else (keys.min() if keys.size else None)
+    end = np.datetime64(date_to, "D") if date_to else (keys.max() if keys.size else None)
+    if start is None or end is None:
+        return result
+
+    full_range = _period_range(start, end, period)
+    return {label: result.get(label, 0) for label in (_bucket_label(p) for p in full_range)}
+
+
+def _period_range(start: np.datetime64, end: np.datetime64, period: str) -> np.ndarray:
+    """Последовательность начал периодов между start и end"""
+    if period == "week":
+        start_days = start.astype("datetime64[D]").astype(np.int64)
+        end_days = end.astype("datetime64[D]").astype(np.int64)
+        first = (start_days - 4) // 7 * 7 + 4
+        return np.arange(first, end_days + 1, 7).astype("datetime64[D]")
+
+    unit = BUCKET_UNITS[period]
+    return np.arange(
+        start.astype(f"datetime64[{unit}]"),
+        end.astype(f"datetime64[{unit}]") + np.timedelta64(1, unit)
+    )
+
+
+def _bucket_label(value: np.datetime64) -> str:
+    """Метка периода в формате ISO (YYYY-MM-DD)"""
+    return str(value.astype("datetime64[D]"))
+
+
+def rate_per_period(counts: Dict[str, int]) -> Dict[str, float]:
+    """
+    Статистика интенсивности событий по периодам
+
+    Args:
+        counts: Результат bucket_by_date
+
+    Returns:
+        Словарь со средним, медианой, максимумом и стандартным отклонением
+    """
+    array = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    if array.size == 0:
+        return {"avg": 0.0, "median": 0.0, "max": 0.0, "std": 0.0}
+
+    return {
+        "avg": round(float(array.mean()), 2),
+        "median": float(np.median(array)),
+        "max": float(array.max()),
+        "std": round(float(array.std()), 2),
+    }
@@ -0,0 +1,203 @@
+"""
+Потоковая выгрузка в колоночные форматы (Parquet, Arrow IPC)
+
+Строки читаются из курсора БД пачками, каждая пачка превращается в Arrow
+RecordBatch и сразу записывается в выходной поток. Колонки-перечисления
+кодируются словарем (dictionary encoding) с фиксированным набором значений.
+"""
+import enum
+import io
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    pyarrow_available = True
+except ImportError:
+    pyarrow_available = False
+
+DEFAULT_BATCH_SIZE = 10000
+
+ColumnType = Union[str, type]
+ColumnSpec = Sequence[Tuple[str, ColumnType]]
+
+# Типы колонок, поддерживаемые в спецификации
+SCALAR_TYPES = ("int", "float", "string", "bool", "timestamp")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Файловый объект, накапливающий записанные байты до следующего сброса"""
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _arrow_type(column_type: ColumnType):
+    """Arrow тип для колонки спецификации"""
+    if isinstance(column_type, type) and issubclass(column_type, enum.Enum):
+        return pa.dictionary(pa.int16(), pa.string())
+    if column_type == "int":
+        return pa.int64()
+    if column_type == "float":
+        return pa.float64()
+    if column_type == "string":
+        return pa.string()
+    if column_type == "bool":
+        return pa.bool_()
+    if column_type == "timestamp":
+        return pa.timestamp("us")
+    raise ValueError(f"Unsupported column type: {column_type}")
+
+
+def build_schema(columns: ColumnSpec):
+    """
+    Arrow схема по спецификации колонок
+
+    Args:
+        columns: Список (имя, тип), где тип - одна из SCALAR_TYPES или класс Enum
+
+    Returns:
+        pyarrow.Schema
+    """
+    return pa.schema([pa.field(name, _arrow_type(column_type)) for name, column_type in columns])
+
+
+def _enum_array(values: List[Any], enum_cls: type):
+    """Словарный массив с фиксированным словарем из значений перечисления"""
+    members = [member.value for member in enum_cls]
+    positions = {value: index for index, value in enumerate(members)}
+    indices = pa.array(
+        [None if v is None else positions[getattr(v, "value", v)] for v in values],
+        type=pa.int16()
+    )
+    return pa.DictionaryArray.from_arrays(indices, pa.array(members, type=pa.string()))
+
+
+def iter_record_batches(
+    rows: Iterable[Sequence[Any]],
+    columns: ColumnSpec,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator["pa.RecordBatch"]:
+    """
+    Преобразование потока строк в Arrow RecordBatch фиксированного размера
+
+    Args:
+        rows: Итератор строк (кортежей в порядке колонок спецификации)
+        columns: Спецификация колонок
+        batch_size: Количество строк в пачке
+
+    Yields:
+        pyarrow.RecordBatch
+    """
+    schema = build_schema(columns)
+    buffers: List[List[Any]] = [[] for _ in columns]
+
+    def flush():
+        arrays = [
+            _enum_array(values, column_type)
+            if isinstance(column_type, type) and issubclass(column_type, enum.Enum)
+            else pa.array(values, type=field.type)
+            for values, (_, column_type), field in zip(buffers, columns, schema)
+        ]
+        for values in buffers:
+            values.clear()
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    count = 0
+    for row in rows:
+        for values, value in zip(buffers, row):
+            values.append(value)
+        count += 1
+        if count == batch_size:
+            yield flush()
+            count = 0
+
+    if count:
+        yield flush()
+
+
+def stream_parquet(
+    rows: Iterable[Sequence[Any]],
+    columns: ColumnSpec,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    compression: str = "zstd"
+) -> Iterator[bytes]:
+    """
+    Потоковая запись Parquet: одна пачка строк - одна row group
+
+    Args:
+        rows: Итератор строк
+        columns: Спецификация колонок
+        batch_size: Строк в row group
+        compression: Кодек сжатия (zstd, snappy, gzip, none)
+
+    Yields:
+        Байтовые чанки файла Parquet
+    """
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, build_schema(columns), compression=compression)
+
+    try:
+        for batch in iter_record_batches(rows, columns, batch_size):
+            writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+
+def stream_arrow_ipc(
+    rows: Iterable[Sequence[Any]],
+    columns: ColumnSpec,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[bytes]:
+    """
+    Потоковая запись Arrow IPC (streaming format)
+
+    Args:
+        rows: Итератор строк
+        columns: Спецификация колонок
+        batch_size: Строк в RecordBatch
+
+    Yields:
+        Байтовые чанки Arrow IPC потока
+    """
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, build_schema(columns))
+
+    try:
+        # Схема пишется вместе с первой пачкой, при пустой выборке - при закрытии
+        for batch in iter_record_batches(rows, columns, batch_size):
+            writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+
+    tail = sink.drain()
+    if tail:
+        yield tail
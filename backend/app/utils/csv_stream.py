@@ -0,0 +1,63 @@
+"""
+Потоковая генерация CSV с постоянным потреблением памяти
+"""
+import csv
+import io
+from typing import Any, Iterable, Iterator, Sequence
+
+# BOM нужен Excel, чтобы открыть UTF-8 CSV с кириллицей без ручного выбора кодировки
+UTF8_BOM = b"\xef\xbb\xbf"
+
+DEFAULT_CHUNK_SIZE = 64 * 1024  # 64 KB
+DEFAULT_FETCH_SIZE = 1000  # Строк за одно чтение серверного курсора
+
+
+def stream_csv(
+    header: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    bom: bool = True,
+    encoding: str = "utf-8"
+) -> Iterator[bytes]:
+    """
+    Генератор CSV, отдающий байтовые чанки фиксированного размера
+
+    Заголовок отдается сразу (первый байт уходит клиенту до выполнения запроса к БД),
+    далее строки накапливаются в буфере и сбрасываются блоками по chunk_size байт.
+    В памяти одновременно находится не больше одного чанка и одной строки.
+
+    Args:
+        header: Заголовки колонок
+        rows: Итератор строк (например, Query.yield_per)
+        chunk_size: Размер чанка в байтах
+        bom: Добавлять UTF-8 BOM в начало файла
+        encoding: Кодировка вывода
+
+    Yields:
+        Байтовые чанки CSV
+    """
+    text_buffer = io.StringIO()
+    writer = csv.writer(text_buffer)
+    pending = bytearray(UTF8_BOM if bom else b"")
+
+    def drain_text() -> bytes:
+        data = text_buffer.getvalue().encode(encoding)
+        text_buffer.seek(0)
+        text_buffer.truncate(0)
+        return data
+
+    writer.writerow(header)
+    pending += drain_text()
+    yield bytes(pending)
+    pending.clear()
+
+    for row in rows:
+        writer.writerow(["" if value is None else value for value in row])
+        pending += drain_text()
+
+        while len(pending) >= chunk_size:
+            yield bytes(pending[:chunk_size])
+            del pending[:chunk_size]
+
+    if pending:
+        yield bytes(pending)
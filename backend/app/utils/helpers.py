@@ -309,6 +309,30 @@ def merge_dicts_deep(dict1: Dict, dict2: Dict) -> Dict:
     return result
 
 
+def flatten_dict(data: Dict[str, Any], separator: str = ".", prefix: str = "") -> List[tuple]:
+    """
+    Разворачивание вложенного словаря в плоский список пар (путь, значение)
+
+    Args:
+        data: Вложенный словарь
+        separator: Разделитель ключей в пути
+        prefix: Префикс пути (для рекурсии)
+
+    Returns:
+        Список кортежей (путь, значение) в порядке обхода
+    """
+    items = []
+
+    for key, value in data.items():
+        path = f"{prefix}{separator}{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            items.extend(flatten_dict(value, separator, path))
+        else:
+            items.append((path, value))
+
+    return items
+
+
 def chunk_list(items: List[Any], chunk_size: int) -> List[List[Any]]:
     """
     Разбиение списка на чанки указанного размера
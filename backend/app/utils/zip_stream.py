@@ -0,0 +1,99 @@
+"""
+Потоковая запись ZIP архива без временных файлов
+"""
+import zipfile
+from datetime import datetime
+from typing import Iterable, Iterator, Tuple, Union
+
+DEFAULT_CHUNK_SIZE = 64 * 1024  # 64 KB
+FILE_READ_SIZE = 256 * 1024
+
+# Содержимое записи: готовые байты или итератор байтовых чанков
+EntryContent = Union[bytes, Iterable[bytes]]
+ZipEntry = Tuple[str, EntryContent, bool]
+
+
+class _UnseekableSink:
+    """
+    Приемник записи без seek
+
+    zipfile, не имея возможности вернуться к заголовку записи, пишет размеры
+    и CRC в data descriptor после данных - это и позволяет отдавать архив потоком.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def iter_file(path: str, chunk_size: int = FILE_READ_SIZE) -> Iterator[bytes]:
+    """
+    Чтение файла с диска чанками
+
+    Args:
+        path: Путь к файлу
+        chunk_size: Размер чанка чтения
+
+    Yields:
+        Байтовые чанки файла
+    """
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def stream_zip(
+    entries: Iterable[ZipEntry],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Генератор ZIP архива из потока записей
+
+    Записи добавляются в архив по мере поступления из итератора entries,
+    содержимое каждой записи может быть итератором чанков (например, файл с диска).
+
+    Args:
+        entries: Итератор кортежей (имя в архиве, содержимое, сжимать ли запись)
+        chunk_size: Минимальный размер отдаваемого чанка
+
+    Yields:
+        Байтовые чанки ZIP архива
+    """
+    sink = _UnseekableSink()
+    timestamp = datetime.now().timetuple()[:6]
+
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as archive:
+        for arcname, content, compress in entries:
+            info = zipfile.ZipInfo(arcname, date_time=timestamp)
+            info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+
+            chunks = [content] if isinstance(content, (bytes, bytearray)) else content
+            with archive.open(info, mode="w", force_zip64=True) as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+                    if sink.pending() >= chunk_size:
+                        yield sink.drain()
+
+            if sink.pending() >= chunk_size:
+                yield sink.drain()
+
+    tail = sink.drain()
+    if tail:
+        yield tail
@@ -1,11 +1,26 @@
 """
 WebSocket handler для real-time обновлений
 """
+import asyncio
 import json
 import logging
-from typing import Dict, Set, List
+import time
+from typing import Dict, Hashable, Iterable, Set, List, Optional
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
+from app.config import settings
+from app.realtime.backplane import (
+    BROADCAST_CHANNEL,
+    Backplane,
+    create_backplane,
+    project_channel,
+    user_channel,
+)
+from app.realtime.coalescer import EventCoalescer
+from app.realtime.codecs import DEFAULT_ENCODING, get_codec
+from app.realtime.event_log import EventLog, create_event_log
+from app.realtime.metrics import WS_CONNECTIONS, WS_REAPED, WS_REJECTED
+from app.realtime.outbound import ConnectionWriter, OverflowPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -13,23 +28,102 @@ logger = logging.getLogger(__name__)
 class ConnectionManager:
     """
     Менеджер WebSocket подключений для real-time обновлений
+
+    Каждое подключение обслуживает собственный ConnectionWriter с ограниченной
+    очередью: рассылка только ставит сообщения в очереди и не ждет сеть.
+    События проектов и пользователей дублируются в backplane, чтобы их получили
+    подключения других воркеров. Клиенты с флагом batch получают события проекта
+    пакетами раз в окно склейки.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        send_timeout: Optional[float] = None,
+        max_queue: Optional[int] = None,
+        overflow_policy: Optional[str] = None,
+        backplane: Optional[Backplane] = None,
+        batch_window: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        event_log: Optional[EventLog] = None
+    ):
+        # Таймаут отправки одному клиенту: медленный клиент не задерживает остальных
+        self.send_timeout = send_timeout if send_timeout is not None else settings.WS_SEND_TIMEOUT
+        # Размер исходящей очереди и поведение при ее переполнении
+        self.max_queue = max_queue if max_queue is not None else settings.WS_QUEUE_SIZE
+        self.overflow_policy = overflow_policy or settings.WS_OVERFLOW_POLICY
+        if self.overflow_policy not in OverflowPolicy.ALL:
+            raise ValueError(f"Unsupported overflow policy: {self.overflow_policy}")
         # Активные подключения: {user_id: Set[WebSocket]}
         self.active_connections: Dict[int, Set[WebSocket]] = {}
         # Подключения по проектам: {project_id: Set[WebSocket]}
         self.project_connections: Dict[int, Set[WebSocket]] = {}
+        # Обратный индекс подписок: {WebSocket: Set[project_id]}
+        self.connection_projects: Dict[WebSocket, Set[int]] = {}
+        # Количество подключений (поддерживается при connect/disconnect)
+        self._total_connections = 0
         # Метаданные подключений: {WebSocket: dict}
         self.connection_metadata: Dict[WebSocket, dict] = {}
+        # Исходящие очереди подключений: {WebSocket: ConnectionWriter}
+        self.writers: Dict[WebSocket, ConnectionWriter] = {}
+        # Кодировки кадров подключений (json по умолчанию): {WebSocket: codec}
+        self.codecs: Dict[WebSocket, object] = {}
+        # Фоновые задачи закрытия сокетов (держим ссылки до завершения)
+        self._background: Set[asyncio.Task] = set()
+        # Счетчики отключенных писателей (для статистики)
+        self._dropped_total = 0
+        self._coalesced_total = 0
+        # Рассылка между процессами (воркеры uvicorn, Celery)
+        self.backplane = backplane or create_backplane()
+        # Подключения, получающие события проектов пакетами
+        self.batch_connections: Set[WebSocket] = set()
+        self.coalescer = EventCoalescer(
+            window=batch_window if batch_window is not None else settings.WS_BATCH_WINDOW_MS / 1000,
+            on_flush=self._send_batch,
+            max_events=settings.WS_BATCH_MAX_EVENTS
+        )
+        # Серверный heartbeat: одна фоновая задача обходит все подключения
+        self.heartbeat_interval = (
+            heartbeat_interval if heartbeat_interval is not None else settings.WS_HEARTBEAT_INTERVAL
+        )
+        self.idle_timeout = idle_timeout if idle_timeout is not None else settings.WS_IDLE_TIMEOUT
+        self.max_connections = max_connections if max_connections is not None else settings.WS_MAX_CONNECTIONS
+        # Время последнего входящего кадра (time.monotonic): {WebSocket: float}
+        self.last_seen: Dict[WebSocket, float] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self.reaped = 0
+        self.rejected = 0
+        # Журнал событий проектов: номера seq и повтор пропущенного при переподключении
+        self.event_log = event_log or create_event_log()
+
+    async def start(self):
+        """Запуск приема событий других процессов и heartbeat (при старте приложения)"""
+        await self.event_log.start()
+        await self.backplane.start(self._on_backplane_message)
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self):
+        """Остановка heartbeat, backplane и писателей (при остановке приложения)"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        await self.backplane.stop()
+        await self.event_log.stop()
+        await self.coalescer.flush()
+        for websocket in list(self.writers):
+            self.disconnect(websocket)
 
     async def connect(
         self,
         websocket: WebSocket,
         user_id: int,
         project_id: int = None,
-        metadata: dict = None
-    ):
+        metadata: dict = None,
+        codec=None
+    ) -> bool:
         """
         Подключение нового WebSocket клиента
 
@@ -37,20 +131,42 @@ class ConnectionManager:
             websocket: WebSocket соединение
             user_id: ID пользователя
             project_id: ID проекта (опционально)
-            metadata: Дополнительные метаданные
+            metadata: Дополнительные метаданные (encoding - кодировка кадров, batch - пакетная доставка)
+            codec: Готовый кодек кадров вместо encoding (например, SSE_CODEC для SSE подключений)
+
+        Returns:
+            False если достигнут лимит подключений воркера (сокет закрыт с кодом 1013)
+
+        Raises:
+            ValueError: Неизвестная кодировка
         """
+        codec = codec or get_codec((metadata or {}).get("encoding") or DEFAULT_ENCODING)
+
+        if self._total_connections >= self.max_connections:
+            logger.warning(f"WebSocket connection limit reached ({self.max_connections}), rejecting user_id={user_id}")
+            self.rejected += 1
+            WS_REJECTED.inc()
+            # 1013 Try Again Later: клиент переподключится, возможно к другому воркеру.
+            # Код доходит до клиента только после accept: закрытие до рукопожатия - это HTTP 403
+            await websocket.accept()
+            await websocket.close(code=1013)
+            return False
+
         await websocket.accept()
+        self.codecs[websocket] = codec
+        self.last_seen[websocket] = time.monotonic()
 
         # Добавляем в список активных подключений
         if user_id not in self.active_connections:
             self.active_connections[user_id] = set()
+            self.backplane.subscribe(user_channel(user_id))
         self.active_connections[user_id].add(websocket)
+        self.connection_projects[websocket] = set()
+        self._total_connections += 1
 
         # Добавляем в список подключений проекта
         if project_id:
-            if project_id not in self.project_connections:
-                self.project_connections[project_id] = set()
-            self.project_connections[project_id].add(websocket)
+            self._add_project_connection(websocket, project_id)
 
         # Сохраняем метаданные
         self.connection_metadata[websocket] = {
@@ -59,6 +175,19 @@ class ConnectionManager:
             "connected_at": datetime.now(),
             **(metadata or {})
         }
+        self.set_batching(websocket, bool(self.connection_metadata[websocket].get("batch")))
+
+        # Запускаем писателя исходящей очереди
+        writer = ConnectionWriter(
+            websocket,
+            max_queue=self.max_queue,
+            policy=self.overflow_policy,
+            send_timeout=self.send_timeout,
+            on_failure=self._on_writer_failure
+        )
+        self.writers[websocket] = writer
+        writer.start()
+        WS_CONNECTIONS.inc()
 
         logger.info(
             f"WebSocket connected: user_id={user_id}, "
@@ -71,123 +200,476 @@ class ConnectionManager:
             {
                 "type": "connection_established",
                 "message": "Connected to ТехНадзор real-time updates",
+                "heartbeat_interval": self.heartbeat_interval,
                 "timestamp": datetime.now().isoformat()
             }
         )
+        return True
 
     def disconnect(self, websocket: WebSocket):
         """
         Отключение WebSocket клиента
 
+        Очистка пропорциональна числу подписок подключения; повторный вызов ничего не делает.
+
         Args:
             websocket: WebSocket соединение
         """
-        metadata = self.connection_metadata.get(websocket, {})
+        metadata = self.connection_metadata.pop(websocket, None)
+        if metadata is None:
+            return
         user_id = metadata.get("user_id")
-        project_id = metadata.get("project_id")
+        self._total_connections -= 1
 
         # Удаляем из активных подключений
-        if user_id and user_id in self.active_connections:
-            self.active_connections[user_id].discard(websocket)
-            if not self.active_connections[user_id]:
+        connections = self.active_connections.get(user_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
                 del self.active_connections[user_id]
+                self.backplane.unsubscribe(user_channel(user_id))
 
-        # Удаляем из подключений проекта
-        if project_id and project_id in self.project_connections:
-            self.project_connections[project_id].discard(websocket)
-            if not self.project_connections[project_id]:
-                del self.project_connections[project_id]
+        # Удаляем из всех проектов, на которые подписано подключение
+        project_ids = self.connection_projects.pop(websocket, set())
+        for project_id in project_ids:
+            self._remove_project_connection(websocket, project_id)
 
-        # Удаляем метаданные
-        if websocket in self.connection_metadata:
-            del self.connection_metadata[websocket]
+        self.batch_connections.discard(websocket)
+        self.codecs.pop(websocket, None)
+        self.last_seen.pop(websocket, None)
+
+        # Останавливаем писателя
+        writer = self.writers.pop(websocket, None)
+        if writer is not None:
+            self._dropped_total += writer.dropped
+            self._coalesced_total += writer.coalesced
+            writer.close()
+            WS_CONNECTIONS.dec()
 
         logger.info(
             f"WebSocket disconnected: user_id={user_id}, "
-            f"project_id={project_id}, total_connections={self.get_total_connections()}"
+            f"projects={sorted(project_ids)}, total_connections={self.get_total_connections()}"
         )
 
-    async def send_personal_message(self, websocket: WebSocket, message: dict):
+    def _add_project_connection(self, websocket: WebSocket, project_id: int):
+        """Добавление подключения к проекту (первое подключение подписывает узел на канал)"""
+        if project_id not in self.project_connections:
+            self.project_connections[project_id] = set()
+            self.backplane.subscribe(project_channel(project_id))
+        self.project_connections[project_id].add(websocket)
+        subscriptions = self.connection_projects.get(websocket)
+        if subscriptions is not None:
+            subscriptions.add(project_id)
+
+    def _remove_project_connection(self, websocket: WebSocket, project_id: int):
+        """Удаление подключения из проекта (последнее отписывает узел от канала)"""
+        subscriptions = self.connection_projects.get(websocket)
+        if subscriptions is not None:
+            subscriptions.discard(project_id)
+
+        connections = self.project_connections.get(project_id)
+        if connections is None:
+            return
+        connections.discard(websocket)
+        if not connections:
+            del self.project_connections[project_id]
+            self.backplane.unsubscribe(project_channel(project_id))
+            self.coalescer.discard(project_id)
+
+    def set_batching(self, websocket: WebSocket, enabled: bool):
+        """
+        Включение/выключение пакетной доставки событий проектов
+
+        Args:
+            websocket: WebSocket соединение
+            enabled: True - события проекта приходят кадрами {"type": "batch", "events": [...]}
+        """
+        if enabled:
+            self.batch_connections.add(websocket)
+        else:
+            self.batch_connections.discard(websocket)
+        metadata = self.connection_metadata.get(websocket)
+        if metadata is not None:
+            metadata["batch"] = enabled
+
+    def subscribe_project(self, websocket: WebSocket, project_id: int, batch: Optional[bool] = None):
+        """
+        Подписка подключения на события проекта (в дополнение к текущим подпискам)
+
+        Args:
+            websocket: WebSocket соединение
+            project_id: ID проекта
+            batch: Пакетная доставка событий (None - не менять)
+        """
+        self._add_project_connection(websocket, project_id)
+        if batch is not None:
+            self.set_batching(websocket, batch)
+
+    def unsubscribe_project(self, websocket: WebSocket, project_id: int):
+        """
+        Отписка подключения от событий проекта
+
+        Args:
+            websocket: WebSocket соединение
+            project_id: ID проекта
+        """
+        self._remove_project_connection(websocket, project_id)
+
+    def touch(self, websocket: WebSocket):
+        """Отметка входящей активности клиента (любой кадр, включая pong)"""
+        if websocket in self.last_seen:
+            self.last_seen[websocket] = time.monotonic()
+
+    async def sweep(self) -> int:
+        """
+        Один проход heartbeat по всем подключениям
+
+        Молчащим дольше heartbeat_interval отправляется ping, молчащие дольше
+        idle_timeout (полуоткрытые TCP соединения) закрываются.
+
+        Returns:
+            Количество закрытых подключений
+        """
+        now = time.monotonic()
+        ping = None
+        reaped = []
+
+        for websocket, seen in list(self.last_seen.items()):
+            idle = now - seen
+            if idle >= self.idle_timeout:
+                reaped.append(websocket)
+            elif idle >= self.heartbeat_interval:
+                if ping is None:
+                    ping = {"type": "ping", "timestamp": datetime.now().isoformat()}
+                await self.send_personal_message(websocket, ping)
+
+        for websocket in reaped:
+            user_id = self.connection_metadata.get(websocket, {}).get("user_id")
+            logger.info(f"Reaping idle WebSocket: user_id={user_id}, idle_timeout={self.idle_timeout}s")
+            WS_REAPED.labels(reason="idle_timeout").inc()
+            self.disconnect(websocket)
+            task = asyncio.create_task(self._close_quietly(websocket, code=1001))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+        self.reaped += len(reaped)
+        return len(reaped)
+
+    async def _sweep_loop(self):
+        """Фоновая задача heartbeat"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"WebSocket heartbeat sweep failed: {e}", exc_info=True)
+
+    async def replay(self, websocket: WebSocket, project_id: int, last_seq: int) -> bool:
+        """
+        Отправка клиенту событий проекта, пропущенных после last_seq
+
+        Пропущенные события уходят одним кадром {"type": "replay", "events": [...]},
+        чтобы повтор не переполнял исходящую очередь. Подписка оформляется до повтора,
+        поэтому новые события могут прийти и в повторе, и отдельно - клиент
+        отбрасывает события с seq не больше уже обработанного.
+
+        Args:
+            websocket: WebSocket соединение
+            project_id: ID проекта
+            last_seq: Номер последнего полученного клиентом события
+
+        Returns:
+            False если часть событий уже вытеснена из журнала (нужно перечитать проект)
+        """
+        events, complete = await self.event_log.since(project_id, last_seq)
+        await self.send_personal_message(
+            websocket,
+            {
+                "type": "replay",
+                "project_id": project_id,
+                "from_seq": last_seq,
+                "last_seq": events[-1]["seq"] if events else await self.event_log.current(project_id),
+                "complete": complete,
+                "count": len(events),
+                "events": events,
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+        return complete
+
+    def get_subscriptions(self, websocket: WebSocket) -> List[int]:
+        """Получить ID проектов, на которые подписано подключение"""
+        return sorted(self.connection_projects.get(websocket, ()))
+
+    def _on_writer_failure(self, websocket: WebSocket, reason: str):
+        """
+        Отключение клиента по сигналу писателя (таймаут, ошибка, переполнение)
+
+        Args:
+            websocket: WebSocket соединение
+            reason: Причина отключения
+        """
+        logger.info(f"Dropping WebSocket client: reason={reason}")
+        self.disconnect(websocket)
+        task = asyncio.create_task(self._close_quietly(websocket))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def send_personal_message(self, websocket: WebSocket, message: dict) -> bool:
         """
         Отправка сообщения конкретному WebSocket подключению
 
         Args:
             websocket: WebSocket соединение
             message: Сообщение (dict)
+
+        Returns:
+            True если сообщение поставлено в очередь
+        """
+        writer = self.writers.get(websocket)
+        if writer is None:
+            return False
+        return writer.enqueue(self.encode_message(message, self.codecs.get(websocket)))
+
+    @staticmethod
+    def encode_message(message: dict, codec=None):
         """
+        Сериализация сообщения в кадр кодировки подключения (JSON по умолчанию)
+
+        Returns:
+            str для текстовых кодировок, bytes для бинарных
+        """
+        return (codec or get_codec()).encode(message)
+
+    def decode_message(self, websocket: WebSocket, frame) -> dict:
+        """
+        Разбор входящего кадра клиента
+
+        Текстовые кадры всегда JSON, бинарные - в кодировке подключения.
+
+        Raises:
+            ValueError: Кадр не удалось разобрать
+        """
+        if isinstance(frame, str):
+            message = json.loads(frame)
+        else:
+            message = self.codecs.get(websocket, get_codec()).decode(frame)
+        if not isinstance(message, dict):
+            raise ValueError("Message must be an object")
+        return message
+
+    @staticmethod
+    def _coalesce_key(message: dict) -> Optional[Hashable]:
+        """
+        Ключ склейки сообщения для политики coalesce
+
+        Устаревшие версии одного и того же объекта в очереди заменяются новой.
+        События-факты (создание, фото, дефекты) не склеиваются.
+        """
+        message_type = message.get("type")
+        if message_type == "inspection_updated":
+            return message_type, message.get("inspection_id")
+        if message_type == "project_updated":
+            return message_type, message.get("project_id")
+        return None
+
+    async def _fan_out(self, connections: Iterable[WebSocket], message: dict) -> int:
+        """
+        Рассылка сообщения группе подключений
+
+        Сообщение сериализуется один раз на каждую кодировку и кладется в исходящие
+        очереди подключений без ожидания сети; доставкой занимаются писатели подключений.
+
+        Returns:
+            Количество подключений, принявших сообщение в очередь
+        """
+        targets = list(connections)
+        if not targets:
+            return 0
+
+        default_codec = get_codec()
+        frames = {}
+        key = self._coalesce_key(message)
+
+        accepted = 0
+        for websocket in targets:
+            writer = self.writers.get(websocket)
+            if writer is None:
+                continue
+            codec = self.codecs.get(websocket, default_codec)
+            frame = frames.get(codec.name)
+            if frame is None:
+                frame = frames[codec.name] = codec.encode(message)
+            if writer.enqueue(frame, key):
+                accepted += 1
+        return accepted
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket, code: int = 1011):
+        """Закрытие сокета после ошибки/таймаута без исключений"""
         try:
-            await websocket.send_json(message)
-        except Exception as e:
-            logger.error(f"Error sending message: {e}")
-            self.disconnect(websocket)
+            await asyncio.wait_for(websocket.close(code=code), timeout=1.0)
+        except Exception:
+            pass
 
-    async def send_to_user(self, user_id: int, message: dict):
+    async def send_to_user(self, user_id: int, message: dict) -> int:
         """
-        Отправка сообщения всем подключениям пользователя
+        Отправка сообщения всем подключениям пользователя (во всех процессах)
 
         Args:
             user_id: ID пользователя
             message: Сообщение (dict)
-        """
-        if user_id in self.active_connections:
-            disconnected = []
-            for websocket in self.active_connections[user_id]:
-                try:
-                    await websocket.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error sending to user {user_id}: {e}")
-                    disconnected.append(websocket)
 
-            # Очистка отключенных соединений
-            for ws in disconnected:
-                self.disconnect(ws)
+        Returns:
+            Количество локальных подключений, принявших сообщение
+        """
+        delivered = await self._fan_out(self.active_connections.get(user_id, ()), message)
+        await self.backplane.publish(user_channel(user_id), message)
+        return delivered
 
-    async def send_to_project(self, project_id: int, message: dict):
+    async def send_to_project(self, project_id: int, message: dict) -> int:
         """
-        Отправка сообщения всем подключениям проекта
+        Отправка сообщения всем подключениям проекта (во всех процессах)
+
+        Сообщение получает очередной номер seq проекта и сохраняется в журнале событий.
 
         Args:
             project_id: ID проекта
             message: Сообщение (dict)
+
+        Returns:
+            Количество локальных подключений, принявших сообщение
+        """
+        seq = await self.event_log.append(project_id, message)
+        if seq is not None:
+            message = {**message, "seq": seq}
+        delivered = await self._deliver_to_project(project_id, message)
+        await self.backplane.publish(project_channel(project_id), message)
+        return delivered
+
+    async def _deliver_to_project(self, project_id: int, message: dict) -> int:
         """
-        if project_id in self.project_connections:
-            disconnected = []
-            for websocket in self.project_connections[project_id]:
-                try:
-                    await websocket.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error sending to project {project_id}: {e}")
-                    disconnected.append(websocket)
+        Локальная доставка события проекта
 
-            # Очистка отключенных соединений
-            for ws in disconnected:
-                self.disconnect(ws)
+        Обычные подписчики получают событие сразу, подписчики с batch - в ближайшем пакете.
+
+        Returns:
+            Количество подключений, принявших событие сразу или в пакет
+        """
+        connections = self.project_connections.get(project_id)
+        if not connections:
+            return 0
+
+        if not self.batch_connections:
+            return await self._fan_out(connections, message)
+
+        immediate = [websocket for websocket in connections if websocket not in self.batch_connections]
+        batched = len(connections) - len(immediate)
+        if batched:
+            self.coalescer.add(project_id, message, self._coalesce_key(message))
+        return await self._fan_out(immediate, message) + batched
+
+    async def _send_batch(self, project_id: int, events: List[dict]):
+        """Отправка накопленного пакета событий подписчикам проекта с batch"""
+        targets = [
+            websocket
+            for websocket in self.project_connections.get(project_id, ())
+            if websocket in self.batch_connections
+        ]
+        await self._fan_out(targets, {
+            "type": "batch",
+            "project_id": project_id,
+            "count": len(events),
+            "events": events,
+            "timestamp": datetime.now().isoformat()
+        })
 
-    async def broadcast(self, message: dict, exclude: WebSocket = None):
+    async def broadcast(self, message: dict, exclude: WebSocket = None) -> int:
         """
-        Отправка сообщения всем активным подключениям
+        Отправка сообщения всем активным подключениям (во всех процессах)
 
         Args:
             message: Сообщение (dict)
-            exclude: WebSocket который нужно исключить
-        """
-        disconnected = []
-        for user_connections in self.active_connections.values():
-            for websocket in user_connections:
-                if websocket != exclude:
-                    try:
-                        await websocket.send_json(message)
-                    except Exception as e:
-                        logger.error(f"Error broadcasting: {e}")
-                        disconnected.append(websocket)
-
-        # Очистка отключенных соединений
-        for ws in disconnected:
-            self.disconnect(ws)
+            exclude: Локальный WebSocket который нужно исключить
+
+        Returns:
+            Количество локальных подключений, принявших сообщение
+        """
+        delivered = await self._fan_out(self._all_connections(exclude), message)
+        await self.backplane.publish(BROADCAST_CHANNEL, message)
+        return delivered
+
+    def _all_connections(self, exclude: WebSocket = None) -> List[WebSocket]:
+        """Все локальные подключения, кроме exclude"""
+        return [websocket for websocket in self.connection_metadata if websocket is not exclude]
+
+    async def _on_backplane_message(self, channel: str, message: dict):
+        """
+        Доставка события из другого процесса локальным подключениям
+
+        Args:
+            channel: Канал backplane
+            message: Сообщение (dict)
+        """
+        if channel == BROADCAST_CHANNEL:
+            await self._fan_out(self._all_connections(), message)
+            return
+
+        _, kind, target_id = channel.split(":", 2)
+        if kind == "project":
+            await self.event_log.record(int(target_id), message)
+            await self._deliver_to_project(int(target_id), message)
+        elif kind == "user":
+            await self._fan_out(self.active_connections.get(int(target_id), ()), message)
+
+    async def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Ожидание доставки всех поставленных в очереди сообщений
+
+        Returns:
+            True если все очереди опустели до таймаута
+        """
+        await self.coalescer.flush()
+        results = await asyncio.gather(*(writer.flush(timeout) for writer in list(self.writers.values())))
+        return all(results)
+
+    def get_queue_stats(self) -> dict:
+        """Статистика исходящих очередей процесса"""
+        writers = list(self.writers.values())
+        return {
+            "overflow_policy": self.overflow_policy,
+            "max_queue": self.max_queue,
+            "queued": sum(writer.depth for writer in writers),
+            "max_depth": max((writer.depth for writer in writers), default=0),
+            "dropped": self._dropped_total + sum(writer.dropped for writer in writers),
+            "coalesced": self._coalesced_total + sum(writer.coalesced for writer in writers),
+            "batch_connections": len(self.batch_connections),
+            "batch_pending": self.coalescer.pending,
+            "batch_frames": self.coalescer.frames,
+            "batch_collapsed": self.coalescer.collapsed,
+        }
+
+    def get_heartbeat_stats(self) -> dict:
+        """Состояние heartbeat и лимита подключений"""
+        return {
+            "heartbeat_interval": self.heartbeat_interval,
+            "idle_timeout": self.idle_timeout,
+            "max_connections": self.max_connections,
+            "reaped": self.reaped,
+            "rejected": self.rejected,
+        }
+
+    def get_backplane_stats(self) -> dict:
+        """Состояние backplane процесса"""
+        return {
+            "type": type(self.backplane).__name__,
+            "node_id": self.backplane.node_id,
+            "channels": len(self.backplane.channels),
+        }
 
     def get_total_connections(self) -> int:
         """Получить общее количество активных подключений"""
-        return sum(len(connections) for connections in self.active_connections.values())
+        return self._total_connections
 
     def get_user_connections(self, user_id: int) -> int:
         """Получить количество подключений пользователя"""
@@ -227,37 +709,46 @@ async def handle_websocket_message(websocket: WebSocket, data: dict):
             {"type": "pong", "timestamp": datetime.now().isoformat()}
         )
 
+    elif message_type == "pong":
+        # Ответ на серверный ping: активность уже отмечена при получении кадра
+        pass
+
     elif message_type == "subscribe_project":
         # Подписка на обновления проекта
         project_id = data.get("project_id")
         if project_id:
-            if project_id not in manager.project_connections:
-                manager.project_connections[project_id] = set()
-            manager.project_connections[project_id].add(websocket)
-            metadata["project_id"] = project_id
+            batch = bool(data["batch"]) if "batch" in data else None
+            manager.subscribe_project(websocket, project_id, batch=batch)
 
             await manager.send_personal_message(
                 websocket,
                 {
                     "type": "subscribed",
                     "project_id": project_id,
+                    "batch": websocket in manager.batch_connections,
+                    "subscriptions": manager.get_subscriptions(websocket),
+                    "last_seq": await manager.event_log.current(project_id),
                     "message": f"Subscribed to project {project_id}"
                 }
             )
 
+            # Переподключение: досылаем пропущенные события
+            last_seq = data.get("last_seq")
+            if isinstance(last_seq, int):
+                await manager.replay(websocket, project_id, last_seq)
+
     elif message_type == "unsubscribe_project":
         # Отписка от обновлений проекта
         project_id = data.get("project_id")
-        if project_id and project_id in manager.project_connections:
-            manager.project_connections[project_id].discard(websocket)
-            if not manager.project_connections[project_id]:
-                del manager.project_connections[project_id]
+        if project_id and project_id in manager.connection_projects.get(websocket, ()):
+            manager.unsubscribe_project(websocket, project_id)
 
             await manager.send_personal_message(
                 websocket,
                 {
                     "type": "unsubscribed",
                     "project_id": project_id,
+                    "subscriptions": manager.get_subscriptions(websocket),
                     "message": f"Unsubscribed from project {project_id}"
                 }
             )
@@ -270,7 +761,8 @@ async def handle_websocket_message(websocket: WebSocket, data: dict):
                 "type": "stats",
                 "total_connections": manager.get_total_connections(),
                 "connected_users": len(manager.get_connected_users()),
-                "your_connections": manager.get_user_connections(user_id)
+                "your_connections": manager.get_user_connections(user_id),
+                "your_subscriptions": manager.get_subscriptions(websocket)
             }
         )
 
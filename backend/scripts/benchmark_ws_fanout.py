@@ -0,0 +1,123 @@
+"""
+Бенчмарк рассылки WebSocket сообщений подписчикам проекта
+
+Сравнивает последовательную отправку (как было раньше) с рассылкой
+ConnectionManager через исходящие очереди на симулированных клиентах без сети.
+Для очередей замеряется время постановки (сколько ждет рассылающий код)
+и время доставки всем быстрым клиентам.
+
+Запуск:
+    python scripts/benchmark_ws_fanout.py --subscribers 5000 --slow 50
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Добавляем путь к приложению
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.websocket import ConnectionManager
+
+
+class SimulatedWebSocket:
+    """Симуляция клиента: задержка отправки как у сети, без реального сокета"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(self.latency)
+        self.received += 1
+
+    async def send_json(self, data: dict):
+        await self.send_text(json.dumps(data, ensure_ascii=False))
+
+    async def close(self, code: int = 1000, reason: str = None):
+        pass
+
+
+def build_clients(count: int, slow: int, latency: float, slow_latency: float):
+    """Клиенты с сетевой задержкой; slow из них - "плохая сотовая связь" """
+    clients = [SimulatedWebSocket(random.uniform(0, latency)) for _ in range(count - slow)]
+    clients += [SimulatedWebSocket(slow_latency) for _ in range(slow)]
+    random.shuffle(clients)
+    return clients
+
+
+async def sequential_send(clients, message: dict) -> float:
+    """Прежняя реализация: await send_json по очереди для каждого сокета"""
+    start = time.perf_counter()
+    for client in clients:
+        await client.send_json(message)
+    return time.perf_counter() - start
+
+
+async def queued_send(manager: ConnectionManager, clients, project_id: int, message: dict, slow_latency: float):
+    """Текущая реализация ConnectionManager.send_to_project: постановка и доставка"""
+    expected = {id(client): client.received + 1 for client in clients if client.latency < slow_latency}
+
+    start = time.perf_counter()
+    await manager.send_to_project(project_id, message)
+    enqueued = time.perf_counter() - start
+
+    while any(client.received < expected[id(client)] for client in clients if id(client) in expected):
+        await asyncio.sleep(0.001)
+    delivered = time.perf_counter() - start
+    return enqueued, delivered
+
+
+async def run(args):
+    message = {
+        "type": "defect_detected",
+        "defect_id": 1,
+        "photo_id": 1,
+        "project_id": 1,
+        "data": {"defect_type": "crack", "severity": "major", "confidence": 0.92},
+        "timestamp": "2024-01-01T12:00:00",
+    }
+
+    manager = ConnectionManager(send_timeout=args.timeout, max_queue=args.queue, overflow_policy=args.policy)
+    clients = build_clients(args.subscribers, args.slow, args.latency, args.slow_latency)
+    for index, client in enumerate(clients):
+        await manager.connect(client, user_id=index, project_id=1)
+
+    print(f"Подписчиков: {args.subscribers}, медленных: {args.slow} "
+          f"(задержка {args.slow_latency}s), таймаут отправки: {args.timeout}s, "
+          f"очередь: {args.queue} ({args.policy})")
+
+    if args.sequential:
+        elapsed = await sequential_send(clients, message)
+        print(f"Последовательно:  {elapsed:8.3f}s")
+
+    for attempt in range(args.rounds):
+        enqueued, delivered = await queued_send(manager, clients, 1, message, args.slow_latency)
+        print(f"Очереди #{attempt + 1}: постановка {enqueued:8.4f}s, доставка {delivered:8.3f}s, "
+              f"осталось подписчиков: {manager.get_project_connections(1)}")
+
+    print(f"Очереди: {manager.get_queue_stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк WebSocket fan-out")
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--slow", type=int, default=50, help="Количество медленных клиентов")
+    parser.add_argument("--latency", type=float, default=0.005, help="Максимальная задержка обычного клиента, сек")
+    parser.add_argument("--slow-latency", type=float, default=10.0, help="Задержка медленного клиента, сек")
+    parser.add_argument("--timeout", type=float, default=2.0, help="Таймаут отправки, сек")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--queue", type=int, default=256, help="Размер исходящей очереди подключения")
+    parser.add_argument("--policy", default="drop_oldest", help="Политика переполнения очереди")
+    parser.add_argument("--sequential", action="store_true", help="Замерить и старую последовательную отправку")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Переиндексация поискового бэкенда (Elasticsearch или embedded)
+
+Запуск:
+    python scripts/reindex_search.py                      # все индексы
+    python scripts/reindex_search.py --index regulations --recreate
+    python scripts/reindex_search.py --celery             # через Celery воркер
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Добавляем путь к приложению
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.search.indexer import INDEXES, REINDEX_BATCH_SIZE, reindex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Переиндексация поискового бэкенда")
+    parser.add_argument("--index", choices=list(INDEXES), help="Индекс (по умолчанию все)")
+    parser.add_argument("--recreate", action="store_true", help="Пересоздать индекс (после изменения mapping)")
+    parser.add_argument("--batch-size", type=int, default=REINDEX_BATCH_SIZE)
+    parser.add_argument("--celery", action="store_true", help="Отправить задачу Celery воркеру")
+    args = parser.parse_args()
+
+    if args.celery:
+        from app.tasks.search_tasks import reindex_all
+        result = reindex_all.delay(args.index, args.recreate)
+        print(f"Задача переиндексации отправлена: {result.id}")
+        return
+
+    db = SessionLocal()
+    try:
+        for name in [args.index] if args.index else list(INDEXES):
+            started = time.perf_counter()
+            total = reindex(db, name, batch_size=args.batch_size, recreate=args.recreate)
+            print(f"{name}: {total} документов за {time.perf_counter() - started:.2f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Нагрузочный тест real-time подсистемы
+
+Открывает тысячи симулированных WebSocket клиентов прямо через ASGI интерфейс
+эндпоинта /ws (без сети, в одном процессе), рассылает события через notify_* и
+измеряет:
+- задержку fan-out от вызова notify_* до получения кадра клиентом (перцентили)
+- память на подключение (tracemalloc во время подключения клиентов)
+- процессорное время на отправленное событие и на доставленный кадр
+
+Запуск:
+    python scripts/ws_load_test.py --clients 5000 --projects 20 --events 500 --rate 200
+    python scripts/ws_load_test.py --clients 2000 --encoding msgpack --batch --max-p99-ms 250
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from urllib.parse import urlencode
+
+# Добавляем путь к приложению
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# В одном процессе backplane и журнал событий в Redis не нужны
+os.environ.setdefault("WS_BACKPLANE", "local")
+os.environ.setdefault("WS_EVENT_LOG", "memory")
+
+from fastapi import FastAPI
+
+from app.api.v1.endpoints import ws
+from app.config import settings
+from app.realtime.codecs import get_codec
+from app.utils.analytics import describe
+from app import websocket as realtime
+
+NOTIFIERS = ("inspection_created", "inspection_updated", "photo_uploaded", "defect_detected")
+
+
+def build_app() -> FastAPI:
+    """Минимальное приложение только с WebSocket роутером"""
+    app = FastAPI()
+    app.include_router(ws.router, prefix=settings.API_V1_PREFIX)
+    return app
+
+
+class ASGIWebSocketClient:
+    """Симулированный WebSocket клиент, вызывающий ASGI приложение напрямую"""
+
+    def __init__(self, app, query: dict, encoding: str = "json", delay: float = 0.0):
+        self.app = app
+        self.query = query
+        self.codec = get_codec(encoding)
+        self.delay = delay
+        self.latencies = []
+        self.frames = 0
+        self.events = 0
+        self.accepted = False
+        self._handshake = asyncio.Event()
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        self._connected = False
+        self._task = None
+
+    async def connect(self) -> bool:
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": f"{settings.API_V1_PREFIX}/ws",
+            "raw_path": f"{settings.API_V1_PREFIX}/ws".encode(),
+            "query_string": urlencode(self.query).encode(),
+            "headers": [],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+            "subprotocols": [],
+        }
+        self._task = asyncio.create_task(self.app(scope, self._receive, self._send))
+        await self._handshake.wait()
+        return self.accepted
+
+    async def _receive(self) -> dict:
+        if not self._connected:
+            self._connected = True
+            return {"type": "websocket.connect"}
+        return await self._inbox.get()
+
+    async def _send(self, message: dict):
+        kind = message["type"]
+        if kind == "websocket.accept":
+            self.accepted = True
+            self._handshake.set()
+        elif kind == "websocket.close":
+            self._handshake.set()
+        elif kind == "websocket.send":
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            received_at = time.perf_counter()
+            frame = message.get("text")
+            self._record(self.codec.decode(frame if frame is not None else message["bytes"]), received_at)
+
+    def _record(self, payload: dict, received_at: float):
+        self.frames += 1
+        events = payload.get("events") if payload.get("type") == "batch" else [payload]
+        for event in events:
+            sent_at = (event.get("data") or {}).get("sent_at")
+            if sent_at is not None:
+                self.events += 1
+                self.latencies.append((received_at - sent_at) * 1000)
+
+    async def close(self):
+        if self._task is None:
+            return
+        await self._inbox.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+async def notify(kind: str, index: int, project_id: int):
+    """Вызов notify_* с отметкой времени отправки"""
+    data = {"sent_at": time.perf_counter(), "index": index}
+    if kind == "inspection_created":
+        await realtime.notify_inspection_created(index, project_id, data)
+    elif kind == "inspection_updated":
+        # Небольшое число проверок: повторные обновления одной проверки схлопываются при batch
+        await realtime.notify_inspection_updated(index % 10, project_id, data)
+    elif kind == "photo_uploaded":
+        await realtime.notify_photo_uploaded(index, index, project_id, data)
+    else:
+        await realtime.notify_defect_detected(index, index, project_id, data)
+
+
+async def run_load_test(
+    clients: int = 1000,
+    projects: int = 10,
+    events: int = 100,
+    rate: float = 0.0,
+    encoding: str = "json",
+    batch: bool = False,
+    slow: int = 0,
+    slow_delay: float = 1.0,
+    drain_timeout: float = 30.0
+) -> dict:
+    """
+    Прогон нагрузочного теста
+
+    Args:
+        clients: Количество клиентов
+        projects: Количество проектов (клиенты распределяются равномерно)
+        events: Количество событий
+        rate: Событий в секунду (0 - без пауз)
+        encoding: Кодировка кадров клиентов
+        batch: Пакетная доставка событий
+        slow: Количество медленных клиентов
+        slow_delay: Задержка приема кадра медленным клиентом, сек
+        drain_timeout: Сколько ждать доставки после последнего события, сек
+
+    Returns:
+        Отчет с перцентилями задержки, памятью и CPU
+    """
+    app = build_app()
+    manager = realtime.manager
+    await manager.start()
+
+    # Подключение клиентов с замером памяти
+    pool = []
+    for index in range(clients):
+        query = {"token": "load-test", "project_id": index % projects + 1, "encoding": encoding}
+        if batch:
+            query["batch"] = "true"
+        pool.append(ASGIWebSocketClient(app, query, encoding, delay=slow_delay if index < slow else 0.0))
+
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    connect_started = time.perf_counter()
+    accepted = 0
+    for client in pool:
+        accepted += await client.connect()
+    connect_elapsed = time.perf_counter() - connect_started
+    await manager.flush(timeout=drain_timeout)
+    memory_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Рассылка событий (приветственные кадры не учитываем)
+    for client in pool:
+        client.frames = 0
+    interval = 1.0 / rate if rate > 0 else 0.0
+    cpu_started = time.process_time()
+    send_started = time.perf_counter()
+    for index in range(events):
+        await notify(NOTIFIERS[index % len(NOTIFIERS)], index, index % projects + 1)
+        if interval:
+            await asyncio.sleep(interval)
+        elif index % 50 == 49:
+            # Даем писателям поработать, как при реальном потоке событий
+            await asyncio.sleep(0)
+    send_elapsed = time.perf_counter() - send_started
+    drained = await manager.flush(timeout=drain_timeout)
+    cpu_elapsed = time.process_time() - cpu_started
+
+    latencies = [value for client in pool for value in client.latencies]
+    delivered = sum(client.events for client in pool)
+    frames = sum(client.frames for client in pool)
+    stats = describe(latencies, percentiles=(50, 90, 95, 99, 99.9))
+    queue_stats = manager.get_queue_stats()
+
+    for client in pool:
+        await client.close()
+    await manager.stop()
+
+    return {
+        "clients": clients,
+        "accepted": accepted,
+        "projects": projects,
+        "events": events,
+        "encoding": encoding,
+        "batch": batch,
+        "connect_seconds": round(connect_elapsed, 3),
+        "memory_per_connection_kb": round((memory_after - memory_before) / max(accepted, 1) / 1024, 2),
+        "send_seconds": round(send_elapsed, 3),
+        "drained": drained,
+        "delivered_events": delivered,
+        "frames": frames,
+        "latency_ms": {
+            "avg": round(stats["avg"], 3),
+            "max": round(stats["max"], 3),
+            **{key: round(value, 3) for key, value in stats["percentiles"].items()},
+        },
+        "cpu_us_per_event": round(cpu_elapsed / max(events, 1) * 1e6, 1),
+        "cpu_us_per_delivery": round(cpu_elapsed / max(delivered, 1) * 1e6, 2),
+        "dropped": queue_stats["dropped"],
+        "coalesced": queue_stats["coalesced"] + queue_stats["batch_collapsed"],
+    }
+
+
+def print_report(report: dict):
+    """Вывод отчета в консоль"""
+    latency = report["latency_ms"]
+    print(f"Клиентов: {report['accepted']}/{report['clients']}, проектов: {report['projects']}, "
+          f"событий: {report['events']}, кодировка: {report['encoding']}, batch: {report['batch']}")
+    print(f"Подключение:        {report['connect_seconds']:.3f}s, "
+          f"память на подключение: {report['memory_per_connection_kb']:.2f} KB")
+    print(f"Рассылка:           {report['send_seconds']:.3f}s, доставлено событий: {report['delivered_events']} "
+          f"в {report['frames']} кадрах, очереди опустели: {report['drained']}")
+    print(f"Задержка, мс:       p50={latency['p50']:.2f} p90={latency['p90']:.2f} "
+          f"p99={latency['p99']:.2f} p99.9={latency['p99.9']:.2f} max={latency['max']:.2f}")
+    print(f"CPU:                {report['cpu_us_per_event']:.1f} мкс на событие, "
+          f"{report['cpu_us_per_delivery']:.2f} мкс на доставку")
+    print(f"Отброшено: {report['dropped']}, схлопнуто: {report['coalesced']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест WebSocket fan-out")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=0.0, help="Событий в секунду (0 - без пауз)")
+    parser.add_argument("--encoding", default="json", help="json, msgpack или deflate")
+    parser.add_argument("--batch", action="store_true", help="Клиенты получают события пакетами")
+    parser.add_argument("--slow", type=int, default=0, help="Количество медленных клиентов")
+    parser.add_argument("--slow-delay", type=float, default=1.0, help="Задержка приема кадра медленным клиентом, сек")
+    parser.add_argument("--json", action="store_true", help="Вывести отчет в JSON")
+    parser.add_argument("--max-p99-ms", type=float, default=None, help="Порог p99 задержки (код выхода 1 при превышении)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(
+        clients=args.clients,
+        projects=args.projects,
+        events=args.events,
+        rate=args.rate,
+        encoding=args.encoding,
+        batch=args.batch,
+        slow=args.slow,
+        slow_delay=args.slow_delay,
+    ))
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+    if args.max_p99_ms is not None and report["latency_ms"]["p99"] > args.max_p99_ms:
+        print(f"p99 {report['latency_ms']['p99']:.2f} ms превышает порог {args.max_p99_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
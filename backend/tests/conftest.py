@@ -1,11 +1,16 @@
 """
 Pytest конфигурация и фикстуры
 """
+import os
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+# Поисковый индекс в памяти процесса: тестам не нужен Elasticsearch и Celery
+os.environ.setdefault("SEARCH_BACKEND", "embedded")
+
 from app.main import app
 from app.database import Base, get_db
 from app.models.user import User
@@ -0,0 +1,84 @@
+"""
+Тесты для векторизованной аналитики
+"""
+import pytest
+from datetime import datetime, date
+
+from app.utils.analytics import describe, bucket_by_date, rate_per_period
+
+
+class TestDescribe:
+    """Тесты для describe"""
+
+    def test_basic_statistics(self):
+        stats = describe([1.0, 2.0, 3.0, 4.0, 5.0])
+        assert stats["count"] == 5
+        assert stats["min"] == 1.0
+        assert stats["max"] == 5.0
+        assert stats["sum"] == 15.0
+        assert stats["avg"] == 3.0
+        assert stats["std"] == pytest.approx(1.41421356, rel=1e-6)
+        assert stats["percentiles"]["p50"] == 3.0
+
+    def test_ignores_none(self):
+        stats = describe([0.5, None, 0.7])
+        assert stats["count"] == 2
+        assert stats["avg"] == pytest.approx(0.6)
+
+    def test_empty_list(self):
+        stats = describe([])
+        assert stats["count"] == 0
+        assert stats["avg"] == 0.0
+        assert stats["histogram"]["counts"] == []
+
+    def test_histogram_with_range(self):
+        stats = describe([0.05, 0.15, 0.95, 0.96], bins=10, value_range=(0.0, 1.0))
+        assert len(stats["histogram"]["bins"]) == 11
+        assert sum(stats["histogram"]["counts"]) == 4
+        assert stats["histogram"]["counts"][-1] == 2
+
+
+class TestBucketByDate:
+    """Тесты для bucket_by_date"""
+
+    def test_by_day(self):
+        timestamps = [
+            datetime(2024, 1, 1, 10, 0),
+            datetime(2024, 1, 1, 15, 30),
+            datetime(2024, 1, 3, 9, 0),
+        ]
+        buckets = bucket_by_date(timestamps)
+        assert buckets == {"2024-01-01": 2, "2024-01-03": 1}
+
+    def test_fill_gaps(self):
+        timestamps = [datetime(2024, 1, 1), datetime(2024, 1, 3)]
+        buckets = bucket_by_date(timestamps, fill_gaps=True)
+        assert buckets == {"2024-01-01": 1, "2024-01-02": 0, "2024-01-03": 1}
+
+    def test_by_week_starts_on_monday(self):
+        # 2024-01-01 - понедельник, 2024-01-07 - воскресенье
+        timestamps = [date(2024, 1, 1), date(2024, 1, 7), date(2024, 1, 8)]
+        buckets = bucket_by_date(timestamps, period="week")
+        assert buckets == {"2024-01-01": 2, "2024-01-08": 1}
+
+    def test_by_month(self):
+        timestamps = [date(2024, 1, 31), date(2024, 2, 1), date(2024, 2, 29)]
+        buckets = bucket_by_date(timestamps, period="month")
+        assert buckets == {"2024-01-01": 1, "2024-02-01": 2}
+
+    def test_invalid_period(self):
+        with pytest.raises(ValueError):
+            bucket_by_date([], period="hour")
+
+
+class TestRatePerPeriod:
+    """Тесты для rate_per_period"""
+
+    def test_rate(self):
+        rate = rate_per_period({"2024-01-01": 2, "2024-01-02": 0, "2024-01-03": 4})
+        assert rate["avg"] == 2.0
+        assert rate["median"] == 2.0
+        assert rate["max"] == 4.0
+
+    def test_empty(self):
+        assert rate_per_period({})["avg"] == 0.0
@@ -0,0 +1,75 @@
+"""
+Тесты BM25 поиска по требованиям нормативов
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from app.search.bm25 import BM25Index
+from app.search.requirements import RequirementsIndex
+from app.search.text import analyze, stem
+
+REGULATIONS_PATH = Path(__file__).parent.parent / "data" / "regulations_database.json"
+
+
+@pytest.fixture(scope="module")
+def requirements_index():
+    with open(REGULATIONS_PATH, encoding="utf-8") as f:
+        return RequirementsIndex(json.load(f)["regulations"])
+
+
+class TestStemmer:
+    """Тесты стеммера"""
+
+    @pytest.mark.parametrize("words", [
+        ("трещина", "трещины", "трещин"),
+        ("фундамент", "фундамента", "фундаменты"),
+        ("бетонирование", "бетонирования"),
+        ("допустимая", "допустимой", "допустимые"),
+    ])
+    def test_word_forms_share_stem(self, words):
+        assert len({stem(word) for word in words}) == 1
+
+    def test_numbers_and_latin_unchanged(self):
+        assert stem("13330") == "13330"
+        assert stem("b15") == "b15"
+
+    def test_analyze_skips_stop_words(self):
+        assert analyze("Какая ширина трещин в бетоне?") == ["ширин", "трещин", "бетон"]
+
+
+class TestBM25Index:
+    """Тесты индекса BM25"""
+
+    def test_field_weight_and_rare_terms_rank_higher(self):
+        index = BM25Index({"title": 3.0, "body": 1.0})
+        index.add(1, {"title": "Кровля", "body": "Уклон кровли и водосток"})
+        index.add(2, {"title": "Водосток", "body": "Кровельные работы"})
+        index.add(3, {"title": "Фасад", "body": "Отделка фасада"})
+
+        assert [key for key, _ in index.search("водостоки")] == [2, 1]
+        assert index.search("перекрытие") == []
+
+    def test_documents_added_after_search_are_found(self):
+        index = BM25Index({"title": 1.0})
+        index.add("a", {"title": "Гидроизоляция подвала"})
+        assert index.search("гидроизоляция")
+        index.add("b", {"title": "Гидроизоляция кровли"})
+        assert {key for key, _ in index.search("гидроизоляции")} == {"a", "b"}
+
+
+class TestRequirementsIndex:
+    """Тесты поиска по базе нормативов"""
+
+    def test_best_requirement_with_article(self, requirements_index):
+        top = requirements_index.search_requirements("Какая допустимая ширина раскрытия трещин?", limit=3)[0]
+        assert top["number"] == "63.13330.2018"
+        assert top["article"] == "п. 8.2.4"
+
+    def test_regulations_ranked_and_grouped(self, requirements_index):
+        results = requirements_index.search_regulations("контроль сварных швов", limit=2)
+        assert len(results) <= 2
+        assert results[0]["id"] == "gost_23055_78"
+        assert results[0]["key_requirements"][0]["topic"] == "Контроль сварных швов"
+        assert results[0]["score"] >= results[-1]["score"]
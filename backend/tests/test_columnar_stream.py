@@ -0,0 +1,32 @@
+"""
+Тесты потоковой выгрузки в Arrow IPC
+"""
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from app.utils.columnar_stream import stream_arrow_ipc
+
+COLUMNS = [("id", "int"), ("title", "string")]
+
+
+class TestStreamArrowIPC:
+    """Тесты чанков Arrow IPC потока"""
+
+    def test_chunks_are_not_empty(self):
+        rows = ((i, f"Проверка {i}") for i in range(5))
+        chunks = list(stream_arrow_ipc(rows, COLUMNS, batch_size=2))
+
+        assert len(chunks) == 4
+        assert all(chunks)
+
+        table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+        assert table.column("id").to_pylist() == [0, 1, 2, 3, 4]
+
+    def test_empty_rows_still_write_schema(self):
+        chunks = list(stream_arrow_ipc(iter(()), COLUMNS))
+
+        assert all(chunks)
+        table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+        assert table.num_rows == 0
+        assert table.schema.names == ["id", "title"]
@@ -0,0 +1,93 @@
+"""
+Тесты подбора контекста нормативов для ИИ-консультанта
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.regulation import Regulation
+from app.search import backends
+from app.search.backends import EmbeddedBackend
+from app.services.consultant_context import ConsultContextCache, build_context, estimate_tokens
+from app.services.consultant_engine import ConsultantEngine
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """SQLite с нормативами и embedded поисковый индекс"""
+    monkeypatch.setattr(backends, "_backend", EmbeddedBackend())
+    engine = create_engine("sqlite://")
+    Regulation.__table__.create(engine)
+    with Session(engine) as session:
+        session.add_all([
+            Regulation(code="СП 22.13330.2016", title="Основания зданий и сооружений", regulation_type="СП",
+                       description="Расчет осадок и деформаций оснований фундаментов"),
+            Regulation(code="СП 17.13330.2017", title="Кровли", regulation_type="СП"),
+            Regulation(code="СНиП 2.02.01-83", title="Основания зданий и сооружений", regulation_type="СНиП",
+                       description="Осадка фундаментов", is_active=False),
+        ])
+        session.commit()
+        yield session
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Движок консультанта, сохраняющий векторный индекс во временный каталог"""
+    return ConsultantEngine(embeddings_path=tmp_path / "embeddings.npz")
+
+
+class TestBuildContext:
+    """Тесты сборки контекста"""
+
+    def test_relevant_requirements_and_regulations(self, db, engine):
+        context = build_context(db, "Какая допустимая осадка фундамента?", engine=engine)
+
+        assert context.regulations[0] == "СП 22.13330.2016"
+        assert "СП 17.13330.2017" not in context.regulations
+        assert "СНиП 2.02.01-83" not in context.regulations
+        # Требования - с пунктом норматива
+        assert context.lines[0].startswith("- СП 22.13330.2016, ")
+
+    def test_token_budget(self, db, engine):
+        full = build_context(db, "Какая допустимая осадка фундамента?", engine=engine)
+        small = build_context(
+            db, "Какая допустимая осадка фундамента?", token_budget=full.tokens // 2, engine=engine
+        )
+
+        assert 0 < len(small.lines) < len(full.lines)
+        assert small.tokens <= full.tokens // 2
+        assert build_context(db, "осадка", token_budget=0, engine=engine).lines == []
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("абв" * 10) == 10
+
+
+class TestContextCache:
+    """Тесты кеша контекста"""
+
+    def test_same_question_built_once(self, db, engine):
+        cache = ConsultContextCache(ttl_seconds=60, max_entries=10)
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return build_context(db, "осадка фундамента", engine=engine)
+
+        first = cache.get_or_build("Осадка  фундамента", builder)
+        second = cache.get_or_build("осадка фундамента", builder)
+        assert first is second
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_expired_and_evicted(self, db, engine):
+        cache = ConsultContextCache(ttl_seconds=0, max_entries=1)
+        cache.get_or_build("кровля", lambda: build_context(db, "кровля", engine=engine))
+        cache.get_or_build("кровля", lambda: build_context(db, "кровля", engine=engine))
+        assert cache.misses == 2
+
+        cache = ConsultContextCache(ttl_seconds=60, max_entries=1)
+        cache.get_or_build("кровля", lambda: build_context(db, "кровля", engine=engine))
+        cache.get_or_build("осадка", lambda: build_context(db, "осадка", engine=engine))
+        cache.get_or_build("кровля", lambda: build_context(db, "кровля", engine=engine))
+        assert cache.misses == 3
@@ -0,0 +1,90 @@
+"""
+Тесты движка базы знаний консультанта
+"""
+import json
+
+import pytest
+
+from app.services.ai_consultant_service import AIConsultantService
+from app.services.ai_consultant_service_v2 import AIConsultantServiceV2
+from app.services.consultant_engine import CLASSIC, STRUCTURED, ConsultantEngine, KnowledgeBase
+
+
+@pytest.fixture
+def knowledge_dir(tmp_path):
+    """База знаний из двух тем, у одной - две редакции"""
+    topics = tmp_path / "topics"
+    topics.mkdir()
+    (topics / "roof.classic.html").write_text("Кровля: подробно", encoding="utf-8")
+    (topics / "roof.structured.html").write_text("Кровля: структурно", encoding="utf-8")
+    (topics / "weld.classic.html").write_text("Сварка: подробно", encoding="utf-8")
+    (topics / "general.classic.html").write_text("Общий ответ", encoding="utf-8")
+    index = {
+        "general": {"title": "Общая информация", "bodies": {"classic": "topics/general.classic.html"}},
+        "topics": {
+            "кровля": {
+                "title": "Кровля",
+                "keywords": ["кровля", "крыша"],
+                "regulations": ["СП 17.13330.2017"],
+                "complexity": "Средний",
+                "reading_time_minutes": 12,
+                "bodies": {"classic": "topics/roof.classic.html", "structured": "topics/roof.structured.html"},
+            },
+            "сварка": {
+                "title": "Сварка",
+                "keywords": ["сварка", "швы"],
+                "complexity": "Продвинутый",
+                "bodies": {"classic": "topics/weld.classic.html"},
+            },
+        },
+    }
+    (tmp_path / "index.json").write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+    return tmp_path
+
+
+class TestKnowledgeBase:
+    """Тесты загрузки тем"""
+
+    def test_bodies_loaded_on_demand_and_cached(self, knowledge_dir):
+        knowledge_base = KnowledgeBase(knowledge_dir, cache_size=1)
+        assert knowledge_base.loads == 0
+        assert knowledge_base.topics["кровля"].reading_time_minutes == 12
+
+        assert knowledge_base.body("кровля") == "Кровля: подробно"
+        assert knowledge_base.body("кровля") == "Кровля: подробно"
+        assert knowledge_base.loads == 1
+
+        # Размер кэша 1: чтение другой темы вытесняет первую
+        knowledge_base.body("сварка")
+        knowledge_base.body("кровля")
+        assert knowledge_base.loads == 3
+
+    def test_missing_edition_falls_back_to_classic(self, knowledge_dir):
+        knowledge_base = KnowledgeBase(knowledge_dir)
+        assert knowledge_base.body("кровля", STRUCTURED) == "Кровля: структурно"
+        assert knowledge_base.body("сварка", STRUCTURED) == "Сварка: подробно"
+        assert knowledge_base.body(KnowledgeBase.GENERAL, STRUCTURED) == "Общий ответ"
+
+
+class TestConsultantServices:
+    """Тесты сервисов поверх общего движка"""
+
+    def test_both_services_share_engine(self, knowledge_dir):
+        engine = ConsultantEngine(KnowledgeBase(knowledge_dir), embeddings_path=knowledge_dir / "embeddings.npz")
+        v1 = AIConsultantService(engine)
+        v2 = AIConsultantServiceV2(engine)
+
+        assert v1.get_answer("Протекает крыша") == "Кровля: подробно"
+        assert v1.get_answer("Вопрос про окна") == "Общий ответ"
+
+        answer = v2.get_answer("Сварка и швы: кровля")
+        assert answer["answer"] == "Сварка: подробно"
+        assert answer["metadata"]["complexity"] == "Продвинутый"
+        assert answer["metadata"]["matched_topics"] == ["кровля"]
+
+    def test_packaged_knowledge_base(self):
+        knowledge_base = KnowledgeBase()
+        for key, topic in knowledge_base.topics.items():
+            assert topic.keywords and topic.reading_time_minutes > 0
+            assert knowledge_base.body(key, CLASSIC)
+        assert knowledge_base.body("кровля", STRUCTURED) != knowledge_base.body("кровля", CLASSIC)
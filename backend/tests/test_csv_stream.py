@@ -0,0 +1,38 @@
+"""
+Тесты для потоковой генерации CSV
+"""
+import csv
+from io import StringIO
+
+from app.utils.csv_stream import stream_csv, UTF8_BOM
+
+
+def _rows(count):
+    for i in range(count):
+        yield (i, "Объект «Горизонт»", None)
+
+
+class TestStreamCSV:
+    """Тесты для stream_csv"""
+
+    def test_header_is_first_chunk(self):
+        chunks = stream_csv(["ID", "Название", "Примечание"], _rows(10))
+        first = next(chunks)
+        assert first == UTF8_BOM + "ID,Название,Примечание\r\n".encode("utf-8")
+
+    def test_fixed_size_chunks(self):
+        chunks = list(stream_csv(["ID", "Название", "Примечание"], _rows(5000), chunk_size=1024))
+        body = chunks[1:]
+        assert all(len(chunk) == 1024 for chunk in body[:-1])
+        assert 0 < len(body[-1]) <= 1024
+
+    def test_content_roundtrip(self):
+        data = b"".join(stream_csv(["ID", "Название", "Примечание"], _rows(3)))
+        rows = list(csv.reader(StringIO(data.decode("utf-8-sig"))))
+        assert rows[0] == ["ID", "Название", "Примечание"]
+        assert rows[1] == ["0", "Объект «Горизонт»", ""]
+        assert len(rows) == 4
+
+    def test_without_bom(self):
+        data = b"".join(stream_csv(["ID"], [], bom=False))
+        assert data == b"ID\r\n"
@@ -0,0 +1,65 @@
+"""
+Тесты векторного поиска консультанта
+"""
+import numpy as np
+
+from app.search.embeddings import HashingEncoder, VectorIndex
+from app.services.consultant_engine import ConsultantEngine
+
+DOCUMENTS = [
+    ("roof", "Протечки кровли: уклон кровельного покрытия и водосток"),
+    ("base", "Осадка фундамента и деформации основания здания"),
+    ("weld", "Контроль качества сварных швов"),
+]
+
+
+class TestVectorIndex:
+    """Тесты матрицы векторов"""
+
+    def test_encoder_is_deterministic(self):
+        encoder = HashingEncoder(dim=256)
+        first, second = encoder.encode(["Осадка фундамента"]), encoder.encode(["Осадка фундамента"])
+        assert first.shape == (1, 256)
+        assert np.array_equal(first, second)
+
+    def test_finds_word_forms_and_close_spelling(self):
+        index = VectorIndex.build(DOCUMENTS)
+        assert index.search("усадка оснований", limit=1)[0][0] == "base"
+        assert index.search("кровельные протечки", limit=1)[0][0] == "roof"
+        assert index.search("!!!") == []
+
+    def test_save_and_load(self, tmp_path):
+        path = tmp_path / "vectors.npz"
+        index = VectorIndex.build([(("doc", key), text) for key, text in DOCUMENTS], fingerprint="v1")
+        index.save(path)
+
+        loaded = VectorIndex.load(path, fingerprint="v1")
+        assert loaded.keys == index.keys
+        assert np.array_equal(loaded.matrix, index.matrix)
+        assert loaded.search("сварка швов", limit=1)[0][0] == ("doc", "weld")
+
+        assert VectorIndex.load(path, fingerprint="v2") is None
+        assert VectorIndex.load(tmp_path / "missing.npz") is None
+
+
+class TestSemanticFallback:
+    """Тесты поиска по смыслу в консультанте"""
+
+    def test_paraphrase_routed_by_vectors(self, tmp_path):
+        engine = ConsultantEngine(embeddings_path=tmp_path / "embeddings.npz")
+
+        assert engine.knowledge_base.match("усадка основания") == []
+        assert engine.match_topics("усадка основания")[0][0] == "фундамент"
+        assert engine.match_topics("как оформить отпуск") == []
+
+    def test_index_persisted_between_engines(self, tmp_path, monkeypatch):
+        path = tmp_path / "embeddings.npz"
+        ConsultantEngine(embeddings_path=path).semantic_index
+        assert path.exists()
+
+        def fail(*args):
+            raise AssertionError("index should be loaded from file")
+
+        engine = ConsultantEngine(embeddings_path=path)
+        monkeypatch.setattr(engine, "_build_semantic_index", fail)
+        assert len(engine.semantic_index) > 0
@@ -5,7 +5,15 @@ import pytest
 from fastapi.testclient import TestClient
 import csv
 import json
-from io import StringIO
+import zipfile
+from io import BytesIO, StringIO
+
+from app.models.hidden_works import HiddenWork, HiddenWorkType
+from app.models.inspection import Inspection
+from app.models.project import Project, ProjectType
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
 
 
 def test_export_projects_csv(client: TestClient):
@@ -18,7 +26,7 @@ def test_export_projects_csv(client: TestClient):
     assert "projects_" in response.headers["content-disposition"]
 
     # Проверка содержимого CSV
-    csv_content = response.text
+    csv_content = response.content.decode("utf-8-sig")
     csv_reader = csv.reader(StringIO(csv_content))
     rows = list(csv_reader)
 
@@ -40,7 +48,7 @@ def test_export_inspections_csv(client: TestClient):
     assert response.headers["content-type"] == "text/csv; charset=utf-8"
 
     # Проверка содержимого
-    csv_content = response.text
+    csv_content = response.content.decode("utf-8-sig")
     csv_reader = csv.reader(StringIO(csv_content))
     rows = list(csv_reader)
 
@@ -59,7 +67,7 @@ def test_export_inspections_csv_with_filter(client: TestClient):
     assert response.status_code == 200
 
     # Проверка, что все проверки относятся к указанному проекту
-    csv_content = response.text
+    csv_content = response.content.decode("utf-8-sig")
     csv_reader = csv.reader(StringIO(csv_content))
     rows = list(csv_reader)
 
@@ -69,6 +77,46 @@ def test_export_inspections_csv_with_filter(client: TestClient):
             assert str(row[1]) == str(project_id)
 
 
+def test_export_csv_utf8_bom(client: TestClient):
+    """Тест UTF-8 BOM в начале CSV (для Excel) и его отключения"""
+    response = client.get("/api/v1/export/projects/csv")
+    assert response.content.startswith(b"\xef\xbb\xbf")
+
+    response = client.get("/api/v1/export/projects/csv?bom=false")
+    assert response.content.startswith(b"ID,")
+
+
+def test_export_projects_parquet(client: TestClient):
+    """Тест экспорта проектов в Parquet"""
+    response = client.get("/api/v1/export/projects/parquet")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+
+    table = pq.read_table(BytesIO(response.content))
+    assert "id" in table.column_names
+    assert "status" in table.column_names
+    # Перечисления закодированы словарем
+    assert pa.types.is_dictionary(table.schema.field("status").type)
+
+
+def test_export_defects_arrow(client: TestClient):
+    """Тест экспорта дефектов в Arrow IPC"""
+    response = client.get("/api/v1/export/defects/arrow")
+
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert "severity" in table.column_names
+    assert "confidence_score" in table.column_names
+
+
+def test_export_columnar_unknown_dataset(client: TestClient):
+    """Тест колоночного экспорта неизвестного набора данных"""
+    response = client.get("/api/v1/export/materials/parquet")
+
+    assert response.status_code == 404
+
+
 def test_export_project_json(client: TestClient):
     """Тест экспорта проекта в JSON"""
     project_id = 1
@@ -117,6 +165,64 @@ def test_batch_export(client: TestClient):
     assert isinstance(data["projects"], list)
 
 
+@pytest.fixture
+def seeded_project(db, test_user):
+    """Проект пользователя с одной проверкой и одной скрытой работой"""
+    project = Project(
+        name="ЖК Северный", project_type=ProjectType.RESIDENTIAL,
+        address="ул. Ленина, 1", created_by=test_user.id
+    )
+    db.add(project)
+    db.flush()
+    inspection = Inspection(project_id=project.id, inspector_id=test_user.id, title="Армирование плиты")
+    db.add_all([
+        inspection,
+        HiddenWork(project_id=project.id, title="Армирование фундамента", work_type=HiddenWorkType.REINFORCEMENT),
+    ])
+    db.commit()
+    return project, inspection
+
+
+def test_batch_export_zip(client: TestClient, auth_headers, seeded_project):
+    """Тест пакетного экспорта в потоковый ZIP архив"""
+    project, inspection = seeded_project
+    payload = {
+        "project_ids": [project.id],
+        "format": "zip",
+        "include_pdfs": True
+    }
+
+    response = client.post("/api/v1/export/batch-export", json=payload, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    assert ".zip" in response.headers["content-disposition"]
+
+    archive = zipfile.ZipFile(BytesIO(response.content))
+    assert archive.testzip() is None
+
+    folder = f"project_{project.id}"
+    assert sorted(archive.namelist()) == [
+        "manifest.json",
+        f"{folder}/hidden_works.csv",
+        f"{folder}/inspections.csv",
+        f"{folder}/project.json",
+        f"{folder}/reports/inspection_{inspection.id}.pdf",
+    ]
+
+    manifest = json.loads(archive.read("manifest.json"))
+    assert manifest["projects"] == [{
+        "id": project.id,
+        "name": "ЖК Северный",
+        "status": "exported",
+        "inspections": 1,
+        "hidden_works": 1,
+        "photos": 0,
+    }]
+    assert json.loads(archive.read(f"{folder}/project.json"))["project"]["name"] == "ЖК Северный"
+    assert "Армирование фундамента" in archive.read(f"{folder}/hidden_works.csv").decode("utf-8-sig")
+
+
 def test_batch_export_no_projects(client: TestClient):
     """Тест пакетного экспорта с пустым списком"""
     payload = {
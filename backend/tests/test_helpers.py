@@ -19,6 +19,7 @@ from app.utils.helpers import (
     calculate_statistics,
     group_by_date,
     convert_decimal_to_float,
+    flatten_dict,
     chunk_list,
     calculate_expiry_status,
     format_currency
@@ -262,6 +263,21 @@ class TestConvertDecimalToFloat:
         assert all(isinstance(item["price"], float) for item in result["items"])
 
 
+class TestFlattenDict:
+    """Тесты для flatten_dict"""
+
+    def test_nested(self):
+        data = {"summary": {"total": 5, "active": 2}, "name": "test"}
+        assert flatten_dict(data) == [
+            ("summary.total", 5),
+            ("summary.active", 2),
+            ("name", "test"),
+        ]
+
+    def test_empty_nested_dict(self):
+        assert flatten_dict({"a": {}}) == []
+
+
 class TestChunkList:
     """Тесты для chunk_list"""
 
@@ -0,0 +1,53 @@
+"""
+Тесты выбора темы консультанта по ключевым словам
+"""
+from app.search.keywords import KeywordMatcher
+
+
+class TestKeywordMatcher:
+    """Тесты автомата Ахо-Корасик"""
+
+    def test_finds_overlapping_keywords(self):
+        matcher = KeywordMatcher()
+        for keyword in ("ширина", "ширина трещины", "трещины", "трещ"):
+            matcher.add(keyword, keyword)
+
+        assert sorted(matcher.find("Ширина трещины")) == [
+            (0, "ширина"), (0, "ширина трещины"), (7, "трещ"), (7, "трещины"),
+        ]
+
+    def test_matches_from_word_start_only(self):
+        matcher = KeywordMatcher.from_topics({"сварка": ["швы"], "трещины": ["трещина"]})
+
+        assert [keyword for _, keyword in matcher.find("Трещинами покрыты швы")] == ["трещина", "швы"]
+        assert matcher.find("плашвы") == []
+
+    def test_rank_by_keyword_weight(self):
+        matcher = KeywordMatcher.from_topics({
+            "гидроизоляция": ["гидроизоляция", "подвал", "фундамент"],
+            "фундамент": ["фундамент", "осадка", "деформация фундамента"],
+        })
+
+        assert matcher.rank("Гидроизоляция подвала и фундамента")[0][0] == "гидроизоляция"
+        assert matcher.rank("Деформация фундамента и осадка") == [("фундамент", 3.5), ("гидроизоляция", 0.5)]
+        assert matcher.rank("Вопрос про окна") == []
+
+    def test_keyword_counted_once(self):
+        matcher = KeywordMatcher.from_topics({"бетон": ["бетон"], "кровля": ["кровля", "крыша"]})
+
+        assert matcher.rank("бетон, бетон, бетон; кровля и крыша") == [("кровля", 2.0), ("бетон", 1.0)]
+
+
+class TestConsultantRouting:
+    """Тесты выбора темы консультантом"""
+
+    def test_best_topic_instead_of_first(self, tmp_path):
+        from app.services.ai_consultant_service import AIConsultantService
+        from app.services.consultant_engine import ConsultantEngine
+
+        service = AIConsultantService(ConsultantEngine(embeddings_path=tmp_path / "embeddings.npz"))
+
+        topics = service.match_topics("Какая допустимая осадка и деформация фундамента?")
+        assert topics[0][0] == "фундамент"
+        answer = service.get_answer("Какая допустимая осадка и деформация фундамента?")
+        assert answer == service.engine.knowledge_base.body("фундамент")
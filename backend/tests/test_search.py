@@ -1,8 +1,22 @@
 """
 Тесты для endpoints поиска
 """
+import json
+import time
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.document import Document
+from app.models.inspection import Inspection
+from app.models.project import Project
+from app.models.regulation import Regulation
+from app.models.user import User
+from app.search import autocomplete, federated, fulltext, trigram
 
 
 def test_global_search(client: TestClient):
@@ -95,6 +109,23 @@ def test_search_regulations(client: TestClient):
         assert "regulation_type" in regulation
 
 
+def test_search_regulations_by_category(client: TestClient, db):
+    """Фильтр по категории ищет в JSON массиве categories"""
+    db.add_all([
+        Regulation(code="СП 63.13330.2018", title="Бетонные конструкции", regulation_type="СП",
+                   categories=json.dumps(["бетон", "конструкции"], ensure_ascii=False)),
+        Regulation(code="СП 28.13330.2017", title="Защита от коррозии бетонных конструкций", regulation_type="СП",
+                   categories=json.dumps(["защита от коррозии"])),
+    ])
+    db.commit()
+
+    response = client.get("/api/v1/search/regulations?q=СП&category=бетон")
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(r["code"], r["categories"]) for r in results] == [("СП 63.13330.2018", ["бетон", "конструкции"])]
+
+
 def test_autocomplete(client: TestClient):
     """Тест автодополнения"""
     response = client.get("/api/v1/search/autocomplete?q=жк")
@@ -145,3 +176,196 @@ def test_global_search_various_terms(client: TestClient, search_term: str):
     assert response.status_code == 200
     data = response.json()
     assert data["query"] == search_term
+
+
+def test_fulltext_query_uses_search_vector():
+    """Полнотекстовый запрос идет по search_vector (GIN индекс) и сортируется по ts_rank"""
+    query = fulltext.ranked_query(Session().query(Regulation), Regulation, "бетон -кирпич", Regulation.content)
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+    assert "regulations.search_vector @@ websearch_to_tsquery(" in sql
+    assert "ts_headline(" in sql
+    assert "ORDER BY rank DESC" in sql
+    assert "ILIKE" not in sql.upper()
+
+
+@pytest.fixture
+def regulations_db():
+    """SQLite сессия с двумя нормативами"""
+    engine = create_engine("sqlite://")
+    Regulation.__table__.create(engine)
+    with Session(engine) as db:
+        db.add_all([
+            Regulation(code="СП 63.13330.2018", title="Бетонные конструкции", regulation_type="СП"),
+            Regulation(code="СП 15.13330.2020", title="Каменные конструкции", regulation_type="СП"),
+        ])
+        db.commit()
+        yield db
+
+
+def test_fulltext_falls_back_to_ilike_outside_postgres(regulations_db):
+    """На SQLite поиск работает через ILIKE без ранга и фрагментов"""
+    db = regulations_db
+    hits = fulltext.ranked_search(db.query(Regulation), Regulation, "Бетон", [Regulation.title])
+
+    assert [(hit[0].code, hit[1], hit[2]) for hit in hits] == [("СП 63.13330.2018", None, None)]
+
+
+def test_fuzzy_match_uses_trigram_operator():
+    """Нечеткое совпадение - оператор word_similarity, который обслуживает gin_trgm_ops индекс"""
+    sql = str(trigram.fuzzy_match("СП 63.1333", Regulation.code).compile(dialect=postgresql.dialect()))
+
+    assert sql.replace("%%", "%") == "%(param_1)s <% regulations.code"
+
+
+def test_trigram_falls_back_outside_postgres(regulations_db):
+    """На SQLite нечеткий поиск - подстрока, автодополнение - префикс"""
+    db = regulations_db
+
+    hits = trigram.fuzzy_search(db.query(Regulation), "63.1333", [Regulation.code])
+    suggestions = trigram.suggest(db.query(Regulation.code), Regulation.code, "СП 1", limit=10)
+
+    assert [(hit[0].code, hit[1]) for hit in hits] == [("СП 63.13330.2018", None)]
+    assert suggestions == ["СП 15.13330.2020"]
+
+
+def test_parallel_search_returns_partial_results_after_deadline():
+    """Поиски выполняются параллельно; не успевшие к дедлайну помечаются, ответ не ждет их"""
+    engine = create_engine("sqlite://")
+
+    def slow(db):
+        time.sleep(0.5)
+        return [{"type": "document", "rank": 1.0}]
+
+    def failing(db):
+        raise RuntimeError("connection lost")
+
+    tasks = {
+        "projects": lambda db: [{"type": "project", "rank": 0.2}],
+        "inspections": lambda db: [{"type": "inspection", "rank": 0.1}],
+        "documents": slow,
+        "hidden_works": failing,
+    }
+
+    started = time.monotonic()
+    found, missing = federated.run_parallel(engine, tasks, deadline=0.1)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.4
+    assert list(found) == ["projects", "inspections"]
+    assert missing == ["documents", "hidden_works"]
+
+
+def test_parallel_search_logs_failures_with_traceback(caplog):
+    """Упавший поиск пишется в лог как ошибка, даже если упал уже после дедлайна"""
+    engine = create_engine("sqlite://")
+
+    def failing(db):
+        raise RuntimeError("no such column: inspections.location")
+
+    def failing_late(db):
+        time.sleep(0.2)
+        raise RuntimeError("connection lost")
+
+    with caplog.at_level("ERROR", logger="app.search.federated"):
+        found, missing = federated.run_parallel(
+            engine, {"inspections": failing, "documents": failing_late}, deadline=0.1
+        )
+        time.sleep(0.3)
+
+    assert missing == ["inspections", "documents"]
+    errors = {record.getMessage(): record for record in caplog.records if record.levelname == "ERROR"}
+    assert set(errors) == {"Search for inspections failed", "Search for documents failed"}
+    assert all(record.exc_info for record in errors.values())
+
+
+def test_merge_ranked_orders_by_rank_with_per_type_cap():
+    """Общий список упорядочен по рангу, от каждого типа не больше per_type"""
+    groups = {
+        "projects": [{"id": 1, "rank": 0.9}, {"id": 2, "rank": 0.3}, {"id": 3, "rank": 0.2}],
+        "documents": [{"id": 10, "rank": 0.5}],
+    }
+
+    merged = federated.merge_ranked(groups, per_type=2)
+
+    assert [hit["id"] for hit in merged] == [1, 10, 2]
+
+
+def test_prefix_index_matches_string_and_word_starts():
+    """Подсказки по началу строки идут первыми, затем по началу слова; регистр и ё не важны"""
+    index = autocomplete.PrefixIndex()
+    for kind, text in [
+        ("project", "ЖК Горизонт"),
+        ("project", "Горизонт Парк"),
+        ("inspection", "Секция 2, этаж 5"),
+        ("inspection", "Секция 2, этаж 5"),
+        ("document", "Акт освидетельствования арматуры"),
+    ]:
+        index.add(kind, text)
+
+    assert index.search("гор", limit=10) == [("project", "Горизонт Парк"), ("project", "ЖК Горизонт")]
+    assert index.search("АРМАТ", limit=10) == [("document", "Акт освидетельствования арматуры")]
+    assert index.search("с", limit=10, kinds={"inspection"}) == [("inspection", "Секция 2, этаж 5")]
+
+    # Одинаковые названия проверок хранятся со счетчиком
+    index.remove("inspection", "Секция 2, этаж 5")
+    assert index.search("секц", limit=10) == [("inspection", "Секция 2, этаж 5")]
+    index.remove("inspection", "Секция 2, этаж 5")
+    assert index.search("секц", limit=10) == []
+
+
+def test_autocomplete_index_is_built_lazily_and_follows_commits(monkeypatch):
+    """Индекс пользователя строится один раз и обновляется после commit, но не после rollback"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine, tables=[User.__table__, Project.__table__, Inspection.__table__, Document.__table__]
+    )
+    index = autocomplete.AutocompleteIndex(ttl_seconds=60, max_scopes=10)
+    monkeypatch.setattr(autocomplete, "autocomplete_index", index)
+
+    def project(name, owner_id):
+        return Project(name=name, project_type="residential", address="ул. Ленина, 1", created_by=owner_id)
+
+    with Session(engine) as db:
+        horizon = project("ЖК Горизонт", 1)
+        db.add_all([horizon, project("ЖК Чужой", 2)])
+        db.commit()
+        db.add(Inspection(project_id=horizon.id, inspector_id=1, title="Армирование плиты"))
+        db.commit()
+
+        assert index.suggest(db, 1, "жк") == [{"text": "ЖК Горизонт", "type": "project"}]
+        assert index.suggest(db, 1, "арм") == [{"text": "Армирование плиты", "type": "inspection"}]
+
+        park = project("Горизонт Парк", 1)
+        db.add_all([park, project("Горизонт Чужой", 2)])
+        db.commit()
+        assert index.suggest(db, 1, "гор") == [
+            {"text": "Горизонт Парк", "type": "project"},
+            {"text": "ЖК Горизонт", "type": "project"},
+        ]
+
+        # Проверки нового проекта попадают в индекс: проект уже в области пользователя
+        db.add(Inspection(project_id=park.id, inspector_id=1, title="Бетонирование колонн"))
+        db.commit()
+        assert index.suggest(db, 1, "бет", kinds={"inspection"}) == [
+            {"text": "Бетонирование колонн", "type": "inspection"}
+        ]
+
+        park.name = "Горизонт Сити"
+        db.flush()
+        db.rollback()
+        assert index.suggest(db, 1, "горизонт п") == [{"text": "Горизонт Парк", "type": "project"}]
+
+        park.name = "Горизонт Сити"
+        db.commit()
+        assert index.suggest(db, 1, "горизонт") == [
+            {"text": "Горизонт Сити", "type": "project"},
+            {"text": "ЖК Горизонт", "type": "project"},
+        ]
+
+        # Проект передан другому пользователю - подсказка пропадает
+        park.created_by = 2
+        db.commit()
+        assert index.suggest(db, 1, "горизонт") == [{"text": "ЖК Горизонт", "type": "project"}]
+
+    assert index.builds == 1
@@ -0,0 +1,147 @@
+"""
+Тесты индексации в поисковом бэкенде
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.regulation import Regulation
+from app.search import backends, indexer
+from app.search.backends import EmbeddedBackend, SearchBackend
+
+
+@pytest.fixture
+def db():
+    """SQLite сессия с таблицей нормативов"""
+    engine = create_engine("sqlite://")
+    Regulation.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Embedded бэкенд как общий бэкенд процесса"""
+    backend = EmbeddedBackend()
+    monkeypatch.setattr(backends, "_backend", backend)
+    return backend
+
+
+def add_regulations(db):
+    db.add_all([
+        Regulation(code="СП 63.13330.2018", title="Бетонные и железобетонные конструкции", regulation_type="СП"),
+        Regulation(code="СП 70.13330.2012", title="Несущие и ограждающие конструкции", regulation_type="СП"),
+        Regulation(code="ГОСТ 10180-2012", title="Бетоны. Методы определения прочности", regulation_type="ГОСТ",
+                   is_active=False),
+    ])
+    db.commit()
+
+
+class TestEmbeddedBackend:
+    """Тесты инвертированного индекса в памяти"""
+
+    def test_incomplete_backend_fails_on_construction(self):
+        class NoCount(SearchBackend):
+            def ensure_index(self, index, mapping):
+                pass
+
+        with pytest.raises(TypeError):
+            NoCount()
+
+    def test_ranks_by_field_weight_and_filters(self):
+        backend = EmbeddedBackend()
+        backend.bulk("docs", [
+            ("index", 1, {"title": "Акт скрытых работ", "description": "бетонирование", "project_id": 1}),
+            ("index", 2, {"title": "Журнал бетонных работ", "description": "", "project_id": 1}),
+            ("index", 3, {"title": "Бетонирование плиты", "description": "", "project_id": 2}),
+        ])
+
+        hits = backend.search("docs", "бетонирование", {"title": 3.0, "description": 1.0})
+        assert [hit["id"] for hit in hits] == ["3", "1"]
+
+        hits = backend.search("docs", "бетонирование", {"title": 3.0, "description": 1.0}, filters={"project_id": [1]})
+        assert [hit["id"] for hit in hits] == ["1"]
+
+    def test_reindexing_document_replaces_old_terms(self):
+        backend = EmbeddedBackend()
+        backend.bulk("docs", [("index", 1, {"title": "Акт приемки"})])
+        backend.bulk("docs", [("index", 1, {"title": "Протокол испытаний"})])
+
+        assert backend.search("docs", "акт", {"title": 1.0}) == []
+        assert [hit["id"] for hit in backend.search("docs", "протокол", {"title": 1.0})] == ["1"]
+
+        backend.bulk("docs", [("delete", 1, None)])
+        assert backend.count("docs") == 0
+
+
+class TestIndexer:
+    """Тесты индексации моделей"""
+
+    def test_reindex_and_search(self, db, backend):
+        add_regulations(db)
+
+        assert indexer.reindex(db, "regulations", batch_size=2) == 3
+
+        hits = indexer.search_index(db, "regulations", "бетонные конструкции", filters={"is_active": True})
+        assert [hit["source"]["code"] for hit in hits][0] == "СП 63.13330.2018"
+        assert "ГОСТ 10180-2012" not in [hit["source"]["code"] for hit in hits]
+
+    def test_embedded_index_is_filled_on_first_search(self, db, backend):
+        add_regulations(db)
+
+        hits = indexer.search_index(db, "regulations", "ГОСТ 10180")
+
+        assert [hit["source"]["code"] for hit in hits] == ["ГОСТ 10180-2012"]
+
+    def test_commit_before_first_search_does_not_skip_fill(self, db, backend):
+        db.add(Regulation(code="СП 70.13330.2012", title="Несущие и ограждающие конструкции", regulation_type="СП"))
+        db.commit()
+        indexer.track_changes(indexer.dispatch_in_process)
+        try:
+            db.add(Regulation(code="СП 63.13330.2018", title="Бетонные и железобетонные конструкции",
+                              regulation_type="СП"))
+            db.commit()
+        finally:
+            indexer.stop_tracking()
+        assert backend.count("regulations") == 1
+
+        hits = indexer.search_index(db, "regulations", "конструкции")
+
+        assert sorted(hit["source"]["code"] for hit in hits) == ["СП 63.13330.2018", "СП 70.13330.2012"]
+
+    def test_index_entities_removes_deleted(self, db, backend):
+        add_regulations(db)
+        indexer.reindex(db, "regulations")
+        regulation = db.query(Regulation).filter(Regulation.code == "СП 70.13330.2012").one()
+        db.delete(regulation)
+        db.commit()
+
+        assert indexer.index_entities(db, "regulations", [regulation.id]) == 1
+        assert backend.count("regulations") == 2
+
+    def test_changes_are_indexed_after_commit(self, db, backend):
+        dispatched = []
+        indexer.track_changes(lambda session, changes: dispatched.append(changes))
+        try:
+            add_regulations(db)
+            regulation = db.query(Regulation).filter(Regulation.code == "СП 63.13330.2018").one()
+            regulation.title = "Бетонные конструкции"
+            db.flush()
+            db.rollback()
+        finally:
+            indexer.stop_tracking()
+
+        assert dispatched == [{"regulations": {1, 2, 3}}]
+
+    def test_in_process_dispatch_updates_embedded_index(self, db, backend):
+        indexer.track_changes(indexer.dispatch_in_process)
+        try:
+            add_regulations(db)
+            regulation = db.query(Regulation).filter(Regulation.code == "СП 63.13330.2018").one()
+            regulation.title = "Железобетонные конструкции"
+            db.commit()
+        finally:
+            indexer.stop_tracking()
+
+        hits = backend.search("regulations", "железобетонные", {"title": 1.0})
+        assert [hit["source"]["code"] for hit in hits] == ["СП 63.13330.2018"]
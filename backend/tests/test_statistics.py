@@ -5,6 +5,11 @@ import pytest
 from fastapi.testclient import TestClient
 from datetime import datetime
 
+from app.models.project import Project, ProjectType
+from app.models.inspection import Inspection, InspectionPhoto, DefectDetection, DefectType, DefectSeverity
+from app.models.hidden_works import HiddenWork, HiddenWorkType
+from app.services.stats_cache import stats_cache
+
 
 def test_get_dashboard_stats(client: TestClient):
     """Тест получения статистики дашборда"""
@@ -105,3 +110,79 @@ def test_get_trends_various_periods(client: TestClient, days: int):
     assert response.status_code == 200
     data = response.json()
     assert data["period_days"] == days
+
+
+@pytest.fixture
+def own_project(db, test_user):
+    """Проект пользователя с проверкой, двумя дефектами, найденными ИИ, и скрытой работой"""
+    project = Project(
+        name="ЖК Северный", project_type=ProjectType.RESIDENTIAL,
+        address="ул. Ленина, 1", created_by=test_user.id
+    )
+    db.add(project)
+    db.flush()
+    inspection = Inspection(project_id=project.id, inspector_id=test_user.id, title="Армирование плиты")
+    db.add(inspection)
+    db.flush()
+    photo = InspectionPhoto(inspection_id=inspection.id, file_url="s3://photos/1.jpg")
+    db.add(photo)
+    db.flush()
+    db.add_all([
+        DefectDetection(photo_id=photo.id, defect_type=DefectType.CRACK, severity=DefectSeverity.MAJOR,
+                        detected_by_ai=True, confidence_score=0.9),
+        DefectDetection(photo_id=photo.id, defect_type=DefectType.WELDING, severity=DefectSeverity.MINOR,
+                        detected_by_ai=True, confidence_score=0.3),
+        HiddenWork(project_id=project.id, title="Армирование фундамента", work_type=HiddenWorkType.REINFORCEMENT),
+    ])
+    db.commit()
+    # Снимки статистики кешируются по ID пользователя, а база пересоздается в каждом тесте
+    stats_cache.clear()
+    return project
+
+
+def test_defect_confidence_of_own_projects(client: TestClient, auth_headers, own_project):
+    """Распределение уверенности считается по проектам пользователя"""
+    response = client.get("/api/v1/statistics/defects/confidence?bins=2", headers=auth_headers)
+
+    assert response.status_code == 200
+    confidence = response.json()["confidence"]
+    assert confidence["count"] == 2
+
+
+def test_inspection_throughput_of_own_projects(client: TestClient, auth_headers, own_project):
+    """Пропускная способность считается по проектам пользователя"""
+    response = client.get(
+        f"/api/v1/statistics/inspections/throughput?days=7&project_id={own_project.id}",
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert sum(item["count"] for item in data["throughput"]) == 1
+
+
+def test_export_stats_csv(client: TestClient, auth_headers, own_project):
+    """Экспорт статистики дашборда в CSV"""
+    response = client.get("/api/v1/statistics/export-stats?format=csv", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = dict(line.split(",", 1) for line in response.text.splitlines()[1:])
+    assert rows["summary.total_projects"] == "1"
+    assert rows["summary.total_defects"] == "2"
+    assert rows["summary.pending_hidden_works"] == "1"
+    assert rows["inspections_by_result.draft"] == "1"
+
+
+def test_export_stats_pdf(client: TestClient, auth_headers, own_project):
+    """Экспорт статистики проекта в PDF"""
+    response = client.get(
+        f"/api/v1/statistics/export-stats?format=pdf&project_id={own_project.id}",
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+    assert response.headers["X-Stats-Snapshot"]
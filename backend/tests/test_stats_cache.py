@@ -0,0 +1,56 @@
+"""
+Тесты для кеша снимков статистики
+"""
+import pytest
+
+from app.services.stats_cache import StatsSnapshotCache
+
+
+@pytest.fixture
+def cache():
+    """Фикстура кеша снимков"""
+    return StatsSnapshotCache(ttl_seconds=300, max_entries=2)
+
+
+class TestStatsSnapshotCache:
+    """Тесты для StatsSnapshotCache"""
+
+    def test_repeated_export_uses_snapshot(self, cache):
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return {"summary": {"total_projects": 3}}
+
+        first = cache.get_or_create(1, None, builder)
+        second = cache.get_or_create(1, None, builder)
+
+        assert len(calls) == 1
+        assert first is second
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_keyed_by_user_and_project(self, cache):
+        cache.get_or_create(1, 10, lambda: {"project_id": 10})
+        snapshot = cache.get_or_create(1, 20, lambda: {"project_id": 20})
+
+        assert snapshot["stats"]["project_id"] == 20
+        assert cache.get(2, 10, snapshot["snapshot_ts"]) is None
+
+    def test_get_by_timestamp(self, cache):
+        snapshot = cache.get_or_create(1, None, lambda: {"a": 1})
+        assert cache.get(1, None, snapshot["snapshot_ts"]) is snapshot
+        assert cache.get(1, None, snapshot["snapshot_ts"] - 300) is None
+
+    def test_lru_eviction(self, cache):
+        cache.get_or_create(1, 1, lambda: {})
+        cache.get_or_create(1, 2, lambda: {})
+        snapshot = cache.get_or_create(1, 3, lambda: {})
+
+        assert cache.get(1, 1, snapshot["snapshot_ts"]) is None
+        assert cache.get(1, 3, snapshot["snapshot_ts"]) is snapshot
+
+    def test_invalidate_project(self, cache):
+        snapshot = cache.get_or_create(1, 5, lambda: {})
+        cache.invalidate(project_id=5)
+        assert cache.get(1, 5, snapshot["snapshot_ts"]) is None
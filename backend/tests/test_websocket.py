@@ -0,0 +1,727 @@
+"""
+Тесты для WebSocket ConnectionManager
+"""
+import asyncio
+import json
+import time
+
+import zlib
+
+import pytest
+
+from app.realtime.backplane import Backplane, InMemoryBackplane, InMemoryBroker, encode_envelope, project_channel
+from app.realtime.codecs import SSE_CODEC, get_codec
+from app.realtime.event_log import InMemoryEventLog, create_event_log
+from app.realtime.outbound import ConnectionWriter, OverflowPolicy
+from app.realtime.sse import SSEConnection
+from app.websocket import ConnectionManager
+
+
+class FakeWebSocket:
+    """Фейковый WebSocket клиент с настраиваемой задержкой"""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        await asyncio.sleep(self.delay)
+        self.sent.append(text)
+
+    async def send_bytes(self, data: bytes):
+        await self.send_text(data)
+
+    async def close(self, code: int = 1000, reason: str = None):
+        self.closed = True
+
+    def messages(self, codec=None):
+        """Полученные сообщения без приветствия"""
+        decoded = [codec.decode(frame) if codec else json.loads(frame) for frame in self.sent]
+        return [message for message in decoded if message["type"] != "connection_established"]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def connect_all(manager, sockets, project_id):
+    """Подключение сокетов через connect() и ожидание приветствий"""
+    for index, ws in enumerate(sockets):
+        await manager.connect(ws, user_id=index + 1, project_id=project_id)
+    await manager.flush(timeout=1.0)
+
+
+class TestFanOut:
+    """Тесты рассылки"""
+
+    def test_send_to_project(self):
+        manager = ConnectionManager(send_timeout=0.2)
+        sockets = [FakeWebSocket() for _ in range(3)]
+
+        async def scenario():
+            await connect_all(manager, sockets, 10)
+            delivered = await manager.send_to_project(10, {"type": "project_updated", "project_id": 10})
+            await manager.flush()
+            return delivered
+
+        assert run(scenario()) == 3
+        for ws in sockets:
+            assert ws.messages()[0]["type"] == "project_updated"
+
+    def test_fan_out_does_not_wait_for_network(self):
+        manager = ConnectionManager(send_timeout=10.0)
+        slow = [FakeWebSocket(delay=0.5) for _ in range(20)]
+
+        async def scenario():
+            for index, ws in enumerate(slow):
+                await manager.connect(ws, user_id=index + 1, project_id=1)
+            start = time.perf_counter()
+            await manager.send_to_project(1, {"type": "ping"})
+            return time.perf_counter() - start
+
+        assert run(scenario()) < 0.1
+
+    def test_slow_client_does_not_block_others(self):
+        manager = ConnectionManager(send_timeout=0.2)
+        fast = [FakeWebSocket(delay=0.01) for _ in range(50)]
+        slow = FakeWebSocket()
+
+        async def scenario():
+            await connect_all(manager, fast + [slow], 1)
+            slow.delay = 5.0
+            start = time.perf_counter()
+            await manager.send_to_project(1, {"type": "ping"})
+            await asyncio.sleep(0.4)
+            return time.perf_counter() - start
+
+        elapsed = run(scenario())
+
+        assert elapsed < 1.0
+        assert all(len(ws.messages()) == 1 for ws in fast)
+        assert slow.closed
+        assert manager.get_project_connections(1) == 50
+
+    def test_failed_socket_is_removed(self):
+        manager = ConnectionManager(send_timeout=0.2)
+        ok = FakeWebSocket()
+        broken = FakeWebSocket()
+
+        async def scenario():
+            await connect_all(manager, [ok, broken], 1)
+            broken.fail = True
+            await manager.broadcast({"type": "notice"})
+            await asyncio.sleep(0.05)
+
+        run(scenario())
+
+        assert manager.get_user_connections(2) == 0
+        assert manager.get_total_connections() == 1
+        assert broken not in manager.writers
+
+    def test_broadcast_exclude(self):
+        manager = ConnectionManager(send_timeout=0.2)
+        first, second = FakeWebSocket(), FakeWebSocket()
+
+        async def scenario():
+            await manager.connect(first, user_id=1, project_id=1)
+            await manager.connect(second, user_id=2, project_id=2)
+            await manager.broadcast({"type": "notice"}, exclude=first)
+            await manager.flush()
+
+        run(scenario())
+
+        assert first.messages() == []
+        assert len(second.messages()) == 1
+
+    def test_queue_stats(self):
+        manager = ConnectionManager(send_timeout=0.2, max_queue=8)
+
+        async def scenario():
+            await connect_all(manager, [FakeWebSocket()], 1)
+            return manager.get_queue_stats()
+
+        stats = run(scenario())
+
+        assert stats["max_queue"] == 8
+        assert stats["queued"] == 0
+        assert stats["overflow_policy"] == manager.overflow_policy
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            ConnectionManager(overflow_policy="block")
+
+
+class TestConnectionWriter:
+    """Тесты исходящей очереди подключения"""
+
+    @staticmethod
+    def make_writer(policy, max_queue=3):
+        failures = []
+        ws = FakeWebSocket()
+        writer = ConnectionWriter(
+            ws,
+            max_queue=max_queue,
+            policy=policy,
+            send_timeout=0.2,
+            on_failure=lambda websocket, reason: failures.append(reason)
+        )
+        return ws, writer, failures
+
+    def test_drop_oldest(self):
+        ws, writer, _ = self.make_writer(OverflowPolicy.DROP_OLDEST)
+
+        async def scenario():
+            for index in range(5):
+                writer.enqueue(str(index))
+            writer.start()
+            await writer.flush()
+            writer.close()
+
+        run(scenario())
+
+        assert ws.sent == ["2", "3", "4"]
+        assert writer.dropped == 2
+
+    def test_coalesce_replaces_pending_frame(self):
+        ws, writer, _ = self.make_writer(OverflowPolicy.COALESCE)
+
+        async def scenario():
+            writer.enqueue("a1", ("inspection_updated", 1))
+            writer.enqueue("b", None)
+            writer.enqueue("a2", ("inspection_updated", 1))
+            writer.start()
+            await writer.flush()
+            writer.close()
+
+        run(scenario())
+
+        assert ws.sent == ["a2", "b"]
+        assert writer.coalesced == 1
+        assert writer.dropped == 0
+
+    def test_disconnect_on_overflow(self):
+        ws, writer, failures = self.make_writer(OverflowPolicy.DISCONNECT, max_queue=2)
+
+        accepted = [writer.enqueue(str(index)) for index in range(3)]
+
+        assert accepted == [True, True, False]
+        assert failures == ["queue_overflow"]
+        assert writer.closed
+        assert writer.depth == 0
+
+    def test_send_timeout_fails_writer(self):
+        ws, writer, failures = self.make_writer(OverflowPolicy.DROP_OLDEST)
+        ws.delay = 1.0
+
+        async def scenario():
+            writer.start()
+            writer.enqueue("x")
+            await asyncio.sleep(0.4)
+
+        run(scenario())
+
+        assert failures == ["send_timeout"]
+        assert ws.sent == []
+
+
+class TestBackplane:
+    """Тесты рассылки между процессами через backplane"""
+
+    @staticmethod
+    def make_nodes(count=2):
+        broker = InMemoryBroker()
+        nodes = [
+            ConnectionManager(send_timeout=0.2, backplane=InMemoryBackplane(broker))
+            for _ in range(count)
+        ]
+        return broker, nodes
+
+    def test_event_reaches_every_node_once(self):
+        broker, (first, second) = self.make_nodes()
+        local, remote = FakeWebSocket(), FakeWebSocket()
+
+        async def scenario():
+            for node in (first, second):
+                await node.start()
+            await first.connect(local, user_id=1, project_id=7)
+            await second.connect(remote, user_id=2, project_id=7)
+            await first.send_to_project(7, {"type": "defect_detected", "project_id": 7})
+            await first.flush()
+            await second.flush()
+
+        run(scenario())
+
+        assert [m["type"] for m in local.messages()] == ["defect_detected"]
+        assert [m["type"] for m in remote.messages()] == ["defect_detected"]
+        assert broker.published == 1
+
+    def test_node_subscribes_only_while_it_has_subscribers(self):
+        _, (node,) = self.make_nodes(1)
+        ws = FakeWebSocket()
+
+        async def scenario():
+            await node.start()
+            await node.connect(ws, user_id=1, project_id=3)
+            subscribed = project_channel(3) in node.backplane.channels
+            node.disconnect(ws)
+            return subscribed
+
+        assert run(scenario())
+        assert project_channel(3) not in node.backplane.channels
+
+    def test_worker_event_and_user_channel(self):
+        broker, (first, second) = self.make_nodes()
+        a, b, other = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+
+        async def scenario():
+            for node in (first, second):
+                await node.start()
+            await first.connect(a, user_id=1, project_id=5)
+            await second.connect(b, user_id=2, project_id=5)
+            await second.connect(other, user_id=3, project_id=6)
+            # Событие Celery задачи: origin не совпадает ни с одним узлом
+            await broker.publish(project_channel(5), encode_envelope("worker", {"type": "inspection_created"}))
+            await first.send_to_user(2, {"type": "notice"})
+            for node in (first, second):
+                await node.flush()
+
+        run(scenario())
+
+        assert [m["type"] for m in a.messages()] == ["inspection_created"]
+        assert [m["type"] for m in b.messages()] == ["inspection_created", "notice"]
+        assert other.messages() == []
+
+
+class TestBatching:
+    """Тесты пакетной доставки событий проекта"""
+
+    def test_events_are_batched_per_window(self):
+        manager = ConnectionManager(send_timeout=0.2, batch_window=0.05)
+        plain, batched = FakeWebSocket(), FakeWebSocket()
+
+        async def scenario():
+            await manager.connect(plain, user_id=1, project_id=1)
+            await manager.connect(batched, user_id=2, project_id=1, metadata={"batch": True})
+            for photo_id in range(20):
+                await manager.send_to_project(1, {"type": "photo_uploaded", "photo_id": photo_id})
+            await asyncio.sleep(0.1)
+            await manager.flush()
+
+        run(scenario())
+
+        assert len(plain.messages()) == 20
+        frames = batched.messages()
+        assert len(frames) == 1
+        assert frames[0]["type"] == "batch"
+        assert [event["photo_id"] for event in frames[0]["events"]] == list(range(20))
+
+    def test_inspection_updates_collapse(self):
+        manager = ConnectionManager(send_timeout=0.2, batch_window=10.0)
+        ws = FakeWebSocket()
+
+        async def scenario():
+            await manager.connect(ws, user_id=1, project_id=1, metadata={"batch": True})
+            for version in range(5):
+                await manager.send_to_project(1, {"type": "inspection_updated", "inspection_id": 3, "v": version})
+            await manager.send_to_project(1, {"type": "inspection_updated", "inspection_id": 4, "v": 0})
+            await manager.flush()
+
+        run(scenario())
+
+        events = ws.messages()[0]["events"]
+        assert [(event["inspection_id"], event["v"]) for event in events] == [(3, 4), (4, 0)]
+        assert manager.coalescer.collapsed == 4
+
+    def test_collapsed_event_keeps_seq_order(self):
+        manager = ConnectionManager(send_timeout=0.2, batch_window=10.0, event_log=InMemoryEventLog())
+        ws = FakeWebSocket()
+
+        async def scenario():
+            await manager.connect(ws, user_id=1, project_id=1, metadata={"batch": True})
+            await manager.send_to_project(1, {"type": "inspection_updated", "inspection_id": 3, "v": 0})
+            await manager.send_to_project(1, {"type": "photo_uploaded", "photo_id": 7})
+            await manager.send_to_project(1, {"type": "inspection_updated", "inspection_id": 3, "v": 1})
+            await manager.flush()
+
+        run(scenario())
+
+        events = ws.messages()[0]["events"]
+        assert [(event["type"], event["seq"]) for event in events] == [("photo_uploaded", 2), ("inspection_updated", 3)]
+        seqs = [event["seq"] for event in events]
+        assert seqs == sorted(seqs)
+
+    def test_opt_in_via_subscribe_flag(self):
+        manager = ConnectionManager(send_timeout=0.2)
+        ws = FakeWebSocket()
+
+        async def scenario():
+            await manager.connect(ws, user_id=1)
+            manager.subscribe_project(ws, 9, batch=True)
+            return ws in manager.batch_connections
+
+        assert run(scenario())
+
+
+class TestEncodings:
+    """Тесты кодировок кадров"""
+
+    def test_deflate_round_trip(self):
+        codec = get_codec("deflate")
+        message = {"type": "defect_detected", "data": {"description": "Трещина в бетоне"}}
+
+        frame = codec.encode(message)
+
+        assert isinstance(frame, bytes)
+        assert json.loads(zlib.decompress(frame)) == message
+        assert codec.decode(frame) == message
+
+    def test_msgpack_round_trip(self):
+        pytest.importorskip("msgpack")
+        codec = get_codec("msgpack")
+        message = {"type": "pong", "items": [1, 2.5, None, "ok"]}
+
+        assert codec.decode(codec.encode(message)) == message
+
+    def test_unknown_encoding(self):
+        with pytest.raises(ValueError):
+            get_codec("xml")
+
+    def test_mixed_encodings_fan_out(self):
+        manager = ConnectionManager(send_timeout=0.2)
+        text_client, deflate_client = FakeWebSocket(), FakeWebSocket()
+
+        async def scenario():
+            await manager.connect(text_client, user_id=1, project_id=1)
+            await manager.connect(deflate_client, user_id=2, project_id=1, metadata={"encoding": "deflate"})
+            await manager.send_to_project(1, {"type": "photo_uploaded", "photo_id": 5})
+            await manager.flush()
+
+        run(scenario())
+
+        assert all(isinstance(frame, str) for frame in text_client.sent)
+        assert all(isinstance(frame, bytes) for frame in deflate_client.sent)
+        assert deflate_client.messages(get_codec("deflate"))[0]["photo_id"] == 5
+        assert text_client.messages()[0]["photo_id"] == 5
+
+    def test_decode_incoming_frames(self):
+        manager = ConnectionManager(send_timeout=0.2)
+        ws = FakeWebSocket()
+        codec = get_codec("deflate")
+
+        async def scenario():
+            await manager.connect(ws, user_id=1, metadata={"encoding": "deflate"})
+
+        run(scenario())
+
+        assert manager.decode_message(ws, '{"type": "ping"}') == {"type": "ping"}
+        assert manager.decode_message(ws, codec.encode({"type": "ping"})) == {"type": "ping"}
+        with pytest.raises(ValueError):
+            manager.decode_message(ws, b"garbage")
+
+
+class TestSubscriptions:
+    """Тесты учета подписок подключений"""
+
+    def test_multiple_projects_cleaned_on_disconnect(self):
+        manager = ConnectionManager(send_timeout=0.2)
+        ws, other = FakeWebSocket(), FakeWebSocket()
+
+        async def scenario():
+            await manager.connect(ws, user_id=1, project_id=1)
+            await manager.connect(other, user_id=2, project_id=2)
+            manager.subscribe_project(ws, 2)
+            manager.subscribe_project(ws, 3)
+            assert manager.get_subscriptions(ws) == [1, 2, 3]
+            await manager.send_to_project(3, {"type": "project_updated", "project_id": 3})
+            await manager.flush()
+            manager.disconnect(ws)
+
+        run(scenario())
+
+        assert [m["project_id"] for m in ws.messages()] == [3]
+        assert set(manager.project_connections) == {2}
+        assert manager.project_connections[2] == {other}
+        assert ws not in manager.connection_projects
+
+    def test_unsubscribe_keeps_other_projects(self):
+        manager = ConnectionManager(send_timeout=0.2)
+        ws = FakeWebSocket()
+
+        async def scenario():
+            await manager.connect(ws, user_id=1, project_id=1)
+            manager.subscribe_project(ws, 2)
+            manager.unsubscribe_project(ws, 1)
+
+        run(scenario())
+
+        assert manager.get_subscriptions(ws) == [2]
+        assert manager.get_project_connections(1) == 0
+
+    def test_total_connections_is_incremental(self):
+        manager = ConnectionManager(send_timeout=0.2)
+        sockets = [FakeWebSocket() for _ in range(3)]
+
+        async def scenario():
+            for ws in sockets:
+                await manager.connect(ws, user_id=1)
+            manager.disconnect(sockets[0])
+            manager.disconnect(sockets[0])
+
+        run(scenario())
+
+        assert manager.get_total_connections() == 2
+        assert manager.get_user_connections(1) == 2
+
+
+class TestHeartbeat:
+    """Тесты серверного heartbeat и лимита подключений"""
+
+    def test_idle_connection_is_reaped(self):
+        manager = ConnectionManager(send_timeout=0.2, heartbeat_interval=0.05, idle_timeout=0.15)
+        idle, active = FakeWebSocket(), FakeWebSocket()
+
+        async def scenario():
+            await manager.connect(idle, user_id=1, project_id=1)
+            await manager.connect(active, user_id=2, project_id=1)
+            await asyncio.sleep(0.08)
+            manager.touch(active)
+            assert await manager.sweep() == 0
+            await manager.flush()
+            await asyncio.sleep(0.1)
+            manager.touch(active)
+            reaped = await manager.sweep()
+            await asyncio.sleep(0.01)
+            return reaped
+
+        assert run(scenario()) == 1
+        assert idle.closed
+        assert any(m["type"] == "ping" for m in idle.messages())
+        assert manager.get_total_connections() == 1
+        assert manager.get_project_connections(1) == 1
+
+    def test_sweeper_task_runs_in_background(self):
+        manager = ConnectionManager(
+            send_timeout=0.2, heartbeat_interval=0.02, idle_timeout=0.05, backplane=Backplane()
+        )
+        ws = FakeWebSocket()
+
+        async def scenario():
+            await manager.start()
+            await manager.connect(ws, user_id=1)
+            await asyncio.sleep(0.15)
+            await manager.stop()
+
+        run(scenario())
+
+        assert manager.reaped == 1
+        assert manager.get_total_connections() == 0
+
+    def test_connection_limit(self):
+        manager = ConnectionManager(send_timeout=0.2, max_connections=2)
+        sockets = [FakeWebSocket() for _ in range(3)]
+
+        async def scenario():
+            return [await manager.connect(ws, user_id=index) for index, ws in enumerate(sockets)]
+
+        assert run(scenario()) == [True, True, False]
+        assert sockets[2].closed
+        assert manager.get_total_connections() == 2
+        assert manager.rejected == 1
+
+    def test_rejected_client_receives_close_code(self):
+        from starlette.applications import Starlette
+        from starlette.routing import WebSocketRoute
+        from starlette.testclient import TestClient
+        from starlette.websockets import WebSocketDisconnect
+
+        manager = ConnectionManager(send_timeout=0.2, max_connections=0, backplane=Backplane())
+
+        async def endpoint(websocket):
+            await manager.connect(websocket, user_id=1)
+
+        client = TestClient(Starlette(routes=[WebSocketRoute("/ws", endpoint)]))
+        with client.websocket_connect("/ws") as ws:
+            # Рукопожатие принято: клиент видит код 1013, а не отказ HTTP 403
+            with pytest.raises(WebSocketDisconnect) as closed:
+                ws.receive_text()
+
+        assert closed.value.code == 1013
+
+
+class TestReplay:
+    """Тесты номеров событий и повтора пропущенного"""
+
+    def test_events_are_numbered_per_project(self):
+        manager = ConnectionManager(send_timeout=0.2, event_log=InMemoryEventLog(max_events=10))
+        ws = FakeWebSocket()
+
+        async def scenario():
+            await manager.connect(ws, user_id=1, project_id=1)
+            manager.subscribe_project(ws, 2)
+            for project_id in (1, 1, 2, 1):
+                await manager.send_to_project(project_id, {"type": "photo_uploaded", "project_id": project_id})
+            await manager.flush()
+
+        run(scenario())
+
+        assert [(m["project_id"], m["seq"]) for m in ws.messages()] == [(1, 1), (1, 2), (2, 1), (1, 3)]
+
+    def test_reconnect_receives_only_missed_delta(self):
+        manager = ConnectionManager(send_timeout=0.2, event_log=InMemoryEventLog(max_events=10))
+        ws = FakeWebSocket()
+
+        async def scenario():
+            for index in range(5):
+                await manager.send_to_project(1, {"type": "inspection_created", "inspection_id": index})
+            await manager.connect(ws, user_id=1, project_id=1)
+            complete = await manager.replay(ws, 1, last_seq=3)
+            await manager.flush()
+            return complete
+
+        assert run(scenario())
+        frame = ws.messages()[0]
+        assert frame["type"] == "replay"
+        assert frame["complete"] is True
+        assert [event["seq"] for event in frame["events"]] == [4, 5]
+        assert frame["last_seq"] == 5
+
+    def test_evicted_events_require_resync(self):
+        manager = ConnectionManager(send_timeout=0.2, event_log=InMemoryEventLog(max_events=3))
+        ws = FakeWebSocket()
+
+        async def scenario():
+            for index in range(10):
+                await manager.send_to_project(1, {"type": "defect_detected", "defect_id": index})
+            await manager.connect(ws, user_id=1, project_id=1)
+            complete = await manager.replay(ws, 1, last_seq=2)
+            await manager.flush()
+            return complete
+
+        assert run(scenario()) is False
+        frame = ws.messages()[0]
+        assert frame["complete"] is False
+        assert frame["events"] == []
+        assert frame["last_seq"] == 10
+
+    def test_remote_events_are_recorded_with_origin_seq(self):
+        broker = InMemoryBroker()
+        first = ConnectionManager(send_timeout=0.2, backplane=InMemoryBackplane(broker), event_log=InMemoryEventLog())
+        second = ConnectionManager(send_timeout=0.2, backplane=InMemoryBackplane(broker), event_log=InMemoryEventLog())
+        remote = FakeWebSocket()
+
+        async def scenario():
+            for node in (first, second):
+                await node.start()
+            await second.connect(remote, user_id=1, project_id=4)
+            for index in range(3):
+                await first.send_to_project(4, {"type": "photo_uploaded", "photo_id": index})
+            events, complete = await second.event_log.since(4, 1)
+            for node in (first, second):
+                await node.stop()
+            return events, complete
+
+        events, complete = run(scenario())
+
+        assert complete
+        assert [event["seq"] for event in events] == [2, 3]
+
+    def test_memory_log_rejected_with_redis_backplane(self, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "WS_BACKPLANE", "redis")
+        with pytest.raises(ValueError):
+            create_event_log("memory")
+
+        monkeypatch.setattr(settings, "WS_BACKPLANE", "local")
+        assert isinstance(create_event_log("memory"), InMemoryEventLog)
+
+
+class TestSSE:
+    """Тесты Server-Sent Events подключений"""
+
+    def test_codec_uses_seq_as_event_id(self):
+        frame = SSE_CODEC.encode({"type": "defect_detected", "project_id": 1, "seq": 7})
+
+        assert frame.startswith("id: 7\nevent: defect_detected\ndata: {")
+        assert frame.endswith("\n\n")
+
+    def test_codec_expands_replay(self):
+        frame = SSE_CODEC.encode({
+            "type": "replay",
+            "project_id": 1,
+            "last_seq": 5,
+            "complete": True,
+            "events": [{"type": "photo_uploaded", "seq": 4}, {"type": "photo_uploaded", "seq": 5}],
+        })
+
+        ids = [line for line in frame.split("\n") if line.startswith("id: ")]
+        assert ids == ["id: 4", "id: 5", "id: 5"]
+        assert "event: replay" in frame
+
+    def test_stream_resumes_from_last_event_id(self):
+        manager = ConnectionManager(send_timeout=0.2, event_log=InMemoryEventLog(max_events=10))
+        connection = SSEConnection(heartbeat_interval=0.05)
+
+        async def scenario():
+            for index in range(3):
+                await manager.send_to_project(1, {"type": "inspection_created", "inspection_id": index})
+            await manager.connect(connection, user_id=1, project_id=1, codec=SSE_CODEC)
+            await manager.replay(connection, 1, last_seq=1)
+            await manager.send_to_project(1, {"type": "inspection_created", "inspection_id": 3})
+
+            chunks = []
+            stream = connection.stream(retry_ms=1000)
+            async for chunk in stream:
+                chunks.append(chunk)
+                if chunk == ": heartbeat\n\n":
+                    break
+            await stream.aclose()
+            manager.disconnect(connection)
+            return "".join(chunks)
+
+        body = run(scenario())
+
+        assert body.startswith("retry: 1000\n\n")
+        ids = [line for line in body.split("\n") if line.startswith("id: ")]
+        assert ids == ["id: 2", "id: 3", "id: 3", "id: 4"]
+        assert body.endswith(": heartbeat\n\n")
+        assert manager.get_total_connections() == 0
+
+    def test_server_close_ends_stream(self):
+        connection = SSEConnection(heartbeat_interval=1.0)
+
+        async def scenario():
+            await connection.send_text("data: 1\n\n")
+            await connection.close()
+            return [chunk async for chunk in connection.stream(retry_ms=0)]
+
+        assert run(scenario()) == ["retry: 0\n\n"]
+
+
+class TestLoadHarness:
+    """Smoke-тест нагрузочного скрипта scripts/ws_load_test.py"""
+
+    def test_reports_fan_out_metrics(self, monkeypatch):
+        from app import websocket as realtime
+        from scripts.ws_load_test import run_load_test
+
+        # Без Redis: локальный backplane и журнал событий в памяти
+        monkeypatch.setattr(realtime.manager, "backplane", Backplane())
+        monkeypatch.setattr(realtime.manager, "event_log", InMemoryEventLog())
+
+        report = run(run_load_test(clients=40, projects=4, events=20))
+
+        assert report["accepted"] == 40
+        assert report["drained"] is True
+        # Каждое событие уходит 10 клиентам своего проекта
+        assert report["delivered_events"] == 200
+        assert report["latency_ms"]["p99"] >= report["latency_ms"]["p50"] > 0
+        assert report["memory_per_connection_kb"] > 0
+        assert realtime.manager.get_total_connections() == 0